@@ -5,6 +5,8 @@ through shared memory IPC.
 """
 
 import time
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FuturesTimeoutError
 from contextlib import asynccontextmanager
 from typing import Any
 
@@ -26,8 +28,8 @@ from champi_imgui.extensions.file_dialog import (
     MessageDialog,
 )
 from champi_imgui.extensions.notification import NotificationManager, NotificationType
-from champi_imgui.ipc.command_types import CommandType
-from champi_imgui.ipc.shared_memory_manager import SharedMemoryManager
+from champi_imgui.ipc.array_arena import array_ref
+from champi_imgui.ipc.command_types import AckStatus, CommandType
 from champi_imgui.layout.manager import LayoutManager, LayoutMode
 from champi_imgui.themes.manager import ThemeManager
 from champi_imgui.themes.presets import THEME_PRESETS
@@ -255,6 +257,98 @@ def create_mcp_app(**overrides: Any) -> FastMCP:
 
     mcp._create_widget_in_canvas = _create_widget_in_canvas  # type: ignore[attr-defined]
 
+    def _wait_for_ack(future: Future[AckStatus], timeout: float = 5.0) -> str | None:
+        """Block until a submitted command is applied.
+
+        Returns:
+            None if the command applied cleanly, otherwise an error message
+        """
+        try:
+            status = future.result(timeout=timeout)
+        except FuturesTimeoutError:
+            return "Timed out waiting for the canvas to apply the command"
+        if status != AckStatus.OK:
+            return f"Canvas failed to apply the command ({status.name})"
+        return None
+
+    def _render_host_error(canvas_id: str, feature: str) -> dict[str, Any] | None:
+        """Return the error for a tool that needs the in-process render loop.
+
+        The model canvas of a canvas drawn by a render host never renders,
+        so a request queued for its render thread would only time out.
+
+        Returns:
+            None if the canvas renders in this process, else a failure result
+        """
+        if canvas_manager.shard_of(canvas_id) is None:
+            return None
+        return {
+            "success": False,
+            "error": f"{feature} is not available for canvases "
+            "drawn by a render host process",
+        }
+
+    def _update_widget(
+        canvas: Any,
+        widget: Any,
+        properties: dict[str, Any] | None = None,
+        ops: list[list[Any]] | None = None,
+        wait: bool = False,
+    ) -> str | None:
+        """Mutate a widget without racing the render thread.
+
+        While the canvas is being rendered the mutation travels as an
+        UPDATE_WIDGET command and is applied at the start of the next frame.
+        Otherwise nothing is reading the widget, so it is applied directly.
+
+        Args:
+            canvas: Canvas holding the widget
+            widget: Widget to update
+            properties: Properties to overwrite
+            ops: List-level edits (see Widget.apply_ops)
+            wait: Wait until a queued update is applied, for ops that are
+                validated against the widget's state when they apply
+
+        Returns:
+            None, or with *wait* an error message if the canvas failed to
+            apply the update
+
+        Raises:
+            Exception: Whatever Widget.update/apply_ops raise when the update
+                is applied directly
+        """
+        if canvas._running and canvas_manager.is_loop_healthy():
+            fields = {
+                "widget_id": widget.widget_id,
+                "properties": properties or {},
+                "ops": ops or [],
+            }
+            canvas_id = canvas.state.canvas_id
+            try:
+                if wait:
+                    future = canvas_manager.submit_command(
+                        canvas_id, CommandType.UPDATE_WIDGET, **fields
+                    )
+                else:
+                    canvas_manager.send_command(
+                        canvas_id, CommandType.UPDATE_WIDGET, **fields
+                    )
+            except FileNotFoundError:
+                logger.debug(
+                    f"No command region for canvas '{canvas_id}', "
+                    f"updating widget '{widget.widget_id}' in place"
+                )
+            else:
+                canvas._wake_render()
+                return _wait_for_ack(future) if wait else None
+
+        if properties:
+            widget.update(**properties)
+        if ops:
+            widget.apply_ops(ops)
+        canvas._wake_render()
+        return None
+
     # ==============================================================================
     # Canvas management tools
     # ==============================================================================
@@ -266,6 +360,8 @@ def create_mcp_app(**overrides: Any) -> FastMCP:
         width: int = 800,
         height: int = 600,
         auto_start: bool = True,
+        fps_target: int = 60,
+        cache_draw_lists: bool = True,
     ) -> dict[str, Any]:
         """Create a new canvas window.
 
@@ -278,6 +374,10 @@ def create_mcp_app(**overrides: Any) -> FastMCP:
             width: Window width in pixels
             height: Window height in pixels
             auto_start: Whether to automatically start rendering (default: True)
+            fps_target: Maximum full redraws per second; between them the
+                        canvas reuses its last drawn frame (0 = every frame)
+            cache_draw_lists: Reuse the last drawn frame while no widget has
+                              changed and the window is not being used
 
         Returns:
             Success status and canvas state data
@@ -297,6 +397,8 @@ def create_mcp_app(**overrides: Any) -> FastMCP:
                 title=title,
                 size=(width, height),
                 auto_start=auto_start,
+                fps_target=fps_target,
+                cache_draw_lists=cache_draw_lists,
             )
 
             if auto_start:
@@ -364,14 +466,15 @@ def create_mcp_app(**overrides: Any) -> FastMCP:
             }
 
     @mcp.tool()
-    def clear_canvas(canvas_id: str) -> dict[str, Any]:
+    def clear_canvas(canvas_id: str, wait: bool = False) -> dict[str, Any]:
         """Clear all widgets from a canvas.
 
         Sends a CLEAR_CANVAS command via shared memory to the canvas render thread.
-        The command is processed asynchronously (fire-and-forget).
+        The command is processed asynchronously (fire-and-forget) unless wait is set.
 
         Args:
             canvas_id: Canvas identifier
+            wait: Block until the render thread has applied the command
 
         Returns:
             Success status
@@ -388,32 +491,30 @@ def create_mcp_app(**overrides: Any) -> FastMCP:
             if not canvas._running:
                 canvas.run_async()
 
-            # Send command via shared memory (MCP server attaches to Canvas's memory)
-            shm_manager = SharedMemoryManager(name_prefix=f"canvas_{canvas_id}")
-            try:
-                shm_manager.attach_regions()
-
-                # Write command (fire-and-forget)
-                seq_num = shm_manager.write_command(
-                    CommandType.CLEAR_CANVAS, canvas_id=canvas_id
+            # Send command via shared memory
+            if wait:
+                future = canvas_manager.submit_command(
+                    canvas_id, CommandType.CLEAR_CANVAS
                 )
-
-                logger.info(
-                    f"Sent CLEAR_CANVAS command to '{canvas_id}' (seq={seq_num})"
+                seq_num = future.seq_num
+                error = _wait_for_ack(future)
+                if error is not None:
+                    return {"success": False, "error": error}
+            else:
+                seq_num = canvas_manager.send_command(
+                    canvas_id, CommandType.CLEAR_CANVAS
                 )
 
-                return {
-                    "success": True,
-                    "data": {
-                        "canvas_id": canvas_id,
-                        "command": "CLEAR_CANVAS",
-                        "seq_num": seq_num,
-                    },
-                }
+            logger.info(f"Sent CLEAR_CANVAS command to '{canvas_id}' (seq={seq_num})")
 
-            finally:
-                # Clean up shared memory handle (Canvas owns the memory)
-                shm_manager.cleanup()
+            return {
+                "success": True,
+                "data": {
+                    "canvas_id": canvas_id,
+                    "command": "CLEAR_CANVAS",
+                    "seq_num": seq_num,
+                },
+            }
 
         except Exception as e:
             logger.error(f"Error clearing canvas '{canvas_id}': {e}")
@@ -453,6 +554,7 @@ def create_mcp_app(**overrides: Any) -> FastMCP:
         title: str | None = None,
         width: int | None = None,
         height: int | None = None,
+        wait: bool = False,
     ) -> dict[str, Any]:
         """Update canvas state (title, size).
 
@@ -464,6 +566,7 @@ def create_mcp_app(**overrides: Any) -> FastMCP:
             title: New window title (optional)
             width: New window width in pixels (optional)
             height: New window height in pixels (optional)
+            wait: Block until the render thread has applied the updates
 
         Returns:
             Success status
@@ -489,34 +592,37 @@ def create_mcp_app(**overrides: Any) -> FastMCP:
 
             sent: list[str] = []
             last_seq: int = 0
+            futures: list[Future[AckStatus]] = []
 
-            shm_manager = SharedMemoryManager(name_prefix=f"canvas_{canvas_id}")
-            try:
-                shm_manager.attach_regions()
-
-                if title is not None:
-                    last_seq = shm_manager.write_command(
-                        CommandType.UPDATE_TITLE, canvas_id=canvas_id, title=title
-                    )
-                    logger.info(
-                        f"Sent UPDATE_TITLE command to '{canvas_id}' (seq={last_seq})"
-                    )
-                    sent.append("title")
-
-                if width is not None and height is not None:
-                    last_seq = shm_manager.write_command(
-                        CommandType.UPDATE_SIZE,
-                        canvas_id=canvas_id,
-                        width=width,
-                        height=height,
-                    )
-                    logger.info(
-                        f"Sent UPDATE_SIZE command to '{canvas_id}' (seq={last_seq})"
+            def _send(command_type: CommandType, **kwargs: Any) -> int:
+                if not wait:
+                    return canvas_manager.send_command(
+                        canvas_id, command_type, **kwargs
                     )
-                    sent.append("size")
+                future = canvas_manager.submit_command(
+                    canvas_id, command_type, **kwargs
+                )
+                futures.append(future)
+                return future.seq_num
 
-            finally:
-                shm_manager.cleanup()
+            if title is not None:
+                last_seq = _send(CommandType.UPDATE_TITLE, title=title)
+                logger.info(
+                    f"Sent UPDATE_TITLE command to '{canvas_id}' (seq={last_seq})"
+                )
+                sent.append("title")
+
+            if width is not None and height is not None:
+                last_seq = _send(CommandType.UPDATE_SIZE, width=width, height=height)
+                logger.info(
+                    f"Sent UPDATE_SIZE command to '{canvas_id}' (seq={last_seq})"
+                )
+                sent.append("size")
+
+            for future in futures:
+                error = _wait_for_ack(future)
+                if error is not None:
+                    return {"success": False, "error": error}
 
             return {
                 "success": True,
@@ -556,23 +662,11 @@ def create_mcp_app(**overrides: Any) -> FastMCP:
 
             # Send shutdown command via shared memory
             if canvas._running:
-                shm_manager = SharedMemoryManager(name_prefix=f"canvas_{canvas_id}")
-                try:
-                    shm_manager.attach_regions()
-                    seq_num = shm_manager.write_command(
-                        CommandType.SHUTDOWN, canvas_id=canvas_id
-                    )
-                    logger.info(
-                        f"Sent SHUTDOWN command to '{canvas_id}' (seq={seq_num})"
-                    )
-                finally:
-                    shm_manager.cleanup()
+                seq_num = canvas_manager.send_command(canvas_id, CommandType.SHUTDOWN)
+                logger.info(f"Sent SHUTDOWN command to '{canvas_id}' (seq={seq_num})")
 
-            # Stop canvas and cleanup
-            canvas.stop()
-
-            # Remove from manager
-            del canvas_manager.canvases[canvas_id]
+            # Stop canvas, release its client handles and remove it from the manager
+            canvas_manager.remove_canvas(canvas_id)
 
             logger.info(f"Shutdown canvas '{canvas_id}'")
 
@@ -623,7 +717,11 @@ def create_mcp_app(**overrides: Any) -> FastMCP:
             canvas_id: Canvas identifier
 
         Returns:
-            Dict with thread_alive, is_healthy, and last_error fields
+            Dict with thread_alive, is_healthy and last_error fields, plus the
+            shared loop's fps and stall count over the last 5 seconds (see
+            get_frame_telemetry for details). ``watchdog_restarts`` counts
+            loop restarts after stalled frames and ``last_stall`` is the
+            watchdog's latest report, with the stalled loop's stacks.
         """
         try:
             canvas = canvas_manager.get_canvas(canvas_id)
@@ -631,6 +729,8 @@ def create_mcp_app(**overrides: Any) -> FastMCP:
                 return {"success": False, "error": f"Canvas '{canvas_id}' not found"}
             thread_alive = canvas_manager.is_loop_healthy()
             err = canvas._render_error
+            frames = canvas_manager.telemetry.summary(5.0, time.perf_counter())
+            watchdog = canvas_manager.watchdog
             return {
                 "success": True,
                 "data": {
@@ -638,12 +738,58 @@ def create_mcp_app(**overrides: Any) -> FastMCP:
                     "thread_alive": thread_alive,
                     "is_healthy": canvas.is_render_healthy(),
                     "last_error": str(err) if err is not None else None,
+                    "fps": frames.get("fps", 0.0),
+                    "stalls": frames.get("stalls", 0),
+                    "watchdog_restarts": watchdog.restarts if watchdog else 0,
+                    "last_stall": watchdog.last_report() if watchdog else None,
                 },
             }
         except Exception as e:
             logger.error(f"Error getting render health for '{canvas_id}': {e}")
             return {"success": False, "error": str(e)}
 
+    @mcp.tool()
+    def get_frame_telemetry(
+        window_seconds: float = 10.0,
+        stall_ms: float = 50.0,
+    ) -> dict[str, Any]:
+        """Return frame-time statistics of the shared render loop.
+
+        Every loop frame is recorded with its total time and the time spent
+        draining command rings, rendering widgets, and in ImGui render / buffer
+        swap / idle wait. A stall is a frame that kept the render thread busy
+        longer than stall_ms, or one that arrived later than stall_ms while the
+        loop was meant to run at full rate (typically GIL contention with tool
+        handlers). Deliberate idle waits are not stalls and do not add jitter.
+
+        Args:
+            window_seconds: How many seconds of recent frames to summarize
+            stall_ms: Threshold in milliseconds for counting a stall
+
+        Returns:
+            Success status and fps, frame-time percentiles, jitter, stall
+            counts and mean per-phase times
+        """
+        try:
+            if window_seconds <= 0:
+                return {"success": False, "error": "window_seconds must be positive"}
+            if canvas_manager.render_process:
+                return {
+                    "success": False,
+                    "error": "Frame telemetry is recorded inside the render host "
+                    "processes and is not available here",
+                }
+            summary = canvas_manager.telemetry.summary(
+                window_seconds, time.perf_counter(), stall_ms
+            )
+            return {
+                "success": True,
+                "data": {"loop_running": canvas_manager.is_loop_healthy(), **summary},
+            }
+        except Exception as e:
+            logger.error(f"Error getting frame telemetry: {e}")
+            return {"success": False, "error": str(e)}
+
     @mcp.tool()
     def get_system_state() -> dict[str, Any]:
         """Return a full snapshot of the champi-imgui server's internal state.
@@ -652,8 +798,9 @@ def create_mcp_app(**overrides: Any) -> FastMCP:
         blinker signal receiver counts. Useful for observability and debugging.
 
         Returns:
-            Dict with version, uptime_seconds, canvas_count, canvases list,
-            managers dict, and signals dict.
+            Dict with version, uptime_seconds, canvas_count, canvases list
+            (each with the render host "shard" it lives on, or None when
+            rendering in-process), managers dict, and signals dict.
         """
         try:
             canvas_ids = canvas_manager.list_canvases()
@@ -672,6 +819,7 @@ def create_mcp_app(**overrides: Any) -> FastMCP:
                         "last_error": str(canvas._render_error)
                         if canvas._render_error is not None
                         else None,
+                        "shard": canvas_manager.shard_of(cid),
                     }
                 )
 
@@ -745,6 +893,7 @@ def create_mcp_app(**overrides: Any) -> FastMCP:
                         "last_error": str(canvas._render_error)
                         if canvas._render_error is not None
                         else None,
+                        "profile": canvas.profiler.snapshot(),
                     },
                 },
             }
@@ -752,6 +901,47 @@ def create_mcp_app(**overrides: Any) -> FastMCP:
             logger.error(f"Error getting canvas diagnostics for '{canvas_id}': {e}")
             return {"success": False, "error": str(e)}
 
+    @mcp.tool()
+    def get_render_profile(
+        canvas_id: str,
+        enable: bool | None = None,
+        reset: bool = False,
+    ) -> dict[str, Any]:
+        """Return per-widget render timings for a canvas.
+
+        Profiling is off by default. Call with enable=True to start collecting,
+        then call again to read rolling p50/p95/max render times (microseconds),
+        render-call and exception counts per top-level widget, slowest first.
+        A container's time includes its children.
+
+        Args:
+            canvas_id: Canvas identifier
+            enable: Turn profiling on (True) or off (False); None leaves it as is
+            reset: Drop all samples collected so far
+
+        Returns:
+            Success status and the profile snapshot
+        """
+        try:
+            canvas = canvas_manager.get_canvas(canvas_id)
+            if canvas is None:
+                return {"success": False, "error": f"Canvas '{canvas_id}' not found"}
+            error = _render_host_error(canvas_id, "Render profiling")
+            if error:
+                return error
+
+            if reset:
+                canvas.profiler.reset()
+            if enable is not None:
+                canvas.profiler.enabled = enable
+            return {
+                "success": True,
+                "data": {"canvas_id": canvas_id, **canvas.profiler.snapshot()},
+            }
+        except Exception as e:
+            logger.error(f"Error getting render profile for '{canvas_id}': {e}")
+            return {"success": False, "error": str(e)}
+
     # ==============================================================================
     # Basic widget tools
     # ==============================================================================
@@ -2211,6 +2401,8 @@ def create_mcp_app(**overrides: Any) -> FastMCP:
         y_data: list[float] | None = None,
         width: float = -1.0,
         height: float = -1.0,
+        x_array: str | None = None,
+        y_array: str | None = None,
     ) -> dict[str, Any]:
         """Add a line chart widget to the canvas (requires ImPlot).
 
@@ -2222,6 +2414,8 @@ def create_mcp_app(**overrides: Any) -> FastMCP:
             y_data: Y-axis data points
             width: Plot width (-1 for full width)
             height: Plot height (-1 for auto)
+            x_array: Shared array handle to plot instead of x_data
+            y_array: Shared array handle to plot instead of y_data
 
         Returns:
             Success status and serialized widget data
@@ -2230,8 +2424,8 @@ def create_mcp_app(**overrides: Any) -> FastMCP:
             widget = LineChartWidget(
                 widget_id,
                 title=title,
-                x_data=x_data or [],
-                y_data=y_data or [],
+                x_data=array_ref(x_array) if x_array else x_data or [],
+                y_data=array_ref(y_array) if y_array else y_data or [],
                 size=(width, height),
             )
             return _create_widget_in_canvas(canvas_id, widget)
@@ -2285,6 +2479,8 @@ def create_mcp_app(**overrides: Any) -> FastMCP:
         y_data: list[float] | None = None,
         width: float = -1.0,
         height: float = -1.0,
+        x_array: str | None = None,
+        y_array: str | None = None,
     ) -> dict[str, Any]:
         """Add a scatter plot widget to the canvas (requires ImPlot).
 
@@ -2296,6 +2492,8 @@ def create_mcp_app(**overrides: Any) -> FastMCP:
             y_data: Y-axis data points
             width: Plot width (-1 for full width)
             height: Plot height (-1 for auto)
+            x_array: Shared array handle to plot instead of x_data
+            y_array: Shared array handle to plot instead of y_data
 
         Returns:
             Success status and serialized widget data
@@ -2304,8 +2502,8 @@ def create_mcp_app(**overrides: Any) -> FastMCP:
             widget = ScatterPlotWidget(
                 widget_id,
                 title=title,
-                x_data=x_data or [],
-                y_data=y_data or [],
+                x_data=array_ref(x_array) if x_array else x_data or [],
+                y_data=array_ref(y_array) if y_array else y_data or [],
                 size=(width, height),
             )
             return _create_widget_in_canvas(canvas_id, widget)
@@ -2358,6 +2556,7 @@ def create_mcp_app(**overrides: Any) -> FastMCP:
         values: list[list[float]] | None = None,
         width: float = -1.0,
         height: float = -1.0,
+        values_array: str | None = None,
     ) -> dict[str, Any]:
         """Add a heatmap widget to the canvas (requires ImPlot).
 
@@ -2368,6 +2567,7 @@ def create_mcp_app(**overrides: Any) -> FastMCP:
             values: 2D list of float values (rows x cols)
             width: Plot width (-1 for full width)
             height: Plot height (-1 for auto)
+            values_array: Shared 2D array handle to plot instead of values
 
         Returns:
             Success status and serialized widget data
@@ -2376,7 +2576,7 @@ def create_mcp_app(**overrides: Any) -> FastMCP:
             widget = HeatmapWidget(
                 widget_id,
                 title=title,
-                values=values or [],
+                values=array_ref(values_array) if values_array else values or [],
                 size=(width, height),
             )
             return _create_widget_in_canvas(canvas_id, widget)
@@ -3222,13 +3422,18 @@ def create_mcp_app(**overrides: Any) -> FastMCP:
                     "success": False,
                     "error": f"Widget '{widget_id}' is not an ImageWidget",
                 }
+            updates: dict[str, Any] = {}
             if file_path is not None:
-                widget.state.properties["file_path"] = file_path
+                updates["file_path"] = file_path
             if width is not None:
-                widget.state.properties["width"] = width
+                updates["width"] = width
             if height is not None:
-                widget.state.properties["height"] = height
-            return {"success": True, "data": widget.serialize()}
+                updates["height"] = height
+            data = widget.serialize()
+            if updates:
+                _update_widget(canvas, widget, properties=updates)
+                data["properties"].update(updates)
+            return {"success": True, "data": data}
         except Exception as e:
             logger.error(f"Error updating image widget '{widget_id}': {e}")
             return {"success": False, "error": str(e)}
@@ -3472,7 +3677,7 @@ def create_mcp_app(**overrides: Any) -> FastMCP:
                     "success": False,
                     "error": f"Widget {widget_id} is not a DrawingWidget",
                 }
-            widget.clear()
+            _update_widget(canvas, widget, ops=[["call", "clear", [], {}]])
             return {"success": True, "data": {"widget_id": widget_id}}
         except Exception as e:
             logger.error(f"Error clearing drawing widget '{widget_id}': {e}")
@@ -3503,7 +3708,7 @@ def create_mcp_app(**overrides: Any) -> FastMCP:
                     "success": False,
                     "error": f"Widget {widget_id} is not a DrawingWidget",
                 }
-            widget.undo()
+            _update_widget(canvas, widget, ops=[["call", "undo", [], {}]])
             return {"success": True, "data": {"widget_id": widget_id}}
         except Exception as e:
             logger.error(f"Error undoing on drawing widget '{widget_id}': {e}")
@@ -3534,7 +3739,7 @@ def create_mcp_app(**overrides: Any) -> FastMCP:
                     "success": False,
                     "error": f"Widget {widget_id} is not a DrawingWidget",
                 }
-            widget.redo()
+            _update_widget(canvas, widget, ops=[["call", "redo", [], {}]])
             return {"success": True, "data": {"widget_id": widget_id}}
         except Exception as e:
             logger.error(f"Error redoing on drawing widget '{widget_id}': {e}")
@@ -3624,38 +3829,28 @@ def create_mcp_app(**overrides: Any) -> FastMCP:
                         "success": False,
                         "error": "Ellipse radii must be positive",
                     }
-                widget.add_shape(
-                    shape_type,
-                    color=color_tuple,
-                    thickness=thickness,
-                    filled=filled,
-                    cx=cx,
-                    cy=cy,
-                    rx=rx,
-                    ry=ry,
-                )
+                coords: dict[str, float] = {"cx": cx, "cy": cy, "rx": rx, "ry": ry}
             elif shape_type == "circle":
-                widget.add_shape(
-                    shape_type,
-                    color=color_tuple,
-                    thickness=thickness,
-                    filled=filled,
-                    cx=cx,
-                    cy=cy,
-                    radius=radius,
-                )
+                coords = {"cx": cx, "cy": cy, "radius": radius}
             else:
-                widget.add_shape(
-                    shape_type,
-                    color=color_tuple,
-                    thickness=thickness,
-                    filled=filled,
-                    x1=x1,
-                    y1=y1,
-                    x2=x2,
-                    y2=y2,
-                )
-            canvas._wake_render()
+                coords = {"x1": x1, "y1": y1, "x2": x2, "y2": y2}
+            _update_widget(
+                canvas,
+                widget,
+                ops=[
+                    [
+                        "call",
+                        "add_shape",
+                        [shape_type],
+                        {
+                            "color": color_tuple,
+                            "thickness": thickness,
+                            "filled": filled,
+                            **coords,
+                        },
+                    ]
+                ],
+            )
             return {"success": True, "data": {"widget_id": widget_id}}
         except Exception as e:
             logger.error(f"Error adding shape to drawing widget '{widget_id}': {e}")
@@ -3702,8 +3897,18 @@ def create_mcp_app(**overrides: Any) -> FastMCP:
             color_tuple: tuple[float, float, float, float] = (
                 tuple(color) if color else (1.0, 1.0, 1.0, 1.0)  # type: ignore[assignment]
             )
-            widget.add_annotation(x, y, text, color_tuple, font_size)
-            canvas._wake_render()
+            _update_widget(
+                canvas,
+                widget,
+                ops=[
+                    [
+                        "call",
+                        "add_annotation",
+                        [x, y, text, color_tuple, font_size],
+                        {},
+                    ]
+                ],
+            )
             return {"success": True, "data": {"widget_id": widget_id}}
         except Exception as e:
             logger.error(f"Error adding text to drawing widget '{widget_id}': {e}")
@@ -3755,23 +3960,20 @@ def create_mcp_app(**overrides: Any) -> FastMCP:
                 tuple(color) if color else AUTHOR_COLORS["llm"]  # type: ignore[assignment]
             )
             stroke_points = [(float(p[0]), float(p[1])) for p in points]
-            strokes: list[dict[str, Any]] = widget.state.properties.get("strokes", [])
-            strokes.append(
-                {
-                    "points": stroke_points,
-                    "author": "llm",
-                    "timestamp": time.time(),
-                    "tool": "brush",
-                    "color": color_tuple,
-                    "brush_size": brush_size,
-                    "brush_style": brush_style,
-                }
-            )
-            widget.state.properties["strokes"] = strokes
-            canvas._wake_render()
+            stroke = {
+                "points": stroke_points,
+                "author": "llm",
+                "timestamp": time.time(),
+                "tool": "brush",
+                "color": color_tuple,
+                "brush_size": brush_size,
+                "brush_style": brush_style,
+            }
+            stroke_count = len(widget.state.properties.get("strokes", [])) + 1
+            _update_widget(canvas, widget, ops=[["extend", "strokes", [stroke]]])
             return {
                 "success": True,
-                "data": {"widget_id": widget_id, "stroke_count": len(strokes)},
+                "data": {"widget_id": widget_id, "stroke_count": stroke_count},
             }
         except Exception as e:
             logger.error(
@@ -3838,7 +4040,9 @@ def create_mcp_app(**overrides: Any) -> FastMCP:
         Args:
             canvas_id: Target canvas identifier
             widget_id: DrawingWidget identifier
-            strokes: List of strokes to import (each stroke is a list of [x, y] points)
+            strokes: List of strokes to import (each stroke is a list of [x, y] points;
+                a stroke's "points" may also be {"$shm_array": handle} naming an
+                (N, 2) shared array)
             shapes: List of shape dicts to import
             annotations: List of annotation dicts to import
             merge: When False (default) replace existing data; when True append to it
@@ -3888,27 +4092,21 @@ def create_mcp_app(**overrides: Any) -> FastMCP:
                             ),
                         }
 
-            def _apply() -> None:
-                props = widget.state.properties
-                if strokes is not None:
-                    if merge:
-                        props["strokes"] = props.get("strokes", []) + list(strokes)
-                    else:
-                        props["strokes"] = list(strokes)
-                if shapes is not None:
-                    if merge:
-                        props["shapes"] = props.get("shapes", []) + list(shapes)
-                    else:
-                        props["shapes"] = list(shapes)
-                if annotations is not None:
-                    if merge:
-                        props["annotations"] = props.get("annotations", []) + list(
-                            annotations
-                        )
-                    else:
-                        props["annotations"] = list(annotations)
-
-            _apply()
+            replace: dict[str, Any] = {}
+            ops: list[list[Any]] = []
+            for key, items in (
+                ("strokes", strokes),
+                ("shapes", shapes),
+                ("annotations", annotations),
+            ):
+                if items is None:
+                    continue
+                if merge:
+                    ops.append(["extend", key, list(items)])
+                else:
+                    replace[key] = list(items)
+            if replace or ops:
+                _update_widget(canvas, widget, properties=replace, ops=ops)
             return {"success": True, "data": {"widget_id": widget_id}}
         except Exception as e:
             logger.error(f"Error importing strokes into '{widget_id}': {e}")
@@ -3959,22 +4157,24 @@ def create_mcp_app(**overrides: Any) -> FastMCP:
                     "error": f"Widget {widget_id} is not a DrawingWidget",
                 }
 
-            strokes: list[dict[str, Any]] = widget.state.properties.get("strokes", [])
-            if index >= len(strokes):
-                return {
-                    "success": False,
-                    "error": f"index {index} out of range ({len(strokes)} strokes)",
-                }
-
-            stroke = strokes[index]
+            fields: dict[str, Any] = {}
             if points is not None:
-                stroke["points"] = points
+                fields["points"] = points
             if color is not None:
-                stroke["color"] = tuple(color)
+                fields["color"] = tuple(color)
             if brush_size is not None:
-                stroke["brush_size"] = brush_size
-
-            canvas._wake_render()
+                fields["brush_size"] = brush_size
+
+            # Bounds are checked where the op applies, after queued extends
+            if fields:
+                error = _update_widget(
+                    canvas,
+                    widget,
+                    ops=[["set_item", "strokes", index, fields]],
+                    wait=True,
+                )
+                if error:
+                    return {"success": False, "error": error}
             return {"success": True}
         except Exception as e:
             logger.error(f"Error updating stroke {index} on widget '{widget_id}': {e}")
@@ -4029,28 +4229,28 @@ def create_mcp_app(**overrides: Any) -> FastMCP:
                     "error": f"Widget {widget_id} is not a DrawingWidget",
                 }
 
-            annotations: list[dict[str, Any]] = widget.state.properties.get(
-                "annotations", []
-            )
-            if index >= len(annotations):
-                return {
-                    "success": False,
-                    "error": f"index {index} out of range ({len(annotations)} annotations)",
-                }
-
-            annotation = annotations[index]
+            fields: dict[str, Any] = {}
             if text is not None:
-                annotation["text"] = text
+                fields["text"] = text
             if x is not None:
-                annotation["x"] = x
+                fields["x"] = x
             if y is not None:
-                annotation["y"] = y
+                fields["y"] = y
             if color is not None:
-                annotation["color"] = tuple(color)
+                fields["color"] = tuple(color)
             if font_size is not None:
-                annotation["font_size"] = font_size
-
-            canvas._wake_render()
+                fields["font_size"] = font_size
+
+            # Bounds are checked where the op applies, after queued extends
+            if fields:
+                error = _update_widget(
+                    canvas,
+                    widget,
+                    ops=[["set_item", "annotations", index, fields]],
+                    wait=True,
+                )
+                if error:
+                    return {"success": False, "error": error}
             return {"success": True}
         except Exception as e:
             logger.error(
@@ -4114,7 +4314,7 @@ def create_mcp_app(**overrides: Any) -> FastMCP:
             if not widget:
                 return {"success": False, "error": f"Widget {widget_id} not found"}
 
-            from champi_imgui.widgets.drawing import FILL_SUPPORTED_TYPES, DrawingWidget
+            from champi_imgui.widgets.drawing import DrawingWidget
 
             if not isinstance(widget, DrawingWidget):
                 return {
@@ -4122,28 +4322,14 @@ def create_mcp_app(**overrides: Any) -> FastMCP:
                     "error": f"Widget {widget_id} is not a DrawingWidget",
                 }
 
-            shapes: list[dict[str, Any]] = widget.state.properties.get("shapes", [])
-            if index >= len(shapes):
-                return {
-                    "success": False,
-                    "error": f"index {index} out of range ({len(shapes)} shapes)",
-                }
-
-            shape = shapes[index]
+            fields: dict[str, Any] = {}
             if color is not None:
-                shape["color"] = tuple(color)
+                fields["color"] = tuple(color)
             if thickness is not None:
-                shape["thickness"] = thickness
+                fields["thickness"] = thickness
             if filled is not None:
-                if filled and shape.get("type") not in FILL_SUPPORTED_TYPES:
-                    return {
-                        "success": False,
-                        "error": (
-                            f"Shape type '{shape.get('type')}' does not support fill; "
-                            f"only {sorted(FILL_SUPPORTED_TYPES)} do"
-                        ),
-                    }
-                shape["filled"] = filled
+                # Fill support is checked by DrawingWidget.check_item_update
+                fields["filled"] = filled
             for key, val in [
                 ("x1", x1),
                 ("y1", y1),
@@ -4156,9 +4342,18 @@ def create_mcp_app(**overrides: Any) -> FastMCP:
                 ("ry", ry),
             ]:
                 if val is not None:
-                    shape[key] = val
-
-            canvas._wake_render()
+                    fields[key] = val
+
+            # Bounds are checked where the op applies, after queued extends
+            if fields:
+                error = _update_widget(
+                    canvas,
+                    widget,
+                    ops=[["set_item", "shapes", index, fields]],
+                    wait=True,
+                )
+                if error:
+                    return {"success": False, "error": error}
             return {"success": True}
         except Exception as e:
             logger.error(f"Error updating shape {index} on widget '{widget_id}': {e}")
@@ -4208,31 +4403,71 @@ def create_mcp_app(**overrides: Any) -> FastMCP:
     @mcp.tool()
     def screenshot_canvas(
         canvas_id: str,
-        filepath: str,
+        filepath: str | None = None,
         region: list[int] | None = None,
+        image_format: str = "png",
+        compression: int | None = None,
+        output: str = "file",
+        skip_unchanged: bool = False,
+        diff_threshold: int = 0,
     ) -> dict[str, Any]:
-        """Capture the rendered canvas window as a PNG file.
+        """Capture the rendered canvas window as an image.
 
-        Takes a pixel-level screenshot of the canvas window and saves it to disk.
-        Optionally crop to a sub-region [x, y, width, height].
+        Takes a pixel-level screenshot of the canvas window and saves it to disk,
+        or returns it inline as base64. Optionally crop to a sub-region
+        [x, y, width, height]; only that rectangle is read back, which makes
+        small crops much cheaper than full captures.
 
         Args:
             canvas_id: Target canvas identifier
-            filepath: Destination PNG file path (e.g. "/tmp/canvas.png")
-            region: Optional [x, y, width, height] crop region in pixels
+            filepath: Destination file path (e.g. "/tmp/canvas.png"); required
+                when output is "file"
+            region: Optional [x, y, width, height] crop region in pixels from the
+                canvas's top left, clipped to the canvas
+            image_format: "png", "webp" or "rgba" (raw top-down RGBA rows)
+            compression: PNG zlib level 0-9 (default 6; lower is faster) or
+                WebP quality 0-100 (default 80)
+            output: "file" to write filepath, or "base64" to return the encoded
+                image in ``data`` without touching the disk
+            skip_unchanged: If nothing visible changed since the previous
+                screenshot of this canvas, return ``unchanged: true`` without
+                writing or returning the image
+            diff_threshold: Per-channel difference (0-255) still counted as
+                unchanged, to ignore anti-aliasing noise
 
         Returns:
-            Success status with filepath, width, and height of saved image
+            Success status with width, height and format of the image, plus
+            filepath (file output) or data (base64 output). Also ``unchanged``,
+            ``changed_region`` ([x, y, width, height] within the image that
+            differs from the previous screenshot) and a pixel ``hash``.
         """
         try:
+            if output not in ("file", "base64"):
+                return {
+                    "success": False,
+                    "error": f"output must be 'file' or 'base64', got '{output}'",
+                }
             canvas = canvas_manager.get_canvas(canvas_id)
             if not canvas:
                 return {"success": False, "error": f"Canvas {canvas_id} not found"}
+            error = _render_host_error(canvas_id, "Screenshots")
+            if error:
+                return error
             canvas_manager.ensure_canvas_running(canvas_id)
-            result = canvas.request_screenshot(filepath, region=region)
+            result = canvas.request_screenshot(
+                filepath,
+                region=region,
+                image_format=image_format,
+                compression=compression,
+                output=output,
+                diff_threshold=diff_threshold,
+                skip_unchanged=skip_unchanged,
+            )
             if "error" in result:
                 return {"success": False, "error": result["error"]}
-            return {"success": True, "filepath": filepath, **result}
+            if output == "file" and "path" in result:
+                return {"success": True, "filepath": filepath, **result}
+            return {"success": True, **result}
         except TimeoutError:
             return {
                 "success": False,
@@ -4242,6 +4477,86 @@ def create_mcp_app(**overrides: Any) -> FastMCP:
             logger.error(f"Error taking screenshot of '{canvas_id}': {e}")
             return {"success": False, "error": str(e)}
 
+    @mcp.tool()
+    def start_capture(
+        canvas_id: str,
+        directory: str,
+        fps: float = 10.0,
+        image_format: str = "png",
+        compression: int | None = None,
+        region: list[int] | None = None,
+        max_pending: int = 8,
+    ) -> dict[str, Any]:
+        """Start recording a canvas as an image sequence or raw frame stream.
+
+        The render loop captures frames itself at the requested rate, so no
+        per-frame tool call is needed. When encoding falls behind, frames are
+        dropped (and counted) instead of slowing rendering. Call stop_capture
+        to finish; it writes capture.json with frame timestamps.
+
+        Args:
+            canvas_id: Target canvas identifier
+            directory: Output directory (created if missing)
+            fps: Frames captured per second
+            image_format: "png" or "webp" writes frame_NNNNNN files; "rgba"
+                appends raw top-down RGBA frames to frames.rgba
+            compression: PNG zlib level 0-9 or WebP quality 0-100
+            region: Optional [x, y, width, height] crop, fixed for the recording
+            max_pending: Frames allowed between readback and disk before
+                new frames are dropped
+
+        Returns:
+            Success status and the capture stats
+        """
+        try:
+            canvas = canvas_manager.get_canvas(canvas_id)
+            if canvas is None:
+                return {"success": False, "error": f"Canvas '{canvas_id}' not found"}
+            error = _render_host_error(canvas_id, "Capture")
+            if error:
+                return error
+            canvas_manager.ensure_canvas_running(canvas_id)
+            stats = canvas.start_capture(
+                directory,
+                fps=fps,
+                image_format=image_format,
+                compression=compression,
+                region=region,
+                max_pending=max_pending,
+            )
+            return {"success": True, "data": {"canvas_id": canvas_id, **stats}}
+        except Exception as e:
+            logger.error(f"Error starting capture of '{canvas_id}': {e}")
+            return {"success": False, "error": str(e)}
+
+    @mcp.tool()
+    def stop_capture(canvas_id: str) -> dict[str, Any]:
+        """Stop a recording started with start_capture.
+
+        Waits for queued frames to be written, then writes capture.json.
+
+        Args:
+            canvas_id: Target canvas identifier
+
+        Returns:
+            Success status and the final stats: frames captured, written and
+            dropped
+        """
+        try:
+            canvas = canvas_manager.get_canvas(canvas_id)
+            if canvas is None:
+                return {"success": False, "error": f"Canvas '{canvas_id}' not found"}
+            stats = canvas.stop_capture()
+            if stats is None:
+                return {
+                    "success": False,
+                    "error": f"Canvas '{canvas_id}' is not being captured",
+                }
+            return {"success": True, "data": {"canvas_id": canvas_id, **stats}}
+        except Exception as e:
+            logger.error(f"Error stopping capture of '{canvas_id}': {e}")
+            return {"success": False, "error": str(e)}
+
     @mcp.tool()
     def measure_text(
         canvas_id: str,
@@ -4270,6 +4585,10 @@ def create_mcp_app(**overrides: Any) -> FastMCP:
             if not canvas:
                 return {"success": False, "error": f"Canvas {canvas_id} not found"}
 
+            error = _render_host_error(canvas_id, "Text measurement")
+            if error:
+                return error
+
             if not canvas._running:
                 return {"success": False, "error": "Canvas not running"}
 
@@ -4290,6 +4609,55 @@ def create_mcp_app(**overrides: Any) -> FastMCP:
             logger.error(f"Error measuring text on canvas '{canvas_id}': {e}")
             return {"success": False, "error": str(e)}
 
+    @mcp.tool()
+    def measure_text_batch(
+        canvas_id: str,
+        texts: list[str],
+        font_size: int,
+    ) -> dict[str, Any]:
+        """Measure the rendered pixel dimensions of many text strings at once.
+
+        Strings made of characters already seen at this font size are measured
+        from cached glyph metrics without waiting for a frame; the rest are
+        measured together on the render thread in a single frame. Prefer this
+        over repeated ``measure_text`` calls when laying out many labels.
+
+        Args:
+            canvas_id: Target canvas identifier.
+            texts: The strings to measure.
+            font_size: Desired font size in pixels; the closest loaded font is used.
+
+        Returns:
+            ``{"success": True, "data": {"sizes": [{"width": int, "height": int},
+            ...], "cached": int}}`` with sizes in the order of *texts*, or
+            ``{"success": False, "error": <message>}`` on failure.
+        """
+        try:
+            canvas = canvas_manager.get_canvas(canvas_id)
+            if not canvas:
+                return {"success": False, "error": f"Canvas {canvas_id} not found"}
+
+            error = _render_host_error(canvas_id, "Text measurement")
+            if error:
+                return error
+
+            if not canvas._running:
+                return {"success": False, "error": "Canvas not running"}
+
+            result = canvas.request_measure_text_batch(texts, font_size)
+            if "error" in result:
+                return {"success": False, "error": result["error"]}
+
+            return {"success": True, "data": result}
+        except TimeoutError:
+            return {
+                "success": False,
+                "error": "measure_text_batch timed out — canvas may not be rendering",
+            }
+        except Exception as e:
+            logger.error(f"Error measuring texts on canvas '{canvas_id}': {e}")
+            return {"success": False, "error": str(e)}
+
     @mcp.tool()
     def get_canvas_info(canvas_id: str) -> dict[str, Any]:
         """Return coordinate and display metadata for a canvas.
@@ -4316,6 +4684,10 @@ def create_mcp_app(**overrides: Any) -> FastMCP:
             if not canvas:
                 return {"success": False, "error": f"Canvas {canvas_id} not found"}
 
+            error = _render_host_error(canvas_id, "Canvas info")
+            if error:
+                return error
+
             if not canvas._running:
                 return {"success": False, "error": "Canvas not running"}
 
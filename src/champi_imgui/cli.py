@@ -88,13 +88,61 @@ def cli() -> None:
 
 
 @cli.command("serve")
-def serve() -> None:
+@click.option(
+    "--render-process",
+    is_flag=True,
+    help="Render canvases in a separate process instead of a server thread.",
+)
+@click.option(
+    "--render-hosts",
+    default=1,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Number of render processes to shard canvases across (implies --render-process when > 1).",
+)
+@click.option(
+    "--placement",
+    default="round_robin",
+    show_default=True,
+    type=click.Choice(["round_robin", "least_loaded"]),
+    help="How new canvases are assigned to render processes.",
+)
+@click.option(
+    "--headless",
+    is_flag=True,
+    help="Render without a window or display; screenshots are rasterized in software.",
+)
+@click.option(
+    "--stall-timeout",
+    default=5.0,
+    show_default=True,
+    type=click.FloatRange(min=0.0),
+    help="Restart the render loop when a frame runs longer than this many seconds (0 disables).",
+)
+def serve(
+    render_process: bool,
+    render_hosts: int,
+    placement: str,
+    headless: bool,
+    stall_timeout: float,
+) -> None:
     """Start the MCP server (stdio transport for MCP clients)."""
     from champi_imgui.api.server import create_mcp_app
+    from champi_imgui.core.canvas import CanvasManager
 
     _configure_logger()
-    _check_display()
-    mcp = create_mcp_app()
+    if headless and (render_process or render_hosts > 1):
+        raise click.UsageError("--headless cannot be combined with render processes")
+    if not headless:
+        _check_display()
+    manager = CanvasManager(
+        render_process=render_process or render_hosts > 1,
+        render_hosts=render_hosts,
+        placement=placement,
+        headless=headless,
+        stall_timeout=stall_timeout or None,
+    )
+    mcp = create_mcp_app(canvas_manager=manager)
     mcp.run()
 
 
@@ -229,5 +277,44 @@ def ipc_cleanup(prefix: str, yes: bool) -> None:
     click.echo(f"Removed {removed}/{len(regions)} region(s)")
 
 
+@cli.group()
+def bench() -> None:
+    """Performance benchmarks (headless)."""
+
+
+@bench.command("ipc")
+@click.option(
+    "--codec-iterations", default=20000, show_default=True, type=click.IntRange(min=1)
+)
+@click.option(
+    "--round-trips", default=2000, show_default=True, type=click.IntRange(min=1)
+)
+@click.option("--burst", default=20000, show_default=True, type=click.IntRange(min=1))
+@click.option(
+    "--output",
+    "-o",
+    type=click.Path(dir_okay=False, writable=True),
+    help="Write the JSON report to this file instead of stdout.",
+)
+def bench_ipc(
+    codec_iterations: int, round_trips: int, burst: int, output: str | None
+) -> None:
+    """Benchmark command codec throughput, ACK round-trip latency and burst load."""
+    import json
+
+    from champi_imgui.ipc.benchmark import run_ipc_benchmarks
+
+    report = run_ipc_benchmarks(
+        codec_iterations=codec_iterations, round_trips=round_trips, burst=burst
+    )
+    text = json.dumps(report, indent=2)
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+        click.echo(f"Wrote IPC benchmark report to {output}", err=True)
+    else:
+        click.echo(text)
+
+
 if __name__ == "__main__":
     cli()
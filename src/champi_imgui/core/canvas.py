@@ -7,43 +7,75 @@ Note: Screenshot capture uses GDK (PyGObject) as primary path and xwd/ImageMagic
 as fallback. Wayland-native (non-XWayland) is out of scope.
 """
 
+import contextlib
+import select
 import subprocess
 import threading
-from collections.abc import Callable
-from typing import Any, TypedDict
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import CancelledError, Future
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from typing import TYPE_CHECKING, Any, TypeVar
 
 from imgui_bundle import hello_imgui, imgui
 from loguru import logger
 
-from champi_imgui.core.state import CanvasState
+from champi_imgui.core.draw_cache import DrawListCache
+from champi_imgui.core.frame_capture import (
+    FramebufferReader,
+    FrameDiffer,
+    capture_image,
+    check_image_options,
+)
+from champi_imgui.core.headless import (
+    HeadlessFramebuffer,
+    HeadlessRunner,
+    SoftwareRasterizer,
+)
+from champi_imgui.core.profiler import RenderProfiler
+from champi_imgui.core.recording import DEFAULT_MAX_PENDING, CaptureSession
+from champi_imgui.core.render_tasks import RenderTaskQueue
+from champi_imgui.core.state import CanvasState, style_changed, widget_updated
+from champi_imgui.core.telemetry import FrameTelemetry
+from champi_imgui.core.text_metrics import PRELOAD_CHARS, TextMetricsCache
+from champi_imgui.core.watchdog import (
+    DEFAULT_STALL_TIMEOUT,
+    RenderStalled,
+    RenderWatchdog,
+)
 from champi_imgui.core.widget import Widget, WidgetRegistry
-from champi_imgui.ipc.command_types import CommandType
-from champi_imgui.ipc.shared_memory_manager import SharedMemoryManager
+from champi_imgui.ipc.command_types import AckStatus, CommandType
+from champi_imgui.ipc.doorbell import Doorbell
+from champi_imgui.ipc.shared_memory_manager import CommandFuture, SharedMemoryManager
 
+if TYPE_CHECKING:
+    from champi_imgui.core.render_host import RenderHostProcess
 
-class _ScreenshotRequest(TypedDict, total=False):
-    """Internal screenshot request passed between threads."""
+# How long ensure_canvas_running() waits for a new render host's first frame
+_HOST_READY_TIMEOUT = 10.0
 
-    filepath: str
-    region: list[int] | None
-    done: threading.Event
-    result: dict[str, Any]
+# How long a client write waits for the render side to free command ring
+# slots; large commands are sent in fragments within this time
+_WRITE_TIMEOUT = 5.0
 
+# Frames rendered after a change: ImGui settles auto-sized layout on the second
+_DIRTY_FRAMES = 2
 
-class _MeasureTextRequest(TypedDict, total=False):
-    """Internal text-measurement request passed between threads."""
+# Frame rate while nothing is dirty or animating (a heartbeat, not a refresh rate)
+_IDLE_FPS = 1.0
 
-    text: str
-    font_size: int
-    done: threading.Event
-    result: dict[str, Any]
+# How long cleanup() waits for the headless loop to finish its frame
+_HEADLESS_STOP_TIMEOUT = 5.0
 
+# A paced canvas renders when its slot is this close (at most _PACING_SLACK
+# seconds) so that vsync jitter does not push it back a whole display frame
+_PACING_SLACK_FRACTION = 0.25
+_PACING_SLACK = 0.004
 
-class _CanvasInfoRequest(TypedDict, total=False):
-    """Internal canvas-info request passed between threads."""
+T = TypeVar("T")
 
-    done: threading.Event
-    result: dict[str, Any]
+# How often the doorbell watcher notices canvases being added or removed
+_BELL_WATCH_TICK = 0.25
 
 
 class Canvas:
@@ -53,16 +85,39 @@ class Canvas:
     from shared memory regions. Window appears immediately when created.
     """
 
-    def __init__(self, canvas_id: str, **kwargs: Any):
+    def __init__(self, canvas_id: str, attach_ipc: bool = False, **kwargs: Any):
         """Initialize canvas.
 
         Args:
             canvas_id: Unique identifier for canvas
+            attach_ipc: Attach to regions another process created instead of
+                        creating them (render host side)
             **kwargs: Canvas state parameters (title, size, etc.)
         """
         self.state = CanvasState(canvas_id=canvas_id, **kwargs)
         self.shm_manager = SharedMemoryManager(name_prefix=f"canvas_{canvas_id}")
         self.widget_registry = WidgetRegistry()
+        self.widget_registry.on_dirty = self.mark_dirty
+
+        # Frames still owed since the last change; the loop idles at zero
+        self._dirty_frames = _DIRTY_FRAMES
+        # Wakes the render loop from any thread; set by CanvasManager
+        self._request_frame: Callable[[], None] = lambda: None
+
+        # Between full frames (paced by fps_target, or while nothing changed)
+        # the window replays the draw commands captured on the last one
+        self._draw_cache = DrawListCache()
+        self._next_due = 0.0
+        self._was_interacting = False
+        self._clock: Callable[[], float] = time.monotonic
+
+        # Per-widget render timings; off until enabled through get_render_profile
+        self.profiler = RenderProfiler()
+        # Seconds the last frame spent draining the command ring
+        self._commands_s = 0.0
+        # Root widget id -> (height incl. item spacing, width) measured
+        # the last time it rendered; used to skip widgets scrolled out of view
+        self._extents: dict[str, tuple[float, float]] = {}
 
         self._running = False
         self._render_error: Exception | None = None
@@ -73,17 +128,27 @@ class Canvas:
         # Injected by CanvasManager so is_render_healthy() can probe the shared loop.
         self._loop_healthy: Callable[[], bool] = lambda: False
 
-        # Screenshot request: set by request_screenshot(), consumed in render thread
-        self._screenshot_request: _ScreenshotRequest | None = None
-
-        # Text-measurement request: set by request_measure_text(), consumed in render thread
-        self._measure_text_request: _MeasureTextRequest | None = None
-
-        # Canvas-info request: set by request_canvas_info(), consumed in render thread
-        self._canvas_info_request: _CanvasInfoRequest | None = None
-
-        # Create shared memory regions (Canvas is the creator)
-        self.shm_manager.create_regions()
+        # Work other threads need done on the render thread (screenshots,
+        # text measurement, ...); drained once per frame
+        self.render_tasks = RenderTaskQueue()
+        # Glyph advances seen by the render thread, for off-thread measure_text
+        self.text_metrics = TextMetricsCache()
+        # Screenshot readback; CanvasManager shares one across its canvases
+        self._framebuffer = FramebufferReader()
+        # Last screenshot, to report what changed since (see FrameDiffer)
+        self._screenshot_differ = FrameDiffer()
+        # Continuous capture started by start_capture()
+        self._capture: CaptureSession | None = None
+
+        # Set by CanvasManager when an out-of-process render host mirrors this
+        # canvas; receives every widget added or removed here.
+        self._mirror: Callable[..., None] | None = None
+
+        if attach_ipc:
+            self.shm_manager.attach_regions()
+        else:
+            # Create shared memory regions (Canvas is the creator)
+            self.shm_manager.create_regions()
         logger.info(f"Canvas '{canvas_id}' initialized with shared memory")
 
     def get_window_id(self) -> int | None:
@@ -111,9 +176,56 @@ class Canvas:
         if not self._running:
             return
         self._running = False
+        self.render_tasks.cancel_all()
+        self.stop_capture()
         self.shm_manager.cleanup()
         logger.info(f"Canvas '{self.state.canvas_id}' stopped")
 
+    def submit_render_task(
+        self, fn: Callable[..., T], *args: Any, **kwargs: Any
+    ) -> Future[T]:
+        """Run ``fn(*args, **kwargs)`` on the render thread (thread-safe).
+
+        The call happens after the canvas window is drawn in the next frame,
+        together with every other task pending by then.
+
+        Returns:
+            Future resolving to the call's result
+        """
+        future = self.render_tasks.submit(fn, *args, **kwargs)
+        self._request_frame()
+        return future
+
+    def _call_on_render_thread(
+        self,
+        fn: Callable[[], "dict[str, Any] | Future[dict[str, Any]]"],
+        timeout: float,
+        what: str,
+    ) -> dict[str, Any]:
+        """Submit *fn* and block for its result.
+
+        *fn* may return a Future for work it hands off the render thread;
+        that is waited for too, within the same *timeout*.
+
+        Raises:
+            TimeoutError: If no frame runs it within *timeout*; the task is
+                          cancelled so a late frame does not run it either.
+        """
+        deadline = time.monotonic() + timeout
+        future = self.submit_render_task(fn)
+        try:
+            result = future.result(timeout=timeout)
+            if isinstance(result, Future):
+                result = result.result(timeout=max(deadline - time.monotonic(), 0.0))
+            return result
+        except FuturesTimeoutError:
+            future.cancel()
+            raise TimeoutError(
+                f"{what} canvas '{self.state.canvas_id}' timed out after {timeout}s"
+            ) from None
+        except CancelledError:
+            return {"error": f"Canvas '{self.state.canvas_id}' stopped"}
+
     def add_widget(self, widget: Widget) -> None:
         """Add a widget to the canvas registry.
 
@@ -126,16 +238,151 @@ class Canvas:
         logger.debug(
             f"Added widget '{widget.widget_id}' to canvas '{self.state.canvas_id}'"
         )
+        if self._mirror is not None:
+            self._mirror(
+                CommandType.ADD_WIDGET,
+                widget_id=widget.widget_id,
+                widget_type=widget.state.widget_type,
+                properties=widget.state.properties,
+                parent_id=widget._parent_id or "",
+            )
         self._wake_render()
 
+    def mark_dirty(self) -> None:
+        """Mark the canvas as changed and wake the render loop.
+
+        Thread-safe: may be called from any thread.
+        """
+        self._dirty_frames = _DIRTY_FRAMES
+        self._request_frame()
+
     def _wake_render(self) -> None:
-        """Signal hello_imgui to render a fresh frame after external state mutation."""
-        import contextlib
+        """Signal the render loop to draw a fresh frame after external state mutation."""
+        self.mark_dirty()
 
-        with contextlib.suppress(Exception):
-            hello_imgui.get_runner_params().fps_idling.time_active_after_last_event = (
-                0.5
+    def needs_frame(self) -> bool:
+        """Return True if the canvas has changed or a widget is animating."""
+        if self._dirty_frames > 0:
+            return True
+        return any(w.is_animating() for w in self.widget_registry.widgets())
+
+    def frame_interval(self) -> float:
+        """Return the seconds between full frames (0 = every loop frame)."""
+        fps = self.state.fps_target
+        return 1.0 / fps if fps > 0 else 0.0
+
+    def _slot_reached(self, now: float) -> bool:
+        interval = self.frame_interval()
+        slack = min(interval * _PACING_SLACK_FRACTION, _PACING_SLACK)
+        return now >= self._next_due - slack
+
+    def _frame_due(self, now: float) -> bool:
+        """Return True if the canvas should render in full at *now*."""
+        if self.frame_interval() <= 0:
+            return True
+        # The settling frame after a change follows it immediately
+        if 0 < self._dirty_frames < _DIRTY_FRAMES:
+            return True
+        return self._slot_reached(now)
+
+    def next_frame_delay(self, now: float) -> float | None:
+        """Return seconds until this canvas next needs a full frame.
+
+        None means the canvas is idle: nothing changed and nothing animates.
+        """
+        if len(self.render_tasks) or self._framebuffer.pending:
+            # Queued tasks run on the next frame, full or replayed; so does
+            # the completion of a screenshot readback
+            return 0.0
+        capture = self._capture
+        capture_delay = (
+            capture.next_delay(now) if capture is not None and capture.active else None
+        )
+        if not self.needs_frame():
+            return capture_delay
+        delay = 0.0 if self._frame_due(now) else max(self._next_due - now, 0.0)
+        return delay if capture_delay is None else min(delay, capture_delay)
+
+    def _user_interacting(self) -> bool:
+        """Return True if input is aimed at the current (canvas) window."""
+        if imgui.is_window_hovered(imgui.HoveredFlags_.child_windows):
+            return True
+        if imgui.is_popup_open(
+            "", imgui.PopupFlags_.any_popup_id | imgui.PopupFlags_.any_popup_level
+        ):
+            return True
+        if not imgui.is_window_focused(imgui.FocusedFlags_.child_windows):
+            return False
+        # Text cursors, drags and keyboard navigation highlights are live state
+        return imgui.is_any_item_active() or imgui.get_io().nav_visible
+
+    def _render_widgets(self) -> None:
+        """Render the root widgets that intersect the visible part of the window.
+
+        Like ImGuiListClipper: a widget whose height is known from an earlier
+        frame and lies entirely outside the window's clip rect is skipped, and
+        runs of skipped widgets are replaced by one Dummy of the same size so
+        the content extent, and thus scrolling, stays the same.  Widgets
+        measured at zero height (popups, menu bars) or followed by one (which
+        may continue their line) always render.
+        """
+        profiler = self.profiler if self.profiler.enabled else None
+        # Widgets owned by a container are rendered by their parent
+        roots = self.widget_registry.roots()
+        extents = self._extents
+        draw_list = imgui.get_window_draw_list()
+        visible_top = draw_list.get_clip_rect_min().y
+        visible_bottom = draw_list.get_clip_rect_max().y
+        window = imgui.internal.get_current_window()
+        skipped_height = 0.0
+        skipped_width = 0.0
+        last = len(roots) - 1
+        for i, widget in enumerate(roots):
+            cursor = imgui.get_cursor_screen_pos()
+            extent = extents.get(widget.widget_id)
+            if (
+                extent is not None
+                and extent[0] > 0
+                and (i == last or extents.get(roots[i + 1].widget_id, (1.0,))[0] > 0)
+            ):
+                top = cursor.y + skipped_height
+                if top + extent[0] < visible_top or top > visible_bottom:
+                    skipped_height += extent[0]
+                    skipped_width = max(skipped_width, extent[1])
+                    continue
+            if skipped_height:
+                self._skip_space(skipped_width, skipped_height)
+                skipped_height = skipped_width = 0.0
+                cursor = imgui.get_cursor_screen_pos()
+
+            failed = False
+            start = time.perf_counter_ns() if profiler is not None else 0
+            try:
+                widget.render()
+            except Exception as e:
+                import traceback
+
+                failed = True
+                logger.error(
+                    f"Error rendering widget '{widget.widget_id}': {e}\n{traceback.format_exc()}"
+                )
+            if profiler is not None:
+                profiler.record(
+                    widget.widget_id, time.perf_counter_ns() - start, failed
+                )
+            extents[widget.widget_id] = (
+                imgui.get_cursor_screen_pos().y - cursor.y,
+                window.dc.cursor_max_pos.x - cursor.x,
             )
+        if skipped_height:
+            self._skip_space(skipped_width, skipped_height)
+
+    @staticmethod
+    def _skip_space(width: float, height: float) -> None:
+        """Advance the layout as if widgets totalling *height* were drawn."""
+        # Dummy adds item spacing after itself; the measured heights include it
+        spacing = imgui.get_style().item_spacing.y
+        imgui.dummy(imgui.ImVec2(max(width, 0.0), max(height - spacing, 0.0)))
 
     def remove_widget(self, widget_id: str) -> bool:
         """Remove a widget from the canvas registry.
@@ -151,11 +398,18 @@ class Canvas:
             logger.debug(
                 f"Removed widget '{widget_id}' from canvas '{self.state.canvas_id}'"
             )
+            self.profiler.forget(widget_id)
+            self._extents.pop(widget_id, None)
+            if self._mirror is not None:
+                self._mirror(CommandType.REMOVE_WIDGET, widget_id=widget_id)
+            self._wake_render()
         return removed
 
     def _render_frame(self) -> None:
         """Render a single frame — called by the shared CanvasManager render loop."""
+        start = time.perf_counter()
         self._process_commands()
+        self._commands_s = time.perf_counter() - start
 
         imgui.set_next_window_size(
             imgui.ImVec2(*self.state.size), imgui.Cond_.first_use_ever
@@ -165,105 +419,214 @@ class Canvas:
             flags=imgui.WindowFlags_.no_collapse,
         )
 
+        full_frame = True
         if expanded:
-            # Render all registered widgets (skip widgets owned by a parent container)
-            for widget in self.widget_registry.get_all().values():
-                if widget._parent_id is not None:
-                    continue
-                try:
-                    widget.render()
-                except Exception as e:
-                    import traceback
-
-                    logger.error(
-                        f"Error rendering widget '{widget.widget_id}': {e}\n{traceback.format_exc()}"
-                    )
+            now = self._clock()
+            interacting = self._user_interacting()
+            # The frame after an interaction is drawn in full so hover and
+            # active highlights are not left baked into the replayed copy
+            settled = not interacting and not self._was_interacting
+            self._was_interacting = interacting
+            if (
+                settled
+                and self.state.cache_draw_lists
+                and not (self._frame_due(now) and self.needs_frame())
+                and self._draw_cache.can_replay()
+            ):
+                # Unchanged, or between paced frames: redraw last output as-is
+                self._draw_cache.replay()
+                full_frame = False
+            else:
+                self._draw_cache.begin_capture()
+                self._render_widgets()
+                self._draw_cache.end_capture()
+                if self._slot_reached(now):
+                    self._advance_pacing(now)
+        else:
+            self._draw_cache.invalidate()
 
         imgui.end()
-        self._handle_screenshot()
-        self._handle_measure_text()
-        self._handle_canvas_info()
+        if expanded and self.profiler.enabled:
+            self.profiler.record_frame(replayed=not full_frame)
+        self.render_tasks.run_pending()
+        capture = self._capture
+        if capture is not None:
+            capture.on_frame(self._clock(), self._framebuffer)
+        if full_frame and self._dirty_frames > 0:
+            self._dirty_frames -= 1
+
+    def _advance_pacing(self, now: float) -> None:
+        """Book the next full-frame slot after rendering one at *now*."""
+        interval = self.frame_interval()
+        if interval <= 0:
+            return
+        if now - self._next_due < interval:
+            # Keep a steady cadence rather than drifting by each frame's lateness
+            self._next_due += interval
+        else:
+            self._next_due = now + interval
+
+    def _capture_rect(self, region: list[int] | None) -> tuple[int, int, int, int]:
+        """Return *region* clipped to the canvas as ``(x, y, width, height)``.
 
-    def _handle_screenshot(self) -> None:
-        """Capture the canvas window and write a PNG file if requested.
+        *region* is ``[x, y, width, height]`` with the origin at the top left;
+        None selects the whole canvas.
 
-        Tries GDK (PyGObject) first, falls back to xwd + ImageMagick convert.
-        Must be called from the render thread after all ImGui draw calls so the
-        window contents are fully rendered.
+        Raises:
+            ValueError: If *region* is malformed or misses the canvas entirely
+        """
+        canvas_w, canvas_h = (int(v) for v in self.state.size)
+        if region is None:
+            return 0, 0, canvas_w, canvas_h
+        if len(region) != 4:
+            raise ValueError("region must be [x, y, width, height]")
+        x, y, width, height = (int(v) for v in region)
+        if width <= 0 or height <= 0:
+            raise ValueError("region width and height must be positive")
+        x0, y0 = max(x, 0), max(y, 0)
+        x1, y1 = min(x + width, canvas_w), min(y + height, canvas_h)
+        if x1 <= x0 or y1 <= y0:
+            raise ValueError(
+                f"region {region} lies outside the {canvas_w}x{canvas_h} canvas"
+            )
+        return x0, y0, x1 - x0, y1 - y0
+
+    def _gl_rect(self, rect: tuple[int, int, int, int]) -> tuple[int, int, int, int]:
+        """Convert a top-left-origin canvas rectangle to GL (bottom-left) rows."""
+        x, y, width, height = rect
+        return x, int(self.state.size[1]) - y - height, width, height
+
+    def _take_screenshot(
+        self,
+        filepath: str | None,
+        region: list[int] | None = None,
+        image_format: str = "png",
+        compression: int | None = None,
+        output: str = "file",
+        diff_threshold: int = 0,
+        skip_unchanged: bool = False,
+    ) -> "dict[str, Any] | Future[dict[str, Any]]":
+        """Capture the canvas window, or *region* of it.
+
+        Tries OpenGL first, then GDK (PyGObject), then xwd + ImageMagick convert.
+        Only OpenGL captures support formats other than PNG and in-memory
+        output. Must be called from the render thread after all ImGui draw
+        calls so the window contents are fully rendered.
+
+        Returns:
+            The result dict, or a Future for it while an OpenGL capture is
+            read back and encoded off the render thread
         """
-        req = self._screenshot_request
-        if req is None:
-            return
-        self._screenshot_request = None
-        filepath = req["filepath"]
         try:
+            rect = self._capture_rect(region)
             # OpenGL reads directly from the GPU framebuffer — no X11 needed.
             # Always try it first so Wayland/headless environments are covered.
-            if self._capture_opengl(filepath):
-                req["result"] = {"path": filepath}
-                return
+            capture = self._capture_opengl(
+                filepath,
+                rect,
+                image_format,
+                compression,
+                output,
+                diff_threshold=diff_threshold,
+                skip_unchanged=skip_unchanged,
+            )
+            if capture is not None:
+                return capture
+
+            if output != "file" or image_format != "png":
+                return {
+                    "success": False,
+                    "error": (
+                        "Screenshot failed: OpenGL unavailable; other capture "
+                        "methods only write PNG files"
+                    ),
+                }
+            assert filepath is not None
 
             # Fall back to X11-based methods.
             win_id = self._window_id
             if win_id is None:
-                req["result"] = {
+                return {
                     "success": False,
                     "error": (
                         "Screenshot failed: OpenGL unavailable and no X11 window ID "
                         "(Wayland-native sessions are not supported)"
                     ),
                 }
-                return
 
-            captured = self._capture_gdk(win_id, filepath)
+            crop = rect if region is not None else None
+            captured = self._capture_gdk(win_id, filepath, crop)
             if not captured:
-                captured = self._capture_xwd(win_id, filepath)
+                captured = self._capture_xwd(win_id, filepath, crop)
 
             if captured:
-                req["result"] = {"path": filepath}
-            else:
-                req["result"] = {
-                    "success": False,
-                    "error": "Screenshot failed: all capture methods unavailable",
-                }
+                return {"path": filepath}
+            return {
+                "success": False,
+                "error": "Screenshot failed: all capture methods unavailable",
+            }
         except Exception as e:
             logger.error(f"Screenshot failed: {e}")
-            req["result"] = {"success": False, "error": str(e)}
-        finally:
-            req["done"].set()
+            return {"success": False, "error": str(e)}
 
-    def _capture_opengl(self, filepath: str) -> bool:
+    def _capture_opengl(
+        self,
+        filepath: str | None,
+        rect: tuple[int, int, int, int] | None = None,
+        image_format: str = "png",
+        compression: int | None = None,
+        output: str = "file",
+        diff_threshold: int = 0,
+        skip_unchanged: bool = False,
+    ) -> "Future[dict[str, Any]] | None":
         """Capture the window by reading the OpenGL framebuffer directly.
 
         Does not use X11 — works on XWayland and when the compositor blocks XGetImage.
         Reads from the back buffer (contains the previous fully-rendered frame).
+        Only *rect* is read back; the readback completes on a later frame and
+        the image is encoded on a worker thread (see frame_capture).
 
         Args:
-            filepath: Destination PNG path.
+            filepath: Destination path for file output.
+            rect: ``(x, y, width, height)`` from the top left; whole canvas if None.
+            image_format: ``"png"``, ``"webp"`` or ``"rgba"``.
+            compression: PNG zlib level or WebP quality.
+            output: ``"file"``, ``"bytes"`` or ``"base64"``.
+            diff_threshold: Channel difference ignored when diffing against
+                the previous capture.
+            skip_unchanged: Skip encoding when nothing changed.
 
         Returns:
-            True on success, False if OpenGL or Pillow are unavailable.
+            Future for the result, or None if OpenGL is unavailable.
         """
         try:
-            from OpenGL import GL
-            from PIL import Image
-
-            w, h = self.state.size
-            data = GL.glReadPixels(0, 0, w, h, GL.GL_RGBA, GL.GL_UNSIGNED_BYTE)
-            img = Image.frombytes("RGBA", (w, h), data)
-            img = img.transpose(Image.Transpose.FLIP_TOP_BOTTOM)
-            img.save(filepath, "PNG")
-            return True
+            return capture_image(
+                self._framebuffer,
+                self._gl_rect(rect or self._capture_rect(None)),
+                filepath,
+                image_format,
+                compression,
+                output,
+                differ=self._screenshot_differ,
+                diff_threshold=diff_threshold,
+                skip_unchanged=skip_unchanged,
+            )
         except Exception as e:
             logger.debug(f"OpenGL capture failed, will try GDK: {e}")
-            return False
+            return None
 
-    def _capture_gdk(self, win_id: int, filepath: str) -> bool:
+    def _capture_gdk(
+        self,
+        win_id: int,
+        filepath: str,
+        crop: tuple[int, int, int, int] | None = None,
+    ) -> bool:
         """Capture window using GDK (PyGObject).
 
         Args:
             win_id: X11 window ID.
             filepath: Destination PNG path.
+            crop: Optional ``(x, y, width, height)`` from the window's top left.
 
         Returns:
             True on success, False if GDK is unavailable or capture failed.
@@ -280,9 +643,12 @@ class Canvas:
             gdk_window = GdkX11.X11Window.foreign_new_for_display(display, win_id)
             if gdk_window is None:
                 return False
+            x, y = 0, 0
             width = gdk_window.get_width()
             height = gdk_window.get_height()
-            pixbuf = Gdk.pixbuf_get_from_window(gdk_window, 0, 0, width, height)
+            if crop is not None:
+                x, y, width, height = crop
+            pixbuf = Gdk.pixbuf_get_from_window(gdk_window, x, y, width, height)
             if pixbuf is None:
                 return False
             pixbuf.savev(filepath, "png", [], [])
@@ -291,12 +657,18 @@ class Canvas:
             logger.debug(f"GDK capture failed, will try fallback: {e}")
             return False
 
-    def _capture_xwd(self, win_id: int, filepath: str) -> bool:
+    def _capture_xwd(
+        self,
+        win_id: int,
+        filepath: str,
+        crop: tuple[int, int, int, int] | None = None,
+    ) -> bool:
         """Capture window using xwd + ImageMagick convert as fallback.
 
         Args:
             win_id: X11 window ID.
             filepath: Destination PNG path.
+            crop: Optional ``(x, y, width, height)`` from the window's top left.
 
         Returns:
             True on success, False if xwd/convert are unavailable or failed.
@@ -313,8 +685,12 @@ class Canvas:
                 check=True,
                 timeout=10,
             )
+            geometry = []
+            if crop is not None:
+                x, y, width, height = crop
+                geometry = ["-crop", f"{width}x{height}+{x}+{y}", "+repage"]
             subprocess.run(
-                ["convert", xwd_path, filepath],
+                ["convert", xwd_path, *geometry, filepath],
                 check=True,
                 timeout=10,
             )
@@ -331,55 +707,135 @@ class Canvas:
 
     def request_screenshot(
         self,
-        filepath: str,
+        filepath: str | None = None,
         region: list[int] | None = None,
         timeout: float = 5.0,
+        *,
+        image_format: str = "png",
+        compression: int | None = None,
+        output: str = "file",
+        diff_threshold: int = 0,
+        skip_unchanged: bool = False,
     ) -> dict[str, Any]:
-        """Capture the canvas window as a PNG file (thread-safe).
+        """Capture the canvas window as an image (thread-safe).
 
         Schedules a screenshot on the render thread and blocks until it
         completes or the timeout expires.
 
         Args:
-            filepath: Destination path for the PNG file.
-            region: Optional ``[x, y, width, height]`` crop in pixels (GDK path
-                ignores this; the parameter is reserved for future use).
+            filepath: Destination path; required for ``output="file"``.
+            region: Optional ``[x, y, width, height]`` crop in pixels from the
+                canvas's top left, clipped to the canvas. Only this rectangle
+                is read back.
             timeout: Seconds to wait for the render thread to respond.
+            image_format: ``"png"``, ``"webp"`` or ``"rgba"`` (raw top-down rows).
+            compression: PNG zlib level (0-9) or WebP quality (0-100).
+            output: ``"file"``, ``"bytes"`` or ``"base64"``.
+            diff_threshold: Largest per-channel difference (0-255) still
+                counted as unchanged when comparing with the previous capture.
+            skip_unchanged: When nothing changed since the previous capture,
+                skip encoding: no file is written and no data returned.
 
         Returns:
-            ``{"path": filepath}`` on success, or
-            ``{"success": False, "error": <message>}`` on failure.
+            ``{"width", "height", "format"}`` with ``"path"`` (file) or
+            ``"data"`` (bytes / base64) on success, plus ``"unchanged"``,
+            ``"changed_region"`` (``[x, y, width, height]`` within the image,
+            None if unchanged) and the pixel ``"hash"``. The X11 fallbacks
+            return just ``{"path": filepath}``. On failure,
+            ``{"success": False, "error": <message>}``.
 
         Raises:
+            ValueError: On invalid options or a region outside the canvas.
             TimeoutError: If the render thread does not respond within *timeout*.
         """
-        done = threading.Event()
-        req: _ScreenshotRequest = {"filepath": filepath, "region": region, "done": done}
-        self._screenshot_request = req
-        self._wake_render()
+        check_image_options(image_format, compression, output, filepath)
+        if not 0 <= diff_threshold <= 255:
+            raise ValueError(
+                f"diff_threshold must be in [0, 255], got {diff_threshold}"
+            )
+        self._capture_rect(region)
+        return self._call_on_render_thread(
+            lambda: self._take_screenshot(
+                filepath,
+                region,
+                image_format,
+                compression,
+                output,
+                diff_threshold,
+                skip_unchanged,
+            ),
+            timeout,
+            "Screenshot of",
+        )
 
-        if not done.wait(timeout=timeout):
-            self._screenshot_request = None
-            raise TimeoutError(
-                f"Screenshot of canvas '{self.state.canvas_id}' timed out after {timeout}s"
+    def start_capture(
+        self,
+        directory: str,
+        fps: float = 10.0,
+        image_format: str = "png",
+        compression: int | None = None,
+        region: list[int] | None = None,
+        max_pending: int = DEFAULT_MAX_PENDING,
+    ) -> dict[str, Any]:
+        """Start recording the canvas into *directory* (thread-safe).
+
+        The render loop captures a frame every 1/*fps* seconds and a writer
+        thread stores it; see recording.CaptureSession. Frames are dropped
+        rather than slowing rendering when the writer falls behind.
+
+        Args:
+            directory: Output directory, created if missing.
+            fps: Frames captured per second.
+            image_format: ``"png"`` or ``"webp"`` for an image sequence,
+                ``"rgba"`` for a raw frame stream.
+            compression: PNG zlib level (0-9) or WebP quality (0-100).
+            region: Optional ``[x, y, width, height]`` crop, fixed for the session.
+            max_pending: Frames allowed between readback and disk.
+
+        Returns:
+            The session's stats.
+
+        Raises:
+            RuntimeError: If a capture is already running.
+            ValueError: On invalid options or a region outside the canvas.
+        """
+        if self._capture is not None and self._capture.active:
+            raise RuntimeError(
+                f"Canvas '{self.state.canvas_id}' is already being captured"
             )
+        session = CaptureSession(
+            directory,
+            fps,
+            self._gl_rect(self._capture_rect(region)),
+            image_format,
+            compression,
+            max_pending,
+        )
+        self._capture = session
+        self._request_frame()
+        return session.stats()
 
-        return req.get("result", {"error": "No result produced"})
+    def stop_capture(self) -> dict[str, Any] | None:
+        """Stop recording and flush written frames (thread-safe).
 
-    def _handle_measure_text(self) -> None:
-        """Measure text on the render thread if a request is pending.
+        Returns:
+            Final stats of the session, or None if none was running.
+        """
+        session = self._capture
+        self._capture = None
+        if session is None:
+            return None
+        return session.stop()
+
+    def _measure_texts(self, texts: list[str], font_size: int) -> dict[str, Any]:
+        """Measure texts with the loaded font closest to *font_size*.
 
+        Also records the glyph advances involved in ``text_metrics``, so later
+        measurements with the same characters need not wait for a frame.
         Must be called from the render thread after ImGui frame setup so that
         the font atlas is active.
         """
-        req = self._measure_text_request
-        if req is None:
-            return
-        self._measure_text_request = None
         try:
-            text = req["text"]
-            font_size = req["font_size"]
-
             io = imgui.get_io()
             fonts = io.fonts.fonts
             best_font = None
@@ -388,17 +844,38 @@ class Canvas:
 
             if best_font is not None:
                 imgui.push_font(best_font, float(font_size))
-                size = imgui.calc_text_size(text)
-                imgui.pop_font()
-            else:
-                size = imgui.calc_text_size(text)
-
-            req["result"] = {"width": int(size.x), "height": int(size.y)}
+            try:
+                sizes = [imgui.calc_text_size(text) for text in texts]
+                self._learn_glyphs(texts, font_size)
+            finally:
+                if best_font is not None:
+                    imgui.pop_font()
+
+            return {
+                "sizes": [
+                    {"width": int(size.x), "height": int(size.y)} for size in sizes
+                ]
+            }
         except Exception as e:
             logger.error(f"measure_text failed: {e}")
-            req["result"] = {"error": str(e)}
-        finally:
-            req["done"].set()
+            return {"error": str(e)}
+
+    def _learn_glyphs(self, texts: list[str], font_size: int) -> None:
+        """Cache advances of the current font for *texts* (render thread)."""
+        chars = self.text_metrics.missing([*texts, PRELOAD_CHARS], font_size)
+        if not chars:
+            return
+        baked = imgui.get_font_baked()
+        self.text_metrics.learn(
+            font_size,
+            imgui.get_font_size(),
+            {c: baked.get_char_advance(ord(c)) for c in chars},
+        )
+
+    def _measure_text(self, text: str, font_size: int) -> dict[str, Any]:
+        """Measure one text on the render thread; see _measure_texts()."""
+        result = self._measure_texts([text], font_size)
+        return result["sizes"][0] if "sizes" in result else result
 
     def request_measure_text(
         self,
@@ -406,7 +883,10 @@ class Canvas:
         font_size: int,
         timeout: float = 5.0,
     ) -> dict[str, Any]:
-        """Measure rendered text dimensions on the render thread (thread-safe).
+        """Measure rendered text dimensions (thread-safe).
+
+        Answered from cached glyph metrics when every character has been
+        seen at this size; otherwise measured on the render thread.
 
         Args:
             text: The string to measure.
@@ -419,25 +899,53 @@ class Canvas:
         Raises:
             TimeoutError: If the render thread does not respond within *timeout*.
         """
-        done = threading.Event()
-        req: _MeasureTextRequest = {"text": text, "font_size": font_size, "done": done}
-        self._measure_text_request = req
-        self._wake_render()
+        cached = self.text_metrics.measure(text, font_size)
+        if cached is not None:
+            return cached
+        return self._call_on_render_thread(
+            lambda: self._measure_text(text, font_size), timeout, "measure_text on"
+        )
 
-        if not done.wait(timeout=timeout):
-            self._measure_text_request = None
-            raise TimeoutError(
-                f"measure_text on canvas '{self.state.canvas_id}' timed out after {timeout}s"
-            )
+    def request_measure_text_batch(
+        self,
+        texts: list[str],
+        font_size: int,
+        timeout: float = 5.0,
+    ) -> dict[str, Any]:
+        """Measure many texts at once (thread-safe).
 
-        return req.get("result", {"error": "No result produced"})
+        Texts the glyph cache can answer are measured immediately; the rest
+        are measured together on the render thread in a single frame.
 
-    def _handle_canvas_info(self) -> None:
-        """Collect canvas rendering info on the render thread if a request is pending."""
-        req = self._canvas_info_request
-        if req is None:
-            return
-        self._canvas_info_request = None
+        Args:
+            texts: The strings to measure.
+            font_size: Desired font size; the closest loaded font is used.
+            timeout: Seconds to wait for the render thread to respond.
+
+        Returns:
+            ``{"sizes": [{"width": int, "height": int}, ...], "cached": int}``
+            in the order of *texts*, where ``cached`` counts the texts that
+            did not need the render thread; or ``{"error": <message>}``.
+
+        Raises:
+            TimeoutError: If the render thread does not respond within *timeout*.
+        """
+        sizes = [self.text_metrics.measure(text, font_size) for text in texts]
+        pending = [i for i, size in enumerate(sizes) if size is None]
+        if pending:
+            result = self._call_on_render_thread(
+                lambda: self._measure_texts([texts[i] for i in pending], font_size),
+                timeout,
+                "measure_text_batch on",
+            )
+            if "error" in result:
+                return result
+            for i, size in zip(pending, result["sizes"], strict=True):
+                sizes[i] = size
+        return {"sizes": sizes, "cached": len(texts) - len(pending)}
+
+    def _canvas_info(self) -> dict[str, Any]:
+        """Collect canvas rendering info (render thread)."""
         try:
             io = imgui.get_io()
             pixel_scale = io.display_framebuffer_scale.x
@@ -450,16 +958,14 @@ class Canvas:
                     offset_x, offset_y = widget.canvas_screen_offset
                     break
 
-            req["result"] = {
+            return {
                 "screen_offset_x": offset_x,
                 "screen_offset_y": offset_y,
                 "pixel_scale": pixel_scale,
             }
         except Exception as e:
             logger.error(f"canvas_info fetch failed: {e}")
-            req["result"] = {"error": str(e)}
-        finally:
-            req["done"].set()
+            return {"error": str(e)}
 
     def request_canvas_info(self, timeout: float = 5.0) -> dict[str, Any]:
         """Fetch live canvas rendering info from the render thread (thread-safe).
@@ -471,26 +977,25 @@ class Canvas:
         Raises:
             TimeoutError: If the render thread does not respond within *timeout*.
         """
-        done = threading.Event()
-        req: _CanvasInfoRequest = {"done": done}
-        self._canvas_info_request = req
-        self._wake_render()
+        return self._call_on_render_thread(self._canvas_info, timeout, "canvas_info on")
 
-        if not done.wait(timeout=timeout):
-            self._canvas_info_request = None
-            raise TimeoutError(
-                f"canvas_info on canvas '{self.state.canvas_id}' timed out after {timeout}s"
-            )
+    def _process_commands(self) -> None:
+        """Drain the command ring and apply every pending command in one pass.
 
-        return req.get("result", {"error": "No result produced"})
+        The whole batch is acknowledged at once: the ACK watermark moves to
+        the last drained command, and only failures get a status record.
+        Commands drained after a SHUTDOWN are acknowledged as CANCELLED.
+        """
+        if not self._running:
+            return
 
-    def _process_commands(self) -> None:
-        """Process all pending commands from shared memory."""
-        while self._running:
-            # Non-blocking read
-            command_data = self.shm_manager.read_command(timeout=0.0)
-            if command_data is None:
-                break
+        last_seq = 0
+        failures: list[tuple[int, AckStatus]] = []
+        for command_data in self.shm_manager.drain_commands():
+            if not self._running:
+                failures.append((command_data.seq_num, AckStatus.CANCELLED))
+                last_seq = command_data.seq_num
+                continue
 
             logger.debug(
                 f"Processing command: {command_data.command_type.name} (seq={command_data.seq_num})"
@@ -498,27 +1003,50 @@ class Canvas:
 
             # Handle command
             try:
-                if command_data.command_type == CommandType.CLEAR_CANVAS:
-                    self._handle_clear_canvas(command_data.data)
-                elif command_data.command_type == CommandType.UPDATE_TITLE:
-                    self._handle_update_title(command_data.data)
-                elif command_data.command_type == CommandType.UPDATE_SIZE:
-                    self._handle_update_size(command_data.data)
-                elif command_data.command_type == CommandType.SHUTDOWN:
-                    self._handle_shutdown(command_data.data)
-                elif command_data.command_type == CommandType.REMOVE_WIDGET:
-                    self._handle_remove_widget(command_data.data)
-                else:
-                    logger.warning(
-                        f"Unknown command type: {command_data.command_type.name}"
-                    )
-
-                # Send acknowledgment
-                self.shm_manager.write_ack(command_data.seq_num)
+                if not self.apply_command(command_data.command_type, command_data.data):
+                    failures.append((command_data.seq_num, AckStatus.UNSUPPORTED))
             except Exception as e:
                 logger.error(
                     f"Error processing command {command_data.command_type.name}: {e}"
                 )
+                failures.append((command_data.seq_num, AckStatus.ERROR))
+            last_seq = command_data.seq_num
+
+        # Send one cumulative acknowledgment for the batch
+        if last_seq:
+            self.shm_manager.write_ack(last_seq, failures)
+            self._dirty_frames = _DIRTY_FRAMES
+
+    def apply_command(self, command_type: CommandType, data: dict[str, Any]) -> bool:
+        """Apply one command's fields to this canvas.
+
+        Not thread-safe, like apply_widget_update().
+
+        Args:
+            command_type: Command to apply
+            data: Command fields
+
+        Returns:
+            False if the command type has no handler, True otherwise
+        """
+        if command_type == CommandType.CLEAR_CANVAS:
+            self._handle_clear_canvas(data)
+        elif command_type == CommandType.UPDATE_TITLE:
+            self._handle_update_title(data)
+        elif command_type == CommandType.UPDATE_SIZE:
+            self._handle_update_size(data)
+        elif command_type == CommandType.SHUTDOWN:
+            self._handle_shutdown(data)
+        elif command_type == CommandType.ADD_WIDGET:
+            self._handle_add_widget(data)
+        elif command_type == CommandType.UPDATE_WIDGET:
+            self._handle_update_widget(data)
+        elif command_type == CommandType.REMOVE_WIDGET:
+            self._handle_remove_widget(data)
+        else:
+            logger.warning(f"Unknown command type: {command_type.name}")
+            return False
+        return True
 
     def _handle_clear_canvas(self, data: dict[str, Any]) -> None:
         """Handle CLEAR_CANVAS command."""
@@ -530,6 +1058,8 @@ class Canvas:
             return
 
         self.widget_registry.clear()
+        self.profiler.reset()
+        self._extents.clear()
         logger.info(f"Clearing canvas '{canvas_id}'")
 
     def _handle_update_title(self, data: dict[str, Any]) -> None:
@@ -556,6 +1086,94 @@ class Canvas:
         self.state.size = (data["width"], data["height"])
         logger.info(f"Updated size for canvas '{canvas_id}'")
 
+    def apply_widget_update(
+        self,
+        widget_id: str,
+        properties: dict[str, Any] | None = None,
+        ops: list[list[Any]] | None = None,
+    ) -> bool:
+        """Apply a property update and list ops to a widget.
+
+        Not thread-safe: call it from the render thread (via UPDATE_WIDGET) or
+        while the canvas is not being rendered.
+
+        Args:
+            widget_id: Identifier of the widget to update
+            properties: Properties to overwrite
+            ops: Ops for Widget.apply_ops, applied after *properties*
+
+        Returns:
+            True if the widget exists, False otherwise
+        """
+        widget = self.widget_registry.get(widget_id)
+        if widget is None:
+            logger.warning(
+                f"Update for unknown widget '{widget_id}' on canvas '{self.state.canvas_id}'"
+            )
+            return False
+        if properties:
+            widget.update(**properties)
+        if ops:
+            widget.apply_ops(ops)
+        return True
+
+    def _handle_add_widget(self, data: dict[str, Any]) -> None:
+        """Handle ADD_WIDGET command."""
+        canvas_id = data.get("canvas_id")
+        if canvas_id != self.state.canvas_id:
+            logger.warning(
+                f"Add widget command for wrong canvas: {canvas_id} (expected {self.state.canvas_id})"
+            )
+            return
+
+        import champi_imgui.widgets as widget_classes
+        from champi_imgui.widgets.container import TabBarWidget, TabItemWidget
+
+        widget_id = data.get("widget_id", "")
+        widget_type = data.get("widget_type", "")
+        properties = data.get("properties", {})
+        widget_class = getattr(widget_classes, widget_type, None)
+        if isinstance(widget_class, type) and issubclass(widget_class, Widget):
+            widget = widget_class(widget_id, **properties)
+        else:
+            widget = self.widget_registry.factory.create(
+                widget_type.lower(), widget_id, **properties
+            )
+        # Constructors may reset some properties; keep exactly what was sent
+        widget.state.properties.update(properties)
+
+        parent_id = data.get("parent_id", "")
+        parent = self.widget_registry.get(parent_id) if parent_id else None
+        if isinstance(parent, TabBarWidget) and isinstance(widget, TabItemWidget):
+            parent.add_tab_item(widget)
+        elif isinstance(parent, TabItemWidget):
+            parent.add_child(widget)
+        elif parent_id:
+            widget._parent_id = parent_id
+        self.widget_registry.add(widget)
+        logger.info(f"Added widget '{widget_id}' to canvas '{canvas_id}'")
+
+    def _handle_update_widget(self, data: dict[str, Any]) -> None:
+        """Handle UPDATE_WIDGET command.
+
+        Raises:
+            KeyError: If the widget does not exist, so the command is
+                acknowledged with an error status
+        """
+        canvas_id = data.get("canvas_id")
+        if canvas_id != self.state.canvas_id:
+            logger.warning(
+                f"Update widget command for wrong canvas: {canvas_id} (expected {self.state.canvas_id})"
+            )
+            return
+
+        widget_id = data.get("widget_id", "")
+        if not self.apply_widget_update(
+            widget_id, data.get("properties"), data.get("ops")
+        ):
+            msg = f"Widget '{widget_id}' not found"
+            raise KeyError(msg)
+
     def _handle_remove_widget(self, data: dict[str, Any]) -> None:
         """Handle REMOVE_WIDGET command."""
         canvas_id = data.get("canvas_id")
@@ -567,6 +1185,8 @@ class Canvas:
 
         widget_id = data.get("widget_id", "")
         self.widget_registry.remove(widget_id)
+        self.profiler.forget(widget_id)
+        self._extents.pop(widget_id, None)
         logger.info(f"Removed widget '{widget_id}' from canvas '{canvas_id}'")
 
     def _handle_shutdown(self, data: dict[str, Any]) -> None:
@@ -593,21 +1213,111 @@ class CanvasManager:
     hello_imgui.run() is a process-level singleton — calling it more than once
     crashes with "Already initialized a platform backend!".  CanvasManager owns
     exactly one render thread; every Canvas is an ImGui window inside that loop.
+
+    With ``render_process=True`` the loop runs in child processes instead (see
+    champi_imgui.core.render_host); the canvases here stay the model and every
+    change to them is forwarded to the host rendering that canvas.  Each of
+    the ``render_hosts`` processes has its own window, and new canvases are
+    placed on one by ``placement``: "round_robin", or "least_loaded" (lowest
+    measured frame time, then fewest canvases).
+
+    With ``headless=True`` the loop runs without a window or display (see
+    champi_imgui.core.headless); screenshots are rasterized in software.
+
+    Unless ``stall_timeout`` is None, a RenderWatchdog handles frames that run
+    longer than ``stall_timeout`` seconds: it restarts a headless loop or a
+    render host, and fails the canvases of a windowed loop, which cannot be
+    started twice.
     """
 
-    def __init__(self):
+    PLACEMENTS = ("round_robin", "least_loaded")
+
+    window_title = "champi-imgui"
+
+    def __init__(
+        self,
+        render_process: bool = False,
+        render_hosts: int = 1,
+        placement: str = "round_robin",
+        headless: bool = False,
+        stall_timeout: float | None = DEFAULT_STALL_TIMEOUT,
+    ):
+        if render_hosts < 1:
+            raise ValueError(f"render_hosts must be at least 1, got {render_hosts}")
+        if placement not in self.PLACEMENTS:
+            raise ValueError(
+                f"Unknown placement '{placement}' (expected one of {self.PLACEMENTS})"
+            )
+        if headless and render_process:
+            raise ValueError("headless rendering runs in-process, not in render hosts")
         self.canvases: dict[str, Canvas] = {}
         self._render_thread: threading.Thread | None = None
         self._loop_running = False
         self._implot_ctx: object = None
         self._window_id: int | None = None
-        logger.info("CanvasManager initialized")
+        # glfw.post_empty_event once the window exists: wakes an idle loop
+        self._post_empty_event: Callable[[], None] | None = None
+        self._bell_watcher: threading.Thread | None = None
+        # Per-frame timings of the shared loop (see get_frame_telemetry)
+        self.telemetry = FrameTelemetry()
+        # Screenshot readback shared by every canvas in the loop's window
+        self.framebuffer = FramebufferReader()
+        # Windowless loop used instead of hello_imgui.run() when headless
+        self._headless: HeadlessRunner | None = None
+        if headless:
+            framebuffer = HeadlessFramebuffer(SoftwareRasterizer())
+            self.framebuffer = framebuffer
+            self._headless = HeadlessRunner(framebuffer)
+        # (start, end) of the previous frame callback, and whether the loop
+        # was allowed to idle after it
+        self._last_frame: tuple[float, float] | None = None
+        self._idle_allowed = True
+        # time.monotonic() when the running frame callback started, None
+        # between frames; the watchdog's heartbeat
+        self._frame_started: float | None = None
+        self.watchdog = (
+            RenderWatchdog(self, stall_timeout) if stall_timeout is not None else None
+        )
+        # Attached command/ACK handles, one per canvas, reused across tool calls
+        self._clients: dict[str, SharedMemoryManager] = {}
+        self._clients_lock = threading.RLock()
+        # Per-canvas write locks; the pool lock only guards _clients itself
+        self._client_locks: dict[str, threading.RLock] = {}
+
+        self._hosts: list[RenderHostProcess] = []
+        self._placement = placement
+        self._next_shard = 0
+        # canvas_id -> index into _hosts
+        self._shards: dict[str, int] = {}
+        # Set while this thread applies a forwarded command to the model, so
+        # the resulting widget_updated signals are not forwarded a second time
+        self._applying = threading.local()
+        if render_process:
+            from champi_imgui.core import render_host
+
+            self._hosts = [
+                render_host.RenderHostProcess(shard) for shard in range(render_hosts)
+            ]
+            widget_updated.connect(self._on_widget_updated, weak=True)
+        # A theme change restyles every canvas; cached draw data is stale
+        style_changed.connect(self._on_style_changed, weak=True)
+        logger.info(
+            f"CanvasManager initialized (render_process={render_process}, "
+            f"render_hosts={len(self._hosts)})"
+        )
 
     # ------------------------------------------------------------------
     # Shared render loop
     # ------------------------------------------------------------------
 
+    @property
+    def render_process(self) -> bool:
+        """True if canvases are drawn by render host processes."""
+        return bool(self._hosts)
+
     def is_loop_healthy(self) -> bool:
+        if self._hosts:
+            return all(host.is_alive() for host in self._hosts)
         return (
             self._loop_running
             and self._render_thread is not None
@@ -615,8 +1325,13 @@ class CanvasManager:
         )
 
     def _start_render_loop(self) -> None:
+        if self.watchdog is not None:
+            self.watchdog.start()
         if self.is_loop_healthy():
             return
+        if self._hosts:
+            self._start_render_hosts()
+            return
         self._loop_running = False
         self._render_thread = threading.Thread(
             target=self._render_loop, daemon=True, name="CanvasRenderThread"
@@ -628,37 +1343,52 @@ class CanvasManager:
         from imgui_bundle import implot
 
         runner_params = hello_imgui.RunnerParams()
-        runner_params.app_window_params.window_title = "champi-imgui"
+        runner_params.app_window_params.window_title = self.window_title
         runner_params.app_window_params.window_geometry.size = (1600, 900)
+        # Idle unless a canvas is dirty or animating (see _schedule_next_frame);
+        # user input keeps the loop active briefly as usual.
         runner_params.fps_idling.enable_idling = True
-        runner_params.fps_idling.fps_idle = 10
+        runner_params.fps_idling.fps_idle = _IDLE_FPS
+        runner_params.fps_idling.time_active_after_last_event = 0.5
 
         def _post_init() -> None:
             self._loop_running = True
             self._implot_ctx = implot.create_context()
-            try:
-                import glfw
-                from imgui_bundle import glfw_utils
+            if self._headless is not None:
+                self._post_empty_event = self._headless.wake
+            else:
+                try:
+                    import glfw
+                    from imgui_bundle import glfw_utils
 
-                glfw_window = glfw_utils.glfw_window_hello_imgui()
-                self._window_id = glfw.get_x11_window(glfw_window)
-            except Exception as e:
-                logger.debug(f"Could not obtain X11 window id: {e}")
+                    self._post_empty_event = glfw.post_empty_event
+                    glfw_window = glfw_utils.glfw_window_hello_imgui()
+                    self._window_id = glfw.get_x11_window(glfw_window)
+                except Exception as e:
+                    logger.debug(f"Could not obtain X11 window id: {e}")
+            self._start_bell_watcher()
 
         def _before_exit() -> None:
+            self.framebuffer.release()
             if self._implot_ctx is not None:
                 implot.destroy_context(self._implot_ctx)
                 self._implot_ctx = None
             for canvas in self.canvases.values():
                 canvas._running = False
             self._loop_running = False
+            self._post_empty_event = None
 
         runner_params.callbacks.post_init = _post_init
         runner_params.callbacks.show_gui = self._render_all_canvases
         runner_params.callbacks.before_exit = _before_exit
 
         try:
-            hello_imgui.run(runner_params)
+            if self._headless is not None:
+                self._headless.run(self._render_all_canvases, _post_init, _before_exit)
+            else:
+                hello_imgui.run(runner_params)
+        except RenderStalled:
+            logger.warning("Shared render loop unwound after a stalled frame")
         except Exception as e:
             logger.error(f"Shared render loop crashed: {e}")
             for canvas in self.canvases.values():
@@ -668,9 +1398,237 @@ class CanvasManager:
             self._loop_running = False
 
     def _render_all_canvases(self) -> None:
+        self._frame_started = time.monotonic()
+        try:
+            self._render_canvases()
+        finally:
+            self._frame_started = None
+
+    def _render_canvases(self) -> None:
+        start = time.perf_counter()
+        running = [c for c in list(self.canvases.values()) if c._running]
+        commands_s = 0.0
+        for canvas in running:
+            canvas._render_frame()
+            commands_s += canvas._commands_s
+        self.framebuffer.poll()
+        delays = [
+            delay
+            for canvas in running
+            if (delay := canvas.next_frame_delay(canvas._clock())) is not None
+        ]
+        delay = min(delays) if delays else None
+        self._schedule_next_frame(delay)
+        self._record_frame(start, time.perf_counter(), commands_s)
+        self._idle_allowed = delay is None or delay > 0
+
+    def _record_frame(self, start: float, end: float, commands_s: float) -> None:
+        """Add the frame callback that ran from *start* to *end* to telemetry."""
+        previous = self._last_frame
+        self._last_frame = (start, end)
+        if previous is None:
+            return
+        prev_start, prev_end = previous
+        self.telemetry.record(
+            start,
+            frame_ms=(start - prev_start) * 1000.0,
+            commands_ms=commands_s * 1000.0,
+            render_ms=(end - start - commands_s) * 1000.0,
+            idle_ms=(start - prev_end) * 1000.0,
+            idle_allowed=self._idle_allowed,
+        )
+
+    # ------------------------------------------------------------------
+    # Frame scheduling
+    # ------------------------------------------------------------------
+
+    def _schedule_next_frame(self, delay: float | None) -> None:
+        """Set how long the loop may wait before its next frame.
+
+        Args:
+            delay: Seconds until the soonest canvas needs a full frame
+                   (0 = run at full rate), or None if every canvas is idle
+
+        While idling, hello_imgui waits for input, or for 1/fps_idle seconds,
+        before the next frame; _request_frame() cuts that wait short.
+        """
+        if self._headless is not None:
+            self._headless.schedule(delay)
+            return
+        with contextlib.suppress(Exception):
+            idling = hello_imgui.get_runner_params().fps_idling
+            if delay is not None and delay <= 0:
+                idling.enable_idling = False
+                return
+            idling.enable_idling = True
+            idling.fps_idle = (
+                _IDLE_FPS if delay is None else max(1.0 / delay, _IDLE_FPS)
+            )
+
+    def _on_style_changed(self, sender: Any, **kwargs: Any) -> None:
         for canvas in list(self.canvases.values()):
-            if canvas._running:
-                canvas._render_frame()
+            # Style scaling changes text sizes as well as colors
+            canvas.text_metrics.clear()
+            canvas.mark_dirty()
+
+    def _request_frame(self) -> None:
+        """Wake the render loop if it is waiting for events (any thread)."""
+        post = self._post_empty_event
+        if post is not None:
+            with contextlib.suppress(Exception):
+                post()
+
+    def _start_bell_watcher(self) -> None:
+        """Mark canvases dirty when a writer rings their command doorbell.
+
+        Commands written by other processes (render host mode, external
+        clients) would otherwise wait for the idle heartbeat.
+        """
+        if not hasattr(select, "poll") or (
+            self._bell_watcher is not None and self._bell_watcher.is_alive()
+        ):
+            return
+        self._bell_watcher = threading.Thread(
+            target=self._watch_bells, daemon=True, name="CanvasBellWatcher"
+        )
+        self._bell_watcher.start()
+
+    def _wake_bells(self) -> list[tuple[Doorbell, Callable[[], None]]]:
+        """Return the doorbells that should wake the loop, with their handlers."""
+        return [
+            (canvas.shm_manager.cmd_bell, canvas.mark_dirty)
+            for canvas in list(self.canvases.values())
+            if canvas._running and canvas.shm_manager.cmd_bell is not None
+        ]
+
+    def _watch_bells(self) -> None:
+        while self._loop_running:
+            poller = select.poll()
+            watched = {}
+            for bell, on_ring in self._wake_bells():
+                with contextlib.suppress(RuntimeError):
+                    watched[bell.fileno()] = (bell, on_ring)
+                    poller.register(bell.fileno(), select.POLLIN)
+            try:
+                events = poller.poll(_BELL_WATCH_TICK * 1000)
+            except OSError:
+                continue
+            for fd, event in events:
+                if fd in watched and event & select.POLLIN:
+                    bell, on_ring = watched[fd]
+                    with contextlib.suppress(OSError):
+                        bell.clear()
+                    on_ring()
+
+    # ------------------------------------------------------------------
+    # Out-of-process render host
+    # ------------------------------------------------------------------
+
+    def _start_render_hosts(self) -> None:
+        """Start every dead render host and replay its canvases into it."""
+        started = []
+        replays = []
+        # Only starting the hosts needs the pool lock, so concurrent callers
+        # start each one once; replaying closes clients, which waits on
+        # per-canvas write locks and must not happen under it.
+        with self._clients_lock:
+            for shard, host in enumerate(self._hosts):
+                if host.is_alive():
+                    continue
+                host.start()
+                started.append(host)
+                replays.extend(
+                    (host, canvas)
+                    for canvas_id, canvas in self.canvases.items()
+                    if self._shards.get(canvas_id) == shard
+                )
+        for host, canvas in replays:
+            self._replay_canvas(host, canvas)
+        for host in started:
+            if not host.wait_ready(_HOST_READY_TIMEOUT):
+                logger.warning(f"Render host {host.shard} has not rendered a frame yet")
+
+    def _replay_canvas(self, host: "RenderHostProcess", canvas: Canvas) -> None:
+        """Open *canvas* on a freshly started host with its current widgets."""
+        canvas_id = canvas.state.canvas_id
+        # Commands left in the rings by a dead host are already part of the
+        # model; start the new host from empty rings.
+        self.close_client(canvas_id)
+        canvas.shm_manager.cleanup()
+        canvas.shm_manager.create_regions()
+        host.open_canvas(canvas)
+        for widget in canvas.widget_registry.get_all().values():
+            self._forward(
+                canvas_id,
+                CommandType.ADD_WIDGET,
+                widget_id=widget.widget_id,
+                widget_type=widget.state.widget_type,
+                properties=widget.state.properties,
+                parent_id=widget._parent_id or "",
+            )
+
+    def _choose_shard(self) -> int:
+        """Pick the render host for a new canvas."""
+        if self._placement == "least_loaded":
+            counts = [0] * len(self._hosts)
+            for shard in self._shards.values():
+                counts[shard] += 1
+            return min(
+                range(len(self._hosts)),
+                key=lambda i: (self._hosts[i].frame_time_ms(), counts[i]),
+            )
+        shard = self._next_shard % len(self._hosts)
+        self._next_shard += 1
+        return shard
+
+    def shard_of(self, canvas_id: str) -> int | None:
+        """Return the index of the render host showing a canvas.
+
+        None when canvases render in this process or the canvas is unknown.
+        """
+        return self._shards.get(canvas_id)
+
+    def _host_of(self, canvas_id: str) -> "RenderHostProcess | None":
+        shard = self._shards.get(canvas_id)
+        return None if shard is None else self._hosts[shard]
+
+    def _forward(
+        self, canvas_id: str, command_type: CommandType, **kwargs: Any
+    ) -> None:
+        """Send a model change to the canvas's render host, if it is running."""
+        host = self._host_of(canvas_id)
+        if host is None or not host.is_alive():
+            return
+        with self._client_writer(canvas_id) as client:
+            client.write_command(command_type, canvas_id=canvas_id, **kwargs)
+
+    def _on_widget_updated(self, sender: Any, **kwargs: Any) -> None:
+        """Forward property changes made directly on a model widget."""
+        widget = kwargs.get("widget")
+        if not isinstance(widget, Widget) or getattr(self._applying, "active", False):
+            return
+        for canvas_id, canvas in list(self.canvases.items()):
+            if canvas.widget_registry.get(widget.widget_id) is widget:
+                self._forward(
+                    canvas_id,
+                    CommandType.UPDATE_WIDGET,
+                    widget_id=widget.widget_id,
+                    properties=widget.state.properties,
+                )
+                return
+
+    def _apply_to_model(
+        self, canvas_id: str, command_type: CommandType, data: dict[str, Any]
+    ) -> None:
+        """Apply a command bound for the render host to the local model too."""
+        canvas = self.canvases.get(canvas_id)
+        if canvas is None or command_type == CommandType.SHUTDOWN:
+            return
+        self._applying.active = True
+        try:
+            canvas.apply_command(command_type, {"canvas_id": canvas_id, **data})
+        finally:
+            self._applying.active = False
 
     # ------------------------------------------------------------------
     # Canvas lifecycle
@@ -684,7 +1642,19 @@ class CanvasManager:
 
         canvas = Canvas(canvas_id, **kwargs)
         canvas._loop_healthy = self.is_loop_healthy
+        canvas._request_frame = self._request_frame
+        canvas._framebuffer = self.framebuffer
         self.canvases[canvas_id] = canvas
+        if self._hosts:
+            shard = self._choose_shard()
+            self._shards[canvas_id] = shard
+            host = self._hosts[shard]
+            canvas._loop_healthy = lambda: host.is_alive()
+            canvas._mirror = lambda command_type, **fields: self._forward(
+                canvas_id, command_type, **fields
+            )
+            if host.is_alive():
+                host.open_canvas(canvas)
 
         if auto_start:
             canvas._running = True
@@ -709,12 +1679,150 @@ class CanvasManager:
             self._start_render_loop()
         return True
 
+    def remove_canvas(self, canvas_id: str) -> Canvas | None:
+        """Stop a canvas, close its client handles and forget it.
+
+        Args:
+            canvas_id: Canvas identifier
+
+        Returns:
+            The removed canvas, or None if it was not registered
+        """
+        host = self._host_of(canvas_id)
+        if host is not None and host.is_alive():
+            host.close_canvas(canvas_id)
+        self._shards.pop(canvas_id, None)
+        self.close_client(canvas_id)
+        canvas = self.canvases.pop(canvas_id, None)
+        if canvas is not None:
+            canvas.stop()
+        return canvas
+
     def cleanup(self) -> None:
         logger.info("Cleaning up all canvases...")
+        if self.watchdog is not None:
+            self.watchdog.stop()
+        for host in self._hosts:
+            host.stop()
+        if self._headless is not None and self._render_thread is not None:
+            self._headless.request_exit()
+            self._render_thread.join(timeout=_HEADLESS_STOP_TIMEOUT)
+        for canvas_id in list(self._clients):
+            self.close_client(canvas_id)
         for canvas_id, canvas in list(self.canvases.items()):
             try:
                 canvas.stop()
             except Exception as e:
                 logger.error(f"Error stopping canvas '{canvas_id}': {e}")
         self.canvases.clear()
+        self._shards.clear()
         logger.info("All canvases cleaned up")
+
+    # ------------------------------------------------------------------
+    # Client connections
+    # ------------------------------------------------------------------
+
+    def get_client(self, canvas_id: str) -> SharedMemoryManager:
+        """Return the attached client handle for a canvas, attaching on first use.
+
+        The handle keeps its mappings and sequence counter for the lifetime
+        of the canvas.  Writers must go through _client_writer() (see
+        send_command) because the command ring has a single producer.  Writes
+        wait for ring space, so commands larger than the ring go through too.
+
+        Args:
+            canvas_id: Canvas identifier
+
+        Returns:
+            SharedMemoryManager attached to the canvas's regions
+
+        Raises:
+            FileNotFoundError: If the canvas has no shared memory regions
+        """
+        with self._clients_lock:
+            client = self._clients.get(canvas_id)
+            if client is None:
+                client = SharedMemoryManager(
+                    name_prefix=f"canvas_{canvas_id}", write_timeout=_WRITE_TIMEOUT
+                )
+                client.attach_regions()
+                self._clients[canvas_id] = client
+                self._client_locks[canvas_id] = threading.RLock()
+                logger.debug(f"Attached client for canvas '{canvas_id}'")
+            return client
+
+    @contextlib.contextmanager
+    def _client_writer(self, canvas_id: str) -> Iterator[SharedMemoryManager]:
+        """Hold a canvas's client handle for exclusive writing.
+
+        The pool lock is only taken to look the handle up; the write runs
+        under the canvas's own lock, so a canvas whose ring is full does not
+        stall writers to other canvases.
+
+        Raises:
+            FileNotFoundError: If the canvas has no shared memory regions
+        """
+        while True:
+            with self._clients_lock:
+                client = self.get_client(canvas_id)
+                lock = self._client_locks[canvas_id]
+            with lock:
+                # close_client() may have replaced the handle meanwhile
+                if self._clients.get(canvas_id) is client:
+                    yield client
+                    return
+
+    def send_command(
+        self, canvas_id: str, command_type: CommandType, **kwargs: Any
+    ) -> int:
+        """Write one command into a canvas's command ring.
+
+        Thread-safe: concurrent callers to the same canvas are serialized so
+        the ring keeps a single producer and sequence numbers stay monotonic;
+        callers to other canvases are not held up.  With a render
+        host the command is also applied to the local model, in the same
+        order as the host applies it.
+
+        Args:
+            canvas_id: Target canvas identifier
+            command_type: Command to send
+            **kwargs: Command fields other than canvas_id
+
+        Returns:
+            Sequence number of the written command
+        """
+        with self._client_writer(canvas_id) as client:
+            if self._hosts:
+                self._apply_to_model(canvas_id, command_type, kwargs)
+            return client.write_command(command_type, canvas_id=canvas_id, **kwargs)
+
+    def submit_command(
+        self, canvas_id: str, command_type: CommandType, **kwargs: Any
+    ) -> CommandFuture:
+        """Write one command and return a future for its acknowledgement.
+
+        Thread-safe, like send_command.
+
+        Args:
+            canvas_id: Target canvas identifier
+            command_type: Command to send
+            **kwargs: Command fields other than canvas_id
+
+        Returns:
+            Future resolving to the command's AckStatus once it is applied
+        """
+        with self._client_writer(canvas_id) as client:
+            if self._hosts:
+                self._apply_to_model(canvas_id, command_type, kwargs)
+            return client.submit_command(command_type, canvas_id=canvas_id, **kwargs)
+
+    def close_client(self, canvas_id: str) -> None:
+        """Release the client handle for a canvas, if one is attached."""
+        with self._clients_lock:
+            client = self._clients.pop(canvas_id, None)
+            lock = self._client_locks.pop(canvas_id, None)
+        if client is not None and lock is not None:
+            # Let a write in progress finish before unmapping the ring
+            with lock:
+                client.cleanup()
+            logger.debug(f"Closed client for canvas '{canvas_id}'")
@@ -0,0 +1,209 @@
+"""Replayable copies of a canvas window's draw commands.
+
+Walking every widget of a canvas re-issues every ImGui call, even when the
+result is the same as last frame.  A :class:`DrawListCache` copies the
+vertices, indices and draw commands a canvas emitted into its window's
+ImDrawList on a full frame; on later frames the canvas can replay that copy
+into the window instead of running widget code.
+
+A snapshot is only replayable while the things baked into it still hold:
+
+- the window has the same size (content may reflow otherwise) and scroll
+  offset (content outside the old view may have been culled); a moved window
+  is handled by translating positions and clip rects
+- the font atlas has not been rebuilt (glyph UVs would be stale)
+- the content began no other window (child windows, popups, a main menu
+  bar, top-level windows opened by widgets), which have draw lists of their
+  own and would not be submitted at all on a replayed frame
+
+Replayed items are not interactive, so callers only replay while the user is
+not interacting with the window.
+"""
+
+import ctypes
+from dataclasses import dataclass
+
+import numpy as np
+from imgui_bundle import imgui
+
+# Matches ImDrawVert: pos (2 x f32), uv (2 x f32), col (u32)
+DRAW_VERT_DTYPE = np.dtype([("pos", "<f4", 2), ("uv", "<f4", 2), ("col", "<u4")])
+_IDX_DTYPE = np.dtype(np.uint32)
+
+
+@dataclass
+class _Segment:
+    """Indices of one draw command plus the vertices they reference."""
+
+    clip_rect: tuple[float, float, float, float]
+    tex_data: imgui.ImTextureData | None
+    tex_id: int
+    vertices: np.ndarray
+    indices: np.ndarray
+
+
+def _read(address: int, count: int, dtype: np.dtype) -> np.ndarray:
+    """Copy *count* items of *dtype* from native memory."""
+    nbytes = count * dtype.itemsize
+    return np.frombuffer(
+        bytes((ctypes.c_uint8 * nbytes).from_address(address)), dtype=dtype
+    )
+
+
+def _atlas_key() -> tuple[int, int, int] | None:
+    """Identify the current font atlas texture (changes when it is rebuilt)."""
+    tex = imgui.get_io().fonts.tex_data
+    if tex is None:
+        return None
+    return (tex.unique_id, tex.width, tex.height)
+
+
+class DrawListCache:
+    """Capture and replay the content a canvas draws into its window.
+
+    Call :meth:`begin_capture` right after ``imgui.begin()`` and
+    :meth:`end_capture` before ``imgui.end()`` on a full frame; on a skipped
+    frame call :meth:`replay` between the same two points.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty cache."""
+        self._segments: list[_Segment] = []
+        self._origin = (0.0, 0.0)
+        self._content_size = (0.0, 0.0)
+        self._window_size = (0.0, 0.0)
+        self._scroll = (0.0, 0.0)
+        self._atlas: tuple[int, int, int] | None = None
+        self._valid = False
+        self._marks = (0, 0)
+        # Segments translated for the last replay offset
+        self._shift = (0.0, 0.0)
+        self._shifted: list[np.ndarray] = []
+
+    def invalidate(self) -> None:
+        """Drop the snapshot; the next frame must render in full."""
+        self._valid = False
+        self._segments = []
+        self._shifted = []
+
+    @property
+    def vertex_count(self) -> int:
+        """Number of cached vertices."""
+        return sum(len(s.vertices) for s in self._segments)
+
+    def begin_capture(self) -> None:
+        """Mark where the canvas's content starts in the window draw list."""
+        draw_list = imgui.get_window_draw_list()
+        self._marks = (
+            draw_list.idx_buffer.size(),
+            # Any window the content begins becomes active this frame
+            imgui.get_current_context().windows_active_count,
+        )
+        pos = imgui.get_cursor_screen_pos()
+        self._origin = (pos.x, pos.y)
+
+    def end_capture(self) -> None:
+        """Copy everything drawn since begin_capture() into the snapshot."""
+        draw_list = imgui.get_window_draw_list()
+        window = imgui.internal.get_current_window()
+        idx_start, active_windows = self._marks
+        self.invalidate()
+        if imgui.get_current_context().windows_active_count != active_windows:
+            return
+
+        idx_end = draw_list.idx_buffer.size()
+        indices = _read(draw_list.idx_buffer.data_address(), idx_end, _IDX_DTYPE)
+        all_vertices = _read(
+            draw_list.vtx_buffer.data_address(),
+            draw_list.vtx_buffer.size(),
+            DRAW_VERT_DTYPE,
+        )
+        commands = draw_list.cmd_buffer
+        for i in range(commands.size()):
+            cmd = commands[i]
+            lo = max(cmd.idx_offset, idx_start)
+            hi = min(cmd.idx_offset + cmd.elem_count, idx_end)
+            if hi <= lo:
+                continue
+            global_idx = indices[lo:hi].astype(np.int64) + cmd.vtx_offset
+            first, last = int(global_idx.min()), int(global_idx.max())
+            clip = cmd.clip_rect
+            self._segments.append(
+                _Segment(
+                    clip_rect=(clip.x, clip.y, clip.z, clip.w),
+                    tex_data=cmd.tex_ref._tex_data,
+                    tex_id=cmd.tex_ref._tex_id,
+                    vertices=all_vertices[first : last + 1].copy(),
+                    indices=(global_idx - first).astype(_IDX_DTYPE),
+                )
+            )
+
+        cursor_max = window.dc.cursor_max_pos
+        self._content_size = (
+            max(cursor_max.x - self._origin[0], 0.0),
+            max(cursor_max.y - self._origin[1], 0.0),
+        )
+        size = imgui.get_window_size()
+        self._window_size = (size.x, size.y)
+        self._scroll = (imgui.get_scroll_x(), imgui.get_scroll_y())
+        self._atlas = _atlas_key()
+        self._valid = True
+
+    def can_replay(self) -> bool:
+        """Return True if the snapshot still matches the current window."""
+        if not self._valid:
+            return False
+        size = imgui.get_window_size()
+        return (
+            (size.x, size.y) == self._window_size
+            and (imgui.get_scroll_x(), imgui.get_scroll_y()) == self._scroll
+            and _atlas_key() == self._atlas
+        )
+
+    def replay(self) -> None:
+        """Draw the snapshot into the current window at its current position."""
+        pos = imgui.get_cursor_screen_pos()
+        dx, dy = pos.x - self._origin[0], pos.y - self._origin[1]
+        if (dx, dy) != self._shift or len(self._shifted) != len(self._segments):
+            self._shift = (dx, dy)
+            self._shifted = []
+            for segment in self._segments:
+                vertices = segment.vertices
+                if dx or dy:
+                    vertices = vertices.copy()
+                    vertices["pos"] += (dx, dy)
+                self._shifted.append(vertices)
+
+        draw_list = imgui.get_window_draw_list()
+        for segment, vertices in zip(self._segments, self._shifted, strict=True):
+            x1, y1, x2, y2 = segment.clip_rect
+            draw_list.push_clip_rect(
+                imgui.ImVec2(x1 + dx, y1 + dy), imgui.ImVec2(x2 + dx, y2 + dy), True
+            )
+            tex_ref = imgui.ImTextureRef()
+            tex_ref._tex_data = segment.tex_data  # type: ignore[assignment]
+            tex_ref._tex_id = segment.tex_id
+            draw_list.push_texture(tex_ref)
+
+            n_vtx, n_idx = len(vertices), len(segment.indices)
+            draw_list.prim_reserve(n_idx, n_vtx)
+            base = draw_list._vtx_current_idx
+            vtx_dst = draw_list.vtx_buffer.data_address() + (
+                (draw_list.vtx_buffer.size() - n_vtx) * DRAW_VERT_DTYPE.itemsize
+            )
+            idx_dst = draw_list.idx_buffer.data_address() + (
+                (draw_list.idx_buffer.size() - n_idx) * _IDX_DTYPE.itemsize
+            )
+            ctypes.memmove(vtx_dst, vertices.ctypes.data, vertices.nbytes)
+            rebased = segment.indices + np.uint32(base)
+            ctypes.memmove(idx_dst, rebased.ctypes.data, rebased.nbytes)
+            draw_list._vtx_current_idx = base + n_vtx
+            # An empty reservation moves ImGui's write pointers past our data
+            draw_list.prim_reserve(0, 0)
+
+            draw_list.pop_texture()
+            draw_list.pop_clip_rect()
+
+        # Keep the content extent so scrolling and auto-sizing are unchanged
+        imgui.set_cursor_screen_pos(pos)
+        imgui.dummy(imgui.ImVec2(*self._content_size))
@@ -0,0 +1,480 @@
+"""Framebuffer readback for screenshots without stalling the render thread.
+
+A plain ``glReadPixels`` into client memory waits for the GPU to finish the
+frame and copy the pixels out, and the PNG encoding after it took tens of
+milliseconds more on large windows. Every canvas shares the render thread,
+so each screenshot froze them all.
+
+:class:`FramebufferReader` instead reads into one of a small set of
+pixel-buffer objects (PBOs). ``glReadPixels`` then only queues the copy on
+the GPU, and a fence tells a later frame when the pixels are ready to map.
+With two PBOs a second readback can start while the first is in flight.
+:func:`capture_image` hands the mapped pixels to a worker pool that flips and
+encodes them, so the render thread never compresses an image.
+
+Captures are encoded as PNG (``compression`` = zlib level 0-9), WebP
+(``compression`` = quality 0-100) or raw top-down RGBA rows, and delivered
+as a file, as bytes or as base64 text.
+
+A :class:`FrameDiffer` compares each capture with the previous one of the
+same canvas on the worker, before encoding. Callers learn whether anything
+visible changed, and where, and can skip encoding identical frames
+altogether.
+
+Where PBOs are unavailable the reader falls back to a synchronous read;
+encoding still happens on a worker.
+
+All GL calls happen on the render thread: :meth:`FramebufferReader.read` is
+called from a render task, :meth:`FramebufferReader.poll` once per frame.
+"""
+
+import base64
+import ctypes
+import hashlib
+import io
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any
+
+import numpy as np
+from loguru import logger
+
+# Pixel-buffer objects per reader: one filling while another is mapped
+PBO_COUNT = 2
+
+# Threads flipping and encoding captured frames
+ENCODE_WORKERS = 2
+
+IMAGE_FORMATS = ("png", "webp", "rgba")
+OUTPUTS = ("file", "bytes", "base64")
+
+# (min, max, default) of the compression setting per format
+_COMPRESSION = {"png": (0, 9, 6), "webp": (0, 100, 80)}
+
+_encoder: ThreadPoolExecutor | None = None
+_encoder_lock = threading.Lock()
+
+
+def encoder() -> ThreadPoolExecutor:
+    """Return the shared pool that encodes captured frames."""
+    global _encoder
+    with _encoder_lock:
+        if _encoder is None:
+            _encoder = ThreadPoolExecutor(
+                max_workers=ENCODE_WORKERS, thread_name_prefix="screenshot-encode"
+            )
+        return _encoder
+
+
+def check_image_options(
+    image_format: str, compression: int | None, output: str, filepath: str | None
+) -> None:
+    """Validate capture options before any work is queued.
+
+    Raises:
+        ValueError: On an unknown format or output, a compression level out
+                    of range for the format, or a file output without a path
+    """
+    if image_format not in IMAGE_FORMATS:
+        raise ValueError(
+            f"Unknown image format '{image_format}'; expected one of {IMAGE_FORMATS}"
+        )
+    if output not in OUTPUTS:
+        raise ValueError(f"Unknown output '{output}'; expected one of {OUTPUTS}")
+    if output == "file" and not filepath:
+        raise ValueError("A filepath is required for file output")
+    if compression is None:
+        return
+    if image_format not in _COMPRESSION:
+        raise ValueError(f"Format '{image_format}' takes no compression setting")
+    low, high, _ = _COMPRESSION[image_format]
+    if not low <= compression <= high:
+        raise ValueError(
+            f"Compression for {image_format} must be in [{low}, {high}], "
+            f"got {compression}"
+        )
+
+
+def encode_image(
+    pixels: np.ndarray, image_format: str = "png", compression: int | None = None
+) -> bytes:
+    """Encode bottom-up RGBA rows, as read from OpenGL, top row first.
+
+    Args:
+        pixels: ``(height, width, 4)`` uint8 array, first row at the bottom
+        image_format: ``"png"``, ``"webp"`` or ``"rgba"`` (raw rows)
+        compression: PNG zlib level or WebP quality; the format's default if None
+    """
+    rows = np.ascontiguousarray(pixels[::-1])
+    if image_format == "rgba":
+        return rows.tobytes()
+
+    from PIL import Image
+
+    level = _COMPRESSION[image_format][2] if compression is None else compression
+    buffer = io.BytesIO()
+    image = Image.fromarray(rows, "RGBA")
+    if image_format == "png":
+        image.save(buffer, "PNG", compress_level=level)
+    else:
+        image.save(buffer, "WEBP", quality=level)
+    return buffer.getvalue()
+
+
+class FrameDiffer:
+    """Remembers the last capture of a canvas and diffs new ones against it.
+
+    Thread-safe; used from the encoding workers.
+    """
+
+    def __init__(self) -> None:
+        """Initialize with no previous capture."""
+        self._rect: tuple[int, int, int, int] | None = None
+        self._pixels: np.ndarray | None = None
+        self._lock = threading.Lock()
+
+    def compare(
+        self, rect: tuple[int, int, int, int], pixels: np.ndarray, threshold: int = 0
+    ) -> dict[str, Any]:
+        """Diff *pixels*, read from *rect*, against the previous capture.
+
+        A pixel counts as changed when any channel differs by more than
+        *threshold*. The new capture becomes the baseline unless it counts as
+        unchanged, so differences below the threshold cannot pile up unseen.
+
+        Returns:
+            ``unchanged``, ``changed_region`` (``[x, y, width, height]`` in
+            image pixels from the top left, or None when unchanged) and
+            ``hash`` (hex digest of the raw pixels)
+        """
+        digest = hashlib.blake2b(np.ascontiguousarray(pixels), digest_size=16)
+        height, width = pixels.shape[:2]
+        with self._lock:
+            previous = self._pixels if self._rect == rect else None
+            if previous is None:
+                changed = None
+            elif threshold == 0:
+                changed = np.any(pixels != previous, axis=2)
+            else:
+                delta = np.abs(pixels.astype(np.int16) - previous.astype(np.int16))
+                changed = delta.max(axis=2) > threshold
+            unchanged = changed is not None and not changed.any()
+            if not unchanged:
+                self._rect = rect
+                self._pixels = pixels
+
+        region: list[int] | None
+        if unchanged:
+            region = None
+        elif changed is None:
+            region = [0, 0, width, height]
+        else:
+            rows = np.flatnonzero(changed.any(axis=1))
+            cols = np.flatnonzero(changed.any(axis=0))
+            # Rows are bottom-up; report from the top
+            top = height - 1 - int(rows[-1])
+            region = [
+                int(cols[0]),
+                top,
+                int(cols[-1] - cols[0]) + 1,
+                int(rows[-1] - rows[0]) + 1,
+            ]
+        return {
+            "unchanged": unchanged,
+            "changed_region": region,
+            "hash": digest.hexdigest(),
+        }
+
+
+def deliver_image(
+    pixels: np.ndarray,
+    filepath: str | None,
+    image_format: str = "png",
+    compression: int | None = None,
+    output: str = "file",
+    *,
+    differ: FrameDiffer | None = None,
+    rect: tuple[int, int, int, int] = (0, 0, 0, 0),
+    diff_threshold: int = 0,
+    skip_unchanged: bool = False,
+) -> dict[str, Any]:
+    """Encode *pixels* and write them to *filepath* or return them (worker).
+
+    With a *differ*, the result also reports what changed since its previous
+    capture of *rect* (see :meth:`FrameDiffer.compare`); *skip_unchanged*
+    then skips encoding and delivery of a frame that did not change.
+
+    Returns:
+        ``{"width", "height", "format"}`` plus ``"path"`` for file output, or
+        ``"data"`` (bytes, or base64 text) otherwise, plus the diff fields
+    """
+    height, width = pixels.shape[:2]
+    result: dict[str, Any] = {"width": width, "height": height, "format": image_format}
+    if differ is not None:
+        result.update(differ.compare(rect, pixels, diff_threshold))
+        if skip_unchanged and result["unchanged"]:
+            return result
+
+    data = encode_image(pixels, image_format, compression)
+    if output == "file":
+        assert filepath is not None
+        with open(filepath, "wb") as f:
+            f.write(data)
+        result["path"] = filepath
+    elif output == "base64":
+        result["data"] = base64.b64encode(data).decode("ascii")
+    else:
+        result["data"] = data
+    return result
+
+
+class _Read:
+    """One framebuffer rectangle being read back."""
+
+    def __init__(self, x: int, y: int, width: int, height: int) -> None:
+        self.rect = (x, y, width, height)
+        self.future: Future[np.ndarray] = Future()
+        self.pbo = 0
+        self.fence: Any = None
+
+    @property
+    def nbytes(self) -> int:
+        return self.rect[2] * self.rect[3] * 4
+
+
+class FramebufferReader:
+    """Reads framebuffer rectangles asynchronously through PBOs.
+
+    Render thread only, except :attr:`pending`, which any thread may check.
+    """
+
+    def __init__(self, buffers: int = PBO_COUNT, gl: Any = None) -> None:
+        """Initialize the reader; GL objects are created on first use.
+
+        Args:
+            buffers: Maximum number of PBOs, i.e. reads in flight at once
+            gl: OpenGL module to use; ``OpenGL.GL`` when None
+        """
+        self._gl = gl
+        self._buffers = buffers
+        self._pbos: list[int] = []
+        self._free: list[int] = []
+        self._sizes: dict[int, int] = {}
+        self._queued: deque[_Read] = deque()
+        self._in_flight: deque[_Read] = deque()
+        self._use_pbo = True
+
+    @property
+    def pending(self) -> bool:
+        """True while a read waits for a PBO or for the GPU."""
+        return bool(self._queued or self._in_flight)
+
+    def _module(self) -> Any:
+        if self._gl is None:
+            from OpenGL import GL
+
+            self._gl = GL
+        return self._gl
+
+    def read(self, x: int, y: int, width: int, height: int) -> Future[np.ndarray]:
+        """Start reading a rectangle of the current read framebuffer.
+
+        Returns:
+            Future resolving on a later :meth:`poll` to a ``(height, width, 4)``
+            uint8 RGBA array, bottom row first
+
+        Raises:
+            RuntimeError: If no OpenGL context is current
+        """
+        gl = self._module()
+        # Without a context PyOpenGL calls quietly return nothing
+        if not gl.glGetString(gl.GL_VERSION):
+            raise RuntimeError("No current OpenGL context")
+
+        request = _Read(x, y, width, height)
+        if self._use_pbo:
+            try:
+                if not self._start(request):
+                    self._queued.append(request)
+                return request.future
+            except Exception as e:
+                pixels = self._read_now(request)
+                logger.info(f"PBO readback unavailable, reading synchronously: {e}")
+                self._use_pbo = False
+                request.future.set_result(pixels)
+                return request.future
+
+        request.future.set_result(self._read_now(request))
+        return request.future
+
+    def poll(self) -> None:
+        """Deliver reads the GPU has finished and start queued ones."""
+        if not self.pending:
+            return
+        gl = self._gl
+        while self._in_flight:
+            request = self._in_flight[0]
+            status = gl.glClientWaitSync(
+                request.fence, gl.GL_SYNC_FLUSH_COMMANDS_BIT, 0
+            )
+            if status == gl.GL_TIMEOUT_EXPIRED:
+                # Reads complete in submission order; later ones are not ready
+                break
+            self._in_flight.popleft()
+            gl.glDeleteSync(request.fence)
+            self._finish(request)
+
+        while self._queued:
+            request = self._queued[0]
+            try:
+                if not self._start(request):
+                    break
+            except Exception as e:
+                request.future.set_exception(e)
+            self._queued.popleft()
+
+    def release(self) -> None:
+        """Delete GL objects and fail unfinished reads (before the context goes)."""
+        gl = self._gl
+        for request in (*self._in_flight, *self._queued):
+            request.future.set_exception(RuntimeError("Framebuffer reader released"))
+            if gl is not None and request.fence is not None:
+                gl.glDeleteSync(request.fence)
+        self._in_flight.clear()
+        self._queued.clear()
+        if gl is not None and self._pbos:
+            gl.glDeleteBuffers(len(self._pbos), self._pbos)
+        self._pbos.clear()
+        self._free.clear()
+        self._sizes.clear()
+
+    def _acquire(self) -> int | None:
+        """Return a free PBO, creating one while under the limit."""
+        if self._free:
+            return self._free.pop()
+        if len(self._pbos) >= self._buffers:
+            return None
+        pbo = int(self._gl.glGenBuffers(1))
+        if not pbo:
+            raise RuntimeError("glGenBuffers returned no buffer")
+        self._pbos.append(pbo)
+        return pbo
+
+    def _start(self, request: _Read) -> bool:
+        """Queue the GPU copy for *request*; False if every PBO is busy."""
+        pbo = self._acquire()
+        if pbo is None:
+            return False
+        gl = self._gl
+        try:
+            gl.glBindBuffer(gl.GL_PIXEL_PACK_BUFFER, pbo)
+            if self._sizes.get(pbo) != request.nbytes:
+                gl.glBufferData(
+                    gl.GL_PIXEL_PACK_BUFFER, request.nbytes, None, gl.GL_STREAM_READ
+                )
+                self._sizes[pbo] = request.nbytes
+            # With a PBO bound the last argument is an offset into it
+            gl.glReadPixels(
+                *request.rect, gl.GL_RGBA, gl.GL_UNSIGNED_BYTE, ctypes.c_void_p(0)
+            )
+            request.fence = gl.glFenceSync(gl.GL_SYNC_GPU_COMMANDS_COMPLETE, 0)
+        except Exception:
+            self._free.append(pbo)
+            raise
+        finally:
+            gl.glBindBuffer(gl.GL_PIXEL_PACK_BUFFER, 0)
+        request.pbo = pbo
+        self._in_flight.append(request)
+        return True
+
+    def _finish(self, request: _Read) -> None:
+        """Map the finished PBO, copy the pixels out and resolve the read."""
+        gl = self._gl
+        _, _, width, height = request.rect
+        try:
+            gl.glBindBuffer(gl.GL_PIXEL_PACK_BUFFER, request.pbo)
+            try:
+                pointer = gl.glMapBufferRange(
+                    gl.GL_PIXEL_PACK_BUFFER, 0, request.nbytes, gl.GL_MAP_READ_BIT
+                )
+                address = ctypes.cast(pointer, ctypes.c_void_p).value
+                if not address:
+                    raise RuntimeError("glMapBufferRange failed")
+                raw = (ctypes.c_ubyte * request.nbytes).from_address(address)
+                pixels = np.frombuffer(raw, dtype=np.uint8).reshape(height, width, 4)
+                # Copy out before unmapping invalidates the memory
+                pixels = pixels.copy()
+            finally:
+                gl.glUnmapBuffer(gl.GL_PIXEL_PACK_BUFFER)
+                gl.glBindBuffer(gl.GL_PIXEL_PACK_BUFFER, 0)
+        except Exception as e:
+            request.future.set_exception(e)
+        else:
+            request.future.set_result(pixels)
+        finally:
+            self._free.append(request.pbo)
+
+    def _read_now(self, request: _Read) -> np.ndarray:
+        """Read *request* into client memory, waiting for the GPU."""
+        gl = self._gl
+        _, _, width, height = request.rect
+        data = gl.glReadPixels(*request.rect, gl.GL_RGBA, gl.GL_UNSIGNED_BYTE)
+        pixels = np.frombuffer(bytes(data), dtype=np.uint8)
+        return pixels.reshape(height, width, 4)
+
+
+def capture_image(
+    reader: FramebufferReader,
+    rect: tuple[int, int, int, int],
+    filepath: str | None = None,
+    image_format: str = "png",
+    compression: int | None = None,
+    output: str = "file",
+    *,
+    differ: FrameDiffer | None = None,
+    diff_threshold: int = 0,
+    skip_unchanged: bool = False,
+) -> Future[dict[str, Any]]:
+    """Read *rect* with *reader* and encode it off the render thread.
+
+    Must be called on the render thread; raises like :meth:`FramebufferReader.read`.
+    Options are those of :func:`deliver_image`, already validated with
+    :func:`check_image_options`.
+
+    Returns:
+        Future resolving to the :func:`deliver_image` result, or to
+        ``{"success": False, "error": <message>}`` if the read or encoding failed
+    """
+    pixels = reader.read(*rect)
+    done: Future[dict[str, Any]] = Future()
+
+    def encoded(job: Future[dict[str, Any]]) -> None:
+        error = job.exception()
+        if error is None:
+            done.set_result(job.result())
+        else:
+            logger.error(f"Screenshot encoding failed: {error}")
+            done.set_result({"success": False, "error": f"Screenshot failed: {error}"})
+
+    def read_back(read: Future[np.ndarray]) -> None:
+        error = read.exception()
+        if error is not None:
+            logger.error(f"Screenshot readback failed: {error}")
+            done.set_result({"success": False, "error": f"Screenshot failed: {error}"})
+            return
+        encoder().submit(
+            deliver_image,
+            read.result(),
+            filepath,
+            image_format,
+            compression,
+            output,
+            differ=differ,
+            rect=rect,
+            diff_threshold=diff_threshold,
+            skip_unchanged=skip_unchanged,
+        ).add_done_callback(encoded)
+
+    pixels.add_done_callback(read_back)
+    return done
@@ -0,0 +1,381 @@
+"""Windowless render loop for CI, benchmarks and screenshot tests.
+
+``CanvasManager(headless=True)`` replaces ``hello_imgui.run()`` with a
+:class:`HeadlessRunner`: a plain loop that owns an ImGui context, feeds it a
+fixed display size and the frame clock, and calls the same show_gui
+callback. Canvases build exactly the frames and draw data they would in a
+window, so everything but the pixels of a real GPU can run on a box without
+``DISPLAY`` or ``WAYLAND_DISPLAY``.
+
+Pixels come from :class:`SoftwareRasterizer`, which draws ImGui's draw data
+(textured, vertex-coloured triangles under clip rects) into a NumPy
+framebuffer. It is meant for correctness, not speed, and only runs on frames
+where a screenshot or capture asked for pixels; the rest of the time the
+loop only builds draw data. A :class:`HeadlessFramebuffer` without a
+rasterizer makes the loop a null renderer on which reads fail.
+
+:class:`HeadlessFramebuffer` stands in for the GL
+:class:`~champi_imgui.core.frame_capture.FramebufferReader`, so
+``request_screenshot`` and ``start_capture`` work unchanged. Fonts are
+ImGui's default font rather than hello_imgui's, so text metrics differ from
+a windowed run.
+"""
+
+import math
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future
+
+import numpy as np
+from imgui_bundle import imgui
+from loguru import logger
+
+from champi_imgui.core.draw_cache import _IDX_DTYPE, DRAW_VERT_DTYPE, _read
+from champi_imgui.core.frame_capture import FramebufferReader
+
+# Display size of the headless loop; the same as the hello_imgui window
+DEFAULT_DISPLAY_SIZE = (1600, 900)
+
+# Background the framebuffer is cleared to before each rasterized frame
+DEFAULT_CLEAR_COLOR = (0, 0, 0, 255)
+
+# Longest wait between frames while every canvas is idle
+_IDLE_WAIT = 1.0
+
+
+def _edge(
+    ax: float, ay: float, bx: float, by: float, px: np.ndarray, py: np.ndarray
+) -> np.ndarray:
+    """Edge function of a→b at points (px, py); positive on the inner side."""
+    return (bx - ax) * (py - ay) - (by - ay) * (px - ax)
+
+
+def _owns_edge(ax: float, ay: float, bx: float, by: float) -> bool:
+    """Whether pixel centres exactly on edge a→b belong to its triangle.
+
+    The rule flips with the edge direction, so of two triangles sharing an
+    edge exactly one draws the pixels on it and translucent quads get no
+    double-blended seams.
+    """
+    return by > ay or (by == ay and bx > ax)
+
+
+class SoftwareRasterizer:
+    """Draws ImGui draw data into an RGBA NumPy framebuffer.
+
+    Textures are managed as a renderer backend must when
+    ``BackendFlags_.renderer_has_textures`` is set: :meth:`update_textures`
+    keeps a copy of every texture ImGui creates or updates. Render thread only.
+    """
+
+    def __init__(self, clear_color: tuple[int, int, int, int] = DEFAULT_CLEAR_COLOR):
+        """Initialize with no textures.
+
+        Args:
+            clear_color: RGBA (0-255) the framebuffer starts each frame with
+        """
+        self.clear_color = clear_color
+        # ImTextureID -> (height, width, 4) float32 RGBA in [0, 1]
+        self._textures: dict[int, np.ndarray] = {}
+        self._next_id = 1
+
+    def update_textures(self, draw_data: imgui.ImDrawData) -> None:
+        """Create, update and destroy textures as *draw_data* requests."""
+        status = imgui.ImTextureStatus
+        for tex in draw_data.textures:
+            if tex.status in (status.want_create, status.want_updates):
+                if tex.status == status.want_create:
+                    tex.set_tex_id(self._next_id)
+                    self._next_id += 1
+                self._textures[tex.tex_id] = self._texture_pixels(tex)
+                tex.set_status(status.ok)
+            elif tex.status == status.want_destroy and tex.unused_frames > 0:
+                self._textures.pop(tex.tex_id, None)
+                tex.set_tex_id(0)
+                tex.set_status(status.destroyed)
+
+    @staticmethod
+    def _texture_pixels(tex: imgui.ImTextureData) -> np.ndarray:
+        raw = np.asarray(tex.get_pixels_array(), dtype=np.uint8)
+        if tex.format == imgui.ImTextureFormat.alpha8:
+            pixels = np.full((tex.height, tex.width, 4), 255, dtype=np.uint8)
+            pixels[..., 3] = raw.reshape(tex.height, tex.width)
+        else:
+            pixels = raw.reshape(tex.height, tex.width, 4)
+        return pixels.astype(np.float32) / 255.0
+
+    def rasterize(self, draw_data: imgui.ImDrawData) -> np.ndarray:
+        """Draw *draw_data* into a fresh framebuffer.
+
+        Returns:
+            ``(height, width, 4)`` uint8 RGBA array, top row first
+        """
+        scale_x, scale_y = draw_data.framebuffer_scale.x, draw_data.framebuffer_scale.y
+        width = int(draw_data.display_size.x * scale_x)
+        height = int(draw_data.display_size.y * scale_y)
+        target = np.empty((height, width, 4), dtype=np.float32)
+        target[...] = np.asarray(self.clear_color, dtype=np.float32) / 255.0
+        origin = (draw_data.display_pos.x, draw_data.display_pos.y)
+
+        for draw_list in draw_data.cmd_lists:
+            vertices = _read(
+                draw_list.vtx_buffer.data_address(),
+                draw_list.vtx_buffer.size(),
+                DRAW_VERT_DTYPE,
+            )
+            indices = _read(
+                draw_list.idx_buffer.data_address(),
+                draw_list.idx_buffer.size(),
+                _IDX_DTYPE,
+            )
+            positions = (vertices["pos"] - origin) * (scale_x, scale_y)
+            # ImU32 colours are packed ABGR: red in the low byte
+            channels = (
+                vertices["col"][:, None] >> np.array([0, 8, 16, 24], dtype=np.uint32)
+            ) & 0xFF
+            colors = channels.astype(np.float32) / 255.0
+
+            commands = draw_list.cmd_buffer
+            for i in range(commands.size()):
+                cmd = commands[i]
+                if cmd.user_callback_data is not None or cmd.elem_count == 0:
+                    continue
+                clip = cmd.clip_rect
+                x0 = max(int((clip.x - origin[0]) * scale_x), 0)
+                y0 = max(int((clip.y - origin[1]) * scale_y), 0)
+                x1 = min(int((clip.z - origin[0]) * scale_x), width)
+                y1 = min(int((clip.w - origin[1]) * scale_y), height)
+                if x1 <= x0 or y1 <= y0:
+                    continue
+                texture = self._textures.get(cmd.get_tex_id())
+                if texture is None:
+                    continue
+                triangles = (
+                    indices[cmd.idx_offset : cmd.idx_offset + cmd.elem_count].astype(
+                        np.int64
+                    )
+                    + cmd.vtx_offset
+                ).reshape(-1, 3)
+                for triangle in triangles:
+                    self._triangle(
+                        target,
+                        (x0, y0, x1, y1),
+                        positions[triangle],
+                        vertices["uv"][triangle],
+                        colors[triangle],
+                        texture,
+                    )
+        return np.rint(target * 255.0).astype(np.uint8)
+
+    @staticmethod
+    def _triangle(
+        target: np.ndarray,
+        clip: tuple[int, int, int, int],
+        pos: np.ndarray,
+        uv: np.ndarray,
+        color: np.ndarray,
+        texture: np.ndarray,
+    ) -> None:
+        """Blend one triangle into *target* (source-alpha over)."""
+        (ax, ay), (bx, by), (cx, cy) = pos.tolist()
+        area = (bx - ax) * (cy - ay) - (by - ay) * (cx - ax)
+        if area == 0:
+            return
+        if area < 0:
+            # Wind every triangle the same way so the edge functions agree
+            bx, by, cx, cy = cx, cy, bx, by
+            uv = uv[[0, 2, 1]]
+            color = color[[0, 2, 1]]
+            area = -area
+
+        x0 = max(clip[0], math.floor(min(ax, bx, cx)))
+        x1 = min(clip[2], math.ceil(max(ax, bx, cx)))
+        y0 = max(clip[1], math.floor(min(ay, by, cy)))
+        y1 = min(clip[3], math.ceil(max(ay, by, cy)))
+        if x1 <= x0 or y1 <= y0:
+            return
+        px = np.arange(x0, x1, dtype=np.float32)[None, :] + 0.5
+        py = np.arange(y0, y1, dtype=np.float32)[:, None] + 0.5
+
+        # Weight of each vertex: the edge opposite it, over the full area
+        w_a = _edge(bx, by, cx, cy, px, py)
+        w_b = _edge(cx, cy, ax, ay, px, py)
+        w_c = _edge(ax, ay, bx, by, px, py)
+        inside = (
+            ((w_a > 0) | ((w_a == 0) & _owns_edge(bx, by, cx, cy)))
+            & ((w_b > 0) | ((w_b == 0) & _owns_edge(cx, cy, ax, ay)))
+            & ((w_c > 0) | ((w_c == 0) & _owns_edge(ax, ay, bx, by)))
+        )
+        rows, cols = np.nonzero(inside)
+        if rows.size == 0:
+            return
+        weights = (
+            np.stack([w_a[rows, cols], w_b[rows, cols], w_c[rows, cols]], axis=1) / area
+        )
+
+        tex_h, tex_w = texture.shape[:2]
+        u, v = (weights @ uv).T
+        texels = texture[
+            np.clip((v * tex_h).astype(np.int64), 0, tex_h - 1),
+            np.clip((u * tex_w).astype(np.int64), 0, tex_w - 1),
+        ]
+        source = texels * (weights @ color)
+
+        region = target[y0:y1, x0:x1]
+        dest = region[rows, cols]
+        alpha = source[:, 3:4]
+        dest[:, :3] = source[:, :3] * alpha + dest[:, :3] * (1.0 - alpha)
+        dest[:, 3:4] = alpha + dest[:, 3:4] * (1.0 - alpha)
+        region[rows, cols] = dest
+
+
+class HeadlessFramebuffer(FramebufferReader):
+    """FramebufferReader for the headless loop.
+
+    Reads are queued during the frame and resolved by :meth:`present` once
+    the frame's draw data exists, from a software-rasterized image. Render
+    thread only, except :attr:`pending`.
+    """
+
+    def __init__(self, rasterizer: SoftwareRasterizer | None = None) -> None:
+        """Initialize the reader.
+
+        Args:
+            rasterizer: Draws the frames reads come from; None makes every
+                read fail (null renderer)
+        """
+        super().__init__(buffers=0)
+        self.rasterizer = rasterizer
+        self._reads: list[tuple[tuple[int, int, int, int], Future[np.ndarray]]] = []
+
+    @property
+    def pending(self) -> bool:
+        """True while a read waits for the end of the frame."""
+        return bool(self._reads)
+
+    def read(self, x: int, y: int, width: int, height: int) -> Future[np.ndarray]:
+        """Queue a read of the frame being built.
+
+        Coordinates are GL ones (bottom-left origin), as for the GL reader.
+
+        Raises:
+            RuntimeError: With the null renderer, which has no pixels
+        """
+        if self.rasterizer is None:
+            raise RuntimeError("Headless null renderer has no framebuffer to read")
+        future: Future[np.ndarray] = Future()
+        self._reads.append(((x, y, width, height), future))
+        return future
+
+    def poll(self) -> None:
+        """Nothing to do: reads resolve in :meth:`present`."""
+
+    def present(self, draw_data: imgui.ImDrawData) -> None:
+        """Rasterize *draw_data* if any read is waiting and resolve the reads."""
+        reads, self._reads = self._reads, []
+        if not reads:
+            return
+        assert self.rasterizer is not None
+        try:
+            # Bottom row first, like glReadPixels
+            frame = self.rasterizer.rasterize(draw_data)[::-1]
+        except Exception as e:
+            logger.error(f"Headless rasterization failed: {e}")
+            for _, future in reads:
+                future.set_exception(e)
+            return
+        for (x, y, width, height), future in reads:
+            future.set_result(frame[y : y + height, x : x + width].copy())
+
+    def release(self) -> None:
+        """Fail reads still waiting for a frame."""
+        reads, self._reads = self._reads, []
+        for _, future in reads:
+            future.set_exception(RuntimeError("Headless render loop stopped"))
+
+
+class HeadlessRunner:
+    """Runs ImGui frames without a window, in place of ``hello_imgui.run()``.
+
+    :meth:`run` blocks the calling thread; :meth:`wake`,
+    :meth:`schedule` and :meth:`request_exit` may be called from any thread.
+    """
+
+    def __init__(
+        self,
+        framebuffer: HeadlessFramebuffer,
+        display_size: tuple[int, int] = DEFAULT_DISPLAY_SIZE,
+    ) -> None:
+        """Initialize the runner.
+
+        Args:
+            framebuffer: Reader resolved at the end of every frame
+            display_size: Size of the virtual display, in pixels
+        """
+        self.framebuffer = framebuffer
+        self.display_size = display_size
+        self.frame_count = 0
+        self._delay: float | None = 0.0
+        self._wake = threading.Event()
+        self._exit = False
+
+    def wake(self) -> None:
+        """Start the next frame now if the loop is waiting."""
+        self._wake.set()
+
+    def schedule(self, delay: float | None) -> None:
+        """Set the wait after the current frame (None = idle until woken)."""
+        self._delay = delay
+
+    def request_exit(self) -> None:
+        """Stop the loop after the current frame."""
+        self._exit = True
+        self._wake.set()
+
+    def run(
+        self,
+        show_gui: Callable[[], None],
+        post_init: Callable[[], None] | None = None,
+        before_exit: Callable[[], None] | None = None,
+    ) -> None:
+        """Run frames until :meth:`request_exit`, like ``hello_imgui.run()``.
+
+        Args:
+            show_gui: Called inside every frame to submit the GUI
+            post_init: Called once the ImGui context exists
+            before_exit: Called after the last frame, before the context goes
+        """
+        self._exit = False
+        context = imgui.create_context()
+        imgui.set_current_context(context)
+        io = imgui.get_io()
+        io.set_ini_filename(None)
+        io.display_size = imgui.ImVec2(*self.display_size)
+        io.backend_flags |= imgui.BackendFlags_.renderer_has_textures
+        rasterizer = self.framebuffer.rasterizer or SoftwareRasterizer()
+        try:
+            if post_init is not None:
+                post_init()
+            last = time.perf_counter()
+            while not self._exit:
+                now = time.perf_counter()
+                io.delta_time = max(now - last, 1e-6)
+                last = now
+                self._wake.clear()
+
+                imgui.new_frame()
+                show_gui()
+                imgui.render()
+                draw_data = imgui.get_draw_data()
+                rasterizer.update_textures(draw_data)
+                self.framebuffer.present(draw_data)
+                self.frame_count += 1
+
+                delay = self._delay
+                if delay is None or delay > 0:
+                    self._wake.wait(_IDLE_WAIT if delay is None else delay)
+        finally:
+            if before_exit is not None:
+                before_exit()
+            imgui.destroy_context(context)
@@ -0,0 +1,122 @@
+"""Opt-in per-widget render-time profiler.
+
+A :class:`RenderProfiler` keeps, for every top-level widget of a canvas, a
+rolling window of recent ``render()`` durations together with call and
+exception counts.  Container widgets render their children themselves, so a
+container's time includes its children's.
+
+While disabled the canvas skips timing entirely; the only cost is one flag
+check per frame.
+"""
+
+import statistics
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any
+
+# Render durations kept per widget for the percentiles
+WINDOW_SIZE = 256
+
+
+@dataclass
+class _WidgetStats:
+    """Rolling render statistics for one widget."""
+
+    samples_ns: deque[int] = field(default_factory=lambda: deque(maxlen=WINDOW_SIZE))
+    calls: int = 0
+    errors: int = 0
+    max_ns: int = 0
+
+
+def _percentiles_us(samples_ns: list[int]) -> dict[str, float]:
+    """Summarize render durations (nanoseconds) in microseconds."""
+    if not samples_ns:
+        return {"p50_us": 0.0, "p95_us": 0.0}
+    us = sorted(s / 1000.0 for s in samples_ns)
+    p95 = (
+        statistics.quantiles(us, n=20, method="inclusive")[18] if len(us) > 1 else us[0]
+    )
+    return {
+        "p50_us": round(statistics.median(us), 2),
+        "p95_us": round(p95, 2),
+    }
+
+
+class RenderProfiler:
+    """Per-widget render timings for one canvas.
+
+    Written by the render thread, read from any thread.
+    """
+
+    def __init__(self) -> None:
+        """Initialize a disabled profiler with no samples."""
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._widgets: dict[str, _WidgetStats] = {}
+        self._full_frames = 0
+        self._replayed_frames = 0
+
+    def record(self, widget_id: str, elapsed_ns: int, failed: bool = False) -> None:
+        """Record one render() call of *widget_id*."""
+        with self._lock:
+            stats = self._widgets.get(widget_id)
+            if stats is None:
+                stats = self._widgets[widget_id] = _WidgetStats()
+            stats.samples_ns.append(elapsed_ns)
+            stats.calls += 1
+            if failed:
+                stats.errors += 1
+            if elapsed_ns > stats.max_ns:
+                stats.max_ns = elapsed_ns
+
+    def record_frame(self, replayed: bool) -> None:
+        """Count a frame that walked the widgets or replayed cached draw data."""
+        with self._lock:
+            if replayed:
+                self._replayed_frames += 1
+            else:
+                self._full_frames += 1
+
+    def forget(self, widget_id: str) -> None:
+        """Drop the statistics of a removed widget."""
+        with self._lock:
+            self._widgets.pop(widget_id, None)
+
+    def reset(self) -> None:
+        """Drop every sample and counter."""
+        with self._lock:
+            self._widgets.clear()
+            self._full_frames = 0
+            self._replayed_frames = 0
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return the current statistics as a JSON-serializable dict.
+
+        Widgets are listed slowest first (by p95).
+        """
+        with self._lock:
+            copies = [
+                (wid, list(s.samples_ns), s.calls, s.errors, s.max_ns)
+                for wid, s in self._widgets.items()
+            ]
+            full, replayed = self._full_frames, self._replayed_frames
+
+        widgets: list[dict[str, Any]] = [
+            {
+                "widget_id": wid,
+                "calls": calls,
+                "errors": errors,
+                **_percentiles_us(samples),
+                "max_us": round(max_ns / 1000.0, 2),
+                "window": len(samples),
+            }
+            for wid, samples, calls, errors, max_ns in copies
+        ]
+        widgets.sort(key=lambda w: w["p95_us"], reverse=True)
+        return {
+            "enabled": self.enabled,
+            "full_frames": full,
+            "replayed_frames": replayed,
+            "widgets": widgets,
+        }
@@ -0,0 +1,224 @@
+"""Continuous frame capture for recording a canvas.
+
+A :class:`CaptureSession` grabs the canvas at a fixed rate from inside the
+render loop, without a tool round trip per frame. Each captured frame is
+read back through the shared :class:`~champi_imgui.core.frame_capture.FramebufferReader`
+and handed to a writer thread that encodes it and writes it out, either as
+an image sequence (``frame_000000.png``, ...) or, for the ``"rgba"`` format,
+as one raw stream of top-down RGBA frames (``frames.rgba``).
+
+At most ``max_pending`` frames may be between readback and disk at once.
+When the writer falls behind, new frames are dropped (and counted) instead
+of slowing the render loop. Stopping writes ``capture.json`` with the frame
+size, rate and per-frame timestamps.
+"""
+
+import json
+import os
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Any
+
+import numpy as np
+from loguru import logger
+
+from champi_imgui.core.frame_capture import (
+    FramebufferReader,
+    check_image_options,
+    encode_image,
+)
+
+# Frames allowed between readback and disk before new ones are dropped
+DEFAULT_MAX_PENDING = 8
+
+# How long stop() waits for the writer to drain
+_STOP_TIMEOUT = 10.0
+
+_Frame = tuple[int, float, np.ndarray]
+
+
+class CaptureSession:
+    """Captures frames at a fixed rate and writes them off the render thread.
+
+    :meth:`on_frame` runs on the render thread; :meth:`stop` and
+    :meth:`stats` may be called from any thread.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        fps: float,
+        rect: tuple[int, int, int, int],
+        image_format: str = "png",
+        compression: int | None = None,
+        max_pending: int = DEFAULT_MAX_PENDING,
+    ) -> None:
+        """Create the output directory and start the writer thread.
+
+        Args:
+            directory: Where frames and ``capture.json`` are written
+            fps: Frames captured per second
+            rect: Framebuffer rectangle ``(x, y, width, height)``, GL
+                  coordinates (bottom-left origin); fixed for the session
+            image_format: ``"png"``, ``"webp"`` or ``"rgba"`` (raw stream)
+            compression: PNG zlib level or WebP quality
+            max_pending: Frames allowed in flight before new ones are dropped
+
+        Raises:
+            ValueError: On a non-positive rate or bound, or invalid image options
+        """
+        if fps <= 0:
+            raise ValueError(f"fps must be positive, got {fps}")
+        if max_pending < 1:
+            raise ValueError(f"max_pending must be at least 1, got {max_pending}")
+        check_image_options(image_format, compression, "file", directory)
+        os.makedirs(directory, exist_ok=True)
+
+        self.directory = directory
+        self.fps = fps
+        self.rect = rect
+        self.image_format = image_format
+        self.compression = compression
+        self.max_pending = max_pending
+
+        self._interval = 1.0 / fps
+        self._next_due = 0.0
+        self._started: float | None = None
+        self._lock = threading.Lock()
+        self._closed = False
+        self._outstanding = 0
+        self.captured = 0
+        self.written = 0
+        self.dropped = 0
+        self.error: str | None = None
+        self._timestamps: list[float] = []
+
+        self._stream = (
+            open(os.path.join(directory, "frames.rgba"), "wb")  # noqa: SIM115
+            if image_format == "rgba"
+            else None
+        )
+        self._frames: queue.Queue[_Frame | None] = queue.Queue()
+        self._writer = threading.Thread(
+            target=self._write_loop, name="capture-writer", daemon=True
+        )
+        self._writer.start()
+
+    @property
+    def active(self) -> bool:
+        """True until the session is stopped or fails."""
+        return not self._closed and self.error is None
+
+    def next_delay(self, now: float) -> float:
+        """Seconds until the next frame should be captured."""
+        return max(self._next_due - now, 0.0)
+
+    def on_frame(self, now: float, reader: FramebufferReader) -> None:
+        """Capture a frame if one is due (render thread).
+
+        Args:
+            now: Current monotonic time
+            reader: Framebuffer reader of the render loop
+        """
+        if not self.active or now < self._next_due:
+            return
+        if now - self._next_due < self._interval:
+            # Keep a steady cadence rather than drifting by each frame's lateness
+            self._next_due += self._interval
+        else:
+            self._next_due = now + self._interval
+        if self._started is None:
+            self._started = now
+
+        with self._lock:
+            if self._outstanding >= self.max_pending:
+                self.dropped += 1
+                return
+            self._outstanding += 1
+        index = self.captured
+        self.captured += 1
+        timestamp = now - self._started
+
+        try:
+            pixels = reader.read(*self.rect)
+        except Exception as e:
+            logger.error(f"Frame capture failed: {e}")
+            self.error = str(e)
+            with self._lock:
+                self._outstanding -= 1
+            return
+        pixels.add_done_callback(lambda read: self._enqueue(read, index, timestamp))
+
+    def _enqueue(self, read: Future[np.ndarray], index: int, timestamp: float) -> None:
+        with self._lock:
+            if self._closed or read.exception() is not None:
+                self._outstanding -= 1
+                self.dropped += 1
+                return
+            self._frames.put((index, timestamp, read.result()))
+
+    def _write_loop(self) -> None:
+        while (frame := self._frames.get()) is not None:
+            index, timestamp, pixels = frame
+            failed = False
+            try:
+                data = encode_image(pixels, self.image_format, self.compression)
+                if self._stream is not None:
+                    self._stream.write(data)
+                else:
+                    name = f"frame_{index:06d}.{self.image_format}"
+                    with open(os.path.join(self.directory, name), "wb") as f:
+                        f.write(data)
+                self._timestamps.append(round(timestamp, 6))
+                self.written += 1
+            except Exception as e:
+                logger.error(f"Writing captured frame {index} failed: {e}")
+                self.error = str(e)
+                failed = True
+            finally:
+                with self._lock:
+                    self._outstanding -= 1
+                    self.dropped += failed
+
+    def stop(self) -> dict[str, Any]:
+        """Stop capturing, flush queued frames and write ``capture.json``.
+
+        Frames still being read back when this is called are dropped.
+
+        Returns:
+            Final :meth:`stats`
+        """
+        with self._lock:
+            if self._closed:
+                return self.stats()
+            self._closed = True
+            self._frames.put(None)
+        self._writer.join(timeout=_STOP_TIMEOUT)
+        if self._stream is not None:
+            self._stream.close()
+
+        manifest = {
+            **self.stats(),
+            "timestamps": self._timestamps,
+        }
+        with open(os.path.join(self.directory, "capture.json"), "w") as f:
+            json.dump(manifest, f, indent=2)
+        return self.stats()
+
+    def stats(self) -> dict[str, Any]:
+        """Return a JSON-serializable summary of the session so far."""
+        _, _, width, height = self.rect
+        return {
+            "directory": self.directory,
+            "active": self.active,
+            "fps": self.fps,
+            "format": self.image_format,
+            "width": width,
+            "height": height,
+            "captured": self.captured,
+            "written": self.written,
+            "dropped": self.dropped,
+            "pending": self._outstanding,
+            "error": self.error,
+        }
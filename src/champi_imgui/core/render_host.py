@@ -0,0 +1,346 @@
+"""Out-of-process render host.
+
+By default CanvasManager renders on a thread inside the MCP server process,
+so every frame competes with tool handlers for the GIL.  With
+``CanvasManager(render_process=True)`` the render loop instead runs in a
+dedicated child process started with the ``spawn`` method:
+
+- The server keeps its Canvas objects as the authoritative model and owns
+  every shared memory region.
+- The host attaches a Canvas of its own to each canvas's command/ACK rings,
+  so commands written by the server's pooled clients are applied and
+  acknowledged by the host exactly as the in-process loop would.
+- A separate control ring (``canvas__host_<token>``) tells the host which
+  canvases exist: CREATE_CANVAS opens one, SHUTDOWN with a canvas_id drops
+  it and SHUTDOWN with an empty canvas_id stops the host.
+
+Several hosts can run side by side (``render_hosts=N``), each with its own
+window, so one heavy canvas only slows the canvases sharing its shard.  Each
+host publishes a smoothed frame time in shared memory for least-loaded
+placement.
+
+If a host dies, the next ensure_canvas_running() starts a fresh one and
+replays its canvases from the server-side model. A host whose frame stalls
+is killed and restarted the same way by the server's RenderWatchdog, after
+dumping its stacks through faulthandler (SIGUSR1).
+"""
+
+import contextlib
+import faulthandler
+import multiprocessing
+import os
+import signal
+import tempfile
+import threading
+import time
+import uuid
+from collections.abc import Callable
+from multiprocessing.process import BaseProcess
+from multiprocessing.sharedctypes import Synchronized
+from multiprocessing.synchronize import Event as EventType
+from typing import Any
+
+from imgui_bundle import hello_imgui
+from loguru import logger
+
+from champi_imgui.core.canvas import Canvas, CanvasManager
+from champi_imgui.ipc.command_types import CommandType
+from champi_imgui.ipc.doorbell import Doorbell
+from champi_imgui.ipc.shared_memory_manager import SharedMemoryManager
+
+# Control commands are small and rare
+_CONTROL_CAPACITY = 64
+
+# How long stop() waits for the host to exit before terminating it
+_STOP_TIMEOUT = 3.0
+
+# Weight of the newest frame in the published frame-time average
+_FRAME_TIME_ALPHA = 0.1
+
+# How long dump_stacks() waits for the host to write its stacks
+_DUMP_TIMEOUT = 1.0
+
+
+def stack_file(control_prefix: str) -> str:
+    """Path the host with *control_prefix* dumps its stacks to on SIGUSR1."""
+    return os.path.join(tempfile.gettempdir(), f"{control_prefix}.stacks")
+
+
+class RenderHost(CanvasManager):
+    """CanvasManager running inside the render host process.
+
+    Canvases are created from control commands and attach to regions the
+    server already created; nothing here creates shared memory.
+    """
+
+    def __init__(
+        self,
+        control_prefix: str,
+        ready: EventType | None = None,
+        shard: int = 0,
+        frame_time: "Synchronized[float] | None" = None,
+        heartbeat: "Synchronized[float] | None" = None,
+    ):
+        """Initialize render host.
+
+        Args:
+            control_prefix: Name prefix of the control ring created by the server
+            ready: Set once the first frame has been rendered
+            shard: Index of this host among the server's render hosts
+            frame_time: Shared value receiving the smoothed frame time (ms)
+            heartbeat: Shared value set to ``time.monotonic()`` while a frame
+                runs and to 0.0 between frames
+        """
+        # The server watches this host; it does not watch itself
+        super().__init__(stall_timeout=None)
+        self.control = SharedMemoryManager(name_prefix=control_prefix)
+        self.control.attach_regions()
+        self.window_title = f"champi-imgui [{shard}]"
+        self._ready = ready
+        self._frame_time = frame_time
+        self._heartbeat = heartbeat
+        self._parent_pid = os.getppid()
+        self._exit_requested = False
+
+    def process_control(self) -> None:
+        """Apply every pending control command."""
+        while True:
+            command = self.control.read_command(timeout=0)
+            if command is None:
+                return
+            data = command.data
+            canvas_id = data.get("canvas_id", "")
+            if command.command_type == CommandType.CREATE_CANVAS:
+                self._open_canvas(data)
+            elif command.command_type == CommandType.SHUTDOWN and canvas_id:
+                canvas = self.canvases.pop(canvas_id, None)
+                if canvas is not None:
+                    canvas.stop()
+                    logger.info(f"Render host dropped canvas '{canvas_id}'")
+            elif command.command_type == CommandType.SHUTDOWN:
+                self._exit_requested = True
+            else:
+                logger.warning(
+                    f"Unexpected render host command: {command.command_type.name}"
+                )
+
+    def _open_canvas(self, data: dict[str, Any]) -> None:
+        canvas_id = data["canvas_id"]
+        stale = self.canvases.pop(canvas_id, None)
+        if stale is not None:
+            stale.stop()
+        canvas = Canvas(
+            canvas_id,
+            attach_ipc=True,
+            title=data.get("title", "Canvas"),
+            size=(data.get("width", 800), data.get("height", 600)),
+            fps_target=data.get("fps_target", 60),
+            cache_draw_lists=data.get("cache_draw_lists", True),
+        )
+        canvas._loop_healthy = self.is_loop_healthy
+        canvas._request_frame = self._request_frame
+        canvas._framebuffer = self.framebuffer
+        canvas._running = True
+        self.canvases[canvas_id] = canvas
+        logger.info(f"Render host opened canvas '{canvas_id}'")
+
+    def _render_all_canvases(self) -> None:
+        if self._heartbeat is None:
+            super()._render_all_canvases()
+            return
+        self._heartbeat.value = time.monotonic()
+        try:
+            super()._render_all_canvases()
+        finally:
+            self._heartbeat.value = 0.0
+
+    def _render_canvases(self) -> None:
+        self.process_control()
+        if self._exit_requested or os.getppid() != self._parent_pid:
+            hello_imgui.get_runner_params().app_shall_exit = True
+            return
+        start = time.perf_counter()
+        super()._render_canvases()
+        if self._frame_time is not None:
+            elapsed_ms = (time.perf_counter() - start) * 1000.0
+            previous = self._frame_time.value
+            self._frame_time.value = (
+                elapsed_ms
+                if previous == 0.0
+                else previous + _FRAME_TIME_ALPHA * (elapsed_ms - previous)
+            )
+        if self._ready is not None and not self._ready.is_set():
+            self._ready.set()
+
+    def _wake_bells(self) -> list[tuple[Doorbell, Callable[[], None]]]:
+        bells = super()._wake_bells()
+        if self.control.cmd_bell is not None:
+            bells.append((self.control.cmd_bell, self._request_frame))
+        return bells
+
+    def cleanup(self) -> None:
+        super().cleanup()
+        self.control.cleanup()
+
+
+def run_render_host(
+    control_prefix: str,
+    ready: EventType | None = None,
+    shard: int = 0,
+    frame_time: "Synchronized[float] | None" = None,
+    heartbeat: "Synchronized[float] | None" = None,
+) -> None:
+    """Entry point of the render host process.
+
+    Runs hello_imgui on the process's main thread until the server asks the
+    host to exit or the server process goes away. SIGUSR1 dumps the stacks
+    of every thread to stack_file(control_prefix).
+    """
+    stacks = open(stack_file(control_prefix), "w")  # noqa: SIM115
+    faulthandler.register(signal.SIGUSR1, file=stacks, all_threads=True)
+    host = RenderHost(control_prefix, ready, shard, frame_time, heartbeat)
+    try:
+        host._render_loop()
+    finally:
+        host.cleanup()
+
+
+class RenderHostProcess:
+    """Server-side handle on the render host child process."""
+
+    def __init__(self, shard: int = 0) -> None:
+        """Initialize handle; the process starts on start().
+
+        Args:
+            shard: Index of this host among the manager's render hosts
+        """
+        self.shard = shard
+        self.control_prefix = f"canvas__host_{uuid.uuid4().hex[:12]}"
+        self.control: SharedMemoryManager | None = None
+        self._process: BaseProcess | None = None
+        self._ctx = multiprocessing.get_context("spawn")
+        self.ready = self._ctx.Event()
+        self._frame_time = self._ctx.Value("d", 0.0)
+        self._heartbeat = self._ctx.Value("d", 0.0)
+        self._lock = threading.Lock()
+
+    def is_alive(self) -> bool:
+        """Return True while the host process is running."""
+        return self._process is not None and self._process.is_alive()
+
+    def start(self) -> None:
+        """Start a fresh host process with an empty control ring."""
+        self.stop()
+        self.control = SharedMemoryManager(
+            name_prefix=self.control_prefix, capacity=_CONTROL_CAPACITY
+        )
+        self.control.create_regions()
+        self.ready = self._ctx.Event()
+        self._frame_time.value = 0.0
+        self._heartbeat.value = 0.0
+        self._process = self._ctx.Process(
+            target=run_render_host,
+            args=(
+                self.control_prefix,
+                self.ready,
+                self.shard,
+                self._frame_time,
+                self._heartbeat,
+            ),
+            name="CanvasRenderHost",
+            daemon=True,
+        )
+        self._process.start()
+        logger.info(f"Render host {self.shard} started (pid {self._process.pid})")
+
+    def frame_time_ms(self) -> float:
+        """Return the host's smoothed frame time in ms (0.0 before any frame)."""
+        return float(self._frame_time.value)
+
+    def frame_started(self) -> float:
+        """Return ``time.monotonic()`` at the start of the host's running frame.
+
+        0.0 between frames and before the first one.
+        """
+        return float(self._heartbeat.value)
+
+    def dump_stacks(self, timeout: float = _DUMP_TIMEOUT) -> str:
+        """Have the host dump the stacks of all its threads and return them.
+
+        Works while the host is stuck, as faulthandler writes them from the
+        signal handler. Returns an empty string if the host does not answer.
+        """
+        process = self._process
+        if process is None or process.pid is None or not process.is_alive():
+            return ""
+        path = stack_file(self.control_prefix)
+        try:
+            offset = os.path.getsize(path)
+            os.kill(process.pid, signal.SIGUSR1)
+        except OSError as e:
+            logger.warning(f"Could not dump render host {self.shard} stacks: {e}")
+            return ""
+        deadline = time.monotonic() + timeout
+        size = offset
+        while time.monotonic() < deadline:
+            time.sleep(0.05)
+            current = os.path.getsize(path)
+            if current > offset and current == size:
+                break
+            size = current
+        with open(path) as f:
+            f.seek(offset)
+            return f.read()
+
+    def wait_ready(self, timeout: float) -> bool:
+        """Block until the host has rendered its first frame."""
+        return self.ready.wait(timeout)
+
+    def send(self, command_type: CommandType, **kwargs: Any) -> None:
+        """Write one command into the control ring."""
+        if self.control is None:
+            return
+        with self._lock:
+            self.control.write_command(command_type, **kwargs)
+
+    def open_canvas(self, canvas: Canvas) -> None:
+        """Tell the host to open (or reopen) *canvas*."""
+        width, height = canvas.state.size
+        self.send(
+            CommandType.CREATE_CANVAS,
+            canvas_id=canvas.state.canvas_id,
+            title=canvas.state.title,
+            width=width,
+            height=height,
+            fps_target=canvas.state.fps_target,
+            cache_draw_lists=canvas.state.cache_draw_lists,
+        )
+
+    def close_canvas(self, canvas_id: str) -> None:
+        """Tell the host to drop a canvas."""
+        self.send(CommandType.SHUTDOWN, canvas_id=canvas_id)
+
+    def kill(self) -> None:
+        """Kill the host process without asking it to exit (a hung host)."""
+        process = self._process
+        if process is not None and process.is_alive():
+            process.kill()
+            process.join(_STOP_TIMEOUT)
+
+    def stop(self) -> None:
+        """Ask the host to exit, terminating it if it does not."""
+        process = self._process
+        if process is not None:
+            if process.is_alive():
+                self.send(CommandType.SHUTDOWN, canvas_id="")
+                process.join(_STOP_TIMEOUT)
+                if process.is_alive():
+                    logger.warning("Render host did not exit; terminating it")
+                    process.terminate()
+                    process.join(_STOP_TIMEOUT)
+            self._process = None
+        if self.control is not None:
+            self.control.cleanup()
+            self.control = None
+        with contextlib.suppress(OSError):
+            os.unlink(stack_file(self.control_prefix))
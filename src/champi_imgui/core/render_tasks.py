@@ -0,0 +1,78 @@
+"""Work queued for a canvas's render thread.
+
+ImGui state (fonts, window positions, the framebuffer) may only be touched
+from the thread running the frame. Other threads hand that work over as a
+callable: :meth:`RenderTaskQueue.submit` returns a
+``concurrent.futures.Future`` and the render thread resolves it on its next
+frame by calling :meth:`RenderTaskQueue.run_pending`.
+
+Any number of tasks may be pending; every task queued before a frame starts
+draining runs in that frame, in submission order. Tasks queued while the
+queue drains (including by a task) wait for the next frame.
+"""
+
+import threading
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import Future
+from typing import Any, TypeVar
+
+from loguru import logger
+
+T = TypeVar("T")
+
+
+class RenderTaskQueue:
+    """Thread-safe FIFO of callables run on the render thread."""
+
+    def __init__(self) -> None:
+        """Initialize an empty queue."""
+        self._tasks: deque[tuple[Future[Any], Callable[[], Any]]] = deque()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Number of tasks waiting to run (cancelled ones included)."""
+        return len(self._tasks)
+
+    def submit(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> Future[T]:
+        """Queue ``fn(*args, **kwargs)`` for the render thread (any thread).
+
+        Returns:
+            Future resolving to the call's return value, or raising what it
+            raised. Cancelling it before the frame drains skips the call.
+        """
+        future: Future[T] = Future()
+        with self._lock:
+            self._tasks.append((future, lambda: fn(*args, **kwargs)))
+        return future
+
+    def run_pending(self) -> int:
+        """Run every task queued so far (render thread only).
+
+        Returns:
+            Number of tasks that ran; cancelled tasks are dropped uncounted
+        """
+        with self._lock:
+            if not self._tasks:
+                return 0
+            batch = self._tasks
+            self._tasks = deque()
+
+        ran = 0
+        for future, call in batch:
+            if not future.set_running_or_notify_cancel():
+                continue
+            ran += 1
+            try:
+                future.set_result(call())
+            except Exception as e:
+                logger.error(f"Render-thread task failed: {e}")
+                future.set_exception(e)
+        return ran
+
+    def cancel_all(self) -> int:
+        """Cancel every task still waiting; returns how many were cancelled."""
+        with self._lock:
+            batch = self._tasks
+            self._tasks = deque()
+        return sum(future.cancel() for future, _ in batch)
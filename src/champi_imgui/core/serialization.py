@@ -81,14 +81,14 @@ class UIImporter:
             props = w.get("properties", {})
             try:
                 widget = factory.create(widget_type.lower(), widget_id, **props)
-                widget.state.visible = w.get("visible", True)
-                widget.state.enabled = w.get("enabled", True)
+                widget.set_visible(w.get("visible", True))
+                widget.set_enabled(w.get("enabled", True))
                 pos = w.get("position")
                 if pos:
-                    widget.state.position = tuple(pos)
+                    widget.set_position(*pos)
                 sz = w.get("size")
                 if sz:
-                    widget.state.size = tuple(sz)
+                    widget.set_size(*sz)
                 canvas.add_widget(widget)
             except Exception as e:
                 logger.error(f"Error deserializing widget {widget_id}: {e}")
@@ -34,6 +34,9 @@ class CanvasState:
     fps_target: int = 60
     """Target frames per second for rendering"""
 
+    cache_draw_lists: bool = True
+    """Replay the last frame's draw data instead of re-running unchanged widgets"""
+
     properties: dict[str, Any] = field(default_factory=dict)
     """Additional canvas properties (extensible)"""
 
@@ -53,6 +56,7 @@ class CanvasState:
             "position": list(self.position) if self.position else None,
             "visible": self.visible,
             "fps_target": self.fps_target,
+            "cache_draw_lists": self.cache_draw_lists,
             "properties": self.properties,
             "widgets": {wid: wstate.to_dict() for wid, wstate in self.widgets.items()},
         }
@@ -78,6 +82,7 @@ class CanvasState:
             position=position,
             visible=data.get("visible", True),
             fps_target=data.get("fps_target", 60),
+            cache_draw_lists=data.get("cache_draw_lists", True),
             properties=data.get("properties", {}),
         )
 
@@ -149,3 +154,4 @@ widget_updated = blinker.signal("widget-updated")
 widget_deleted = blinker.signal("widget-deleted")
 canvas_updated = blinker.signal("canvas-updated")
 state_changed = blinker.signal("state-changed")
+style_changed = blinker.signal("style-changed")
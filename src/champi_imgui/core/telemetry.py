@@ -0,0 +1,155 @@
+"""Frame-time telemetry for the shared render loop.
+
+:class:`FrameTelemetry` is a fixed-size ring with one record per loop frame:
+
+- ``start``: when the frame callback began (``time.perf_counter`` seconds)
+- ``frame_ms``: time since the previous frame began
+- ``commands_ms``: draining the canvases' command rings
+- ``render_ms``: the rest of the callback (widget code and draw-list replay)
+- ``idle_ms``: from the end of the previous callback to the start of this
+  one: ImGui rendering, buffer swap and any idle wait for events
+- ``idle_allowed``: whether the loop was allowed to idle before this frame
+
+A *stall* is a frame that either kept the render thread busy for longer than
+the threshold, or arrived late while the loop was meant to run at full rate.
+Busy stalls come from slow widgets; late frames usually mean the render thread
+was waiting for the GIL, e.g. while a tool handler ran.
+"""
+
+import threading
+from typing import Any
+
+import numpy as np
+
+# Frames kept in the ring: a little over a minute at 60 fps
+DEFAULT_CAPACITY = 4096
+
+FRAME_DTYPE = np.dtype(
+    [
+        ("start", "<f8"),
+        ("frame_ms", "<f4"),
+        ("commands_ms", "<f4"),
+        ("render_ms", "<f4"),
+        ("idle_ms", "<f4"),
+        ("idle_allowed", "?"),
+    ]
+)
+
+
+def _round(value: float) -> float:
+    return round(float(value), 3)
+
+
+class FrameTelemetry:
+    """Ring buffer of per-frame timings.
+
+    Written by the render thread, read from any thread.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY) -> None:
+        """Initialize an empty ring.
+
+        Args:
+            capacity: Number of frames kept
+        """
+        self._frames = np.zeros(capacity, dtype=FRAME_DTYPE)
+        self._count = 0
+        self._lock = threading.Lock()
+
+    @property
+    def capacity(self) -> int:
+        """Number of frames the ring holds."""
+        return len(self._frames)
+
+    def record(
+        self,
+        start: float,
+        frame_ms: float,
+        commands_ms: float,
+        render_ms: float,
+        idle_ms: float,
+        idle_allowed: bool,
+    ) -> None:
+        """Append one frame, overwriting the oldest when the ring is full."""
+        with self._lock:
+            self._frames[self._count % len(self._frames)] = (
+                start,
+                frame_ms,
+                commands_ms,
+                render_ms,
+                idle_ms,
+                idle_allowed,
+            )
+            self._count += 1
+
+    def recent(self, since: float) -> np.ndarray:
+        """Return a copy of the frames that started at or after *since*."""
+        with self._lock:
+            n = min(self._count, len(self._frames))
+            head = self._count % len(self._frames)
+            frames = (
+                self._frames[:n].copy()
+                if n < len(self._frames)
+                else np.concatenate((self._frames[head:], self._frames[:head]))
+            )
+        return frames[frames["start"] >= since]
+
+    def summary(
+        self, window_s: float, now: float, stall_ms: float = 50.0
+    ) -> dict[str, Any]:
+        """Summarize the frames of the last *window_s* seconds.
+
+        Args:
+            window_s: How far back to look, in seconds
+            now: Current ``time.perf_counter()`` value
+            stall_ms: Busy or late frames longer than this count as stalls
+
+        Returns:
+            JSON-serializable dict with fps, frame-time percentiles, jitter,
+            stall counts and the mean time spent in each phase
+        """
+        frames = self.recent(now - window_s)
+        result: dict[str, Any] = {
+            "window_s": window_s,
+            "frames": len(frames),
+            "stall_threshold_ms": stall_ms,
+        }
+        if len(frames) == 0:
+            return result
+
+        span = max(now - float(frames["start"][0]), 1e-9)
+        frame_ms = frames["frame_ms"].astype(np.float64)
+        busy_ms = (frames["commands_ms"] + frames["render_ms"]).astype(np.float64)
+        # Idle waits are deliberate; jitter and late frames only count while
+        # the loop was meant to run at full rate
+        active = ~frames["idle_allowed"]
+        active_ms = frame_ms[active]
+        busy = busy_ms > stall_ms
+        late = (frame_ms > stall_ms) & active & ~busy
+        busy_stalls = int(np.count_nonzero(busy))
+        late_stalls = int(np.count_nonzero(late))
+
+        result.update(
+            {
+                "fps": _round(len(frames) / min(span, window_s)),
+                "frame_ms": {
+                    "mean": _round(frame_ms.mean()),
+                    "p50": _round(np.percentile(frame_ms, 50)),
+                    "p95": _round(np.percentile(frame_ms, 95)),
+                    "p99": _round(np.percentile(frame_ms, 99)),
+                    "max": _round(frame_ms.max()),
+                },
+                "jitter_ms": _round(active_ms.std()) if len(active_ms) > 1 else 0.0,
+                "active_frames": int(np.count_nonzero(active)),
+                "stalls": busy_stalls + late_stalls,
+                "busy_stalls": busy_stalls,
+                "late_stalls": late_stalls,
+                "mean_ms": {
+                    "commands": _round(frames["commands_ms"].mean()),
+                    "render": _round(frames["render_ms"].mean()),
+                    "idle": _round(frames["idle_ms"].mean()),
+                },
+                "max_busy_ms": _round(busy_ms.max()),
+            }
+        )
+        return result
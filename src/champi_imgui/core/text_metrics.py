@@ -0,0 +1,109 @@
+"""Glyph metrics cached off the render thread for text measurement.
+
+``imgui.calc_text_size`` must run on the render thread, so every measurement
+used to cost a wait for the next frame. ImGui's measurement is simple enough
+to reproduce, though: per line, the sum of the glyph advances of the baked
+font; the line height is the font size. :class:`TextMetricsCache` keeps the
+advances the render thread has already looked up, per font size, and
+measures any text whose characters are all known without leaving the
+calling thread.
+
+The render thread fills the cache whenever it measures text (see
+``Canvas._measure_texts``), starting with printable ASCII, so the first
+measurement at a size goes to the render thread and most later ones do not.
+"""
+
+import math
+import threading
+
+# Characters whose advances are looked up with any measurement at a new size
+PRELOAD_CHARS = "".join(chr(c) for c in range(32, 127))
+
+
+class _FontMetrics:
+    """Line height and glyph advances of the font used at one size."""
+
+    def __init__(self, line_height: float) -> None:
+        self.line_height = line_height
+        self.advances: dict[str, float] = {}
+
+
+def text_size(
+    text: str, line_height: float, advances: dict[str, float]
+) -> tuple[int, int]:
+    """Measure *text* the way ``imgui.calc_text_size`` does.
+
+    Every character of *text* except newlines must be in *advances*.
+
+    Returns:
+        ``(width, height)`` truncated to ints, as the measure_text tool reports
+    """
+    width = 0.0
+    height = 0.0
+    line_width = 0.0
+    for char in text:
+        if char == "\n":
+            width = max(width, line_width)
+            height += line_height
+            line_width = 0.0
+        elif char != "\r":
+            line_width += advances[char]
+    width = max(width, line_width)
+    # The last line counts unless it is empty after a newline
+    if line_width > 0 or height == 0:
+        height += line_height
+    # calc_text_size rounds the width up to whole pixels
+    return math.trunc(width + 0.99999), int(height)
+
+
+class TextMetricsCache:
+    """Per-font-size glyph advances, readable from any thread."""
+
+    def __init__(self) -> None:
+        """Initialize an empty cache."""
+        self._fonts: dict[int, _FontMetrics] = {}
+        self._lock = threading.Lock()
+
+    def measure(self, text: str, font_size: int) -> dict[str, int] | None:
+        """Return ``{"width", "height"}`` for *text*, or None if not cached.
+
+        None means the font size or one of the characters has not been seen
+        yet; measure on the render thread instead.
+        """
+        with self._lock:
+            metrics = self._fonts.get(font_size)
+            if metrics is None:
+                return None
+            advances = metrics.advances
+            if not all(c in advances or c in "\r\n" for c in text):
+                return None
+            width, height = text_size(text, metrics.line_height, advances)
+        return {"width": width, "height": height}
+
+    def missing(self, texts: list[str], font_size: int) -> str:
+        """Return the characters of *texts* with no cached advance at *font_size*."""
+        chars = set("".join(texts)) - {"\r", "\n"}
+        with self._lock:
+            metrics = self._fonts.get(font_size)
+            if metrics is not None:
+                chars.difference_update(metrics.advances)
+        return "".join(sorted(chars))
+
+    def learn(
+        self, font_size: int, line_height: float, advances: dict[str, float]
+    ) -> None:
+        """Store advances looked up on the render thread."""
+        with self._lock:
+            metrics = self._fonts.get(font_size)
+            if metrics is None or metrics.line_height != line_height:
+                metrics = self._fonts[font_size] = _FontMetrics(line_height)
+            metrics.advances.update(advances)
+
+    def clear(self) -> None:
+        """Forget everything, e.g. after fonts or style scaling changed."""
+        with self._lock:
+            self._fonts.clear()
+
+    def __len__(self) -> int:
+        """Number of font sizes cached."""
+        return len(self._fonts)
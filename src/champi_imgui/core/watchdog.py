@@ -0,0 +1,325 @@
+"""Detection of, and recovery from, stalled render frames.
+
+A widget that deadlocks or loops forever inside its ``render()`` freezes
+every canvas sharing the loop, and nothing crashes, so nothing restarts it.
+:class:`RenderWatchdog` watches the frame heartbeat the loop keeps (the
+time the frame callback started, cleared when it returns) from its own
+thread. When a frame has been running longer than ``stall_timeout`` it:
+
+1. dumps the Python stacks of the stalled loop to the log and keeps them
+   in :attr:`RenderWatchdog.reports` (in-process, the stack of the render
+   thread plus the canvas and root widget it was rendering; for a render
+   host, every thread's stack from ``faulthandler``);
+2. restarts the loop where that is safe. A render host process is killed
+   and started again. The in-process headless loop cannot be killed, so
+   :class:`RenderStalled` is raised inside it, which unwinds the frame and
+   ends the loop, and a fresh loop is started. Code stuck in C without
+   returning to Python cannot be interrupted this way. The windowed
+   in-process loop is never restarted: a second ``hello_imgui.run()``
+   fails once a platform backend is initialized, and unwinding mid-frame
+   leaves ImGui's begin/end stack unbalanced.
+3. The new loop rebuilds every window. In-process the canvases keep their
+   CanvasState and widgets; a restarted host gets them replayed.
+
+Restarts are limited to ``max_restarts`` per ``restart_window`` seconds per
+loop, so a widget that hangs every frame does not cause endless restarts.
+Past the limit, when the loop does not unwind, or when it cannot be
+restarted, the affected canvases get a render error instead and report
+unhealthy until the stalled frame finishes after all.
+"""
+
+import ctypes
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from typing import TYPE_CHECKING, Any
+
+from loguru import logger
+
+if TYPE_CHECKING:
+    from champi_imgui.core.canvas import CanvasManager
+    from champi_imgui.core.render_host import RenderHostProcess
+
+# Seconds a frame may run before it counts as stalled
+DEFAULT_STALL_TIMEOUT = 5.0
+
+# Restarts allowed per loop within _RESTART_WINDOW before giving up
+DEFAULT_MAX_RESTARTS = 3
+_RESTART_WINDOW = 60.0
+
+# Longest time between two heartbeat checks
+_MAX_CHECK_INTERVAL = 0.5
+
+# Stall reports kept for get_render_health
+_MAX_REPORTS = 16
+
+
+class RenderStalled(BaseException):
+    """Raised inside a stalled render thread to unwind its frame.
+
+    A BaseException, so the per-widget ``except Exception`` handlers in the
+    frame let it through.
+    """
+
+
+def _raise_in_thread(thread: threading.Thread, exc_type: type[BaseException]) -> bool:
+    """Raise *exc_type* in *thread* when it next runs Python code."""
+    if thread.ident is None:
+        return False
+    count = ctypes.pythonapi.PyThreadState_SetAsyncExc(
+        ctypes.c_ulong(thread.ident), ctypes.py_object(exc_type)
+    )
+    return bool(count == 1)
+
+
+def thread_stack(thread: threading.Thread) -> tuple[str, str | None, str | None]:
+    """Return the stack of *thread* and the canvas and widget it is rendering.
+
+    Returns:
+        ``(stack, canvas_id, widget_id)``; the ids are None outside
+        ``Canvas._render_widgets``
+    """
+    frame = sys._current_frames().get(thread.ident or 0)
+    if frame is None:
+        return "", None, None
+    stack = "".join(traceback.format_stack(frame))
+    canvas_id = widget_id = None
+    while frame is not None:
+        if frame.f_code.co_name == "_render_widgets":
+            local = frame.f_locals
+            canvas_id = getattr(
+                getattr(local.get("self"), "state", None), "canvas_id", None
+            )
+            widget_id = getattr(local.get("widget"), "widget_id", None)
+            break
+        frame = frame.f_back
+    return stack, canvas_id, widget_id
+
+
+class RenderWatchdog:
+    """Watches a CanvasManager's render loop(s) for stalled frames.
+
+    :meth:`check` runs on the watchdog thread started by :meth:`start`; it
+    may also be called directly (tests).
+    """
+
+    def __init__(
+        self,
+        manager: "CanvasManager",
+        stall_timeout: float = DEFAULT_STALL_TIMEOUT,
+        max_restarts: int = DEFAULT_MAX_RESTARTS,
+        restart_window: float = _RESTART_WINDOW,
+    ) -> None:
+        """Initialize the watchdog; nothing is watched until start().
+
+        Args:
+            manager: Manager whose loop, or render hosts, to watch
+            stall_timeout: Seconds a frame may run before it counts as stalled
+            max_restarts: Restarts allowed per loop within *restart_window*
+            restart_window: Seconds over which restarts are counted
+
+        Raises:
+            ValueError: On a non-positive timeout or a negative restart limit
+        """
+        if stall_timeout <= 0:
+            raise ValueError(f"stall_timeout must be positive, got {stall_timeout}")
+        if max_restarts < 0:
+            raise ValueError(f"max_restarts must be >= 0, got {max_restarts}")
+        self.manager = manager
+        self.stall_timeout = stall_timeout
+        self.max_restarts = max_restarts
+        self.restart_window = restart_window
+        self.restarts = 0
+        self.reports: deque[dict[str, Any]] = deque(maxlen=_MAX_REPORTS)
+        # Loop key (None = in-process, else shard) -> recent restart times
+        self._restart_times: dict[int | None, deque[float]] = {}
+        # Loop key -> start time of the stalled frame already handled
+        self._handled: dict[int | None, float] = {}
+        # Loop key -> (stalled frame start, error, canvases) for stalls that
+        # were not recovered; cleared once that loop's heartbeat moves on
+        self._failed: dict[int | None, tuple[float, Exception, list[Any]]] = {}
+        self._thread: threading.Thread | None = None
+        self._stopping = threading.Event()
+
+    def start(self) -> None:
+        """Start the watchdog thread (no-op if it is running)."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="render-watchdog", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the watchdog thread."""
+        self._stopping.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=self.stall_timeout)
+        self._thread = None
+
+    def _run(self) -> None:
+        interval = min(self.stall_timeout / 2, _MAX_CHECK_INTERVAL)
+        while not self._stopping.wait(interval):
+            try:
+                self.check()
+            except Exception as e:
+                logger.error(f"Render watchdog check failed: {e}")
+
+    def last_report(self) -> dict[str, Any] | None:
+        """Return the most recent stall report, or None."""
+        return self.reports[-1] if self.reports else None
+
+    def check(self, now: float | None = None) -> list[dict[str, Any]]:
+        """Look for stalled frames and recover from each one found.
+
+        Args:
+            now: Current ``time.monotonic()``; read when None
+
+        Returns:
+            Reports of the stalls handled by this call
+        """
+        now = time.monotonic() if now is None else now
+        manager = self.manager
+        reports = []
+        if manager._hosts:
+            for shard, host in enumerate(manager._hosts):
+                started = host.frame_started()
+                self._clear_if_resumed(shard, started)
+                if self._stalled(shard, started, now):
+                    reports.append(self._recover_host(shard, host, now - started))
+        else:
+            started_at = manager._frame_started
+            thread = manager._render_thread
+            self._clear_if_resumed(None, started_at)
+            if (
+                started_at is not None
+                and thread is not None
+                and thread.is_alive()
+                and self._stalled(None, started_at, now)
+            ):
+                reports.append(self._recover_loop(thread, now - started_at))
+        return reports
+
+    def _stalled(self, key: int | None, started: float, now: float) -> bool:
+        """True for a frame stalled past the timeout and not handled yet."""
+        if not started or now - started <= self.stall_timeout:
+            return False
+        if self._handled.get(key) == started:
+            return False
+        self._handled[key] = started
+        return True
+
+    def _clear_if_resumed(self, key: int | None, started: float | None) -> None:
+        """Clear the render errors of a failed stall once its frame has ended."""
+        entry = self._failed.get(key)
+        if entry is None or started == entry[0]:
+            return
+        del self._failed[key]
+        _, error, canvases = entry
+        where = "Render loop" if key is None else f"Render host {key}"
+        logger.info(f"{where} resumed after a stalled frame")
+        for canvas in canvases:
+            if canvas._render_error is error:
+                canvas._render_error = None
+
+    def _may_restart(self, key: int | None, now: float) -> bool:
+        """Book a restart of loop *key* unless its budget is used up."""
+        times = self._restart_times.setdefault(key, deque())
+        while times and now - times[0] > self.restart_window:
+            times.popleft()
+        if len(times) >= self.max_restarts:
+            return False
+        times.append(now)
+        return True
+
+    def _report(
+        self, shard: int | None, stalled_s: float, stack: str, **fields: Any
+    ) -> dict[str, Any]:
+        where = "render loop" if shard is None else f"render host {shard}"
+        logger.error(f"Frame stalled for {stalled_s:.1f}s in {where}; stacks:\n{stack}")
+        report = {
+            "time": time.time(),
+            "shard": shard,
+            "stalled_s": round(stalled_s, 3),
+            "stack": stack,
+            "restarted": False,
+            **fields,
+        }
+        # Recorded up front; "restarted" is filled in once recovery ends
+        self.reports.append(report)
+        return report
+
+    def _recover_loop(
+        self, thread: threading.Thread, stalled_s: float
+    ) -> dict[str, Any]:
+        """Unwind the stalled in-process loop and start a fresh one.
+
+        Only the headless loop is restarted; a stalled windowed loop is
+        reported and its canvases failed.
+        """
+        stack, canvas_id, widget_id = thread_stack(thread)
+        report = self._report(
+            None, stalled_s, stack, canvas_id=canvas_id, widget_id=widget_id
+        )
+        canvases = list(self.manager.canvases.values())
+        if self.manager._headless is None:
+            logger.warning(
+                "Not restarting the windowed render loop; hello_imgui cannot "
+                "be started twice in one process"
+            )
+        elif self._may_restart(None, time.monotonic()):
+            running = [c for c in canvases if c._running]
+            _raise_in_thread(thread, RenderStalled)
+            thread.join(timeout=self.stall_timeout)
+            if not thread.is_alive():
+                # The old loop deactivated its canvases on the way out
+                for canvas in running:
+                    canvas._running = True
+                report["restarted"] = True
+                self.restarts += 1
+                logger.warning("Restarting the render loop after a stalled frame")
+                self.manager._start_render_loop()
+        if not report["restarted"]:
+            self._fail(None, canvases, stalled_s)
+        return report
+
+    def _recover_host(
+        self, shard: int, host: "RenderHostProcess", stalled_s: float
+    ) -> dict[str, Any]:
+        """Kill a stalled render host and start it again with its canvases."""
+        manager = self.manager
+        canvas_ids = [cid for cid, s in manager._shards.items() if s == shard]
+        report = self._report(
+            shard, stalled_s, host.dump_stacks(), canvas_ids=canvas_ids
+        )
+        if self._may_restart(shard, time.monotonic()):
+            host.kill()
+            manager._start_render_hosts()
+            report["restarted"] = host.is_alive()
+            if report["restarted"]:
+                self.restarts += 1
+                logger.warning(f"Render host {shard} restarted after a stalled frame")
+        if not report["restarted"]:
+            self._fail(
+                shard,
+                [c for cid, c in manager.canvases.items() if cid in canvas_ids],
+                stalled_s,
+            )
+        return report
+
+    def _fail(self, key: int | None, canvases: list[Any], stalled_s: float) -> None:
+        """Record an unrecovered stall as the render error of *canvases*.
+
+        The error stands until loop *key* finishes the stalled frame.
+        """
+        error = TimeoutError(
+            f"Render frame stalled for {stalled_s:.1f}s and the loop was not restarted"
+        )
+        logger.error(str(error))
+        for canvas in canvases:
+            canvas._render_error = error
+        self._failed[key] = (self._handled[key], error, canvases)
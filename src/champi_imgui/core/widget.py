@@ -4,6 +4,7 @@ Defines the core Widget ABC, WidgetFactory for widget creation,
 and WidgetRegistry for widget lifecycle management.
 """
 
+import threading
 from abc import ABC, abstractmethod
 from collections.abc import Callable
 from typing import Any
@@ -11,6 +12,7 @@ from typing import Any
 from loguru import logger
 
 from champi_imgui.core.state import WidgetState, widget_created, widget_updated
+from champi_imgui.ipc.array_arena import array_handles, detach_array
 
 _event_queue = None
 
@@ -32,6 +34,9 @@ class Widget(ABC):
     the abstract render() method.
     """
 
+    remote_methods: frozenset[str] = frozenset()
+    """Methods that an UPDATE_WIDGET ``call`` op may invoke on the render thread"""
+
     def __init__(self, widget_id: str, **props):
         """Initialize widget with ID and properties.
 
@@ -44,7 +49,24 @@ class Widget(ABC):
             widget_id=widget_id, widget_type=self.__class__.__name__, properties=props
         )
         self._callbacks: dict[str, Callable] = {}
-        self._parent_id: str | None = None
+        self._parent: str | None = None
+        # Set by the WidgetRegistry this widget is added to
+        self._on_dirty: Callable[[], None] | None = None
+        self._on_reparent: Callable[[], None] | None = None
+        # Shared arrays referenced by the properties (see ipc.array_arena)
+        self._array_handles = array_handles(props)
+
+    @property
+    def _parent_id(self) -> str | None:
+        """ID of the container widget that renders this one, if any."""
+        return self._parent
+
+    @_parent_id.setter
+    def _parent_id(self, parent_id: str | None) -> None:
+        self._parent = parent_id
+        # The registry's list of root widgets depends on this
+        if self._on_reparent is not None:
+            self._on_reparent()
 
     @abstractmethod
     def render(self) -> Any:
@@ -66,9 +88,116 @@ class Widget(ABC):
             **props: Properties to update
         """
         self.state.properties.update(props)
+        self._track_arrays()
+        self.mark_dirty()
         widget_updated.send(self, widget=self)
         logger.debug(f"Updated widget {self.widget_id} with {props}")
 
+    def apply_ops(self, ops: list[list[Any]]) -> None:
+        """Apply list-level property edits carried by an UPDATE_WIDGET command.
+
+        Ops are applied in order; each is a list starting with its name:
+
+        - ``["extend", key, items]``: append items to the list property *key*
+        - ``["set_item", key, index, fields]``: merge fields into the dict at
+          ``properties[key][index]``
+        - ``["call", method, args, kwargs]``: invoke one of
+          :attr:`remote_methods`
+
+        Ops are validated against the state they apply to, so on the render
+        thread they see every earlier queued op.  An op that fails stops the
+        batch; the ops before it stay applied.
+
+        Args:
+            ops: Ops to apply
+
+        Raises:
+            ValueError: If an op is unknown, calls a non-remote method, or
+                sets fields the item does not accept
+            IndexError: If a ``set_item`` index is out of range
+        """
+        props = self.state.properties
+        try:
+            for op in ops:
+                self._apply_op(props, op)
+        finally:
+            self._track_arrays()
+            self.mark_dirty()
+            widget_updated.send(self, widget=self)
+        logger.debug(f"Applied {len(ops)} op(s) to widget {self.widget_id}")
+
+    def _apply_op(self, props: dict[str, Any], op: list[Any]) -> None:
+        kind = op[0]
+        if kind == "extend":
+            _, key, items = op
+            props.setdefault(key, []).extend(items)
+        elif kind == "set_item":
+            _, key, index, fields = op
+            items = props.get(key, [])
+            if not 0 <= index < len(items):
+                msg = f"index {index} out of range ({len(items)} {key})"
+                raise IndexError(msg)
+            self.check_item_update(key, items[index], fields)
+            items[index].update(fields)
+        elif kind == "call":
+            _, method, args, kwargs = op
+            if method not in self.remote_methods:
+                msg = f"{self.__class__.__name__}.{method} is not a remote method"
+                raise ValueError(msg)
+            getattr(self, method)(*args, **kwargs)
+        else:
+            msg = f"Unknown widget op: {kind}"
+            raise ValueError(msg)
+
+    def check_item_update(
+        self, key: str, item: dict[str, Any], fields: dict[str, Any]
+    ) -> None:
+        """Validate a ``set_item`` op before it merges *fields* into *item*.
+
+        Args:
+            key: List property holding the item
+            item: Current item
+            fields: Fields about to be merged in
+
+        Raises:
+            ValueError: If the item does not accept *fields*
+        """
+        return  # Every item accepts any fields unless a subclass says otherwise
+
+    def _track_arrays(self) -> None:
+        """Detach shared arrays the properties no longer reference."""
+        handles = array_handles(self.state.properties)
+        for handle in self._array_handles - handles:
+            detach_array(handle)
+        self._array_handles = handles
+
+    def detach_arrays(self) -> None:
+        """Drop this process's mappings of the shared arrays the widget uses.
+
+        Called when the widget leaves its registry.
+        """
+        for handle in self._array_handles:
+            detach_array(handle)
+        self._array_handles = set()
+
+    def mark_dirty(self) -> None:
+        """Ask the owning canvas to render a fresh frame.
+
+        Call after changing ``state`` directly; update(), apply_ops() and
+        the setters already do.
+        """
+        if self._on_dirty is not None:
+            self._on_dirty()
+
+    def is_animating(self) -> bool:
+        """Return True while the widget changes without being updated.
+
+        The render loop idles while no canvas is dirty; widgets that move on
+        their own (spinners, live shared-memory data) override this to keep
+        it running.
+        """
+        return False
+
     def set_visible(self, visible: bool) -> None:
         """Set widget visibility.
 
@@ -76,6 +205,7 @@ class Widget(ABC):
             visible: Whether the widget should be visible
         """
         self.state.visible = visible
+        self.mark_dirty()
 
     def set_enabled(self, enabled: bool) -> None:
         """Set widget enabled state.
@@ -84,6 +214,7 @@ class Widget(ABC):
             enabled: Whether the widget should be enabled for interaction
         """
         self.state.enabled = enabled
+        self.mark_dirty()
 
     def set_position(self, x: float, y: float) -> None:
         """Set widget position.
@@ -93,6 +224,7 @@ class Widget(ABC):
             y: Y coordinate in pixels
         """
         self.state.position = (x, y)
+        self.mark_dirty()
 
     def set_size(self, width: float, height: float) -> None:
         """Set widget size.
@@ -102,6 +234,7 @@ class Widget(ABC):
             height: Height in pixels
         """
         self.state.size = (width, height)
+        self.mark_dirty()
 
     def register_callback(self, event: str, callback: Callable) -> None:
         """Register a callback function for an event.
@@ -198,13 +331,23 @@ class WidgetRegistry:
 
     Maintains a collection of widget instances and provides
     access to the widget factory.
+
+    The render loop reads :meth:`widgets` and :meth:`roots`: immutable
+    snapshots rebuilt only after a widget is added, removed or reparented,
+    so iterating them every frame neither copies nor filters anything.
     """
 
     def __init__(self):
         """Initialize registry with drawing widgets pre-registered."""
         self._widgets: dict[str, Widget] = {}
+        # Copy-on-write snapshots, None when stale; guarded by _lock
+        self._lock = threading.Lock()
+        self._all: tuple[Widget, ...] | None = None
+        self._roots: tuple[Widget, ...] | None = None
         self._factory = WidgetFactory()
         self._register_defaults()
+        self.on_dirty: Callable[[], None] | None = None
+        """Called when a registered widget changes (set by the owning Canvas)"""
 
     def _register_defaults(self) -> None:
         """Register built-in widget types with the factory."""
@@ -236,7 +379,11 @@ class WidgetRegistry:
         Args:
             widget: Widget instance to add
         """
-        self._widgets[widget.widget_id] = widget
+        with self._lock:
+            self._widgets[widget.widget_id] = widget
+            self._all = self._roots = None
+        widget._on_dirty = self.on_dirty
+        widget._on_reparent = self._invalidate
         logger.debug(f"Added widget {widget.widget_id} to registry")
 
     def get(self, widget_id: str) -> Widget | None:
@@ -259,8 +406,13 @@ class WidgetRegistry:
         Returns:
             True if widget was removed, False if not found
         """
-        if widget_id in self._widgets:
-            del self._widgets[widget_id]
+        with self._lock:
+            widget = self._widgets.pop(widget_id, None)
+            self._all = self._roots = None
+        if widget is not None:
+            widget._on_dirty = None
+            widget._on_reparent = None
+            widget.detach_arrays()
             logger.debug(f"Removed widget {widget_id} from registry")
             return True
         return False
@@ -281,7 +433,44 @@ class WidgetRegistry:
         """
         return self._widgets.copy()
 
+    def widgets(self) -> tuple[Widget, ...]:
+        """Return every widget in insertion order (shared snapshot; do not mutate)."""
+        snapshot = self._all
+        if snapshot is None:
+            with self._lock:
+                if self._all is None:
+                    self._all = tuple(self._widgets.values())
+                snapshot = self._all
+        return snapshot
+
+    def roots(self) -> tuple[Widget, ...]:
+        """Return widgets not owned by a container, in insertion order.
+
+        These are the widgets the canvas renders itself; containers render
+        their children.  Shared snapshot; do not mutate.
+        """
+        snapshot = self._roots
+        if snapshot is None:
+            with self._lock:
+                if self._roots is None:
+                    self._roots = tuple(
+                        w for w in self._widgets.values() if w._parent_id is None
+                    )
+                snapshot = self._roots
+        return snapshot
+
+    def _invalidate(self) -> None:
+        with self._lock:
+            self._all = self._roots = None
+
     def clear(self) -> None:
         """Clear all widgets from the registry."""
-        self._widgets.clear()
+        with self._lock:
+            widgets = list(self._widgets.values())
+            self._widgets.clear()
+            self._all = self._roots = None
+        for widget in widgets:
+            widget._on_dirty = None
+            widget._on_reparent = None
+            widget.detach_arrays()
         logger.debug("Cleared widget registry")
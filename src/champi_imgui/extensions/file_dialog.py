@@ -155,6 +155,7 @@ class FileDialogWidget(Widget):
 
     def set_filters(self, filters: list[str]) -> None:
         self.state.properties["filters"] = filters
+        self.mark_dirty()
 
     def _open_dialog(self) -> None:
         mode = self.state.properties.get("mode", FileDialogMode.OPEN_FILE)
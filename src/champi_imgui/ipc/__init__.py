@@ -1,13 +1,17 @@
 """IPC (Inter-Process Communication) module for Canvas and MCP server."""
 
+from champi_imgui.ipc.array_arena import ArrayArena, ArrayRef, array_ref
 from champi_imgui.ipc.command_types import CommandType
 from champi_imgui.ipc.shared_memory_manager import SharedMemoryManager
 from champi_imgui.ipc.structs import CommandData, pack_command, unpack_command
 
 __all__ = [
+    "ArrayArena",
+    "ArrayRef",
     "CommandData",
     "CommandType",
     "SharedMemoryManager",
+    "array_ref",
     "pack_command",
     "unpack_command",
 ]
@@ -0,0 +1,355 @@
+"""Shared-memory arena for bulk numeric arrays.
+
+Plot series, heatmaps and stroke points can be far too large to travel as JSON
+lists or inside command frames.  A producer (for example a separate data
+process) writes them once into named shared memory through an
+:class:`ArrayArena` and hands out the returned handle; widgets store an
+*array reference* in place of the list::
+
+    {"$shm_array": "canvas_arr_1f0c..."}
+
+and the render side resolves it with :func:`resolve_array` into a NumPy view
+of the same memory, so the data is never copied or converted per frame.  The
+producer may keep writing into its view (e.g. a rolling window) and the next
+frame sees the new values; calling :meth:`ArrayArena.publish` afterwards bumps
+the array's generation, which is how an idle canvas learns it must redraw.
+
+Each array lives in its own segment::
+
+    [ header (64 B): magic | dtype code | ndim | flags | shape[4] | generation
+      | data ... ]
+
+so arrays can be released independently.  Releasing an array flags it in the
+header before unlinking it; readers that still map it then stop resolving it
+and resolve an empty array instead, as they do for a handle that no longer
+exists.  Widgets detach the mappings of arrays they stop referencing (see
+:meth:`Widget.detach_arrays`).  Only float64 and float32 are supported, which
+is what ImPlot consumes.
+"""
+
+import contextlib
+import struct
+import threading
+import uuid
+import weakref
+from collections.abc import Iterator, Sequence
+from multiprocessing import shared_memory
+from typing import Any
+
+import numpy as np
+from loguru import logger
+
+from champi_imgui.ipc.shared_memory_manager import _untrack_shm
+
+# Key marking a property value as a reference to a shared array
+ARRAY_REF_KEY = "$shm_array"
+
+# Segment names share the canvas_ prefix so `ipc status` / `ipc cleanup` see them
+ARRAY_NAME_PREFIX = "canvas_arr_"
+
+ARRAY_HEADER_STRUCT = struct.Struct("<4sBBBx4Q")  # magic, dtype, ndim, flags, shape
+ARRAY_HEADER_SIZE = 64
+MAX_NDIM = 4
+_MAGIC = b"CARR"
+
+# Header flags
+_FLAGS_OFFSET = 6
+_RELEASED = 0x01  # The producer released the array; readers must let go
+
+# Publish counter, bumped by the producer after it changes the data
+_GENERATION_STRUCT = struct.Struct("<Q")
+_GENERATION_OFFSET = ARRAY_HEADER_STRUCT.size
+
+# A property value referencing a shared array: {ARRAY_REF_KEY: handle}
+type ArrayRef = dict[str, str]
+
+_DTYPE_CODES: dict[np.dtype[Any], int] = {
+    np.dtype(np.float64): 1,
+    np.dtype(np.float32): 2,
+}
+_CODE_DTYPES = {code: dtype for dtype, code in _DTYPE_CODES.items()}
+
+
+def array_ref(handle: str) -> ArrayRef:
+    """Return the property value referencing the shared array *handle*."""
+    return {ARRAY_REF_KEY: handle}
+
+
+def is_array_ref(value: Any) -> bool:
+    """Return True if *value* is a shared array reference."""
+    return isinstance(value, dict) and isinstance(value.get(ARRAY_REF_KEY), str)
+
+
+def array_handles(value: Any) -> set[str]:
+    """Return the handles of the shared arrays referenced in *value*.
+
+    Looks into dicts and lists of dicts (e.g. a drawing's strokes), not
+    into lists of numbers.
+    """
+    return set(_iter_handles(value))
+
+
+def _iter_handles(value: Any) -> Iterator[str]:
+    if isinstance(value, dict):
+        if is_array_ref(value):
+            yield value[ARRAY_REF_KEY]
+            return
+        for item in value.values():
+            yield from _iter_handles(item)
+    elif isinstance(value, list | tuple) and value and isinstance(value[0], dict):
+        for item in value:
+            yield from _iter_handles(item)
+
+
+def _buf(shm: shared_memory.SharedMemory) -> memoryview:
+    """Return the mapped buffer of an open segment."""
+    assert shm.buf is not None
+    return shm.buf
+
+
+def _close_when_unused(shm: shared_memory.SharedMemory, view: np.ndarray) -> None:
+    """Close a segment once *view*, and every array derived from it, is gone.
+
+    NumPy views do not pin the mapping, so closing it while one is alive
+    would leave the view pointing at unmapped memory.
+    """
+    weakref.finalize(view, shm.close)
+
+
+def _view(shm: shared_memory.SharedMemory) -> np.ndarray:
+    """Build the NumPy view described by a segment's header."""
+    magic, code, ndim, _, *shape = ARRAY_HEADER_STRUCT.unpack_from(_buf(shm), 0)
+    if magic != _MAGIC or code not in _CODE_DTYPES or not 0 < ndim <= MAX_NDIM:
+        msg = f"Shared memory segment {shm.name} is not a shared array"
+        raise ValueError(msg)
+    return np.ndarray(
+        tuple(shape[:ndim]),
+        dtype=_CODE_DTYPES[code],
+        buffer=shm.buf,
+        offset=ARRAY_HEADER_SIZE,
+    )
+
+
+class ArrayArena:
+    """Producer-side owner of shared arrays.
+
+    Arrays stay alive until released (or the arena is cleaned up); readers
+    that already resolved a handle keep their mapping until they detach.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty arena."""
+        self._segments: dict[str, shared_memory.SharedMemory] = {}
+        # The one writable view per array that allocate() and view() hand out
+        self._views: dict[str, np.ndarray] = {}
+
+    def allocate(
+        self, shape: int | Sequence[int], dtype: Any = np.float64
+    ) -> tuple[str, np.ndarray]:
+        """Create a shared array and return its handle and a writable view.
+
+        Args:
+            shape: Array shape (up to 4 dimensions)
+            dtype: float64 or float32
+
+        Returns:
+            (handle, view) — fill the view in place, then call publish()
+
+        Raises:
+            ValueError: If the dtype or number of dimensions is unsupported
+        """
+        dims = (shape,) if isinstance(shape, int) else tuple(int(n) for n in shape)
+        np_dtype = np.dtype(dtype)
+        if np_dtype not in _DTYPE_CODES:
+            msg = f"Unsupported shared array dtype: {np_dtype} (use float64 or float32)"
+            raise ValueError(msg)
+        if not 0 < len(dims) <= MAX_NDIM:
+            msg = f"Shared arrays support 1 to {MAX_NDIM} dimensions, got {len(dims)}"
+            raise ValueError(msg)
+
+        handle = f"{ARRAY_NAME_PREFIX}{uuid.uuid4().hex[:16]}"
+        nbytes = int(np.prod(dims)) * np_dtype.itemsize
+        shm = shared_memory.SharedMemory(
+            name=handle, create=True, size=ARRAY_HEADER_SIZE + max(nbytes, 1)
+        )
+        _untrack_shm(shm)
+        ARRAY_HEADER_STRUCT.pack_into(
+            _buf(shm),
+            0,
+            _MAGIC,
+            _DTYPE_CODES[np_dtype],
+            len(dims),
+            0,
+            *(dims + (0,) * (MAX_NDIM - len(dims))),
+        )
+        self._segments[handle] = shm
+        self._views[handle] = _view(shm)
+        logger.debug(f"Allocated shared array {handle} {dims} {np_dtype}")
+        return handle, self._views[handle]
+
+    def put(self, data: Any, dtype: Any = None) -> str:
+        """Copy *data* into a new shared array and return its handle.
+
+        Args:
+            data: Array-like numeric data
+            dtype: float64 or float32 (default: float32 input stays float32,
+                   anything else becomes float64)
+
+        Returns:
+            Handle to store in a widget property via array_ref()
+        """
+        array = np.asarray(data)
+        if dtype is None:
+            dtype = np.float32 if array.dtype == np.float32 else np.float64
+        handle, view = self.allocate(array.shape, dtype)
+        view[...] = array
+        self.publish(handle)
+        return handle
+
+    def view(self, handle: str) -> np.ndarray:
+        """Return a writable view of an array owned by this arena."""
+        return self._views[handle]
+
+    def publish(self, handle: str) -> int:
+        """Announce that the array's data changed; returns the new generation.
+
+        Plots backed by the array redraw while its generation keeps
+        changing and let their canvas idle once it stops.
+        """
+        buf = _buf(self._segments[handle])
+        (generation,) = _GENERATION_STRUCT.unpack_from(buf, _GENERATION_OFFSET)
+        generation += 1
+        _GENERATION_STRUCT.pack_into(buf, _GENERATION_OFFSET, generation)
+        return int(generation)
+
+    def handles(self) -> list[str]:
+        """Return the handles of all live arrays."""
+        return list(self._segments)
+
+    def release(self, handle: str) -> None:
+        """Unlink an array and tell its readers to stop resolving it.
+
+        Views readers already hold stay valid until they detach.
+        """
+        shm = self._segments.pop(handle, None)
+        if shm is None:
+            return
+        view = self._views.pop(handle)
+        _buf(shm)[_FLAGS_OFFSET] |= _RELEASED
+        with contextlib.suppress(FileNotFoundError):
+            shm.unlink()
+        # The view handed out by allocate()/view() may still be in use
+        _close_when_unused(shm, view)
+        logger.debug(f"Released shared array {handle}")
+
+    def cleanup(self) -> None:
+        """Release every array in the arena."""
+        for handle in list(self._segments):
+            self.release(handle)
+
+    def __enter__(self) -> "ArrayArena":
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        """Context manager exit with cleanup."""
+        self.cleanup()
+
+
+# Reader-side mappings, shared by every widget in the process
+_attached: dict[str, tuple[shared_memory.SharedMemory, np.ndarray]] = {}
+_attached_lock = threading.Lock()
+# Handles found released or missing; resolve to an empty array until detached
+_gone: set[str] = set()
+
+
+def attach_array(handle: str) -> np.ndarray:
+    """Return a read view of a shared array, mapping it on first use.
+
+    Raises:
+        FileNotFoundError: If no shared array has this handle
+        ValueError: If the segment is not a shared array
+    """
+    entry = _attached.get(handle)
+    if entry is not None:
+        return entry[1]
+    with _attached_lock:
+        entry = _attached.get(handle)
+        if entry is None:
+            shm = shared_memory.SharedMemory(name=handle)
+            _untrack_shm(shm)
+            view = _view(shm)
+            view.flags.writeable = False
+            entry = (shm, view)
+            _attached[handle] = entry
+            logger.debug(f"Attached shared array {handle} {view.shape}")
+    return entry[1]
+
+
+def detach_array(handle: str) -> None:
+    """Drop the reader-side mapping of a shared array.
+
+    Other widgets referencing the same handle map it again on their next
+    resolve, if it still exists.
+    """
+    with _attached_lock:
+        entry = _attached.pop(handle, None)
+        _gone.discard(handle)
+    if entry is not None:
+        shm, view = entry
+        del entry
+        # A view still held elsewhere keeps the mapping until it is dropped
+        _close_when_unused(shm, view)
+
+
+def array_generation(handle: str) -> int | None:
+    """Return the publish generation of a mapped shared array.
+
+    None if this process has not mapped the array (or it is gone).
+    """
+    entry = _attached.get(handle)
+    buf = entry[0].buf if entry is not None else None
+    if buf is None:
+        return None
+    return int(_GENERATION_STRUCT.unpack_from(buf, _GENERATION_OFFSET)[0])
+
+
+def resolve_array(value: Any) -> np.ndarray:
+    """Turn a property value into a NumPy array.
+
+    Array references resolve to a zero-copy view of shared memory, or to an
+    empty array once the array has been released; anything else (lists,
+    tuples, None) is converted to float64.
+
+    Args:
+        value: Property value — an array reference or array-like data
+
+    Returns:
+        NumPy array (empty for None)
+    """
+    if is_array_ref(value):
+        return _resolve_handle(value[ARRAY_REF_KEY])
+    if isinstance(value, np.ndarray):
+        return value
+    if value is None:
+        return np.empty(0, dtype=np.float64)
+    return np.asarray(value, dtype=np.float64)
+
+
+def _resolve_handle(handle: str) -> np.ndarray:
+    if handle in _gone:
+        return np.empty(0, dtype=np.float64)
+    try:
+        view = attach_array(handle)
+    except FileNotFoundError:
+        logger.warning(f"Shared array {handle} does not exist; drawing nothing")
+        _gone.add(handle)
+        return np.empty(0, dtype=np.float64)
+    entry = _attached.get(handle)
+    if entry is not None and _buf(entry[0])[_FLAGS_OFFSET] & _RELEASED:
+        logger.debug(f"Shared array {handle} was released; detaching")
+        del view, entry
+        detach_array(handle)
+        _gone.add(handle)
+        return np.empty(0, dtype=np.float64)
+    return view
@@ -0,0 +1,255 @@
+"""IPC throughput and latency benchmarks.
+
+Measures the command path without a display, so it runs anywhere the IPC
+layer does (CI included):
+
+- ``codec``: pack_command / unpack_command operations per second
+- ``round_trip``: latency of write_command → read_command → write_ack →
+  read_ack with the canvas side on its own thread, woken by the doorbells
+- ``burst``: commands per second when a writer floods the ring and the
+  reader drains it in batches, acknowledging each batch once (as
+  Canvas._process_commands does)
+
+Results are plain JSON-serializable dicts so runs can be stored and compared
+across releases; ``champi-imgui bench ipc`` prints them.
+"""
+
+import platform
+import statistics
+import sys
+import threading
+import time
+import uuid
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import UTC, datetime
+from typing import Any
+
+from loguru import logger
+
+import champi_imgui
+from champi_imgui.ipc.command_types import CommandType
+from champi_imgui.ipc.doorbell import DOORBELL_SUPPORTED
+from champi_imgui.ipc.shared_memory_manager import SharedMemoryManager
+from champi_imgui.ipc.structs import pack_command, unpack_command
+
+# A typical UPDATE_WIDGET: a couple of properties and one extend op
+SAMPLE_COMMAND: dict[str, Any] = {
+    "canvas_id": "bench",
+    "widget_id": "plot",
+    "properties": {"label": "Series", "visible": True, "scale": 0.5},
+    "ops": [["extend", "points", [[float(i), float(i) * 0.5] for i in range(16)]]],
+}
+
+# How long either side waits before concluding the other is stuck
+_STALL_TIMEOUT = 5.0
+
+
+@contextmanager
+def _quiet() -> Iterator[None]:
+    """Silence per-command debug logging, which would dominate the timings."""
+    logger.disable("champi_imgui")
+    try:
+        yield
+    finally:
+        logger.enable("champi_imgui")
+
+
+@contextmanager
+def _channel(
+    capacity: int | None = None,
+) -> Iterator[tuple[SharedMemoryManager, SharedMemoryManager]]:
+    """Create a throwaway canvas-side/server-side pair of handles."""
+    name = f"canvas_bench_{uuid.uuid4().hex[:8]}"
+    canvas_side = (
+        SharedMemoryManager(name_prefix=name)
+        if capacity is None
+        else SharedMemoryManager(name_prefix=name, capacity=capacity)
+    )
+    canvas_side.create_regions()
+    server_side = SharedMemoryManager(name_prefix=name)
+    try:
+        server_side.attach_regions()
+        yield canvas_side, server_side
+    finally:
+        server_side.cleanup()
+        canvas_side.cleanup()
+
+
+def _latency_summary(samples_s: list[float]) -> dict[str, float]:
+    """Summarize latencies (seconds) in microseconds."""
+    us = sorted(s * 1e6 for s in samples_s)
+    pct = (
+        statistics.quantiles(us, n=100, method="inclusive") if len(us) > 1 else us * 99
+    )
+    return {
+        "min_us": round(us[0], 2),
+        "mean_us": round(statistics.fmean(us), 2),
+        "p50_us": round(statistics.median(us), 2),
+        "p95_us": round(pct[94], 2),
+        "p99_us": round(pct[98], 2),
+        "max_us": round(us[-1], 2),
+    }
+
+
+def bench_codec(iterations: int = 20000) -> dict[str, Any]:
+    """Measure pack_command / unpack_command throughput.
+
+    Args:
+        iterations: Number of commands to pack and unpack
+
+    Returns:
+        Dict with frame size and ops/sec for each direction
+    """
+    frame = pack_command(CommandType.UPDATE_WIDGET, 1, **SAMPLE_COMMAND)
+
+    start = time.perf_counter()
+    for seq in range(iterations):
+        pack_command(CommandType.UPDATE_WIDGET, seq, **SAMPLE_COMMAND)
+    pack_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        unpack_command(frame)
+    unpack_s = time.perf_counter() - start
+
+    return {
+        "iterations": iterations,
+        "frame_bytes": len(frame),
+        "pack_ops_per_sec": round(iterations / pack_s, 1),
+        "unpack_ops_per_sec": round(iterations / unpack_s, 1),
+    }
+
+
+def bench_round_trip(iterations: int = 2000) -> dict[str, Any]:
+    """Measure command → ACK round-trip latency.
+
+    Args:
+        iterations: Number of sequential round trips
+
+    Returns:
+        Dict with latency percentiles in microseconds
+
+    Raises:
+        TimeoutError: If a command is not acknowledged in time
+    """
+    samples: list[float] = []
+    with _channel() as (canvas_side, server_side):
+        done = threading.Event()
+
+        def echo() -> None:
+            while not done.is_set():
+                command = canvas_side.read_command(timeout=0.1)
+                if command is not None:
+                    canvas_side.write_ack(command.seq_num)
+
+        worker = threading.Thread(target=echo, name="BenchEcho", daemon=True)
+        worker.start()
+        try:
+            for _ in range(iterations):
+                start = time.perf_counter()
+                server_side.write_command(CommandType.UPDATE_WIDGET, **SAMPLE_COMMAND)
+                if server_side.read_ack(timeout=_STALL_TIMEOUT) is None:
+                    raise TimeoutError("Round-trip benchmark: ACK not received")
+                samples.append(time.perf_counter() - start)
+        finally:
+            done.set()
+            worker.join()
+
+    return {"iterations": iterations, **_latency_summary(samples)}
+
+
+def bench_burst(count: int = 20000, capacity: int = 1024) -> dict[str, Any]:
+    """Measure sustained command throughput under burst load.
+
+    Args:
+        count: Number of commands to push through the ring
+        capacity: Command ring capacity in slots
+
+    Returns:
+        Dict with commands/sec, batch count and how often the writer found
+        the ring full
+
+    Raises:
+        TimeoutError: If the reader stops making progress
+    """
+    batches = 0
+    with _channel(capacity) as (canvas_side, server_side):
+
+        def drain() -> None:
+            nonlocal batches
+            received = 0
+            while received < count:
+                command = canvas_side.read_command(timeout=_STALL_TIMEOUT)
+                if command is None:
+                    return
+                last_seq = command.seq_num
+                received += 1
+                while (command := canvas_side.read_command()) is not None:
+                    last_seq = command.seq_num
+                    received += 1
+                canvas_side.write_ack(last_seq)
+                batches += 1
+
+        worker = threading.Thread(target=drain, name="BenchDrain", daemon=True)
+        full_waits = 0
+        start = time.perf_counter()
+        worker.start()
+        for _ in range(count):
+            while True:
+                try:
+                    server_side.write_command(
+                        CommandType.UPDATE_WIDGET, **SAMPLE_COMMAND
+                    )
+                    break
+                except RuntimeError:
+                    full_waits += 1
+                    if server_side.read_ack(timeout=_STALL_TIMEOUT) is None:
+                        raise TimeoutError(
+                            "Burst benchmark: reader stopped draining"
+                        ) from None
+        while server_side.applied_seq() < count:
+            if server_side.read_ack(timeout=_STALL_TIMEOUT) is None:
+                raise TimeoutError("Burst benchmark: final ACK not received")
+        elapsed = time.perf_counter() - start
+        worker.join()
+
+    return {
+        "commands": count,
+        "ring_capacity": capacity,
+        "commands_per_sec": round(count / elapsed, 1),
+        "ack_batches": batches,
+        "ring_full_waits": full_waits,
+    }
+
+
+def run_ipc_benchmarks(
+    codec_iterations: int = 20000,
+    round_trips: int = 2000,
+    burst: int = 20000,
+) -> dict[str, Any]:
+    """Run every IPC benchmark and return a JSON-serializable report.
+
+    Args:
+        codec_iterations: Iterations for the codec benchmark
+        round_trips: Iterations for the round-trip benchmark
+        burst: Commands for the burst benchmark
+
+    Returns:
+        Dict with run metadata and one entry per benchmark
+    """
+    with _quiet():
+        results = {
+            "codec": bench_codec(codec_iterations),
+            "round_trip": bench_round_trip(round_trips),
+            "burst": bench_burst(burst),
+        }
+    return {
+        "benchmark": "ipc",
+        "version": champi_imgui.__version__,
+        "timestamp": datetime.now(UTC).isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "doorbell": DOORBELL_SUPPORTED,
+        "results": results,
+    }
@@ -0,0 +1,252 @@
+"""Compact binary encoding for IPC frame bodies.
+
+Implements the subset of the MessagePack wire format needed for command
+payloads: nil, bool, int (up to 64-bit), float64, str, bin, array and map.
+Frames written here can be read by any MessagePack decoder, but no third-party
+package is required on either side of the shared memory bridge.
+
+Tuples are encoded as arrays and therefore decode as lists.  Objects exposing
+``tolist()`` (NumPy arrays and scalars) are encoded through that method.
+"""
+
+import struct
+from typing import Any
+
+_UINT8 = struct.Struct(">B")
+_UINT16 = struct.Struct(">H")
+_UINT32 = struct.Struct(">I")
+_UINT64 = struct.Struct(">Q")
+_INT8 = struct.Struct(">b")
+_INT16 = struct.Struct(">h")
+_INT32 = struct.Struct(">i")
+_INT64 = struct.Struct(">q")
+_FLOAT32 = struct.Struct(">f")
+_FLOAT64 = struct.Struct(">d")
+
+
+def encode(value: Any) -> bytes:
+    """Encode a value into MessagePack bytes.
+
+    Args:
+        value: None, bool, int, float, str, bytes, list/tuple or dict
+               (containers may nest)
+
+    Returns:
+        Encoded bytes
+
+    Raises:
+        TypeError: If the value (or a nested value) has an unsupported type
+        OverflowError: If an integer does not fit in 64 bits
+    """
+    out = bytearray()
+    _encode_into(out, value)
+    return bytes(out)
+
+
+def _encode_length(out: bytearray, n: int, fix: int, fix_max: int, tags: bytes) -> None:
+    """Write a container/string length using the smallest available tag."""
+    if n <= fix_max:
+        out.append(fix | n)
+    elif n <= 0xFF and tags[0]:
+        out.append(tags[0])
+        out += _UINT8.pack(n)
+    elif n <= 0xFFFF:
+        out.append(tags[1])
+        out += _UINT16.pack(n)
+    else:
+        out.append(tags[2])
+        out += _UINT32.pack(n)
+
+
+def _encode_int(out: bytearray, value: int) -> None:
+    if 0 <= value <= 0x7F:
+        out.append(value)
+    elif -32 <= value < 0:
+        out += _INT8.pack(value)
+    elif value > 0:
+        if value <= 0xFF:
+            out.append(0xCC)
+            out += _UINT8.pack(value)
+        elif value <= 0xFFFF:
+            out.append(0xCD)
+            out += _UINT16.pack(value)
+        elif value <= 0xFFFFFFFF:
+            out.append(0xCE)
+            out += _UINT32.pack(value)
+        elif value <= 0xFFFFFFFFFFFFFFFF:
+            out.append(0xCF)
+            out += _UINT64.pack(value)
+        else:
+            msg = f"Integer {value} does not fit in 64 bits"
+            raise OverflowError(msg)
+    elif value >= -0x80:
+        out.append(0xD0)
+        out += _INT8.pack(value)
+    elif value >= -0x8000:
+        out.append(0xD1)
+        out += _INT16.pack(value)
+    elif value >= -0x80000000:
+        out.append(0xD2)
+        out += _INT32.pack(value)
+    elif value >= -0x8000000000000000:
+        out.append(0xD3)
+        out += _INT64.pack(value)
+    else:
+        msg = f"Integer {value} does not fit in 64 bits"
+        raise OverflowError(msg)
+
+
+def _encode_into(out: bytearray, value: Any) -> None:
+    if value is None:
+        out.append(0xC0)
+    elif value is True:
+        out.append(0xC3)
+    elif value is False:
+        out.append(0xC2)
+    elif isinstance(value, int):
+        _encode_int(out, value)
+    elif isinstance(value, float):
+        out.append(0xCB)
+        out += _FLOAT64.pack(value)
+    elif isinstance(value, str):
+        data = value.encode("utf-8")
+        _encode_length(out, len(data), 0xA0, 31, b"\xd9\xda\xdb")
+        out += data
+    elif isinstance(value, bytes | bytearray | memoryview):
+        data = bytes(value)
+        _encode_length(out, len(data), 0, -1, b"\xc4\xc5\xc6")
+        out += data
+    elif isinstance(value, list | tuple):
+        _encode_length(out, len(value), 0x90, 15, b"\x00\xdc\xdd")
+        for item in value:
+            _encode_into(out, item)
+    elif isinstance(value, dict):
+        _encode_length(out, len(value), 0x80, 15, b"\x00\xde\xdf")
+        for key, item in value.items():
+            _encode_into(out, key)
+            _encode_into(out, item)
+    elif hasattr(value, "tolist"):
+        _encode_into(out, value.tolist())
+    else:
+        msg = f"Cannot encode value of type {type(value).__name__}"
+        raise TypeError(msg)
+
+
+def decode(data: bytes | memoryview) -> Any:
+    """Decode MessagePack bytes produced by :func:`encode`.
+
+    Args:
+        data: Encoded bytes holding exactly one value
+
+    Returns:
+        Decoded value (arrays become lists, maps become dicts)
+
+    Raises:
+        ValueError: If the data is truncated, has trailing bytes, or uses an
+                    unsupported type tag
+    """
+    view = memoryview(data)
+    try:
+        value, offset = _decode_at(view, 0)
+    except (IndexError, struct.error) as e:
+        msg = f"Truncated payload: {e}"
+        raise ValueError(msg) from e
+    if offset != len(view):
+        msg = f"Trailing bytes after payload ({len(view) - offset} bytes)"
+        raise ValueError(msg)
+    return value
+
+
+def _take(view: memoryview, offset: int, n: int) -> bytes:
+    end = offset + n
+    if end > len(view):
+        msg = f"need {n} bytes at offset {offset}"
+        raise IndexError(msg)
+    return bytes(view[offset:end])
+
+
+def _decode_array(view: memoryview, offset: int, n: int) -> tuple[list[Any], int]:
+    items = []
+    for _ in range(n):
+        item, offset = _decode_at(view, offset)
+        items.append(item)
+    return items, offset
+
+
+def _decode_map(view: memoryview, offset: int, n: int) -> tuple[dict[Any, Any], int]:
+    result: dict[Any, Any] = {}
+    for _ in range(n):
+        key, offset = _decode_at(view, offset)
+        result[key], offset = _decode_at(view, offset)
+    return result, offset
+
+
+def _decode_at(view: memoryview, offset: int) -> tuple[Any, int]:
+    tag = view[offset]
+    offset += 1
+
+    if tag <= 0x7F:
+        return tag, offset
+    if tag >= 0xE0:
+        return tag - 0x100, offset
+    if 0xA0 <= tag <= 0xBF:
+        n = tag & 0x1F
+        return _take(view, offset, n).decode("utf-8"), offset + n
+    if 0x90 <= tag <= 0x9F:
+        return _decode_array(view, offset, tag & 0x0F)
+    if 0x80 <= tag <= 0x8F:
+        return _decode_map(view, offset, tag & 0x0F)
+
+    if tag == 0xC0:
+        return None, offset
+    if tag == 0xC2:
+        return False, offset
+    if tag == 0xC3:
+        return True, offset
+
+    fixed = _FIXED_WIDTH.get(tag)
+    if fixed is not None:
+        return fixed.unpack_from(view, offset)[0], offset + fixed.size
+
+    sized = _SIZED.get(tag)
+    if sized is not None:
+        kind, length_struct = sized
+        (n,) = length_struct.unpack_from(view, offset)
+        offset += length_struct.size
+        if kind == "str":
+            return _take(view, offset, n).decode("utf-8"), offset + n
+        if kind == "bin":
+            return _take(view, offset, n), offset + n
+        if kind == "array":
+            return _decode_array(view, offset, n)
+        return _decode_map(view, offset, n)
+
+    msg = f"Unsupported type tag 0x{tag:02x}"
+    raise ValueError(msg)
+
+
+_FIXED_WIDTH: dict[int, struct.Struct] = {
+    0xCA: _FLOAT32,
+    0xCB: _FLOAT64,
+    0xCC: _UINT8,
+    0xCD: _UINT16,
+    0xCE: _UINT32,
+    0xCF: _UINT64,
+    0xD0: _INT8,
+    0xD1: _INT16,
+    0xD2: _INT32,
+    0xD3: _INT64,
+}
+
+_SIZED: dict[int, tuple[str, struct.Struct]] = {
+    0xC4: ("bin", _UINT8),
+    0xC5: ("bin", _UINT16),
+    0xC6: ("bin", _UINT32),
+    0xD9: ("str", _UINT8),
+    0xDA: ("str", _UINT16),
+    0xDB: ("str", _UINT32),
+    0xDC: ("array", _UINT16),
+    0xDD: ("array", _UINT32),
+    0xDE: ("map", _UINT16),
+    0xDF: ("map", _UINT32),
+}
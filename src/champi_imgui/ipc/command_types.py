@@ -24,3 +24,16 @@ class CommandType(IntEnum):
 
     # Response/acknowledgment
     ACK = 99  # Acknowledgment response
+
+
+class AckStatus(IntEnum):
+    """Outcome of an applied command, reported through the ACK region.
+
+    Only non-OK outcomes are recorded individually; every other command up
+    to the acknowledged watermark is implicitly OK.
+    """
+
+    OK = 0  # Command applied
+    ERROR = 1  # Handler raised while applying the command
+    UNSUPPORTED = 2  # Render side has no handler for the command type
+    CANCELLED = 3  # Drained after a SHUTDOWN in the same batch; not applied
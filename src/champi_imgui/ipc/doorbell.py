@@ -0,0 +1,130 @@
+"""Cross-process doorbell used to wake a blocked reader.
+
+A doorbell is a named FIFO living next to the shared memory regions.  The
+writer publishes data in shared memory and then rings the bell by writing one
+byte; the reader blocks in ``poll()`` on the FIFO until a byte arrives, so a
+waiting reader costs no CPU and wakes as soon as the kernel schedules it.
+
+The bell carries no data: bytes only mean "go and look again", so a reader
+always re-checks shared memory after waking.  Because unread bytes stay in the
+FIFO, a ring that lands between the reader's check and its wait is never
+lost.  Both sides open the FIFO read-write and non-blocking, so opening never
+blocks on the peer and a full FIFO (a bell that has already been rung many
+times) is simply ignored.
+"""
+
+import contextlib
+import os
+import select
+import tempfile
+
+from loguru import logger
+
+# Keep bells beside the shared memory regions where possible so the
+# ``ipc status`` / ``ipc cleanup`` commands see and remove them too.
+BELL_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+
+# Named FIFOs and poll() are POSIX features; elsewhere callers fall back to
+# sleep-polling shared memory.
+DOORBELL_SUPPORTED = hasattr(os, "mkfifo") and hasattr(select, "poll")
+
+
+def bell_path(name: str) -> str:
+    """Return the filesystem path of the doorbell called *name*."""
+    return os.path.join(BELL_DIR, f"{name}.bell")
+
+
+class Doorbell:
+    """Named-FIFO doorbell shared by one writer and one reader."""
+
+    def __init__(self, name: str):
+        """Initialize doorbell.
+
+        Args:
+            name: Doorbell name (e.g., "canvas_main_cmd")
+        """
+        self.name = name
+        self.path = bell_path(name)
+        self._fd: int | None = None
+        self._poller: select.poll | None = None
+        self.is_creator = False
+
+    def create(self) -> None:
+        """Create the FIFO, replacing a stale one, and open it."""
+        self.is_creator = True
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(self.path)
+        os.mkfifo(self.path, 0o600)
+        self._open()
+        logger.debug(f"Created doorbell: {self.path}")
+
+    def attach(self) -> None:
+        """Open an existing FIFO.
+
+        Raises:
+            FileNotFoundError: If the creator has not made the doorbell
+        """
+        self.is_creator = False
+        self._open()
+        logger.debug(f"Attached to doorbell: {self.path}")
+
+    def _open(self) -> None:
+        self._fd = os.open(self.path, os.O_RDWR | os.O_NONBLOCK)
+        self._poller = select.poll()
+        self._poller.register(self._fd, select.POLLIN)
+
+    def fileno(self) -> int:
+        """Return the FIFO descriptor so the bell can join a selector."""
+        if self._fd is None:
+            msg = f"Doorbell {self.name} is not open"
+            raise RuntimeError(msg)
+        return self._fd
+
+    def ring(self) -> None:
+        """Wake the reader (never blocks)."""
+        if self._fd is None:
+            return
+        # A full FIFO means the reader already has plenty of wakeups pending
+        with contextlib.suppress(BlockingIOError):
+            os.write(self._fd, b"\x01")
+
+    def clear(self) -> None:
+        """Discard pending rings without waiting."""
+        if self._fd is None:
+            return
+        with contextlib.suppress(BlockingIOError):
+            while os.read(self._fd, 4096):
+                pass
+
+    def wait(self, timeout: float) -> bool:
+        """Block until the bell rings or *timeout* seconds pass.
+
+        Pending rings are consumed, so the next wait blocks again until a
+        new ring arrives.
+
+        Args:
+            timeout: Maximum time to wait in seconds
+
+        Returns:
+            True if the bell rang, False on timeout
+        """
+        if self._poller is None:
+            msg = f"Doorbell {self.name} is not open"
+            raise RuntimeError(msg)
+        if not self._poller.poll(max(timeout, 0.0) * 1000):
+            return False
+        self.clear()
+        return True
+
+    def close(self) -> None:
+        """Close the FIFO and, on the creator side, remove it."""
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+            self._poller = None
+        if self.is_creator:
+            try:
+                os.unlink(self.path)
+                logger.debug(f"Unlinked doorbell: {self.path}")
+            except FileNotFoundError:
+                pass
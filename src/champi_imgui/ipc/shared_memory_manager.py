@@ -1,21 +1,63 @@
 """Shared memory manager for IPC between MCP server and Canvas render process.
 
 Adapted from mcp_champi/ipc_svc/ shared memory pattern.
+
+The command region is a single-producer/single-consumer ring buffer::
+
+    [ header (64 B) | slot 0 | slot 1 | ... | slot capacity-1 ]
+
+The header holds two monotonically increasing counters: ``head`` (number of
+slots ever written, owned by the MCP server) and ``tail`` (number of slots ever
+consumed, owned by the Canvas).  Each side only ever writes its own counter, so
+no lock is needed: the producer copies a frame into the slots starting at
+``head % capacity`` and then publishes the advanced head; the consumer reads up
+to the published head and then publishes its new tail.
+
+A frame (see ``ipc.structs``) always starts on a slot boundary and occupies as
+many consecutive slots as its length requires, wrapping past the last slot.
+A writer with a ``write_timeout`` waits that long for free slots instead of
+failing on a full ring, and sends a frame larger than the ring as fragments
+of at most half the ring, which the reader joins back into one command.
+
+The ACK region holds a cumulative watermark: the sequence number of the last
+command the Canvas has applied, so one acknowledgement covers every command
+written before it.  Commands that failed additionally get a status record in a
+small ring after the watermark.  Clients can turn a write into a
+``concurrent.futures.Future`` that resolves once the watermark passes it.
+
+Each region has a doorbell (see ``ipc.doorbell``) that the writer rings after
+publishing, so ``read_command`` and ``read_ack`` block without spinning.  On
+platforms without named FIFOs they fall back to sleep-polling.
 """
 
 import struct
+import threading
 import time
+from collections.abc import Iterable
+from concurrent.futures import Future
 from multiprocessing import shared_memory
 from typing import Any
 
 from loguru import logger
 
-from champi_imgui.ipc.command_types import CommandType
+from champi_imgui.ipc.command_types import AckStatus, CommandType
+from champi_imgui.ipc.doorbell import DOORBELL_SUPPORTED, Doorbell
 from champi_imgui.ipc.structs import (
+    ACK_HEADER_SIZE,
+    ACK_HEADER_STRUCT,
+    ACK_STATUS_CAPACITY,
+    ACK_STATUS_STRUCT,
+    FRAME_FRAGMENT,
+    FRAME_HEADER_SIZE,
+    FRAME_HEADER_STRUCT,
+    FRAME_MORE,
     CommandData,
-    pack_ack,
+    frame_flags,
+    frame_size,
+    pack_ack_status,
     pack_command,
-    unpack_ack,
+    split_frame,
+    unpack_ack_status,
     unpack_command,
 )
 
@@ -37,8 +79,53 @@ def _untrack_shm(shm: shared_memory.SharedMemory) -> None:
         pass
 
 
-# Maximum size for command region (use largest struct)
-MAX_COMMAND_SIZE = 512
+# Size of one ring slot; small commands fit in a single slot
+RING_SLOT_SIZE = 64
+
+# Default number of slots in the command ring (128 KiB of frame data)
+DEFAULT_RING_CAPACITY = 2048
+
+# Ring header: head + tail counters, then capacity + slot size.
+# Padded to 64 bytes so slot 0 starts on a cache-line boundary.
+RING_HEADER_STRUCT = struct.Struct("<QQII")
+RING_HEADER_SIZE = 64
+_HEAD_OFFSET = 0
+_TAIL_OFFSET = 8
+
+_COUNTER_STRUCT = struct.Struct("<Q")
+
+# Sleep between checks when no doorbell is available
+_POLL_INTERVAL = 0.001
+
+_APPLIED_OFFSET = 0
+_STATUS_HEAD_OFFSET = 8
+
+# Size of the ACK region: watermark header plus the status record ring
+ACK_REGION_SIZE = ACK_HEADER_SIZE + ACK_STATUS_CAPACITY * ACK_STATUS_STRUCT.size
+
+# How often the ACK listener re-checks whether it should exit
+_LISTENER_TICK = 0.5
+
+
+class CommandFuture(Future[AckStatus]):
+    """Future for a submitted command, resolving to its AckStatus."""
+
+    def __init__(self, seq_num: int):
+        super().__init__()
+        self.seq_num = seq_num
+
+
+def ring_region_size(capacity: int, slot_size: int = RING_SLOT_SIZE) -> int:
+    """Return the number of bytes needed for a command ring.
+
+    Args:
+        capacity: Number of slots in the ring
+        slot_size: Size of each slot in bytes
+
+    Returns:
+        Total region size including the ring header
+    """
+    return RING_HEADER_SIZE + capacity * slot_size
 
 
 class SharedMemoryManager:
@@ -48,41 +135,71 @@ class SharedMemoryManager:
     MCP server attaches to existing regions (consumer).
 
     Memory layout per canvas:
-    - Command region: MCP server writes commands, Canvas reads
+    - Command region: SPSC ring buffer; MCP server writes commands, Canvas reads
     - ACK region: Canvas writes acknowledgments, MCP server reads
+
+    Each region is paired with a doorbell rung by its writer.
     """
 
-    def __init__(self, name_prefix: str = "canvas"):
+    def __init__(
+        self,
+        name_prefix: str = "canvas",
+        capacity: int = DEFAULT_RING_CAPACITY,
+        write_timeout: float = 0.0,
+    ):
         """Initialize shared memory manager.
 
         Args:
             name_prefix: Prefix for shared memory region names
                         (e.g., "canvas_main" creates "canvas_main_cmd")
+            capacity: Number of slots in the command ring (creator side only;
+                      attachers read the capacity from the ring header)
+            write_timeout: Seconds write_command() waits for free slots when
+                           the ring is full (0 = fail at once).  Frames larger
+                           than the ring are only sent when this is positive.
         """
+        if capacity < 1:
+            msg = f"Ring capacity must be at least 1, got {capacity}"
+            raise ValueError(msg)
         self.name_prefix = name_prefix
+        self.capacity = capacity
+        self.slot_size = RING_SLOT_SIZE
         self.cmd_region: shared_memory.SharedMemory | None = None
         self.ack_region: shared_memory.SharedMemory | None = None
+        self.cmd_bell: Doorbell | None = None
+        self.ack_bell: Doorbell | None = None
         self.is_creator = False
+        self.write_timeout = write_timeout
         self._seq_num = 0
+        # Reader side: (seq_num, bytes so far) of a frame arriving in fragments
+        self._partial: tuple[int, bytearray] | None = None
+
+        # Client-side ACK tracking (see submit_command)
+        self._last_ack = 0
+        self._status_index = 0
+        self._statuses: dict[int, AckStatus] = {}
+        self._pending: dict[int, CommandFuture] = {}
+        self._pending_lock = threading.Lock()
+        self._listener: threading.Thread | None = None
+        self._closing = False
 
     def create_regions(self) -> None:
         """Create shared memory regions (Canvas process only).
 
         Creates two regions:
-        - Command region: For commands from MCP server
+        - Command region: Ring buffer for commands from MCP server
         - ACK region: For acknowledgments from Canvas
         """
         self.is_creator = True
 
         # Create command region
         cmd_name = f"{self.name_prefix}_cmd"
+        cmd_size = ring_region_size(self.capacity, self.slot_size)
         try:
             self.cmd_region = shared_memory.SharedMemory(
-                name=cmd_name, create=True, size=MAX_COMMAND_SIZE
+                name=cmd_name, create=True, size=cmd_size
             )
             _untrack_shm(self.cmd_region)
-            # Initialize with zeros
-            self.cmd_region.buf[:MAX_COMMAND_SIZE] = bytes(MAX_COMMAND_SIZE)
             logger.debug(f"Created command region: {cmd_name}")
         except FileExistsError:
             # Region already exists, attach to it
@@ -90,41 +207,160 @@ class SharedMemoryManager:
                 f"Command region {cmd_name} already exists, attaching instead"
             )
             self.cmd_region = shared_memory.SharedMemory(name=cmd_name)
+            if self.cmd_region.size < cmd_size:
+                # Stale region from an older layout — too small for this ring
+                self.cmd_region.close()
+                self.cmd_region.unlink()
+                self.cmd_region = shared_memory.SharedMemory(
+                    name=cmd_name, create=True, size=cmd_size
+                )
+                _untrack_shm(self.cmd_region)
+
+        # Reset the ring: both counters at zero, geometry recorded for attachers
+        self._partial = None
+        self._cmd_buf()[:RING_HEADER_SIZE] = bytes(RING_HEADER_SIZE)
+        RING_HEADER_STRUCT.pack_into(
+            self._cmd_buf(), 0, 0, 0, self.capacity, self.slot_size
+        )
 
         # Create ACK region
         ack_name = f"{self.name_prefix}_ack"
         try:
             self.ack_region = shared_memory.SharedMemory(
-                name=ack_name,
-                create=True,
-                size=8,  # Just sequence number
+                name=ack_name, create=True, size=ACK_REGION_SIZE
             )
             _untrack_shm(self.ack_region)
-            self.ack_region.buf[:8] = bytes(8)
             logger.debug(f"Created ACK region: {ack_name}")
         except FileExistsError:
             logger.warning(f"ACK region {ack_name} already exists, attaching instead")
             self.ack_region = shared_memory.SharedMemory(name=ack_name)
+            if self.ack_region.size < ACK_REGION_SIZE:
+                # Stale region from the single-seq layout
+                self.ack_region.close()
+                self.ack_region.unlink()
+                self.ack_region = shared_memory.SharedMemory(
+                    name=ack_name, create=True, size=ACK_REGION_SIZE
+                )
+                _untrack_shm(self.ack_region)
+
+        # Nothing applied yet, no status records
+        ACK_HEADER_STRUCT.pack_into(self._ack_buf(), 0, 0, 0)
+
+        if DOORBELL_SUPPORTED:
+            self.cmd_bell = Doorbell(cmd_name)
+            self.cmd_bell.create()
+            self.ack_bell = Doorbell(ack_name)
+            self.ack_bell.create()
 
     def attach_regions(self) -> None:
         """Attach to existing shared memory regions (MCP server only).
 
-        Attaches to regions created by Canvas process.
+        Attaches to regions created by Canvas process and reads the ring
+        geometry from the command region header.
         """
         self.is_creator = False
 
         # Attach to command region
         cmd_name = f"{self.name_prefix}_cmd"
         self.cmd_region = shared_memory.SharedMemory(name=cmd_name)
-        logger.debug(f"Attached to command region: {cmd_name}")
+        _, _, self.capacity, self.slot_size = RING_HEADER_STRUCT.unpack_from(
+            self._cmd_buf(), 0
+        )
+        logger.debug(
+            f"Attached to command region: {cmd_name} "
+            f"(capacity={self.capacity}, slot_size={self.slot_size})"
+        )
 
         # Attach to ACK region
         ack_name = f"{self.name_prefix}_ack"
         self.ack_region = shared_memory.SharedMemory(name=ack_name)
+        self._last_ack, self._status_index = ACK_HEADER_STRUCT.unpack_from(
+            self._ack_buf(), 0
+        )
         logger.debug(f"Attached to ACK region: {ack_name}")
 
+        if DOORBELL_SUPPORTED:
+            self.cmd_bell = self._attach_bell(cmd_name)
+            self.ack_bell = self._attach_bell(ack_name)
+
+    @staticmethod
+    def _attach_bell(name: str) -> Doorbell | None:
+        """Open the doorbell for a region, or None if the creator made none."""
+        bell = Doorbell(name)
+        try:
+            bell.attach()
+        except FileNotFoundError:
+            logger.debug(f"No doorbell for {name}, falling back to polling")
+            return None
+        return bell
+
+    @staticmethod
+    def _wait(bell: Doorbell | None, deadline: float) -> bool:
+        """Wait for *bell* to ring, at most until *deadline*.
+
+        Returns:
+            False if the deadline has already passed, True otherwise
+        """
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        if bell is None:
+            time.sleep(min(_POLL_INTERVAL, remaining))
+        else:
+            bell.wait(remaining)
+        return True
+
+    def _cmd_buf(self) -> memoryview:
+        """Return the mapped command region (which must be open)."""
+        assert self.cmd_region is not None and self.cmd_region.buf is not None
+        return self.cmd_region.buf
+
+    def _ack_buf(self) -> memoryview:
+        """Return the mapped ACK region (which must be open)."""
+        assert self.ack_region is not None and self.ack_region.buf is not None
+        return self.ack_region.buf
+
+    def _load_counter(self, offset: int) -> int:
+        return int(_COUNTER_STRUCT.unpack_from(self._cmd_buf(), offset)[0])
+
+    def _store_counter(self, offset: int, value: int) -> None:
+        _COUNTER_STRUCT.pack_into(self._cmd_buf(), offset, value)
+
+    def _slot_offset(self, index: int) -> int:
+        return RING_HEADER_SIZE + (index % self.capacity) * self.slot_size
+
+    def _slots_for(self, size: int) -> int:
+        return -(-size // self.slot_size)
+
+    def pending_count(self) -> int:
+        """Return the number of ring slots written but not yet consumed."""
+        if self.cmd_region is None:
+            return 0
+        return self._load_counter(_HEAD_OFFSET) - self._load_counter(_TAIL_OFFSET)
+
+    def _copy_in(self, index: int, data: bytes) -> None:
+        """Copy *data* into the ring starting at slot *index*, wrapping if needed."""
+        offset = self._slot_offset(index)
+        end_of_ring = ring_region_size(self.capacity, self.slot_size)
+        first = min(len(data), end_of_ring - offset)
+        self._cmd_buf()[offset : offset + first] = data[:first]
+        if first < len(data):
+            rest = len(data) - first
+            self._cmd_buf()[RING_HEADER_SIZE : RING_HEADER_SIZE + rest] = data[first:]
+
+    def _copy_out(self, index: int, size: int) -> bytes:
+        """Copy *size* bytes out of the ring starting at slot *index*."""
+        offset = self._slot_offset(index)
+        end_of_ring = ring_region_size(self.capacity, self.slot_size)
+        first = min(size, end_of_ring - offset)
+        data = bytes(self._cmd_buf()[offset : offset + first])
+        if first < size:
+            rest = size - first
+            data += bytes(self._cmd_buf()[RING_HEADER_SIZE : RING_HEADER_SIZE + rest])
+        return data
+
     def write_command(self, command_type: CommandType, **kwargs: Any) -> int:
-        """Write command to shared memory (MCP server side).
+        """Write command to the ring buffer (MCP server side).
 
         Args:
             command_type: Type of command to write
@@ -132,30 +368,148 @@ class SharedMemoryManager:
 
         Returns:
             Sequence number of written command
+
+        Raises:
+            RuntimeError: If the region is not attached, or the ring stays
+                          full for ``write_timeout`` seconds
+            ValueError: If the packed command is larger than the whole ring
+                        and ``write_timeout`` is 0
         """
         if self.cmd_region is None:
             msg = "Command region not initialized. Call attach_regions() first."
             raise RuntimeError(msg)
 
-        self._seq_num += 1
-        seq_num = self._seq_num
+        seq_num = self._seq_num + 1
 
         # Pack command
         command_bytes = pack_command(command_type, seq_num, **kwargs)
+        if self._slots_for(len(command_bytes)) <= self.capacity:
+            frames = [command_bytes]
+        elif self.write_timeout > 0:
+            fragment_slots = max(self.capacity // 2, 1)
+            frames = split_frame(command_bytes, fragment_slots * self.slot_size)
+        else:
+            msg = (
+                f"Command {command_type.name} is {len(command_bytes)} bytes, "
+                f"larger than the command ring"
+            )
+            raise ValueError(msg)
 
-        # Write to shared memory
-        size = len(command_bytes)
-        self.cmd_region.buf[:size] = command_bytes
-
-        logger.debug(f"Wrote command {command_type.name} (seq={seq_num})")
+        deadline = time.monotonic() + self.write_timeout
+        for published, frame in enumerate(frames):
+            try:
+                self._publish(frame, deadline)
+            except RuntimeError:
+                if published:
+                    # The reader drops the partial frame when the next one
+                    # arrives under another seq_num
+                    self._seq_num = seq_num
+                raise
+
+        self._seq_num = seq_num
+        logger.debug(
+            f"Wrote command {command_type.name} (seq={seq_num}, frames={len(frames)})"
+        )
         return seq_num
 
+    def _publish(self, frame: bytes, deadline: float) -> None:
+        """Copy one frame into the ring once it has room, then publish it.
+
+        Raises:
+            RuntimeError: If the ring is still full at *deadline*
+        """
+        slots = self._slots_for(len(frame))
+        while True:
+            head = self._load_counter(_HEAD_OFFSET)
+            tail = self._load_counter(_TAIL_OFFSET)
+            if head - tail + slots <= self.capacity:
+                break
+            # The reader rings nothing when it frees slots; poll
+            if not self._wait(None, deadline):
+                msg = (
+                    f"Command ring {self.name_prefix}_cmd is full "
+                    f"({head - tail}/{self.capacity} slots pending)"
+                )
+                raise RuntimeError(msg)
+
+        # Fill the slots, then publish them by advancing head
+        self._copy_in(head, frame)
+        self._store_counter(_HEAD_OFFSET, head + slots)
+        if self.cmd_bell is not None:
+            self.cmd_bell.ring()
+
+    def _read_frame(self, index: int, head: int) -> tuple[CommandData | None, int]:
+        """Decode the frame starting at ring position *index*.
+
+        Returns:
+            The decoded command (None if invalid, or if the frame is a
+            fragment that does not complete one) and the ring position just
+            past the frame.  A frame whose length cannot be trusted consumes
+            everything up to *head*.
+        """
+        offset = self._slot_offset(index)
+        header = self._cmd_buf()[offset : offset + FRAME_HEADER_SIZE]
+        size = frame_size(header)
+        next_index = index + self._slots_for(size)
+        if next_index > head:
+            logger.error(
+                f"Error unpacking command: frame of {size} bytes overruns ring head"
+            )
+            self._partial = None
+            return None, head
+        frame = self._copy_out(index, size)
+        if frame_flags(header) & FRAME_FRAGMENT:
+            joined = self._join_fragment(frame)
+            if joined is None:
+                return None, next_index
+            frame = joined
+        elif self._partial is not None:
+            logger.error(
+                f"Dropping incomplete command (seq={self._partial[0]}): "
+                f"its remaining fragments never arrived"
+            )
+            self._partial = None
+        try:
+            command_data = unpack_command(frame)
+        except (ValueError, struct.error) as e:
+            logger.error(f"Error unpacking command: {e}")
+            return None, next_index
+        logger.debug(
+            f"Read command {command_data.command_type.name} (seq={command_data.seq_num})"
+        )
+        return command_data, next_index
+
+    def _join_fragment(self, fragment: bytes) -> bytes | None:
+        """Add a fragment to the frame being reassembled.
+
+        Returns:
+            The whole frame once its last fragment arrives, None before
+        """
+        _, _, _, flags, seq_num = FRAME_HEADER_STRUCT.unpack_from(fragment, 0)
+        if self._partial is not None and self._partial[0] != seq_num:
+            logger.error(
+                f"Dropping incomplete command (seq={self._partial[0]}): "
+                f"its remaining fragments never arrived"
+            )
+            self._partial = None
+        if self._partial is None:
+            self._partial = (seq_num, bytearray())
+        self._partial[1].extend(fragment[FRAME_HEADER_SIZE:])
+        if flags & FRAME_MORE:
+            return None
+        frame = bytes(self._partial[1])
+        self._partial = None
+        return frame
+
     def read_command(self, timeout: float = 0.0) -> CommandData | None:
-        """Read command from shared memory (Canvas side).
+        """Read the oldest pending command from the ring (Canvas side).
 
         Args:
             timeout: Maximum time to wait for command (0 = non-blocking)
 
+        Frames holding invalid data are skipped, so None always means no
+        valid command arrived in time.
+
         Returns:
             CommandData if available, None otherwise
         """
@@ -163,88 +517,214 @@ class SharedMemoryManager:
             msg = "Command region not initialized. Call create_regions() first."
             raise RuntimeError(msg)
 
-        start_time = time.time()
+        deadline = time.monotonic() + timeout
 
         while True:
-            # Read from shared memory
-            data = bytes(self.cmd_region.buf[:MAX_COMMAND_SIZE])
-
-            # Check if data is all zeros (no command)
-            if data == bytes(MAX_COMMAND_SIZE):
-                if timeout == 0:
-                    return None
-                if time.time() - start_time >= timeout:
+            tail = self._load_counter(_TAIL_OFFSET)
+            head = self._load_counter(_HEAD_OFFSET)
+            if head == tail:
+                if timeout == 0 or not self._wait(self.cmd_bell, deadline):
                     return None
-                time.sleep(0.001)  # Short sleep to avoid busy-wait
                 continue
 
-            # Unpack command
-            try:
-                command_data = unpack_command(data)
-                # Clear the command region after reading
-                self.cmd_region.buf[:MAX_COMMAND_SIZE] = bytes(MAX_COMMAND_SIZE)
-                logger.debug(
-                    f"Read command {command_data.command_type.name} (seq={command_data.seq_num})"
-                )
-                return command_data
-            except (ValueError, struct.error) as e:
-                logger.error(f"Error unpacking command: {e}")
-                # Clear invalid data
-                self.cmd_region.buf[:MAX_COMMAND_SIZE] = bytes(MAX_COMMAND_SIZE)
-                return None
+            command_data, next_index = self._read_frame(tail, head)
+            # Release the slots even if they held invalid data
+            self._store_counter(_TAIL_OFFSET, next_index)
+            if command_data is None:
+                # Invalid frame, or a fragment: read on
+                continue
+            return command_data
+
+    def drain_commands(self) -> list[CommandData]:
+        """Read every pending command from the ring in one pass (Canvas side).
+
+        The head counter is sampled once, so commands written while draining
+        are left for the next call.  Frames holding invalid data are skipped,
+        and a command whose fragments have not all arrived is kept back
+        until they have.
+
+        Returns:
+            Pending commands in the order they were written
+        """
+        if self.cmd_region is None:
+            msg = "Command region not initialized. Call create_regions() first."
+            raise RuntimeError(msg)
 
-    def write_ack(self, seq_num: int) -> None:
-        """Write acknowledgment to shared memory (Canvas side).
+        tail = self._load_counter(_TAIL_OFFSET)
+        head = self._load_counter(_HEAD_OFFSET)
+        commands: list[CommandData] = []
+        index = tail
+        while index < head:
+            command_data, index = self._read_frame(index, head)
+            if command_data is not None:
+                commands.append(command_data)
+        if head != tail:
+            self._store_counter(_TAIL_OFFSET, head)
+        return commands
+
+    def _load_ack_counter(self, offset: int) -> int:
+        return int(_COUNTER_STRUCT.unpack_from(self._ack_buf(), offset)[0])
+
+    def _status_offset(self, index: int) -> int:
+        return ACK_HEADER_SIZE + (index % ACK_STATUS_CAPACITY) * ACK_STATUS_STRUCT.size
+
+    def write_ack(
+        self,
+        seq_num: int,
+        statuses: Iterable[tuple[int, AckStatus]] = (),
+    ) -> None:
+        """Acknowledge every command up to *seq_num* (Canvas side).
+
+        Status records are published before the watermark, so a reader that
+        sees the new watermark also sees the statuses it covers.
 
         Args:
-            seq_num: Sequence number to acknowledge
+            seq_num: Sequence number of the last applied command
+            statuses: (seq_num, status) for commands that did not apply
+                      cleanly, in sequence order
         """
         if self.ack_region is None:
             msg = "ACK region not initialized. Call create_regions() first."
             raise RuntimeError(msg)
 
-        ack_bytes = pack_ack(seq_num)
-        self.ack_region.buf[:8] = ack_bytes
+        status_head = self._load_ack_counter(_STATUS_HEAD_OFFSET)
+        for failed_seq, status in statuses:
+            offset = self._status_offset(status_head)
+            self._ack_buf()[offset : offset + ACK_STATUS_STRUCT.size] = pack_ack_status(
+                failed_seq, status
+            )
+            status_head += 1
+        _COUNTER_STRUCT.pack_into(self._ack_buf(), _STATUS_HEAD_OFFSET, status_head)
+        _COUNTER_STRUCT.pack_into(self._ack_buf(), _APPLIED_OFFSET, seq_num)
+        if self.ack_bell is not None:
+            self.ack_bell.ring()
         logger.debug(f"Wrote ACK for seq={seq_num}")
 
+    def applied_seq(self) -> int:
+        """Return the sequence number of the last command the Canvas applied."""
+        if self.ack_region is None:
+            msg = "ACK region not initialized. Call attach_regions() first."
+            raise RuntimeError(msg)
+        return self._load_ack_counter(_APPLIED_OFFSET)
+
     def read_ack(self, timeout: float = 1.0) -> int | None:
-        """Read acknowledgment from shared memory (MCP server side).
+        """Wait for the ACK watermark to advance (MCP server side).
+
+        Do not mix with submit_command() on the same handle: the ACK
+        listener consumes the doorbell this method waits on.
 
         Args:
             timeout: Maximum time to wait for ACK
 
         Returns:
-            Sequence number if ACK received, None otherwise
+            The new watermark if it advanced, None on timeout
         """
         if self.ack_region is None:
             msg = "ACK region not initialized. Call attach_regions() first."
             raise RuntimeError(msg)
 
-        start_time = time.time()
+        deadline = time.monotonic() + timeout
 
         while True:
-            data = bytes(self.ack_region.buf[:8])
+            applied = self._load_ack_counter(_APPLIED_OFFSET)
+            if applied > self._last_ack:
+                self._last_ack = applied
+                logger.debug(f"Read ACK for seq={applied}")
+                return applied
+            if not self._wait(self.ack_bell, deadline):
+                return None
 
-            # Check if data is all zeros (no ACK)
-            if data == bytes(8):
-                if time.time() - start_time >= timeout:
-                    return None
-                time.sleep(0.001)
-                continue
+    def _collect_acks(self) -> None:
+        """Read new status records and resolve futures under the watermark.
 
-            # Unpack ACK
-            try:
-                seq_num = unpack_ack(data)
-                # Clear ACK after reading
-                self.ack_region.buf[:8] = bytes(8)
-                logger.debug(f"Read ACK for seq={seq_num}")
-                return seq_num
-            except struct.error as e:
-                logger.error(f"Error unpacking ACK: {e}")
-                return None
+        Caller must hold ``_pending_lock``.
+        """
+        applied = self._load_ack_counter(_APPLIED_OFFSET)
+        status_head = self._load_ack_counter(_STATUS_HEAD_OFFSET)
+
+        if status_head - self._status_index > ACK_STATUS_CAPACITY:
+            logger.warning(
+                f"ACK status ring {self.name_prefix}_ack overran; "
+                f"{status_head - self._status_index - ACK_STATUS_CAPACITY} "
+                f"status records lost"
+            )
+            self._status_index = status_head - ACK_STATUS_CAPACITY
+        while self._status_index < status_head:
+            offset = self._status_offset(self._status_index)
+            seq_num, status = unpack_ack_status(
+                self._ack_buf()[offset : offset + ACK_STATUS_STRUCT.size]
+            )
+            if seq_num > applied:
+                break  # Belongs to a batch whose watermark is not published yet
+            self._statuses[seq_num] = status
+            self._status_index += 1
+
+        if applied <= self._last_ack and not self._pending:
+            return
+        self._last_ack = max(self._last_ack, applied)
+        for seq_num in [s for s in self._pending if s <= applied]:
+            future = self._pending.pop(seq_num)
+            future.set_result(self._statuses.pop(seq_num, AckStatus.OK))
+        # Statuses for commands nobody is waiting on are no longer needed
+        for seq_num in [s for s in self._statuses if s <= applied]:
+            del self._statuses[seq_num]
+
+    def _listen_for_acks(self) -> None:
+        """Resolve pending futures as ACKs arrive (client-side thread)."""
+        while not self._closing:
+            with self._pending_lock:
+                self._collect_acks()
+            self._wait(self.ack_bell, time.monotonic() + _LISTENER_TICK)
+
+    def submit_command(self, command_type: CommandType, **kwargs: Any) -> CommandFuture:
+        """Write a command and return a future for its acknowledgement.
+
+        The future resolves to the command's AckStatus once the Canvas has
+        applied it.  Commands written with write_command() are acknowledged
+        by the same watermark, so mixing both is fine.
+
+        Args:
+            command_type: Type of command to write
+            **kwargs: Command-specific data
+
+        Returns:
+            Future resolving to the command's AckStatus
+        """
+        seq_num = self.write_command(command_type, **kwargs)
+        future = CommandFuture(seq_num)
+        with self._pending_lock:
+            self._pending[seq_num] = future
+            self._collect_acks()
+            if self._listener is None:
+                self._listener = threading.Thread(
+                    target=self._listen_for_acks,
+                    daemon=True,
+                    name=f"AckListener-{self.name_prefix}",
+                )
+                self._listener.start()
+        return future
 
     def cleanup(self) -> None:
-        """Close and optionally unlink shared memory regions."""
+        """Close and optionally unlink shared memory regions and doorbells."""
+        if self._listener is not None:
+            self._closing = True
+            if self.ack_bell is not None:
+                self.ack_bell.ring()
+            self._listener.join(timeout=_LISTENER_TICK * 2)
+            self._listener = None
+        with self._pending_lock:
+            for future in self._pending.values():
+                future.set_exception(
+                    RuntimeError(f"Connection to {self.name_prefix} closed")
+                )
+            self._pending.clear()
+
+        for bell in (self.cmd_bell, self.ack_bell):
+            if bell is not None:
+                bell.close()
+        self.cmd_bell = None
+        self.ack_bell = None
+
         if self.cmd_region is not None:
             self.cmd_region.close()
             if self.is_creator:
@@ -1,101 +1,108 @@
-"""Binary struct serialization for IPC commands.
+"""Framed binary serialization for IPC commands.
 
-Fixed-size structs for efficient shared memory communication between
-MCP server and Canvas render process.
+Every command travels as a length-prefixed frame::
+
+    [ body_len u32 | version u8 | command_type u8 | flags u8 | pad | seq_num u64 | body ]
+
+The 16-byte header is a fixed struct so the reader can size a frame before
+decoding it; the body is a MessagePack map (see ``ipc.codec``) holding the
+command fields.  Strings are carried at their natural length — nothing is
+padded or truncated — and ADD_WIDGET / UPDATE_WIDGET can carry arbitrary
+property dicts.
+
+A frame too large for the command ring travels as fragments (see
+:func:`split_frame`): frames flagged ``FRAME_FRAGMENT`` whose bodies are
+consecutive slices of the full frame, all with its seq_num, every one but
+the last also flagged ``FRAME_MORE``.
 """
 
 import struct
 from dataclasses import dataclass
 from typing import Any
 
-from champi_imgui.ipc.command_types import CommandType
-
-# Size constants (in bytes)
-MAX_CANVAS_ID_SIZE = 64
-MAX_TITLE_SIZE = 128
-MAX_WIDGET_ID_SIZE = 64
-MAX_WIDGET_TYPE_SIZE = 32
+from champi_imgui.ipc.codec import decode, encode
+from champi_imgui.ipc.command_types import AckStatus, CommandType
 
-# Padding character for fixed-size strings
-PAD_CHAR = b"#"
+# Bumped whenever the header layout or body schema changes incompatibly
+FRAME_VERSION = 1
 
-# Struct definitions
 # Explicit little-endian ('<') ensures consistent wire format on x86-64 and ARM64 (Apple Silicon).
-# '3x' before II pads to 4-byte alignment (offset 73 → 76) so integer fields never
-# land on a misaligned boundary on strict-alignment architectures.
-HEADER_STRUCT = struct.Struct("<QB")  # seq_num + command_type
-
-CLEAR_CANVAS_STRUCT = struct.Struct(
-    f"<QB{MAX_CANVAS_ID_SIZE}s"
-)  # seq_num + cmd_type + canvas_id
-
-UPDATE_TITLE_STRUCT = struct.Struct(
-    f"<QB{MAX_CANVAS_ID_SIZE}s{MAX_TITLE_SIZE}s"
-)  # seq_num + cmd_type + canvas_id + title
-
-UPDATE_SIZE_STRUCT = struct.Struct(
-    f"<QB{MAX_CANVAS_ID_SIZE}s3xII"
-)  # seq_num + cmd_type + canvas_id + (3 pad bytes) + width + height
-
-SHUTDOWN_STRUCT = struct.Struct(
-    f"<QB{MAX_CANVAS_ID_SIZE}s"
-)  # seq_num + cmd_type + canvas_id
-
-# Placeholder for Stage 6
-ADD_WIDGET_STRUCT = struct.Struct(
-    f"<QB{MAX_CANVAS_ID_SIZE}s{MAX_WIDGET_ID_SIZE}s{MAX_WIDGET_TYPE_SIZE}s"
-)  # seq_num + cmd_type + canvas_id + widget_id + widget_type
-
-ACK_STRUCT = struct.Struct("<Q")  # seq_num only
+# The flags byte plus one 'x' pad byte put seq_num at an 8-byte aligned offset
+# so it never lands on a misaligned boundary on strict-alignment architectures.
+FRAME_HEADER_STRUCT = struct.Struct(
+    "<IBBBxQ"
+)  # body_len + version + cmd_type + flags + seq
+FRAME_HEADER_SIZE = FRAME_HEADER_STRUCT.size
+
+# Header flags.  The byte was padding before, so unfragmented frames keep
+# the same bytes.
+FRAME_FRAGMENT = 0x01  # Body is a slice of a larger frame
+FRAME_MORE = 0x02  # More fragments of the same frame follow
+
+# ACK region header: applied-seq watermark + number of status records ever
+# written.  A ring of ACK_STATUS_CAPACITY status records follows the header;
+# only commands that did not apply cleanly get a record.
+ACK_HEADER_STRUCT = struct.Struct("<QQ")
+ACK_HEADER_SIZE = ACK_HEADER_STRUCT.size
+ACK_STATUS_STRUCT = struct.Struct("<QI4x")  # seq_num + AckStatus
+ACK_STATUS_CAPACITY = 256
+
+# Body fields per command type, with the defaults used when a field is omitted.
+# Only these fields are packed, so a command never carries another one's data.
+COMMAND_FIELDS: dict[CommandType, dict[str, Any]] = {
+    CommandType.CREATE_CANVAS: {
+        "canvas_id": "",
+        "title": "Canvas",
+        "width": 800,
+        "height": 600,
+        "fps_target": 60,
+        "cache_draw_lists": True,
+    },
+    CommandType.CLEAR_CANVAS: {"canvas_id": ""},
+    CommandType.UPDATE_TITLE: {"canvas_id": "", "title": ""},
+    CommandType.UPDATE_SIZE: {"canvas_id": "", "width": 800, "height": 600},
+    CommandType.SHUTDOWN: {"canvas_id": ""},
+    CommandType.ADD_WIDGET: {
+        "canvas_id": "",
+        "widget_id": "",
+        "widget_type": "",
+        "properties": {},
+        "parent_id": "",
+    },
+    CommandType.UPDATE_WIDGET: {
+        "canvas_id": "",
+        "widget_id": "",
+        "properties": {},
+        "ops": [],
+    },
+    CommandType.REMOVE_WIDGET: {"canvas_id": "", "widget_id": ""},
+}
 
 
 @dataclass
 class CommandData:
-    """Parsed command data from binary struct."""
+    """Parsed command data from a binary frame."""
 
     command_type: CommandType
     seq_num: int
     data: dict[str, Any]
 
 
-def _pad_string(s: str, size: int) -> bytes:
-    """Pad string to fixed size with PAD_CHAR."""
-    encoded = s.encode("utf-8")[:size]
-    return encoded.ljust(size, PAD_CHAR)
-
-
-def _unpad_string(b: bytes) -> str:
-    """Remove padding from fixed-size string."""
-    return b.rstrip(PAD_CHAR).decode("utf-8", errors="ignore")
-
-
-def get_struct_size(command_type: CommandType) -> int:
-    """Get the size in bytes for a command type."""
-    if command_type == CommandType.CLEAR_CANVAS:
-        return CLEAR_CANVAS_STRUCT.size
-    elif command_type == CommandType.UPDATE_TITLE:
-        return UPDATE_TITLE_STRUCT.size
-    elif command_type == CommandType.UPDATE_SIZE:
-        return UPDATE_SIZE_STRUCT.size
-    elif command_type == CommandType.SHUTDOWN:
-        return SHUTDOWN_STRUCT.size
-    elif command_type == CommandType.ADD_WIDGET:
-        return ADD_WIDGET_STRUCT.size
-    elif command_type == CommandType.ACK:
-        return ACK_STRUCT.size
-    else:
-        # Default to largest struct
-        return max(
-            CLEAR_CANVAS_STRUCT.size,
-            UPDATE_TITLE_STRUCT.size,
-            UPDATE_SIZE_STRUCT.size,
-            SHUTDOWN_STRUCT.size,
-            ADD_WIDGET_STRUCT.size,
-        )
+def frame_size(header: bytes | memoryview) -> int:
+    """Return the total size of a frame from its header bytes.
+
+    Args:
+        header: At least ``FRAME_HEADER_SIZE`` bytes from the start of a frame
+
+    Returns:
+        Header size plus body length
+    """
+    (body_len,) = struct.unpack_from("<I", header, 0)
+    return FRAME_HEADER_SIZE + int(body_len)
 
 
 def pack_command(command_type: CommandType, seq_num: int, **kwargs: Any) -> bytes:
-    """Pack command data into binary struct.
+    """Pack command data into a length-prefixed frame.
 
     Args:
         command_type: Type of command to pack
@@ -103,147 +110,112 @@ def pack_command(command_type: CommandType, seq_num: int, **kwargs: Any) -> byte
         **kwargs: Command-specific data
 
     Returns:
-        Binary struct data
-    """
-    if command_type == CommandType.CLEAR_CANVAS:
-        canvas_id = kwargs.get("canvas_id", "")
-        return CLEAR_CANVAS_STRUCT.pack(
-            seq_num, command_type, _pad_string(canvas_id, MAX_CANVAS_ID_SIZE)
-        )
+        Binary frame data
 
-    elif command_type == CommandType.UPDATE_TITLE:
-        canvas_id = kwargs.get("canvas_id", "")
-        title = kwargs.get("title", "")
-        return UPDATE_TITLE_STRUCT.pack(
-            seq_num,
-            command_type,
-            _pad_string(canvas_id, MAX_CANVAS_ID_SIZE),
-            _pad_string(title, MAX_TITLE_SIZE),
-        )
+    Raises:
+        ValueError: If the command type cannot be sent as a command
+    """
+    fields = COMMAND_FIELDS.get(command_type)
+    if fields is None:
+        msg = f"Unknown command type: {command_type}"
+        raise ValueError(msg)
 
-    elif command_type == CommandType.UPDATE_SIZE:
-        canvas_id = kwargs.get("canvas_id", "")
-        width = kwargs.get("width", 800)
-        height = kwargs.get("height", 600)
-        return UPDATE_SIZE_STRUCT.pack(
-            seq_num,
-            command_type,
-            _pad_string(canvas_id, MAX_CANVAS_ID_SIZE),
-            width,
-            height,
-        )
+    body = encode({name: kwargs.get(name, default) for name, default in fields.items()})
+    header = FRAME_HEADER_STRUCT.pack(
+        len(body), FRAME_VERSION, command_type, 0, seq_num
+    )
+    return header + body
 
-    elif command_type == CommandType.SHUTDOWN:
-        canvas_id = kwargs.get("canvas_id", "")
-        return SHUTDOWN_STRUCT.pack(
-            seq_num, command_type, _pad_string(canvas_id, MAX_CANVAS_ID_SIZE)
-        )
 
-    elif command_type == CommandType.ADD_WIDGET:
-        # Placeholder for Stage 6
-        canvas_id = kwargs.get("canvas_id", "")
-        widget_id = kwargs.get("widget_id", "")
-        widget_type = kwargs.get("widget_type", "")
-        return ADD_WIDGET_STRUCT.pack(
-            seq_num,
-            command_type,
-            _pad_string(canvas_id, MAX_CANVAS_ID_SIZE),
-            _pad_string(widget_id, MAX_WIDGET_ID_SIZE),
-            _pad_string(widget_type, MAX_WIDGET_TYPE_SIZE),
-        )
+def frame_flags(header: bytes | memoryview) -> int:
+    """Return the flags byte of a frame from its header bytes."""
+    return int(FRAME_HEADER_STRUCT.unpack_from(header, 0)[3])
 
-    else:
-        msg = f"Unknown command type: {command_type}"
-        raise ValueError(msg)
 
+def split_frame(frame: bytes, max_size: int) -> list[bytes]:
+    """Split a packed frame into fragment frames of at most *max_size* bytes.
 
-def unpack_command(data: bytes) -> CommandData:
-    """Unpack binary struct into command data.
+    Joining the fragment bodies in order gives back *frame*, which the
+    reader then unpacks as usual.
 
     Args:
-        data: Binary struct data
+        frame: Frame from pack_command()
+        max_size: Largest fragment, header included
 
     Returns:
-        CommandData with parsed fields
-    """
-    # Read header first
-    seq_num, cmd_type_int = HEADER_STRUCT.unpack(data[: HEADER_STRUCT.size])
-    command_type = CommandType(cmd_type_int)
+        Fragment frames, in order
 
-    # Unpack based on command type
-    if command_type == CommandType.CLEAR_CANVAS:
-        seq_num, cmd_type_int, canvas_id_bytes = CLEAR_CANVAS_STRUCT.unpack(data)
-        return CommandData(
-            command_type=command_type,
-            seq_num=seq_num,
-            data={"canvas_id": _unpad_string(canvas_id_bytes)},
+    Raises:
+        ValueError: If *max_size* leaves no room for a body
+    """
+    chunk = max_size - FRAME_HEADER_SIZE
+    if chunk < 1:
+        msg = f"Fragments of {max_size} bytes cannot hold any data"
+        raise ValueError(msg)
+    _, version, command_type, _, seq_num = FRAME_HEADER_STRUCT.unpack_from(frame, 0)
+    fragments = []
+    for start in range(0, len(frame), chunk):
+        body = frame[start : start + chunk]
+        flags = FRAME_FRAGMENT
+        if start + chunk < len(frame):
+            flags |= FRAME_MORE
+        header = FRAME_HEADER_STRUCT.pack(
+            len(body), version, command_type, flags, seq_num
         )
+        fragments.append(header + body)
+    return fragments
 
-    elif command_type == CommandType.UPDATE_TITLE:
-        seq_num, cmd_type_int, canvas_id_bytes, title_bytes = (
-            UPDATE_TITLE_STRUCT.unpack(data)
-        )
-        return CommandData(
-            command_type=command_type,
-            seq_num=seq_num,
-            data={
-                "canvas_id": _unpad_string(canvas_id_bytes),
-                "title": _unpad_string(title_bytes),
-            },
-        )
 
-    elif command_type == CommandType.UPDATE_SIZE:
-        seq_num, cmd_type_int, canvas_id_bytes, width, height = (
-            UPDATE_SIZE_STRUCT.unpack(data)
-        )
-        return CommandData(
-            command_type=command_type,
-            seq_num=seq_num,
-            data={
-                "canvas_id": _unpad_string(canvas_id_bytes),
-                "width": width,
-                "height": height,
-            },
-        )
+def unpack_command(data: bytes | memoryview) -> CommandData:
+    """Unpack a binary frame into command data.
 
-    elif command_type == CommandType.SHUTDOWN:
-        seq_num, cmd_type_int, canvas_id_bytes = SHUTDOWN_STRUCT.unpack(data)
-        return CommandData(
-            command_type=command_type,
-            seq_num=seq_num,
-            data={"canvas_id": _unpad_string(canvas_id_bytes)},
-        )
+    Args:
+        data: Frame bytes (anything after the frame is ignored)
 
-    elif command_type == CommandType.ADD_WIDGET:
-        # Placeholder for Stage 6
-        (
-            seq_num,
-            cmd_type_int,
-            canvas_id_bytes,
-            widget_id_bytes,
-            widget_type_bytes,
-        ) = ADD_WIDGET_STRUCT.unpack(data)
-        return CommandData(
-            command_type=command_type,
-            seq_num=seq_num,
-            data={
-                "canvas_id": _unpad_string(canvas_id_bytes),
-                "widget_id": _unpad_string(widget_id_bytes),
-                "widget_type": _unpad_string(widget_type_bytes),
-            },
-        )
+    Returns:
+        CommandData with parsed fields
 
-    else:
+    Raises:
+        ValueError: If the frame is truncated, has an unknown version or
+                    command type, or its body is not a valid map
+    """
+    if len(data) < FRAME_HEADER_SIZE:
+        msg = f"Frame too short: {len(data)} bytes"
+        raise ValueError(msg)
+
+    body_len, version, cmd_type_int, flags, seq_num = FRAME_HEADER_STRUCT.unpack_from(
+        data, 0
+    )
+    if flags & FRAME_FRAGMENT:
+        msg = "Frame is a fragment; join the fragments before unpacking"
+        raise ValueError(msg)
+    if version != FRAME_VERSION:
+        msg = f"Unsupported frame version: {version}"
+        raise ValueError(msg)
+    command_type = CommandType(cmd_type_int)
+    if command_type not in COMMAND_FIELDS:
         msg = f"Unknown command type: {command_type}"
         raise ValueError(msg)
 
+    end = FRAME_HEADER_SIZE + body_len
+    if len(data) < end:
+        msg = f"Frame truncated: expected {end} bytes, got {len(data)}"
+        raise ValueError(msg)
+
+    body = decode(memoryview(data)[FRAME_HEADER_SIZE:end])
+    if not isinstance(body, dict):
+        msg = "Frame body is not a map"
+        raise ValueError(msg)
+
+    return CommandData(command_type=command_type, seq_num=seq_num, data=body)
+
 
-def pack_ack(seq_num: int) -> bytes:
-    """Pack acknowledgment with sequence number."""
-    return ACK_STRUCT.pack(seq_num)
+def pack_ack_status(seq_num: int, status: AckStatus) -> bytes:
+    """Pack a per-command status record."""
+    return ACK_STATUS_STRUCT.pack(seq_num, status)
 
 
-def unpack_ack(data: bytes) -> int:
-    """Unpack acknowledgment to get sequence number."""
-    result = ACK_STRUCT.unpack(data)
-    return int(result[0])
+def unpack_ack_status(data: bytes | memoryview) -> tuple[int, AckStatus]:
+    """Unpack a per-command status record into (seq_num, status)."""
+    seq_num, status = ACK_STATUS_STRUCT.unpack(data)
+    return int(seq_num), AckStatus(status)
@@ -7,6 +7,8 @@ from typing import Any
 from imgui_bundle import imgui
 from loguru import logger
 
+from champi_imgui.core.state import style_changed
+
 
 class ColorScheme(Enum):
     """Built-in color schemes."""
@@ -140,6 +142,7 @@ class ThemeManager:
         self.current_theme = theme
         self._apply_colors(theme.colors)
         self._apply_style(theme.style)
+        style_changed.send(self)
         logger.info(f"Applied theme: {theme.name}")
 
     def apply_theme_by_name(self, name: str) -> bool:
@@ -165,6 +168,7 @@ class ThemeManager:
             imgui.style_colors_light()
         elif scheme == ColorScheme.CLASSIC:
             imgui.style_colors_classic()
+        style_changed.send(self)
         logger.info(f"Applied color scheme: {scheme.value}")
 
     def get_current_theme(self) -> Theme | None:
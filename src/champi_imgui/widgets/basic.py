@@ -427,6 +427,7 @@ class InputTextWidget(Widget):
         """
         self._value = value
         self.state.properties["value"] = value
+        self.mark_dirty()
 
 
 class CheckboxWidget(Widget):
@@ -485,3 +486,4 @@ class CheckboxWidget(Widget):
         """
         self._checked = checked
         self.state.properties["checked"] = checked
+        self.mark_dirty()
@@ -70,6 +70,7 @@ class ColorEdit3Widget(Widget):
         """
         self._color = list(color)
         self.state.properties["color"] = color
+        self.mark_dirty()
 
 
 class ColorEdit4Widget(Widget):
@@ -131,6 +132,7 @@ class ColorEdit4Widget(Widget):
         """
         self._color = list(color)
         self.state.properties["color"] = color
+        self.mark_dirty()
 
 
 class ColorPicker3Widget(Widget):
@@ -192,6 +194,7 @@ class ColorPicker3Widget(Widget):
         """
         self._color = list(color)
         self.state.properties["color"] = color
+        self.mark_dirty()
 
 
 class ColorPickerWidget(Widget):
@@ -266,6 +269,7 @@ class ColorPickerWidget(Widget):
         """
         self._color = list(color)
         self.state.properties["color"] = color
+        self.mark_dirty()
 
 
 class ColorButtonWidget(Widget):
@@ -331,3 +335,4 @@ class ColorButtonWidget(Widget):
         """
         self._color = list(color)
         self.state.properties["color"] = color
+        self.mark_dirty()
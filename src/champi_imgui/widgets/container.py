@@ -191,6 +191,7 @@ class TabItemWidget(Widget):
     def add_child(self, widget: "Widget") -> None:
         widget._parent_id = self.widget_id
         self._children.append(widget)
+        self.mark_dirty()
 
     def render(self) -> bool:
         """Render the tab item and its children. Must be called inside begin_tab_bar."""
@@ -233,6 +234,7 @@ class TabBarWidget(Widget):
     def add_tab_item(self, tab_item: TabItemWidget) -> None:
         tab_item._parent_id = self.widget_id
         self._tab_items.append(tab_item)
+        self.mark_dirty()
 
     def render(self) -> str | None:
         """Render the tab bar and all owned tab items.
@@ -155,6 +155,7 @@ class PlotLinesWidget(Widget):
             values: New list of float values to display
         """
         self.state.properties["values"] = list(values)
+        self.mark_dirty()
 
     def render(self) -> None:
         """Render the plot lines graph."""
@@ -14,6 +14,7 @@ from imgui_bundle import imgui
 from loguru import logger
 
 from champi_imgui.core.widget import Widget
+from champi_imgui.ipc.array_arena import is_array_ref, resolve_array
 
 AUTHOR_COLORS: dict[str, tuple[float, float, float, float]] = {
     "user": (0.1, 0.1, 0.1, 1.0),
@@ -34,6 +35,8 @@ class DrawingWidget(Widget):
     using ImGui draw list primitives.
     """
 
+    remote_methods = frozenset({"add_shape", "add_annotation", "clear", "undo", "redo"})
+
     def __init__(
         self,
         widget_id: str,
@@ -126,6 +129,8 @@ class DrawingWidget(Widget):
         _default_color: tuple[float, float, float, float] = (0.1, 0.1, 0.1, 1.0)
         for stroke in strokes:
             points = stroke["points"]
+            if is_array_ref(points):
+                points = resolve_array(points)
             if len(points) >= 2:
                 stroke_color: tuple[float, float, float, float] = stroke.get(
                     "color"
@@ -422,6 +427,19 @@ class DrawingWidget(Widget):
         shapes: list[dict[str, Any]] = self.state.properties.get("shapes", [])
         shapes.append(shape)
         self.state.properties["shapes"] = shapes
+        self.mark_dirty()
+
+    def check_item_update(
+        self, key: str, item: dict[str, Any], fields: dict[str, Any]
+    ) -> None:
+        """Reject filling a shape type that does not support fill."""
+        if key == "shapes" and fields.get("filled"):
+            shape_type = item.get("type")
+            if shape_type not in FILL_SUPPORTED_TYPES:
+                raise ValueError(
+                    f"Shape type '{shape_type}' does not support fill; "
+                    f"only {sorted(FILL_SUPPORTED_TYPES)} do"
+                )
 
     def add_annotation(
         self,
@@ -451,10 +469,12 @@ class DrawingWidget(Widget):
         annotations: list[dict[str, Any]] = self.state.properties.get("annotations", [])
         annotations.append(annotation)
         self.state.properties["annotations"] = annotations
+        self.mark_dirty()
 
     def clear_shapes(self) -> None:
         """Remove all shapes from the canvas."""
         self.state.properties["shapes"] = []
+        self.mark_dirty()
 
     def clear(self) -> None:
         """Clear all strokes, shapes, and annotations from the canvas."""
@@ -463,6 +483,7 @@ class DrawingWidget(Widget):
         self.clear_shapes()
         self.state.properties["annotations"] = []
         self.state.properties["redo_stack"] = []
+        self.mark_dirty()
 
     @property
     def can_undo(self) -> bool:
@@ -484,6 +505,7 @@ class DrawingWidget(Widget):
             redo_stack.append(strokes.pop())
             self.state.properties["strokes"] = strokes
             self.state.properties["redo_stack"] = redo_stack
+            self.mark_dirty()
 
     def redo(self) -> None:
         """Restore the last undone stroke from the redo stack."""
@@ -493,6 +515,7 @@ class DrawingWidget(Widget):
             strokes.append(redo_stack.pop())
             self.state.properties["strokes"] = strokes
             self.state.properties["redo_stack"] = redo_stack
+            self.mark_dirty()
 
     def get_strokes_by_author(self, author: str) -> list[dict[str, Any]]:
         """Return all strokes drawn by the given author.
@@ -564,6 +587,7 @@ class BrushWidget(Widget):
         props = self._linked_drawing.state.properties
         for key in ("color", "brush_size", "is_eraser", "brush_style"):
             props[key] = self.state.properties[key]
+        self._linked_drawing.mark_dirty()
 
     def render(self) -> None:  # pragma: no cover
         """Render brush controls."""
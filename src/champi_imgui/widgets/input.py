@@ -69,6 +69,7 @@ class InputIntWidget(Widget):
         """Set value."""
         self._value = value
         self.state.properties["value"] = value
+        self.mark_dirty()
 
 
 class InputFloatWidget(Widget):
@@ -135,6 +136,7 @@ class InputFloatWidget(Widget):
         """Set value."""
         self._value = value
         self.state.properties["value"] = value
+        self.mark_dirty()
 
 
 class InputDoubleWidget(Widget):
@@ -201,6 +203,7 @@ class InputDoubleWidget(Widget):
         """Set value."""
         self._value = value
         self.state.properties["value"] = value
+        self.mark_dirty()
 
 
 class InputScalarWidget(Widget):
@@ -300,6 +303,7 @@ class RadioButtonWidget(Widget):
         """Set active state."""
         self._active = active
         self.state.properties["active"] = active
+        self.mark_dirty()
 
 
 class ComboWidget(Widget):
@@ -367,6 +371,7 @@ class ComboWidget(Widget):
     def set_items(self, items: list[str]) -> None:
         """Set the items list."""
         self.state.properties["items"] = items
+        self.mark_dirty()
 
 
 class ListBoxWidget(Widget):
@@ -492,6 +497,7 @@ class SelectableWidget(Widget):
         """Set selected state."""
         self._selected = selected
         self.state.properties["selected"] = selected
+        self.mark_dirty()
 
 
 class CheckboxFlagsWidget(Widget):
@@ -548,3 +554,4 @@ class CheckboxFlagsWidget(Widget):
         """Set flags value."""
         self._flags = flags
         self.state.properties["flags"] = flags
+        self.mark_dirty()
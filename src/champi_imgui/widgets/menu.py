@@ -241,6 +241,7 @@ class PopupWidget(Widget):
         """Open the popup."""
         self.state.properties["is_open"] = True
         imgui.open_popup(self.widget_id)
+        self.mark_dirty()
 
     def render(self) -> bool:
         """Render the popup.
@@ -267,6 +268,7 @@ class PopupWidget(Widget):
         """Close the popup."""
         self.state.properties["is_open"] = False
         imgui.close_current_popup()
+        self.mark_dirty()
 
 
 class ContextMenuWidget(Widget):
@@ -1,9 +1,16 @@
 """Advanced plotting widgets using ImPlot."""
 
+import time
+
 import numpy as np
 from imgui_bundle import imgui, implot
 
 from champi_imgui.core.widget import Widget
+from champi_imgui.ipc.array_arena import ArrayRef, array_generation, resolve_array
+
+# Seconds a plot keeps redrawing after its shared arrays were last published;
+# longer than the idle heartbeat, so a steady producer never lets it idle
+_LIVE_GRACE = 2.0
 
 
 class PlotWidget(Widget):
@@ -23,6 +30,9 @@ class PlotWidget(Widget):
         props["y_label"] = props.get("y_label", "Y")
         props["legend"] = props.get("legend", True)
         super().__init__(widget_id, **props)
+        # Shared-array generations seen last, and when they last changed
+        self._generations: dict[str, int | None] = {}
+        self._live_until = 0.0
 
     def begin_plot(self) -> bool:
         """Begin plot rendering."""
@@ -32,6 +42,30 @@ class PlotWidget(Widget):
 
         return implot.begin_plot(title, imgui.ImVec2(*size), flags)
 
+    def get_series(self, *keys: str) -> list[np.ndarray]:
+        """Resolve data properties to arrays sharing one float dtype.
+
+        Properties may hold plain lists or shared array references (see
+        ``ipc.array_arena``); references resolve to views of shared memory
+        and are only copied if their dtypes differ.
+        """
+        arrays = [resolve_array(self.state.properties.get(key)) for key in keys]
+        dtype = np.result_type(*arrays)
+        if dtype not in (np.float32, np.float64):
+            dtype = np.dtype(np.float64)
+        return [array.astype(dtype, copy=False) for array in arrays]
+
+    def is_animating(self) -> bool:
+        """Keep redrawing while the producer publishes new shared array data."""
+        if not self._array_handles:
+            return False
+        generations = {h: array_generation(h) for h in self._array_handles}
+        now = time.monotonic()
+        if generations != self._generations:
+            self._generations = generations
+            self._live_until = now + _LIVE_GRACE
+        return now < self._live_until
+
     def end_plot(self) -> None:
         """End plot rendering."""
         implot.end_plot()
@@ -56,8 +90,8 @@ class LineChartWidget(PlotWidget):
         self,
         widget_id: str,
         title: str = "Line Chart",
-        x_data: list[float] | None = None,
-        y_data: list[float] | None = None,
+        x_data: list[float] | ArrayRef | None = None,
+        y_data: list[float] | ArrayRef | None = None,
         **props,
     ):
         """Initialize line chart."""
@@ -71,16 +105,11 @@ class LineChartWidget(PlotWidget):
         if self.begin_plot():
             self.setup_axes()
 
-            x_data = self.state.properties.get("x_data", [])
-            y_data = self.state.properties.get("y_data", [])
+            x_data, y_data = self.get_series("x_data", "y_data")
             line_label = self.state.properties.get("line_label", "Line")
 
-            if x_data and y_data and len(x_data) == len(y_data):
-                implot.plot_line(
-                    line_label,
-                    np.array(x_data, dtype=np.float64),
-                    np.array(y_data, dtype=np.float64),
-                )
+            if x_data.size and y_data.size and len(x_data) == len(y_data):
+                implot.plot_line(line_label, x_data, y_data)
 
             self.end_plot()
 
@@ -92,7 +121,7 @@ class BarChartWidget(PlotWidget):
         self,
         widget_id: str,
         title: str = "Bar Chart",
-        values: list[float] | None = None,
+        values: list[float] | ArrayRef | None = None,
         labels: list[str] | None = None,
         **props,
     ):
@@ -108,16 +137,12 @@ class BarChartWidget(PlotWidget):
         if self.begin_plot():
             self.setup_axes()
 
-            values = self.state.properties.get("values", [])
+            (values,) = self.get_series("values")
             bar_label = self.state.properties.get("bar_label", "Bars")
             bar_width = self.state.properties.get("bar_width", 0.67)
 
-            if values:
-                implot.plot_bars(
-                    bar_label,
-                    np.array(values, dtype=np.float64),
-                    bar_width,
-                )
+            if values.size:
+                implot.plot_bars(bar_label, values, bar_width)
 
             self.end_plot()
 
@@ -129,8 +154,8 @@ class ScatterPlotWidget(PlotWidget):
         self,
         widget_id: str,
         title: str = "Scatter Plot",
-        x_data: list[float] | None = None,
-        y_data: list[float] | None = None,
+        x_data: list[float] | ArrayRef | None = None,
+        y_data: list[float] | ArrayRef | None = None,
         **props,
     ):
         """Initialize scatter plot."""
@@ -144,16 +169,11 @@ class ScatterPlotWidget(PlotWidget):
         if self.begin_plot():
             self.setup_axes()
 
-            x_data = self.state.properties.get("x_data", [])
-            y_data = self.state.properties.get("y_data", [])
+            x_data, y_data = self.get_series("x_data", "y_data")
             scatter_label = self.state.properties.get("scatter_label", "Points")
 
-            if x_data and y_data and len(x_data) == len(y_data):
-                implot.plot_scatter(
-                    scatter_label,
-                    np.array(x_data, dtype=np.float64),
-                    np.array(y_data, dtype=np.float64),
-                )
+            if x_data.size and y_data.size and len(x_data) == len(y_data):
+                implot.plot_scatter(scatter_label, x_data, y_data)
 
             self.end_plot()
 
@@ -165,7 +185,7 @@ class HistogramWidget(PlotWidget):
         self,
         widget_id: str,
         title: str = "Histogram",
-        values: list[float] | None = None,
+        values: list[float] | ArrayRef | None = None,
         bins: int = 10,
         **props,
     ):
@@ -180,18 +200,14 @@ class HistogramWidget(PlotWidget):
         if self.begin_plot():
             self.setup_axes()
 
-            values = self.state.properties.get("values", [])
+            (values,) = self.get_series("values")
             bins = self.state.properties.get("bins", 10)
             histogram_label = self.state.properties.get(
                 "histogram_label", "Distribution"
             )
 
-            if values:
-                implot.plot_histogram(
-                    histogram_label,
-                    np.array(values, dtype=np.float64),
-                    bins,
-                )
+            if values.size:
+                implot.plot_histogram(histogram_label, values, bins)
 
             self.end_plot()
 
@@ -203,7 +219,7 @@ class HeatmapWidget(PlotWidget):
         self,
         widget_id: str,
         title: str = "Heatmap",
-        values: list[list[float]] | None = None,
+        values: list[list[float]] | ArrayRef | None = None,
         **props,
     ):
         """Initialize heatmap."""
@@ -218,13 +234,12 @@ class HeatmapWidget(PlotWidget):
         if self.begin_plot():
             self.setup_axes()
 
-            values = self.state.properties.get("values", [])
+            (arr,) = self.get_series("values")
             heatmap_label = self.state.properties.get("heatmap_label", "Heatmap")
             scale_min = self.state.properties.get("scale_min", 0.0)
             scale_max = self.state.properties.get("scale_max", 1.0)
 
-            if values and len(values) > 0 and len(values[0]) > 0:
-                arr = np.array(values, dtype=np.float64)
+            if arr.ndim == 2 and arr.size:
                 implot.plot_heatmap(
                     heatmap_label,
                     arr,
@@ -281,6 +296,8 @@ class PieChartWidget(Widget):
 class RealtimePlotWidget(PlotWidget):
     """Realtime scrolling plot widget."""
 
+    remote_methods = frozenset({"add_point"})
+
     def __init__(
         self,
         widget_id: str,
@@ -305,6 +322,7 @@ class RealtimePlotWidget(PlotWidget):
             data.pop(0)
 
         self.state.properties["data"] = data
+        self.mark_dirty()
 
     def render(self) -> None:
         """Render realtime plot."""
@@ -334,9 +352,9 @@ class ErrorBarsWidget(PlotWidget):
         self,
         widget_id: str,
         title: str = "Error Bars",
-        x_data: list[float] | None = None,
-        y_data: list[float] | None = None,
-        y_errors: list[float] | None = None,
+        x_data: list[float] | ArrayRef | None = None,
+        y_data: list[float] | ArrayRef | None = None,
+        y_errors: list[float] | ArrayRef | None = None,
         **props,
     ):
         """Initialize error bars plot."""
@@ -351,20 +369,10 @@ class ErrorBarsWidget(PlotWidget):
         if self.begin_plot():
             self.setup_axes()
 
-            x_data = self.state.properties.get("x_data", [])
-            y_data = self.state.properties.get("y_data", [])
-            y_errors = self.state.properties.get("y_errors", [])
+            xs, ys, errs = self.get_series("x_data", "y_data", "y_errors")
             error_label = self.state.properties.get("error_label", "Data")
 
-            if (
-                x_data
-                and y_data
-                and y_errors
-                and len(x_data) == len(y_data) == len(y_errors)
-            ):
-                xs = np.array(x_data, dtype=np.float64)
-                ys = np.array(y_data, dtype=np.float64)
-                errs = np.array(y_errors, dtype=np.float64)
+            if xs.size and ys.size and errs.size and len(xs) == len(ys) == len(errs):
                 implot.plot_error_bars(error_label, xs, ys, errs)
                 implot.plot_line(error_label, xs, ys)
 
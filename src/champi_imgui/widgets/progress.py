@@ -64,6 +64,7 @@ class ProgressBarWidget(Widget):
         """
         self._fraction = max(0.0, min(1.0, fraction))
         self.state.properties["fraction"] = self._fraction
+        self.mark_dirty()
 
 
 class LoadingIndicatorWidget(Widget):
@@ -94,6 +95,10 @@ class LoadingIndicatorWidget(Widget):
         props["color"] = color
         super().__init__(widget_id, **props)
 
+    def is_animating(self) -> bool:
+        """The spinner turns every frame while visible."""
+        return self.state.visible
+
     def render(self) -> None:
         """Render the loading indicator."""
         if not self.state.visible:
@@ -196,6 +201,7 @@ class StatusBarWidget(Widget):
         """
         self._text = text
         self.state.properties["text"] = text
+        self.mark_dirty()
 
     def get_progress_fraction(self) -> float:
         """Get current progress fraction.
@@ -213,6 +219,7 @@ class StatusBarWidget(Widget):
         """
         self._progress_fraction = max(0.0, min(1.0, fraction))
         self.state.properties["progress_fraction"] = self._progress_fraction
+        self.mark_dirty()
 
     def set_show_progress(self, show: bool) -> None:
         """Set whether to show progress bar.
@@ -221,3 +228,4 @@ class StatusBarWidget(Widget):
             show: True to show progress bar, False to hide
         """
         self.state.properties["show_progress"] = show
+        self.mark_dirty()
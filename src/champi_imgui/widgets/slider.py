@@ -85,6 +85,7 @@ class SliderIntWidget(Widget):
         """
         self._value = value
         self.state.properties["value"] = value
+        self.mark_dirty()
 
 
 class SliderFloatWidget(Widget):
@@ -159,6 +160,7 @@ class SliderFloatWidget(Widget):
         """
         self._value = value
         self.state.properties["value"] = value
+        self.mark_dirty()
 
 
 class DragIntWidget(Widget):
@@ -237,6 +239,7 @@ class DragIntWidget(Widget):
         """
         self._value = value
         self.state.properties["value"] = value
+        self.mark_dirty()
 
 
 class DragFloatWidget(Widget):
@@ -315,3 +318,4 @@ class DragFloatWidget(Widget):
         """
         self._value = value
         self.state.properties["value"] = value
+        self.mark_dirty()
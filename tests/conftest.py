@@ -0,0 +1,27 @@
+"""Shared fixtures for tests that drive Dear ImGui frames without a window."""
+
+import pytest
+from imgui_bundle import imgui
+
+
+@pytest.fixture()
+def display_size() -> tuple[float, float]:
+    """Display size of imgui_context; override in a module to change it."""
+    return (1280, 720)
+
+
+@pytest.fixture()
+def imgui_context(display_size):
+    """A fresh, current ImGui context with a software-ready IO; yields the IO."""
+    previous = imgui.get_current_context()
+    ctx = imgui.create_context()
+    # create_context() keeps an existing context current; use ours
+    imgui.set_current_context(ctx)
+    io = imgui.get_io()
+    io.display_size = imgui.ImVec2(*display_size)
+    io.backend_flags |= imgui.BackendFlags_.renderer_has_textures
+    io.set_ini_filename(None)
+    yield io
+    imgui.destroy_context(ctx)
+    if previous is not None:
+        imgui.set_current_context(previous)
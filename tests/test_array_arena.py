@@ -0,0 +1,234 @@
+"""Tests for the shared-memory array arena.
+
+Covers: arrays written once by a producer resolve to zero-copy views on the
+reader side, in-place producer writes are visible, dtype/shape validation,
+release semantics, widgets detaching arrays they drop, plot widgets
+consuming array references and only animating while the producer publishes,
+and segments closing once the last view of them is dropped.
+"""
+
+import gc
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+import champi_imgui.ipc.array_arena as array_arena
+import champi_imgui.widgets.plotting as plotting
+from champi_imgui.core.widget import WidgetRegistry
+from champi_imgui.ipc.array_arena import (
+    ArrayArena,
+    array_generation,
+    array_handles,
+    array_ref,
+    attach_array,
+    detach_array,
+    is_array_ref,
+    resolve_array,
+)
+from champi_imgui.widgets.plotting import HeatmapWidget, LineChartWidget
+
+
+@pytest.fixture()
+def arena():
+    arena = ArrayArena()
+    yield arena
+    for handle in arena.handles():
+        detach_array(handle)
+    arena.cleanup()
+
+
+def test_put_and_resolve_round_trip(arena):
+    handle = arena.put(np.linspace(0.0, 1.0, 1000))
+    view = resolve_array(array_ref(handle))
+    assert view.dtype == np.float64
+    assert view.shape == (1000,)
+    assert view[-1] == 1.0
+
+
+def test_resolved_view_is_cached_and_read_only(arena):
+    handle = arena.put([1.0, 2.0, 3.0])
+    first = attach_array(handle)
+    assert attach_array(handle) is first
+    assert not first.flags.writeable
+
+
+def test_producer_writes_are_visible_without_copy(arena):
+    handle, writer = arena.allocate((4, 2), np.float32)
+    reader = resolve_array(array_ref(handle))
+    writer[2, 1] = 7.5
+    assert reader.dtype == np.float32
+    assert reader[2, 1] == 7.5
+
+
+def test_put_keeps_float32(arena):
+    handle = arena.put(np.ones(3, dtype=np.float32))
+    assert resolve_array(array_ref(handle)).dtype == np.float32
+
+
+def test_unsupported_dtype_rejected(arena):
+    with pytest.raises(ValueError, match="dtype"):
+        arena.allocate(3, np.int64)
+
+
+def test_too_many_dimensions_rejected(arena):
+    with pytest.raises(ValueError, match="dimensions"):
+        arena.allocate((1, 1, 1, 1, 1))
+
+
+def test_released_array_cannot_be_attached():
+    arena = ArrayArena()
+    handle = arena.put([1.0])
+    arena.release(handle)
+    with pytest.raises(FileNotFoundError):
+        attach_array(handle)
+
+
+def test_released_array_stops_resolving(arena):
+    handle = arena.put([1.0, 2.0])
+    assert resolve_array(array_ref(handle)).size == 2
+
+    arena.release(handle)
+
+    assert resolve_array(array_ref(handle)).size == 0
+    assert handle not in array_arena._attached
+
+
+def test_missing_array_resolves_empty():
+    assert resolve_array(array_ref("canvas_arr_missing")).size == 0
+    detach_array("canvas_arr_missing")
+
+
+def test_array_handles_finds_nested_refs():
+    strokes = [
+        {"points": array_ref("a"), "color": [1.0, 0.0, 0.0, 1.0]},
+        {"points": [[0.0, 0.0], [1.0, 1.0]]},
+    ]
+    props = {"strokes": strokes, "x_data": array_ref("b"), "y_data": [1.0]}
+    assert array_handles(props) == {"a", "b"}
+
+
+def test_replaced_ref_is_detached(arena):
+    old, new = arena.put([1.0]), arena.put([2.0])
+    widget = LineChartWidget("line", y_data=array_ref(old))
+    widget.get_series("y_data")
+    assert old in array_arena._attached
+
+    widget.update(y_data=array_ref(new))
+
+    assert old not in array_arena._attached
+
+
+def test_removed_and_cleared_widgets_detach(arena):
+    first, second = arena.put([1.0]), arena.put([2.0])
+    registry = WidgetRegistry()
+    for widget_id, handle in (("a", first), ("b", second)):
+        widget = LineChartWidget(widget_id, y_data=array_ref(handle))
+        widget.get_series("y_data")
+        registry.add(widget)
+
+    registry.remove("a")
+    assert first not in array_arena._attached
+    assert second in array_arena._attached
+
+    registry.clear()
+    assert second not in array_arena._attached
+
+
+def test_resolve_plain_values():
+    assert resolve_array([1, 2]).dtype == np.float64
+    assert resolve_array(None).size == 0
+    assert not is_array_ref([1.0])
+    assert is_array_ref(array_ref("x"))
+
+
+def test_line_chart_plots_shared_views(arena, monkeypatch):
+    x_handle = arena.put(np.arange(10, dtype=np.float64))
+    y_handle = arena.put(np.arange(10, dtype=np.float64) ** 2)
+    fake_implot = MagicMock()
+    fake_implot.begin_plot.return_value = True
+    monkeypatch.setattr(plotting, "implot", fake_implot)
+    monkeypatch.setattr(plotting, "imgui", MagicMock())
+
+    widget = LineChartWidget(
+        "line", x_data=array_ref(x_handle), y_data=array_ref(y_handle)
+    )
+    widget.render()
+
+    _, xs, ys = fake_implot.plot_line.call_args.args
+    assert xs is attach_array(x_handle)
+    assert ys is attach_array(y_handle)
+
+
+def test_mixed_dtypes_are_unified(arena):
+    handle = arena.put(np.arange(3, dtype=np.float32))
+    widget = LineChartWidget("line", x_data=[0, 1, 2], y_data=array_ref(handle))
+    xs, ys = widget.get_series("x_data", "y_data")
+    assert xs.dtype == ys.dtype == np.float64
+
+
+def test_heatmap_accepts_shared_2d_array(arena, monkeypatch):
+    handle = arena.put(np.zeros((8, 16)))
+    fake_implot = MagicMock()
+    fake_implot.begin_plot.return_value = True
+    monkeypatch.setattr(plotting, "implot", fake_implot)
+    monkeypatch.setattr(plotting, "imgui", MagicMock())
+
+    HeatmapWidget("heat", values=array_ref(handle)).render()
+
+    assert fake_implot.plot_heatmap.call_args.args[1].shape == (8, 16)
+
+
+def test_publish_bumps_generation(arena):
+    handle, view = arena.allocate(3)
+    attach_array(handle)
+    assert array_generation(handle) == 0
+
+    view[0] = 1.0
+    assert arena.publish(handle) == 1
+    assert array_generation(handle) == 1
+
+
+def test_plot_animates_only_while_published(arena, monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr(plotting.time, "monotonic", lambda: clock[0])
+    handle = arena.put([1.0, 2.0])
+    widget = LineChartWidget("line", y_data=array_ref(handle))
+    widget.get_series("y_data")
+
+    assert widget.is_animating() is True
+    clock[0] += plotting._LIVE_GRACE + 0.1
+    assert widget.is_animating() is False
+
+    arena.publish(handle)
+    assert widget.is_animating() is True
+
+
+def test_plain_plot_does_not_animate():
+    assert LineChartWidget("line", y_data=[1.0, 2.0]).is_animating() is False
+
+
+def test_detach_closes_segment_once_views_die(arena):
+    handle = arena.put([1.0, 2.0, 3.0])
+    held = resolve_array(array_ref(handle))[1:]
+    shm = array_arena._attached[handle][0]
+
+    detach_array(handle)
+    assert shm._mmap is not None
+
+    del held
+    gc.collect()
+    assert shm._mmap is None
+
+
+def test_release_closes_segment_once_views_die():
+    arena = ArrayArena()
+    handle, view = arena.allocate(2)
+    shm = arena._segments[handle]
+
+    arena.release(handle)
+    assert shm._mmap is not None
+
+    del view
+    gc.collect()
+    assert shm._mmap is None
@@ -0,0 +1,132 @@
+"""Tests for the per-canvas client handles pooled by CanvasManager.
+
+Covers: handles are attached once and reused, sequence numbers keep
+increasing across tool calls, concurrent senders are serialized, a blocked
+write to one canvas does not hold up the others, and the handle is released
+when the canvas shuts down.
+"""
+
+import contextlib
+import threading
+import uuid
+
+import pytest
+
+from champi_imgui.api.server import create_mcp_app
+from champi_imgui.core.canvas import CanvasManager
+from champi_imgui.ipc.command_types import CommandType
+
+
+def _fn(mcp, name):
+    return mcp._local_provider._components[f"tool:{name}@"].fn
+
+
+@pytest.fixture()
+def cid() -> str:
+    return f"c_{uuid.uuid4().hex[:8]}"
+
+
+@pytest.fixture()
+def manager(monkeypatch):
+    mgr = CanvasManager()
+    monkeypatch.setattr(mgr, "ensure_canvas_running", lambda canvas_id: True)
+    yield mgr
+    for canvas in list(mgr.canvases.values()):
+        with contextlib.suppress(Exception):
+            canvas.shm_manager.cleanup()
+    mgr.cleanup()
+
+
+def test_client_is_attached_once(manager, cid):
+    manager.create_canvas(cid, auto_start=False)
+    assert manager.get_client(cid) is manager.get_client(cid)
+
+
+def test_seq_numbers_increase_across_tool_calls(manager, cid):
+    canvas = manager.create_canvas(cid, auto_start=False)
+    canvas._running = True
+    mcp = create_mcp_app(canvas_manager=manager)
+
+    first = _fn(mcp, "clear_canvas")(cid)
+    second = _fn(mcp, "update_canvas_state")(cid, title="T", width=10, height=20)
+    third = _fn(mcp, "clear_canvas")(cid)
+
+    assert first["data"]["seq_num"] == 1
+    assert second["data"]["seq_num"] == 3
+    assert third["data"]["seq_num"] == 4
+    assert [c.seq_num for c in canvas.shm_manager.drain_commands()] == [1, 2, 3, 4]
+
+
+def test_concurrent_senders_are_serialized(manager, cid):
+    canvas = manager.create_canvas(cid, auto_start=False)
+    seqs: list[int] = []
+    lock = threading.Lock()
+
+    def _send() -> None:
+        for _ in range(50):
+            seq = manager.send_command(cid, CommandType.UPDATE_TITLE, title="x")
+            with lock:
+                seqs.append(seq)
+
+    threads = [threading.Thread(target=_send) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(seqs) == list(range(1, 201))
+    drained = canvas.shm_manager.drain_commands()
+    assert [c.seq_num for c in drained] == list(range(1, 201))
+
+
+def test_blocked_write_does_not_stall_other_canvases(manager):
+    slow, fast = f"c_{uuid.uuid4().hex[:8]}", f"c_{uuid.uuid4().hex[:8]}"
+    manager.create_canvas(slow, auto_start=False)
+    manager.create_canvas(fast, auto_start=False)
+    client = manager.get_client(slow)
+    entered, release = threading.Event(), threading.Event()
+    write = client.write_command
+
+    def _blocked_write(*args, **kwargs):
+        entered.set()
+        release.wait(timeout=5.0)
+        return write(*args, **kwargs)
+
+    client.write_command = _blocked_write  # type: ignore[method-assign]
+    sender = threading.Thread(
+        target=manager.send_command, args=(slow, CommandType.CLEAR_CANVAS)
+    )
+    sender.start()
+    try:
+        assert entered.wait(timeout=2.0)
+        done = threading.Event()
+
+        def _send_fast() -> None:
+            manager.send_command(fast, CommandType.CLEAR_CANVAS)
+            manager.get_client(fast)
+            done.set()
+
+        threading.Thread(target=_send_fast, daemon=True).start()
+        assert done.wait(timeout=1.0)
+    finally:
+        release.set()
+        sender.join(timeout=5.0)
+
+
+def test_shutdown_releases_client(manager, cid):
+    canvas = manager.create_canvas(cid, auto_start=False)
+    canvas._running = True
+    mcp = create_mcp_app(canvas_manager=manager)
+    client = manager.get_client(cid)
+
+    result = _fn(mcp, "shutdown_canvas")(cid)
+
+    assert result["success"] is True
+    assert cid not in manager._clients
+    assert client.cmd_bell is None
+    assert manager.get_canvas(cid) is None
+
+
+def test_send_to_unknown_canvas_raises(manager):
+    with pytest.raises(FileNotFoundError):
+        manager.send_command("ghost_canvas", CommandType.CLEAR_CANVAS)
@@ -121,6 +121,8 @@ def test_drawing_add_llm_stroke_stroke_stored():
 
     mock_mgr = MagicMock()
     mock_mgr.get_canvas.return_value = mock_canvas
+    # No live render loop, so the stroke is applied in place
+    mock_mgr.is_loop_healthy.return_value = False
     mcp = create_mcp_app(canvas_manager=mock_mgr)
 
     _fn(mcp, "drawing_add_llm_stroke")(
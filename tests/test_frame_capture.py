@@ -0,0 +1,445 @@
+"""Tests for PBO framebuffer readback and off-thread screenshot encoding.
+
+OpenGL is replaced by a small fake module that keeps a numpy framebuffer,
+real ctypes buffers for PBOs and fences whose readiness the test controls.
+"""
+
+import base64
+import contextlib
+import ctypes
+import io
+import threading
+import uuid
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+from PIL import Image
+
+import champi_imgui.core.frame_capture as frame_capture
+from champi_imgui.core.canvas import Canvas, CanvasManager
+from champi_imgui.core.frame_capture import (
+    FramebufferReader,
+    FrameDiffer,
+    capture_image,
+)
+
+
+class FakeGL:
+    GL_VERSION = 0x1F02
+    GL_PIXEL_PACK_BUFFER = 0x88EB
+    GL_STREAM_READ = 0x88E1
+    GL_RGBA = 0x1908
+    GL_UNSIGNED_BYTE = 0x1401
+    GL_SYNC_GPU_COMMANDS_COMPLETE = 0x9117
+    GL_SYNC_FLUSH_COMMANDS_BIT = 0x1
+    GL_TIMEOUT_EXPIRED = 0x911B
+    GL_ALREADY_SIGNALED = 0x911A
+    GL_MAP_READ_BIT = 0x1
+
+    def __init__(self, width=64, height=48, pbo=True, context=True):
+        rng = np.random.default_rng(0)
+        self.framebuffer = rng.integers(0, 256, (height, width, 4), dtype=np.uint8)
+        self.pbo = pbo
+        self.context = context
+        self.ready = True
+        self.buffers: dict[int, ctypes.Array] = {}
+        self.bound = 0
+        self.sync_reads = 0
+        self.deleted: list[int] = []
+
+    def glGetString(self, name):  # noqa: N802
+        return b"4.6 fake" if self.context else None
+
+    def glGenBuffers(self, n):  # noqa: N802
+        if not self.pbo:
+            raise RuntimeError("glGenBuffers unsupported")
+        buffer_id = len(self.buffers) + 1
+        self.buffers[buffer_id] = (ctypes.c_ubyte * 0)()
+        return np.uint32(buffer_id)
+
+    def glBindBuffer(self, target, buffer_id):  # noqa: N802
+        self.bound = buffer_id
+
+    def glBufferData(self, target, size, data, usage):  # noqa: N802
+        self.buffers[self.bound] = (ctypes.c_ubyte * size)()
+
+    def glReadPixels(self, x, y, width, height, fmt, kind, data=None):  # noqa: N802
+        pixels = self.framebuffer[y : y + height, x : x + width].tobytes()
+        if self.bound:
+            ctypes.memmove(self.buffers[self.bound], pixels, len(pixels))
+            return None
+        self.sync_reads += 1
+        return pixels
+
+    def glFenceSync(self, condition, flags):  # noqa: N802
+        return object()
+
+    def glClientWaitSync(self, fence, flags, timeout):  # noqa: N802
+        return self.GL_ALREADY_SIGNALED if self.ready else self.GL_TIMEOUT_EXPIRED
+
+    def glDeleteSync(self, fence):  # noqa: N802
+        pass
+
+    def glMapBufferRange(self, target, offset, length, access):  # noqa: N802
+        return ctypes.addressof(self.buffers[self.bound])
+
+    def glUnmapBuffer(self, target):  # noqa: N802
+        return True
+
+    def glDeleteBuffers(self, n, ids):  # noqa: N802
+        self.deleted.extend(ids)
+
+
+@pytest.fixture()
+def canvas():
+    canvas = Canvas(f"c_{uuid.uuid4().hex[:8]}", size=(64, 48))
+    yield canvas
+    canvas.shm_manager.cleanup()
+
+
+class TestFramebufferReader:
+    def test_read_completes_on_poll(self):
+        gl = FakeGL()
+        reader = FramebufferReader(gl=gl)
+
+        future = reader.read(8, 4, 16, 10)
+        assert not future.done()
+        assert reader.pending
+
+        reader.poll()
+        np.testing.assert_array_equal(
+            future.result(timeout=0), gl.framebuffer[4:14, 8:24]
+        )
+        assert not reader.pending
+        assert gl.sync_reads == 0
+
+    def test_waits_for_fence(self):
+        gl = FakeGL()
+        reader = FramebufferReader(gl=gl)
+        gl.ready = False
+        future = reader.read(0, 0, 64, 48)
+
+        reader.poll()
+        assert not future.done()
+
+        gl.ready = True
+        reader.poll()
+        assert future.done()
+
+    def test_reads_beyond_buffer_count_are_queued(self):
+        gl = FakeGL()
+        reader = FramebufferReader(buffers=2, gl=gl)
+        gl.ready = False
+        futures = [reader.read(i, 0, 4, 4) for i in range(3)]
+        assert len(gl.buffers) == 2
+
+        gl.ready = True
+        reader.poll()
+        assert futures[0].done() and futures[1].done()
+        # The queued read took a freed buffer and completes next frame
+        assert not futures[2].done()
+        reader.poll()
+
+        for i, future in enumerate(futures):
+            np.testing.assert_array_equal(
+                future.result(timeout=0), gl.framebuffer[0:4, i : i + 4]
+            )
+        assert len(gl.buffers) == 2
+
+    def test_falls_back_to_synchronous_read(self):
+        gl = FakeGL(pbo=False)
+        reader = FramebufferReader(gl=gl)
+
+        future = reader.read(0, 0, 64, 48)
+
+        np.testing.assert_array_equal(future.result(timeout=0), gl.framebuffer)
+        assert gl.sync_reads == 1
+        assert not reader.pending
+
+    def test_no_context_raises(self):
+        reader = FramebufferReader(gl=FakeGL(context=False))
+        with pytest.raises(RuntimeError, match="context"):
+            reader.read(0, 0, 4, 4)
+
+    def test_release_fails_pending_reads(self):
+        gl = FakeGL()
+        reader = FramebufferReader(gl=gl)
+        gl.ready = False
+        future = reader.read(0, 0, 4, 4)
+
+        reader.release()
+
+        with pytest.raises(RuntimeError):
+            future.result(timeout=0)
+        assert gl.deleted == [1]
+        assert not reader.pending
+
+
+class TestCapturePng:
+    def test_encodes_on_worker_thread(self, tmp_path, monkeypatch):
+        gl = FakeGL()
+        reader = FramebufferReader(gl=gl)
+        threads: list[str] = []
+        deliver_image = frame_capture.deliver_image
+
+        def recording_deliver(pixels, *args, **kwargs):
+            threads.append(threading.current_thread().name)
+            return deliver_image(pixels, *args, **kwargs)
+
+        monkeypatch.setattr(frame_capture, "deliver_image", recording_deliver)
+        filepath = str(tmp_path / "shot.png")
+
+        done = capture_image(reader, (0, 0, 64, 48), filepath)
+        assert not done.done()
+        reader.poll()
+
+        assert done.result(timeout=5.0)["path"] == filepath
+        assert threads[0].startswith("screenshot-encode")
+        # OpenGL rows are bottom-up; the PNG is top-down
+        image = np.asarray(Image.open(filepath))
+        np.testing.assert_array_equal(image, gl.framebuffer[::-1])
+
+    def test_encoding_error_is_reported(self, tmp_path):
+        reader = FramebufferReader(gl=FakeGL())
+        done = capture_image(reader, (0, 0, 4, 4), str(tmp_path / "missing" / "x.png"))
+        reader.poll()
+
+        result = done.result(timeout=5.0)
+        assert result["success"] is False
+
+
+class TestCanvasScreenshot:
+    def test_request_screenshot_through_readback(self, canvas, tmp_path):
+        canvas._framebuffer = FramebufferReader(gl=FakeGL())
+
+        def frame():
+            canvas.render_tasks.run_pending()
+            canvas._framebuffer.poll()
+
+        canvas._request_frame = frame
+        filepath = str(tmp_path / "shot.png")
+
+        result = canvas.request_screenshot(filepath, timeout=5.0)
+
+        assert result["path"] == filepath
+        assert (result["width"], result["height"], result["format"]) == (
+            64,
+            48,
+            "png",
+        )
+        assert Image.open(filepath).size == (64, 48)
+
+    def test_pending_readback_asks_for_frame(self, canvas):
+        gl = FakeGL()
+        gl.ready = False
+        canvas._framebuffer = FramebufferReader(gl=gl)
+        canvas._dirty_frames = 0
+
+        canvas._framebuffer.read(0, 0, 4, 4)
+
+        assert canvas.next_frame_delay(0.0) == 0.0
+
+    def test_manager_shares_one_reader(self):
+        manager = CanvasManager()
+        try:
+            a = manager.create_canvas(f"a_{uuid.uuid4().hex[:6]}", auto_start=False)
+            b = manager.create_canvas(f"b_{uuid.uuid4().hex[:6]}", auto_start=False)
+            assert a._framebuffer is manager.framebuffer
+            assert b._framebuffer is manager.framebuffer
+        finally:
+            for c in list(manager.canvases.values()):
+                with contextlib.suppress(Exception):
+                    c.shm_manager.cleanup()
+
+
+class TestImageOptions:
+    @pytest.mark.parametrize(
+        ("image_format", "compression", "output", "filepath"),
+        [
+            ("gif", None, "file", "/tmp/x"),
+            ("png", None, "stream", "/tmp/x"),
+            ("png", None, "file", None),
+            ("png", 10, "bytes", None),
+            ("webp", 101, "bytes", None),
+            ("rgba", 3, "bytes", None),
+        ],
+    )
+    def test_rejects_invalid_options(self, image_format, compression, output, filepath):
+        with pytest.raises(ValueError):
+            frame_capture.check_image_options(
+                image_format, compression, output, filepath
+            )
+
+    def test_accepts_valid_options(self):
+        frame_capture.check_image_options("webp", 40, "base64", None)
+        frame_capture.check_image_options("png", 0, "file", "/tmp/x.png")
+
+
+class TestEncodeImage:
+    def test_rgba_is_raw_top_down_rows(self):
+        pixels = FakeGL(8, 4).framebuffer
+        data = frame_capture.encode_image(pixels, "rgba")
+        assert data == pixels[::-1].tobytes()
+
+    def test_png_compression_level(self):
+        pixels = np.zeros((64, 64, 4), dtype=np.uint8)
+        pixels[::2] = 255
+        fast = frame_capture.encode_image(pixels, "png", 0)
+        small = frame_capture.encode_image(pixels, "png", 9)
+        assert len(small) < len(fast)
+        decoded = np.asarray(Image.open(io.BytesIO(small)))
+        np.testing.assert_array_equal(decoded, pixels[::-1])
+
+    def test_webp(self):
+        pixels = FakeGL(16, 16).framebuffer
+        data = frame_capture.encode_image(pixels, "webp", 50)
+        assert Image.open(io.BytesIO(data)).format == "WEBP"
+
+
+class TestRegionCapture:
+    def _frame(self, canvas):
+        def frame():
+            canvas.render_tasks.run_pending()
+            canvas._framebuffer.poll()
+
+        return frame
+
+    def test_capture_rect_clips_to_canvas(self, canvas):
+        assert canvas._capture_rect(None) == (0, 0, 64, 48)
+        assert canvas._capture_rect([10, 5, 20, 10]) == (10, 5, 20, 10)
+        assert canvas._capture_rect([-5, 40, 100, 100]) == (0, 40, 64, 8)
+
+    @pytest.mark.parametrize("region", [[70, 0, 5, 5], [0, 0, 0, 5], [1, 2, 3]])
+    def test_bad_region_is_rejected(self, canvas, region):
+        with pytest.raises(ValueError):
+            canvas.request_screenshot(region=region, output="bytes")
+
+    def test_reads_back_only_the_region(self, canvas):
+        gl = FakeGL(64, 48)
+        canvas._framebuffer = FramebufferReader(gl=gl)
+        canvas._request_frame = self._frame(canvas)
+
+        result = canvas.request_screenshot(
+            region=[10, 5, 20, 8], image_format="rgba", output="bytes"
+        )
+
+        assert (result["width"], result["height"]) == (20, 8)
+        # Top-left origin: rows 5..13 from the top are GL rows 35..43
+        top_down = gl.framebuffer[::-1]
+        assert result["data"] == top_down[5:13, 10:30].tobytes()
+        assert len(gl.buffers[1]) == 20 * 8 * 4
+
+    def test_base64_output(self, canvas):
+        canvas._framebuffer = FramebufferReader(gl=FakeGL(64, 48))
+        canvas._request_frame = self._frame(canvas)
+
+        result = canvas.request_screenshot(output="base64", compression=1)
+
+        image = Image.open(io.BytesIO(base64.b64decode(result["data"])))
+        assert image.size == (64, 48)
+        assert "path" not in result
+
+    def test_x11_fallback_only_writes_png_files(self, canvas):
+        canvas._window_id = 123
+        with patch.object(canvas, "_capture_opengl", return_value=None):
+            result = canvas._take_screenshot(None, output="base64")
+        assert result["success"] is False
+        assert "OpenGL" in result["error"]
+
+    def test_x11_fallback_crops(self, canvas, tmp_path):
+        canvas._window_id = 123
+        with (
+            patch.object(canvas, "_capture_opengl", return_value=None),
+            patch.object(canvas, "_capture_gdk", return_value=True) as gdk,
+        ):
+            canvas._take_screenshot(str(tmp_path / "x.png"), [1, 2, 3, 4])
+        assert gdk.call_args.args[2] == (1, 2, 3, 4)
+
+
+class TestFrameDiffer:
+    RECT = (0, 0, 8, 6)
+
+    def _pixels(self):
+        return np.zeros((6, 8, 4), dtype=np.uint8)
+
+    def test_first_capture_is_fully_changed(self):
+        result = FrameDiffer().compare(self.RECT, self._pixels())
+        assert result["unchanged"] is False
+        assert result["changed_region"] == [0, 0, 8, 6]
+
+    def test_identical_capture_is_unchanged(self):
+        differ = FrameDiffer()
+        first = differ.compare(self.RECT, self._pixels())
+        second = differ.compare(self.RECT, self._pixels())
+        assert second["unchanged"] is True
+        assert second["changed_region"] is None
+        assert second["hash"] == first["hash"]
+
+    def test_changed_region_is_top_left_based(self):
+        differ = FrameDiffer()
+        differ.compare(self.RECT, self._pixels())
+        pixels = self._pixels()
+        # GL rows 1..2 are image rows 3..4 from the top
+        pixels[1:3, 2:5] = 255
+
+        result = differ.compare(self.RECT, pixels)
+
+        assert result["unchanged"] is False
+        assert result["changed_region"] == [2, 3, 3, 2]
+
+    def test_threshold_ignores_small_differences(self):
+        differ = FrameDiffer()
+        differ.compare(self.RECT, self._pixels())
+        pixels = self._pixels()
+        pixels[0, 0] = 3
+
+        assert differ.compare(self.RECT, pixels, threshold=3)["unchanged"] is True
+        assert differ.compare(self.RECT, pixels, threshold=2)["unchanged"] is False
+
+    def test_different_rect_has_no_baseline(self):
+        differ = FrameDiffer()
+        differ.compare(self.RECT, self._pixels())
+        result = differ.compare((1, 0, 8, 6), self._pixels())
+        assert result["changed_region"] == [0, 0, 8, 6]
+
+    def test_skip_unchanged_skips_encoding(self, tmp_path):
+        differ = FrameDiffer()
+        filepath = tmp_path / "shot.png"
+        frame_capture.deliver_image(self._pixels(), str(filepath), differ=differ)
+        filepath.unlink()
+
+        result = frame_capture.deliver_image(
+            self._pixels(), str(filepath), differ=differ, skip_unchanged=True
+        )
+
+        assert result["unchanged"] is True
+        assert "path" not in result
+        assert not filepath.exists()
+
+
+class TestCanvasScreenshotDiff:
+    def test_second_capture_reports_unchanged(self, canvas):
+        gl = FakeGL(64, 48)
+        canvas._framebuffer = FramebufferReader(gl=gl)
+
+        def frame():
+            canvas.render_tasks.run_pending()
+            canvas._framebuffer.poll()
+
+        canvas._request_frame = frame
+
+        first = canvas.request_screenshot(output="bytes")
+        second = canvas.request_screenshot(output="bytes", skip_unchanged=True)
+        gl.framebuffer[0, 0] ^= 0xFF
+        third = canvas.request_screenshot(output="bytes", skip_unchanged=True)
+
+        assert first["unchanged"] is False
+        assert second["unchanged"] is True
+        assert "data" not in second
+        assert third["changed_region"] == [0, 47, 1, 1]
+        assert "data" in third
+
+    def test_rejects_bad_threshold(self, canvas):
+        with pytest.raises(ValueError, match="diff_threshold"):
+            canvas.request_screenshot(output="bytes", diff_threshold=256)
@@ -0,0 +1,258 @@
+"""Tests for per-canvas frame pacing and draw-list replay.
+
+Frames are driven in a headless ImGui context with a fake clock: a canvas
+renders its widgets at most fps_target times per second, and only while
+something changed or animates; otherwise it replays the draw commands
+captured on its last full frame.
+"""
+
+import uuid
+
+import numpy as np
+import pytest
+from imgui_bundle import imgui
+
+from champi_imgui.core.canvas import Canvas
+from champi_imgui.core.draw_cache import DRAW_VERT_DTYPE, DrawListCache, _read
+from champi_imgui.core.widget import Widget
+from champi_imgui.widgets.container import WindowWidget
+
+_FRAME = 1.0 / 60.0
+
+
+class _CountingWidget(Widget):
+    def __init__(self, widget_id: str, animating: bool = False) -> None:
+        super().__init__(widget_id)
+        self.renders = 0
+        self.animating = animating
+
+    def render(self) -> None:
+        self.renders += 1
+        if not self.state.visible:
+            return
+        imgui.text(str(self.state.properties.get("text", "status: ok")))
+        imgui.button("Refresh")
+
+    def is_animating(self) -> bool:
+        return self.animating
+
+
+@pytest.fixture()
+def make_canvas(imgui_context):
+    canvases = []
+
+    def make(
+        fps_target: int = 60, animating: bool = False, **kwargs
+    ) -> tuple[Canvas, _CountingWidget]:
+        canvas = Canvas(
+            f"pace_{uuid.uuid4().hex[:8]}",
+            title=f"Pace {len(canvases)}",
+            size=(300, 200),
+            fps_target=fps_target,
+            **kwargs,
+        )
+        widget = _CountingWidget("w", animating=animating)
+        canvas.add_widget(widget)
+        canvases.append(canvas)
+        return canvas, widget
+
+    yield make
+    for canvas in canvases:
+        canvas.shm_manager.cleanup()
+
+
+def _frame(canvases: list[Canvas], now: float) -> None:
+    imgui.get_io().delta_time = _FRAME
+    imgui.new_frame()
+    for canvas in canvases:
+        canvas._clock = lambda: now
+        canvas._render_frame()
+    imgui.render()
+
+
+def _run(canvases: list[Canvas], frames: int) -> None:
+    for i in range(frames):
+        _frame(canvases, i * _FRAME)
+
+
+def _assert_window_stays_active(canvas: Canvas, frames: int) -> None:
+    canvas.add_widget(WindowWidget("popout", title="Popout"))
+    for i in range(frames):
+        _frame([canvas], i * _FRAME)
+        window = imgui.internal.find_window_by_name("Popout")
+        assert window is not None and window.active, f"inactive on frame {i}"
+
+
+class TestPacing:
+    def test_low_rate_canvas_skips_widget_traversal(self, make_canvas):
+        dashboard, status = make_canvas(fps_target=1, animating=True)
+        realtime, plot = make_canvas(fps_target=60, animating=True)
+
+        _run([dashboard, realtime], 120)
+
+        # First frame, its settling frame, then one per second
+        assert status.renders == 3
+        assert plot.renders == 120
+
+    def test_zero_fps_target_renders_every_frame(self, make_canvas):
+        canvas, widget = make_canvas(fps_target=0, animating=True)
+        _run([canvas], 10)
+        assert widget.renders == 10
+
+    def test_change_waits_for_next_slot_then_settles(self, make_canvas):
+        canvas, widget = make_canvas(fps_target=2)
+        _run([canvas], 3)
+        renders = widget.renders
+
+        widget.update(text="status: degraded")
+        _frame([canvas], 0.1)
+        assert widget.renders == renders
+        assert canvas.next_frame_delay(0.1) == pytest.approx(0.4)
+
+        _frame([canvas], 0.5)
+        _frame([canvas], 0.5 + _FRAME)
+        assert widget.renders == renders + 2
+        assert canvas.needs_frame() is False
+        assert canvas.next_frame_delay(0.6) is None
+
+    def test_replayed_frame_matches_full_frame(self, make_canvas):
+        canvas, widget = make_canvas(fps_target=1)
+        _frame([canvas], 0.0)
+        _frame([canvas], _FRAME)
+        full = imgui.get_draw_data()
+        full_counts = (full.total_vtx_count, full.total_idx_count)
+        renders = widget.renders
+
+        _frame([canvas], 2 * _FRAME)
+        replayed = imgui.get_draw_data()
+
+        assert widget.renders == renders
+        assert (replayed.total_vtx_count, replayed.total_idx_count) == full_counts
+
+    def test_hiding_widget_renders_fresh_frame(self, make_canvas):
+        canvas, widget = make_canvas(fps_target=1)
+        _run([canvas], 3)
+        assert canvas.needs_frame() is False
+        shown = imgui.get_draw_data().total_vtx_count
+        renders = widget.renders
+
+        widget.set_visible(False)
+        _frame([canvas], 1.0)
+
+        assert widget.renders == renders + 1
+        assert imgui.get_draw_data().total_vtx_count < shown
+
+    def test_top_level_window_survives_paced_frames(self, make_canvas):
+        canvas, _ = make_canvas(fps_target=1, animating=True)
+        _assert_window_stays_active(canvas, 10)
+
+    def test_hovered_canvas_renders_in_full(self, make_canvas, imgui_context):
+        canvas, widget = make_canvas(fps_target=1)
+        _run([canvas], 2)
+        renders = widget.renders
+
+        imgui_context.add_mouse_pos_event(100.0, 100.0)
+        for i in range(3):
+            _frame([canvas], (2 + i) * _FRAME)
+        assert widget.renders > renders
+
+        # One more full frame after the pointer leaves, then replay resumes
+        imgui_context.add_mouse_pos_event(-1000.0, -1000.0)
+        _frame([canvas], 5 * _FRAME)
+        renders = widget.renders
+        _frame([canvas], 6 * _FRAME)
+        _frame([canvas], 7 * _FRAME)
+        assert widget.renders == renders
+
+
+class TestStaticReplay:
+    def test_clean_canvas_replays(self, make_canvas):
+        canvas, widget = make_canvas(fps_target=60)
+        _run([canvas], 60)
+        # The first frame and the settling frame only
+        assert widget.renders == 2
+
+    def test_change_renders_then_replays_again(self, make_canvas):
+        canvas, widget = make_canvas(fps_target=60)
+        _run([canvas], 5)
+        widget.update(text="status: degraded")
+        for i in range(5, 10):
+            _frame([canvas], i * _FRAME)
+        assert widget.renders == 4
+
+    def test_top_level_window_stays_active_when_idle(self, make_canvas):
+        canvas, _ = make_canvas(fps_target=60)
+        _assert_window_stays_active(canvas, 10)
+
+    def test_disabled_cache_renders_every_frame(self, make_canvas):
+        canvas, widget = make_canvas(fps_target=60, cache_draw_lists=False)
+        _run([canvas], 10)
+        assert widget.renders == 10
+
+    def test_theme_change_redraws(self, make_canvas):
+        from champi_imgui.core.canvas import CanvasManager
+        from champi_imgui.themes.manager import ColorScheme, ThemeManager
+
+        manager = CanvasManager()
+        canvas, widget = make_canvas(fps_target=60)
+        manager.canvases[canvas.state.canvas_id] = canvas
+        _run([canvas], 5)
+
+        ThemeManager().apply_color_scheme(ColorScheme.LIGHT)
+        _frame([canvas], 5 * _FRAME)
+
+        assert widget.renders == 3
+
+
+class TestDrawListCache:
+    def _window_frame(self, cache: DrawListCache, replay: bool, pos=None):
+        imgui.get_io().delta_time = _FRAME
+        imgui.new_frame()
+        if pos is not None:
+            imgui.set_next_window_pos(imgui.ImVec2(*pos))
+        imgui.set_next_window_size(imgui.ImVec2(300, 200))
+        imgui.begin("cache")
+        if replay:
+            assert cache.can_replay()
+            cache.replay()
+        else:
+            cache.begin_capture()
+            for i in range(5):
+                imgui.text(f"line {i}")
+            cache.end_capture()
+        draw_list = imgui.get_window_draw_list()
+        vertices = _read(
+            draw_list.vtx_buffer.data_address(),
+            draw_list.vtx_buffer.size(),
+            DRAW_VERT_DTYPE,
+        )
+        imgui.end()
+        imgui.render()
+        return vertices
+
+    def test_replay_reproduces_vertices(self, imgui_context):
+        cache = DrawListCache()
+        self._window_frame(cache, replay=False)
+        full = self._window_frame(cache, replay=False)
+        replayed = self._window_frame(cache, replay=True)
+        assert cache.vertex_count > 0
+        assert np.array_equal(full, replayed)
+
+    def test_replay_follows_moved_window(self, imgui_context):
+        cache = DrawListCache()
+        self._window_frame(cache, replay=False, pos=(10, 10))
+        before = self._window_frame(cache, replay=False, pos=(10, 10))
+        after = self._window_frame(cache, replay=True, pos=(50, 70))
+        np.testing.assert_allclose(
+            after["pos"] - before["pos"], [[40, 60]] * len(after), atol=1e-3
+        )
+
+    def test_resized_window_is_not_replayable(self, imgui_context):
+        cache = DrawListCache()
+        self._window_frame(cache, replay=False)
+        imgui.new_frame()
+        imgui.set_next_window_size(imgui.ImVec2(400, 250))
+        imgui.begin("cache")
+        assert cache.can_replay() is False
+        imgui.end()
+        imgui.render()
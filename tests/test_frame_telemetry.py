@@ -0,0 +1,139 @@
+"""Tests for the shared render loop's frame-time telemetry."""
+
+import contextlib
+import time
+import uuid
+
+import pytest
+
+from champi_imgui.api.server import create_mcp_app
+from champi_imgui.core.canvas import CanvasManager
+from champi_imgui.core.telemetry import FrameTelemetry
+
+
+def _fn(mcp, name):
+    return mcp._local_provider._components[f"tool:{name}@"].fn
+
+
+def _steady(telemetry, frames, start=100.0, frame_ms=16.0, idle_allowed=False):
+    """Record *frames* evenly spaced frames; returns the time after the last."""
+    t = start
+    for _ in range(frames):
+        telemetry.record(t, frame_ms, 1.0, 4.0, frame_ms - 5.0, idle_allowed)
+        t += frame_ms / 1000.0
+    return t
+
+
+@pytest.fixture()
+def manager():
+    mgr = CanvasManager()
+    yield mgr
+    for canvas in list(mgr.canvases.values()):
+        with contextlib.suppress(Exception):
+            canvas.shm_manager.cleanup()
+
+
+class TestFrameTelemetry:
+    def test_empty_summary(self):
+        summary = FrameTelemetry().summary(5.0, now=10.0)
+        assert summary["frames"] == 0
+        assert "fps" not in summary
+
+    def test_steady_loop(self):
+        telemetry = FrameTelemetry()
+        now = _steady(telemetry, 120, frame_ms=1000.0 / 60.0)
+
+        summary = telemetry.summary(10.0, now)
+
+        assert summary["frames"] == 120
+        assert summary["fps"] == pytest.approx(60.0, rel=0.01)
+        assert summary["jitter_ms"] == pytest.approx(0.0, abs=1e-3)
+        assert summary["stalls"] == 0
+        assert summary["mean_ms"]["commands"] == pytest.approx(1.0)
+        assert summary["mean_ms"]["render"] == pytest.approx(4.0)
+
+    def test_busy_and_late_stalls(self):
+        telemetry = FrameTelemetry()
+        t = _steady(telemetry, 10)
+        # Slow widget code: the callback itself took 80 ms
+        telemetry.record(t, 90.0, 0.5, 80.0, 9.5, False)
+        # Render thread starved while it should have been running
+        telemetry.record(t + 0.09, 70.0, 0.5, 3.0, 66.5, False)
+
+        summary = telemetry.summary(10.0, t + 0.2)
+
+        assert summary["busy_stalls"] == 1
+        assert summary["late_stalls"] == 1
+        assert summary["stalls"] == 2
+        assert summary["max_busy_ms"] == pytest.approx(80.5)
+        assert summary["jitter_ms"] > 0
+
+    def test_idle_waits_are_not_stalls(self):
+        telemetry = FrameTelemetry()
+        now = _steady(telemetry, 5, frame_ms=1000.0, idle_allowed=True)
+        summary = telemetry.summary(10.0, now)
+        assert summary["stalls"] == 0
+        assert summary["active_frames"] == 0
+        assert summary["jitter_ms"] == 0.0
+
+    def test_window_selects_recent_frames(self):
+        telemetry = FrameTelemetry()
+        now = _steady(telemetry, 600, frame_ms=10.0)
+        assert telemetry.summary(1.0, now)["frames"] in (99, 100)
+
+    def test_ring_keeps_newest_frames(self):
+        telemetry = FrameTelemetry(capacity=8)
+        for i in range(20):
+            telemetry.record(float(i), 16.0, 0.0, 0.0, 16.0, False)
+        starts = telemetry.recent(0.0)["start"].tolist()
+        assert starts == [float(i) for i in range(12, 20)]
+
+
+class TestLoopRecording:
+    def test_frames_are_recorded(self, manager, monkeypatch):
+        canvas = manager.create_canvas(f"c_{uuid.uuid4().hex[:8]}", auto_start=False)
+        canvas._running = True
+        monkeypatch.setattr(manager, "_schedule_next_frame", lambda delay: None)
+
+        def fake_frame():
+            canvas._commands_s = 0.002
+
+        monkeypatch.setattr(canvas, "_render_frame", fake_frame)
+
+        manager._render_all_canvases()
+        assert len(manager.telemetry.recent(0.0)) == 0
+        manager._render_all_canvases()
+
+        (frame,) = manager.telemetry.recent(0.0)
+        assert frame["commands_ms"] == pytest.approx(2.0)
+        assert frame["frame_ms"] >= frame["idle_ms"]
+
+    def test_idle_decision_is_carried_to_next_frame(self, manager, monkeypatch):
+        monkeypatch.setattr(manager, "_schedule_next_frame", lambda delay: None)
+        for _ in range(3):
+            manager._render_all_canvases()
+        assert manager.telemetry.recent(0.0)["idle_allowed"].all()
+
+
+class TestTelemetryTools:
+    def test_get_frame_telemetry(self, manager):
+        _steady(manager.telemetry, 30, start=time.perf_counter() - 0.5)
+        mcp = create_mcp_app(canvas_manager=manager)
+
+        result = _fn(mcp, "get_frame_telemetry")(window_seconds=5.0)
+
+        assert result["success"] is True
+        assert result["data"]["frames"] == 30
+        assert result["data"]["loop_running"] is False
+
+    def test_rejects_bad_window(self, manager):
+        mcp = create_mcp_app(canvas_manager=manager)
+        result = _fn(mcp, "get_frame_telemetry")(window_seconds=0)
+        assert result["success"] is False
+
+    def test_render_health_reports_fps(self, manager):
+        canvas = manager.create_canvas(f"c_{uuid.uuid4().hex[:8]}", auto_start=False)
+        mcp = create_mcp_app(canvas_manager=manager)
+        result = _fn(mcp, "get_render_health")(canvas.state.canvas_id)
+        assert result["data"]["fps"] == 0.0
+        assert result["data"]["stalls"] == 0
@@ -1,7 +1,6 @@
 """Tests for get_canvas_info MCP tool and Canvas.request_canvas_info."""
 
 import contextlib
-import threading
 import uuid
 from unittest.mock import MagicMock, patch
 
@@ -186,21 +185,16 @@ def test_get_canvas_info_timeout(cid, monkeypatch):
 
 
 def test_request_canvas_info_dispatches_to_render_thread(cid):
-    """request_canvas_info sets _canvas_info_request before blocking."""
+    """request_canvas_info queues a render task and returns its result."""
     canvas = Canvas(cid)
     canvas._running = True
-
-    def fake_wake():
-        req = canvas._canvas_info_request
-        if req is not None:
-            req["result"] = {
-                "screen_offset_x": 5.0,
-                "screen_offset_y": 10.0,
-                "pixel_scale": 1.5,
-            }
-            req["done"].set()
-
-    canvas._wake_render = fake_wake  # type: ignore[method-assign]
+    canvas._canvas_info = lambda: {  # type: ignore[method-assign]
+        "screen_offset_x": 5.0,
+        "screen_offset_y": 10.0,
+        "pixel_scale": 1.5,
+    }
+    # Simulate the render thread running the frame immediately
+    canvas._request_frame = canvas.render_tasks.run_pending
 
     result = canvas.request_canvas_info(timeout=2.0)
 
@@ -211,82 +205,61 @@ def test_request_canvas_info_dispatches_to_render_thread(cid):
     canvas.shm_manager.cleanup()
 
 
-def test_request_canvas_info_timeout_clears_request(cid):
-    """request_canvas_info clears _canvas_info_request on timeout."""
+def test_request_canvas_info_timeout_cancels_task(cid):
+    """request_canvas_info cancels its task on timeout."""
     canvas = Canvas(cid)
     canvas._running = True
-    canvas._wake_render = lambda: None  # type: ignore[method-assign]
 
     with pytest.raises(TimeoutError):
         canvas.request_canvas_info(timeout=0.05)
 
-    assert canvas._canvas_info_request is None
+    assert canvas.render_tasks.run_pending() == 0
 
     canvas.shm_manager.cleanup()
 
 
 # ---------------------------------------------------------------------------
-# Canvas._handle_canvas_info — render-thread handler
+# Canvas._canvas_info — render-thread handler
 # ---------------------------------------------------------------------------
 
 
-def test_handle_canvas_info_returns_offset_and_scale(cid):
-    """_handle_canvas_info reads imgui.get_io() and DrawingWidget offset."""
+def test_canvas_info_returns_offset_and_scale(cid):
+    """_canvas_info reads imgui.get_io() and DrawingWidget offset."""
     canvas = Canvas(cid)
 
     drawing = DrawingWidget("dw1")
     drawing.canvas_screen_offset = (15.0, 25.0)
     canvas.widget_registry.add(drawing)
 
-    done = threading.Event()
-    req: dict = {"done": done}
-    canvas._canvas_info_request = req  # type: ignore[assignment]
-
     mock_scale = MagicMock()
     mock_scale.x = 2.0
     mock_io = MagicMock()
     mock_io.display_framebuffer_scale = mock_scale
 
     with patch("champi_imgui.core.canvas.imgui.get_io", return_value=mock_io):
-        canvas._handle_canvas_info()
+        result = canvas._canvas_info()
 
-    assert done.is_set()
-    assert req["result"]["screen_offset_x"] == 15.0
-    assert req["result"]["screen_offset_y"] == 25.0
-    assert req["result"]["pixel_scale"] == 2.0
+    assert result["screen_offset_x"] == 15.0
+    assert result["screen_offset_y"] == 25.0
+    assert result["pixel_scale"] == 2.0
 
     canvas.shm_manager.cleanup()
 
 
-def test_handle_canvas_info_no_drawing_widget_returns_zeros(cid):
-    """_handle_canvas_info returns 0.0 offsets when no DrawingWidget is registered."""
+def test_canvas_info_no_drawing_widget_returns_zeros(cid):
+    """_canvas_info returns 0.0 offsets when no DrawingWidget is registered."""
     canvas = Canvas(cid)
 
-    done = threading.Event()
-    req: dict = {"done": done}
-    canvas._canvas_info_request = req  # type: ignore[assignment]
-
     mock_scale = MagicMock()
     mock_scale.x = 1.0
     mock_io = MagicMock()
     mock_io.display_framebuffer_scale = mock_scale
 
     with patch("champi_imgui.core.canvas.imgui.get_io", return_value=mock_io):
-        canvas._handle_canvas_info()
-
-    assert done.is_set()
-    assert req["result"]["screen_offset_x"] == 0.0
-    assert req["result"]["screen_offset_y"] == 0.0
-
-    canvas.shm_manager.cleanup()
-
-
-def test_handle_canvas_info_no_request_is_noop(cid):
-    """_handle_canvas_info does nothing when no request is pending."""
-    canvas = Canvas(cid)
-    canvas._canvas_info_request = None
+        result = canvas._canvas_info()
 
-    canvas._handle_canvas_info()
+    assert result["screen_offset_x"] == 0.0
+    assert result["screen_offset_y"] == 0.0
 
     canvas.shm_manager.cleanup()
 
@@ -0,0 +1,193 @@
+"""Tests for the headless render loop and the software rasterizer.
+
+The rasterizer tests draw into a throwaway ImGui context's foreground draw
+list; the loop tests run a real CanvasManager(headless=True) on its thread,
+which needs no display.
+"""
+
+import threading
+import time
+import uuid
+from concurrent.futures import Future
+
+import numpy as np
+import pytest
+from click.testing import CliRunner
+from imgui_bundle import imgui
+
+from champi_imgui.cli import cli
+from champi_imgui.core.canvas import CanvasManager
+from champi_imgui.core.headless import (
+    HeadlessFramebuffer,
+    HeadlessRunner,
+    SoftwareRasterizer,
+)
+from champi_imgui.widgets.basic import TextWidget
+
+
+@pytest.fixture()
+def display_size() -> tuple[float, float]:
+    return (64, 48)
+
+
+def _draw(rasterizer: SoftwareRasterizer, paint) -> np.ndarray:
+    """Run one frame whose foreground is drawn by *paint* and rasterize it."""
+    imgui.new_frame()
+    paint(imgui.get_foreground_draw_list())
+    imgui.render()
+    draw_data = imgui.get_draw_data()
+    rasterizer.update_textures(draw_data)
+    return rasterizer.rasterize(draw_data)
+
+
+class TestSoftwareRasterizer:
+    def test_filled_rect(self, imgui_context):
+        rasterizer = SoftwareRasterizer()
+        red = imgui.get_color_u32(imgui.ImVec4(1.0, 0.0, 0.0, 1.0))
+
+        image = _draw(
+            rasterizer,
+            lambda dl: dl.add_rect_filled(
+                imgui.ImVec2(10, 5), imgui.ImVec2(30, 20), red
+            ),
+        )
+
+        assert image.shape == (48, 64, 4)
+        assert (image[5:20, 10:30] == [255, 0, 0, 255]).all()
+        assert (image[:5] == [0, 0, 0, 255]).all()
+        assert (image[:, 30:] == [0, 0, 0, 255]).all()
+
+    def test_translucent_quad_has_no_seam(self, imgui_context):
+        rasterizer = SoftwareRasterizer()
+        half_white = imgui.get_color_u32(imgui.ImVec4(1.0, 1.0, 1.0, 0.5))
+
+        image = _draw(
+            rasterizer,
+            lambda dl: dl.add_rect_filled(
+                imgui.ImVec2(0, 0), imgui.ImVec2(32, 32), half_white
+            ),
+        )
+
+        # Both triangles meet on the diagonal; each pixel is blended once
+        inside = image[:32, :32, 0]
+        assert inside.min() == inside.max() == 128
+
+    def test_clip_rect_limits_drawing(self, imgui_context):
+        rasterizer = SoftwareRasterizer()
+        green = imgui.get_color_u32(imgui.ImVec4(0.0, 1.0, 0.0, 1.0))
+
+        def paint(dl):
+            dl.push_clip_rect(imgui.ImVec2(0, 0), imgui.ImVec2(16, 16))
+            dl.add_rect_filled(imgui.ImVec2(0, 0), imgui.ImVec2(64, 48), green)
+            dl.pop_clip_rect()
+
+        image = _draw(rasterizer, paint)
+
+        assert (image[:16, :16] == [0, 255, 0, 255]).all()
+        assert (image[16:, :] == [0, 0, 0, 255]).all()
+
+    def test_text_uses_the_font_atlas(self, imgui_context):
+        rasterizer = SoftwareRasterizer()
+        white = imgui.get_color_u32(imgui.ImVec4(1.0, 1.0, 1.0, 1.0))
+
+        image = _draw(
+            rasterizer, lambda dl: dl.add_text(imgui.ImVec2(2, 2), white, "Hi")
+        )
+
+        glyphs = image[..., 0]
+        assert glyphs.max() == 255
+        # Glyphs cover only part of their cells
+        assert 0 < np.count_nonzero(glyphs) < 16 * 16
+
+
+class TestHeadlessFramebuffer:
+    def test_null_renderer_cannot_read(self):
+        with pytest.raises(RuntimeError, match="null renderer"):
+            HeadlessFramebuffer().read(0, 0, 4, 4)
+
+    def test_reads_resolve_at_present(self, imgui_context):
+        framebuffer = HeadlessFramebuffer(SoftwareRasterizer())
+        blue = imgui.get_color_u32(imgui.ImVec4(0.0, 0.0, 1.0, 1.0))
+
+        imgui.new_frame()
+        imgui.get_foreground_draw_list().add_rect_filled(
+            imgui.ImVec2(0, 0), imgui.ImVec2(64, 8), blue
+        )
+        # GL coordinates: the top 8 rows of a 48-row display start at y=40
+        future = framebuffer.read(0, 40, 64, 8)
+        assert framebuffer.pending
+        imgui.render()
+        draw_data = imgui.get_draw_data()
+        framebuffer.rasterizer.update_textures(draw_data)
+        framebuffer.present(draw_data)
+
+        assert not framebuffer.pending
+        assert (future.result(timeout=0) == [0, 0, 255, 255]).all()
+
+    def test_release_fails_waiting_reads(self):
+        framebuffer = HeadlessFramebuffer(SoftwareRasterizer())
+        future: Future[np.ndarray] = framebuffer.read(0, 0, 4, 4)
+
+        framebuffer.release()
+
+        with pytest.raises(RuntimeError, match="stopped"):
+            future.result(timeout=0)
+
+
+class TestHeadlessCanvasManager:
+    def test_rejects_render_process(self):
+        with pytest.raises(ValueError, match="headless"):
+            CanvasManager(render_process=True, headless=True)
+
+    def test_screenshot_without_display(self):
+        manager = CanvasManager(headless=True)
+        try:
+            # Screenshot rects assume the canvas spans the display
+            canvas = manager.create_canvas(
+                f"headless_{uuid.uuid4().hex[:8]}", title="Headless", size=(1600, 900)
+            )
+            canvas.add_widget(TextWidget("label", text="rendered headless"))
+
+            result = canvas.request_screenshot(
+                region=[0, 0, 400, 300],
+                image_format="rgba",
+                output="bytes",
+                timeout=10.0,
+            )
+
+            pixels = np.frombuffer(result["data"], dtype=np.uint8).reshape(300, 400, 4)
+            # Something besides the cleared background was drawn
+            assert len(np.unique(pixels.reshape(-1, 4), axis=0)) > 2
+            assert manager.is_loop_healthy()
+            assert canvas.is_render_healthy()
+        finally:
+            manager.cleanup()
+        assert not manager.is_loop_healthy()
+
+    def test_idle_runner_wakes_on_request(self):
+        runner = HeadlessRunner(HeadlessFramebuffer())
+        frames = threading.Semaphore(0)
+
+        def show_gui():
+            runner.schedule(None)
+            frames.release()
+
+        thread = threading.Thread(target=runner.run, args=(show_gui,), daemon=True)
+        thread.start()
+        try:
+            assert frames.acquire(timeout=5.0)
+            # Idle: the next frame waits for a wake-up, well under _IDLE_WAIT
+            start = time.monotonic()
+            runner.wake()
+            assert frames.acquire(timeout=5.0)
+            assert time.monotonic() - start < 0.5
+        finally:
+            runner.request_exit()
+            thread.join(timeout=5.0)
+        assert not thread.is_alive()
+
+
+def test_serve_headless_rejects_render_processes():
+    result = CliRunner().invoke(cli, ["serve", "--headless", "--render-hosts", "2"])
+    assert result.exit_code != 0
+    assert "--headless" in result.output
@@ -0,0 +1,159 @@
+"""Tests for cumulative ACKs and command futures.
+
+Covers: the ACK watermark acknowledges every command up to it, per-command
+failure statuses reach the matching futures, the Canvas acknowledges a
+drained batch once, and tools can wait for their command to be applied.
+"""
+
+import contextlib
+import threading
+import uuid
+
+import pytest
+
+from champi_imgui.api.server import create_mcp_app
+from champi_imgui.core.canvas import CanvasManager
+from champi_imgui.ipc.command_types import AckStatus, CommandType
+from champi_imgui.ipc.shared_memory_manager import SharedMemoryManager
+
+
+@pytest.fixture()
+def shm_pair():
+    prefix = f"ack_{uuid.uuid4().hex[:8]}"
+    creator = SharedMemoryManager(name_prefix=prefix)
+    creator.create_regions()
+    attacher = SharedMemoryManager(name_prefix=prefix)
+    attacher.attach_regions()
+    yield creator, attacher
+    attacher.cleanup()
+    creator.cleanup()
+
+
+@pytest.fixture()
+def manager(monkeypatch):
+    mgr = CanvasManager()
+    monkeypatch.setattr(mgr, "ensure_canvas_running", lambda canvas_id: True)
+    yield mgr
+    for canvas in list(mgr.canvases.values()):
+        with contextlib.suppress(Exception):
+            canvas.shm_manager.cleanup()
+    mgr.cleanup()
+
+
+def _title(client: SharedMemoryManager, title: str = "T"):
+    return client.submit_command(CommandType.UPDATE_TITLE, canvas_id="c", title=title)
+
+
+class TestWatermark:
+    def test_one_ack_covers_earlier_commands(self, shm_pair):
+        creator, attacher = shm_pair
+        for _ in range(3):
+            attacher.write_command(CommandType.UPDATE_TITLE, canvas_id="c", title="T")
+        creator.write_ack(3)
+        assert attacher.read_ack(timeout=1.0) == 3
+        assert attacher.applied_seq() == 3
+
+    def test_read_ack_waits_for_advance(self, shm_pair):
+        creator, attacher = shm_pair
+        creator.write_ack(2)
+        assert attacher.read_ack(timeout=1.0) == 2
+        assert attacher.read_ack(timeout=0.02) is None
+
+
+class TestFutures:
+    def test_futures_resolve_with_statuses(self, shm_pair):
+        creator, attacher = shm_pair
+        futures = [_title(attacher) for _ in range(3)]
+        assert [f.seq_num for f in futures] == [1, 2, 3]
+        assert not any(f.done() for f in futures)
+
+        creator.write_ack(3, [(2, AckStatus.ERROR)])
+
+        results = [f.result(timeout=2.0) for f in futures]
+        assert results == [AckStatus.OK, AckStatus.ERROR, AckStatus.OK]
+
+    def test_future_past_watermark_stays_pending(self, shm_pair):
+        creator, attacher = shm_pair
+        first, second = _title(attacher), _title(attacher)
+
+        creator.write_ack(1)
+        assert first.result(timeout=2.0) == AckStatus.OK
+        assert not second.done()
+
+        creator.write_ack(2, [(2, AckStatus.UNSUPPORTED)])
+        assert second.result(timeout=2.0) == AckStatus.UNSUPPORTED
+
+    def test_cleanup_fails_pending_futures(self, shm_pair):
+        _, attacher = shm_pair
+        future = _title(attacher)
+        attacher.cleanup()
+        with pytest.raises(RuntimeError, match="closed"):
+            future.result(timeout=1.0)
+
+
+class TestCanvasAcks:
+    def test_batch_is_acked_once_with_failures(self, manager):
+        cid = f"c_{uuid.uuid4().hex[:8]}"
+        canvas = manager.create_canvas(cid, auto_start=False)
+        canvas._running = True
+        acks: list[tuple[int, list]] = []
+        write_ack = canvas.shm_manager.write_ack
+
+        def _record(seq_num, statuses=()):
+            statuses = list(statuses)
+            acks.append((seq_num, statuses))
+            write_ack(seq_num, statuses)
+
+        canvas.shm_manager.write_ack = _record  # type: ignore[method-assign]
+
+        ok = manager.submit_command(cid, CommandType.UPDATE_TITLE, title="New")
+        bad = manager.submit_command(
+            cid, CommandType.ADD_WIDGET, widget_id="w", widget_type="NoSuchWidget"
+        )
+        canvas._process_commands()
+
+        assert acks == [(2, [(2, AckStatus.ERROR)])]
+        assert ok.result(timeout=2.0) == AckStatus.OK
+        assert bad.result(timeout=2.0) == AckStatus.ERROR
+
+    def test_commands_after_shutdown_are_cancelled(self, manager):
+        cid = f"c_{uuid.uuid4().hex[:8]}"
+        canvas = manager.create_canvas(cid, auto_start=False)
+        canvas._running = True
+
+        before = manager.submit_command(cid, CommandType.UPDATE_TITLE, title="A")
+        manager.submit_command(cid, CommandType.SHUTDOWN)
+        after = manager.submit_command(cid, CommandType.UPDATE_TITLE, title="B")
+        canvas._process_commands()
+
+        assert before.result(timeout=2.0) == AckStatus.OK
+        assert after.result(timeout=2.0) == AckStatus.CANCELLED
+        assert canvas.state.title == "A"
+
+    def test_update_of_unknown_widget_is_acked_as_error(self, manager):
+        cid = f"c_{uuid.uuid4().hex[:8]}"
+        canvas = manager.create_canvas(cid, auto_start=False)
+        canvas._running = True
+
+        future = manager.submit_command(
+            cid, CommandType.UPDATE_WIDGET, widget_id="missing", properties={"x": 1}
+        )
+        canvas._process_commands()
+
+        assert future.result(timeout=2.0) == AckStatus.ERROR
+
+    def test_clear_canvas_wait_returns_after_apply(self, manager):
+        cid = f"c_{uuid.uuid4().hex[:8]}"
+        canvas = manager.create_canvas(cid, auto_start=False)
+        canvas._running = True
+        mcp = create_mcp_app(canvas_manager=manager)
+        clear_canvas = mcp._local_provider._components["tool:clear_canvas@"].fn
+
+        timer = threading.Timer(0.05, canvas._process_commands)
+        timer.start()
+        result = clear_canvas(cid, wait=True)
+        timer.join()
+
+        assert result["success"] is True
+        assert result["data"]["seq_num"] == 1
+        assert canvas.shm_manager.pending_count() == 0
@@ -0,0 +1,72 @@
+"""Tests for the IPC benchmark harness and the `bench ipc` command.
+
+Runs each benchmark with tiny iteration counts: this checks the harness and
+its JSON report, not performance.
+"""
+
+import json
+
+from click.testing import CliRunner
+
+from champi_imgui.cli import cli
+from champi_imgui.ipc.benchmark import (
+    bench_burst,
+    bench_codec,
+    bench_round_trip,
+    run_ipc_benchmarks,
+)
+
+
+def test_codec_reports_both_directions():
+    result = bench_codec(50)
+    assert result["iterations"] == 50
+    assert result["frame_bytes"] > 0
+    assert result["pack_ops_per_sec"] > 0
+    assert result["unpack_ops_per_sec"] > 0
+
+
+def test_round_trip_percentiles_are_ordered():
+    result = bench_round_trip(20)
+    assert result["iterations"] == 20
+    assert (
+        result["min_us"]
+        <= result["p50_us"]
+        <= result["p95_us"]
+        <= result["p99_us"]
+        <= result["max_us"]
+    )
+
+
+def test_burst_survives_a_full_ring():
+    result = bench_burst(count=200, capacity=16)
+    assert result["commands"] == 200
+    assert result["commands_per_sec"] > 0
+    assert result["ack_batches"] >= 1
+
+
+def test_report_is_json_serializable():
+    report = run_ipc_benchmarks(codec_iterations=10, round_trips=5, burst=20)
+    decoded = json.loads(json.dumps(report))
+    assert decoded["benchmark"] == "ipc"
+    assert set(decoded["results"]) == {"codec", "round_trip", "burst"}
+
+
+def test_cli_writes_report(tmp_path):
+    out = tmp_path / "ipc.json"
+    result = CliRunner().invoke(
+        cli,
+        [
+            "bench",
+            "ipc",
+            "--codec-iterations",
+            "10",
+            "--round-trips",
+            "5",
+            "--burst",
+            "20",
+            "-o",
+            str(out),
+        ],
+    )
+    assert result.exit_code == 0, result.output
+    assert json.loads(out.read_text())["results"]["burst"]["commands"] == 20
@@ -0,0 +1,88 @@
+"""Tests for the MessagePack-compatible IPC body codec."""
+
+import math
+
+import numpy as np
+import pytest
+
+from champi_imgui.ipc.codec import decode, encode
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        None,
+        True,
+        False,
+        0,
+        127,
+        128,
+        255,
+        65535,
+        2**32,
+        2**64 - 1,
+        -1,
+        -32,
+        -33,
+        -129,
+        -(2**15) - 1,
+        -(2**63),
+        0.0,
+        -1.5,
+        1e300,
+        "",
+        "héllo",
+        "x" * 40,
+        "y" * 70000,
+        b"",
+        b"\x00\x01",
+        [],
+        list(range(20)),
+        {"k": "v"},
+        {str(i): i for i in range(20)},
+        {"deep": [{"a": [1, 2, {"b": None}]}]},
+    ],
+)
+def test_round_trip(value):
+    assert decode(encode(value)) == value
+
+
+def test_tuples_decode_as_lists():
+    assert decode(encode((1.0, 0.5, 0.0, 1.0))) == [1.0, 0.5, 0.0, 1.0]
+
+
+def test_small_values_are_compact():
+    assert encode(5) == b"\x05"
+    assert encode(None) == b"\xc0"
+    assert encode("ab") == b"\xa2ab"
+    assert encode({"a": 1}) == b"\x81\xa1a\x01"
+
+
+def test_numpy_values_use_tolist():
+    arr = np.array([1.5, 2.5], dtype=np.float32)
+    assert decode(encode(arr)) == [1.5, 2.5]
+    assert decode(encode(np.int64(9))) == 9
+
+
+def test_nan_survives():
+    assert math.isnan(decode(encode(float("nan"))))
+
+
+def test_unsupported_type_raises():
+    with pytest.raises(TypeError):
+        encode(object())
+
+
+def test_integer_overflow_raises():
+    with pytest.raises(OverflowError):
+        encode(2**64)
+
+
+def test_truncated_data_raises():
+    with pytest.raises(ValueError):
+        decode(encode("hello")[:-1])
+
+
+def test_trailing_data_raises():
+    with pytest.raises(ValueError):
+        decode(encode(1) + b"\x00")
@@ -0,0 +1,138 @@
+"""Tests for the FIFO doorbell and blocking reads in SharedMemoryManager.
+
+Covers: ring/wait semantics, rings that arrive before the wait are not lost,
+blocked read_command / read_ack wake on the writer's ring without spinning,
+and the polling fallback when no doorbell exists.
+"""
+
+import os
+import threading
+import time
+import uuid
+
+import pytest
+
+from champi_imgui.ipc.command_types import CommandType
+from champi_imgui.ipc.doorbell import DOORBELL_SUPPORTED, Doorbell
+from champi_imgui.ipc.shared_memory_manager import SharedMemoryManager
+
+pytestmark = pytest.mark.skipif(
+    not DOORBELL_SUPPORTED, reason="named FIFOs not available"
+)
+
+
+@pytest.fixture()
+def bell_pair():
+    name = f"bell_{uuid.uuid4().hex[:8]}"
+    creator = Doorbell(name)
+    creator.create()
+    attacher = Doorbell(name)
+    attacher.attach()
+    yield creator, attacher
+    attacher.close()
+    creator.close()
+
+
+@pytest.fixture()
+def shm_pair():
+    prefix = f"bell_{uuid.uuid4().hex[:8]}"
+    creator = SharedMemoryManager(name_prefix=prefix)
+    creator.create_regions()
+    attacher = SharedMemoryManager(name_prefix=prefix)
+    attacher.attach_regions()
+    yield creator, attacher
+    attacher.cleanup()
+    creator.cleanup()
+
+
+def _later(delay: float, fn) -> threading.Thread:
+    def _run() -> None:
+        time.sleep(delay)
+        fn()
+
+    thread = threading.Thread(target=_run, daemon=True)
+    thread.start()
+    return thread
+
+
+class TestDoorbell:
+    def test_wait_times_out_without_ring(self, bell_pair):
+        _, attacher = bell_pair
+        assert attacher.wait(0.01) is False
+
+    def test_ring_before_wait_is_not_lost(self, bell_pair):
+        creator, attacher = bell_pair
+        creator.ring()
+        assert attacher.wait(0.0) is True
+
+    def test_wait_consumes_pending_rings(self, bell_pair):
+        creator, attacher = bell_pair
+        for _ in range(10):
+            creator.ring()
+        assert attacher.wait(0.0) is True
+        assert attacher.wait(0.0) is False
+
+    def test_ring_never_blocks_when_fifo_full(self, bell_pair):
+        creator, _ = bell_pair
+        for _ in range(100_000):
+            creator.ring()
+
+    def test_creator_close_removes_fifo(self):
+        bell = Doorbell(f"bell_{uuid.uuid4().hex[:8]}")
+        bell.create()
+        assert os.path.exists(bell.path)
+        bell.close()
+        assert not os.path.exists(bell.path)
+
+    def test_attach_missing_raises(self):
+        with pytest.raises(FileNotFoundError):
+            Doorbell(f"bell_{uuid.uuid4().hex[:8]}").attach()
+
+
+class TestBlockingReads:
+    def test_read_command_wakes_on_write(self, shm_pair):
+        creator, attacher = shm_pair
+        thread = _later(
+            0.05,
+            lambda: attacher.write_command(
+                CommandType.UPDATE_TITLE, canvas_id="c", title="T"
+            ),
+        )
+        start = time.monotonic()
+        command = creator.read_command(timeout=5.0)
+        elapsed = time.monotonic() - start
+        thread.join()
+
+        assert command is not None and command.data["title"] == "T"
+        assert elapsed < 1.0
+
+    def test_read_ack_wakes_on_write(self, shm_pair):
+        creator, attacher = shm_pair
+        thread = _later(0.05, lambda: creator.write_ack(42))
+        assert attacher.read_ack(timeout=5.0) == 42
+        thread.join()
+
+    def test_blocked_reader_does_not_spin(self, shm_pair):
+        creator, _ = shm_pair
+        cpu_start = time.process_time()
+        assert creator.read_command(timeout=0.3) is None
+        assert time.process_time() - cpu_start < 0.1
+
+    def test_read_ack_timeout(self, shm_pair):
+        _, attacher = shm_pair
+        start = time.monotonic()
+        assert attacher.read_ack(timeout=0.05) is None
+        assert time.monotonic() - start >= 0.05
+
+    def test_falls_back_to_polling_without_doorbell(self, shm_pair):
+        creator, attacher = shm_pair
+        assert creator.ack_bell is not None
+        os.unlink(creator.ack_bell.path)
+        client = SharedMemoryManager(name_prefix=attacher.name_prefix)
+        client.attach_regions()
+        try:
+            assert client.ack_bell is None
+            _later(0.02, lambda: creator.write_ack(7))
+            assert client.read_ack(timeout=5.0) == 7
+        finally:
+            client.cleanup()
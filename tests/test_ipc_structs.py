@@ -1,17 +1,23 @@
-"""Tests for IPC command struct serialization.
+"""Tests for IPC command frame serialization.
 
 Covers: UPDATE_TITLE / UPDATE_SIZE separation, cross-platform alignment,
-and CommandType enum values (closes #144, #151).
+CommandType enum values (closes #144, #151), and variable-length frames
+carrying long strings and widget property dicts, split into fragments when
+too large for the command ring.
 """
 
 import pytest
 
 from champi_imgui.ipc.command_types import CommandType
 from champi_imgui.ipc.structs import (
-    UPDATE_SIZE_STRUCT,
-    UPDATE_TITLE_STRUCT,
-    get_struct_size,
+    FRAME_FRAGMENT,
+    FRAME_HEADER_SIZE,
+    FRAME_HEADER_STRUCT,
+    FRAME_MORE,
+    frame_flags,
+    frame_size,
     pack_command,
+    split_frame,
     unpack_command,
 )
 
@@ -47,8 +53,9 @@ class TestUpdateTitleRoundTrip:
         assert "width" not in result.data
         assert "height" not in result.data
 
-    def test_get_struct_size_update_title(self) -> None:
-        assert get_struct_size(CommandType.UPDATE_TITLE) == UPDATE_TITLE_STRUCT.size
+    def test_frame_size_update_title(self) -> None:
+        packed = pack_command(CommandType.UPDATE_TITLE, 1, canvas_id="x", title="T")
+        assert frame_size(packed) == len(packed)
 
     def test_unicode_title_round_trips(self) -> None:
         packed = pack_command(CommandType.UPDATE_TITLE, 99, canvas_id="c", title="Ñoño")
@@ -73,8 +80,11 @@ class TestUpdateSizeRoundTrip:
         result = unpack_command(packed)
         assert "title" not in result.data
 
-    def test_get_struct_size_update_size(self) -> None:
-        assert get_struct_size(CommandType.UPDATE_SIZE) == UPDATE_SIZE_STRUCT.size
+    def test_frame_size_update_size(self) -> None:
+        packed = pack_command(
+            CommandType.UPDATE_SIZE, 2, canvas_id="x", width=800, height=600
+        )
+        assert frame_size(packed) == len(packed)
 
     @pytest.mark.parametrize(
         "width,height",
@@ -118,13 +128,14 @@ class TestCrossContamination:
 
 
 class TestStructAlignment:
-    def test_update_size_width_field_is_4byte_aligned(self) -> None:
-        """Width integer must start at a 4-byte aligned offset (ARM64 requirement)."""
+    def test_frame_header_seq_field_is_8byte_aligned(self) -> None:
+        """seq_num must start at an 8-byte aligned offset (ARM64 requirement)."""
         import struct as _struct
 
-        # offset after QB + 64s + 3x padding
-        offset = _struct.calcsize("<QB64s3x")
-        assert offset % 4 == 0, f"width field at offset {offset} is not 4-byte aligned"
+        # offset after body_len (I) + version (B) + cmd_type (B) + 2x padding
+        offset = _struct.calcsize("<IBB2x")
+        assert offset % 8 == 0, f"seq field at offset {offset} is not 8-byte aligned"
+        assert FRAME_HEADER_STRUCT.size == FRAME_HEADER_SIZE == 16
 
     def test_update_size_round_trip_exact_values(self) -> None:
         """Guard against byte-swap or misread on big-endian / strict-alignment platforms."""
@@ -139,3 +150,90 @@ class TestStructAlignment:
             assert result.data["height"] == h, (
                 f"height mismatch: expected {h:#x}, got {result.data['height']:#x}"
             )
+
+
+class TestVariableLengthFrames:
+    def test_long_title_is_not_truncated(self) -> None:
+        title = "T" * 1000
+        packed = pack_command(CommandType.UPDATE_TITLE, 1, canvas_id="c", title=title)
+        assert unpack_command(packed).data["title"] == title
+
+    def test_long_ids_are_not_truncated(self) -> None:
+        canvas_id = "canvas-" + "x" * 200
+        packed = pack_command(CommandType.CLEAR_CANVAS, 1, canvas_id=canvas_id)
+        assert unpack_command(packed).data["canvas_id"] == canvas_id
+
+    def test_short_command_has_no_padding(self) -> None:
+        packed = pack_command(CommandType.CLEAR_CANVAS, 1, canvas_id="c")
+        assert len(packed) < 32
+        assert b"#" not in packed
+
+    def test_update_widget_carries_property_dict(self) -> None:
+        props = {
+            "label": "OK",
+            "value": 0.5,
+            "enabled": True,
+            "color": [1.0, 0.0, 0.0, 1.0],
+            "points": [[float(i), float(-i)] for i in range(2000)],
+            "nested": {"a": None, "b": -7, "c": 2**40},
+        }
+        packed = pack_command(
+            CommandType.UPDATE_WIDGET, 7, canvas_id="c", widget_id="w", properties=props
+        )
+        result = unpack_command(packed)
+        assert result.command_type == CommandType.UPDATE_WIDGET
+        assert result.seq_num == 7
+        assert result.data == {
+            "canvas_id": "c",
+            "widget_id": "w",
+            "properties": props,
+            "ops": [],
+        }
+
+    def test_add_widget_round_trip(self) -> None:
+        packed = pack_command(
+            CommandType.ADD_WIDGET,
+            3,
+            canvas_id="c",
+            widget_id="btn",
+            widget_type="ButtonWidget",
+            properties={"label": "Go"},
+        )
+        data = unpack_command(packed).data
+        assert data["widget_type"] == "ButtonWidget"
+        assert data["properties"] == {"label": "Go"}
+
+    def test_remove_widget_round_trip(self) -> None:
+        packed = pack_command(
+            CommandType.REMOVE_WIDGET, 4, canvas_id="c", widget_id="w"
+        )
+        data = unpack_command(packed).data
+        assert data == {"canvas_id": "c", "widget_id": "w"}
+
+    def test_trailing_bytes_after_frame_are_ignored(self) -> None:
+        packed = pack_command(CommandType.SHUTDOWN, 1, canvas_id="c")
+        assert unpack_command(packed + bytes(100)).data["canvas_id"] == "c"
+
+    def test_truncated_frame_rejected(self) -> None:
+        packed = pack_command(CommandType.UPDATE_TITLE, 1, canvas_id="c", title="abc")
+        with pytest.raises(ValueError):
+            unpack_command(packed[:-1])
+
+    def test_ack_is_not_a_command(self) -> None:
+        with pytest.raises(ValueError):
+            pack_command(CommandType.ACK, 1)
+
+    def test_split_frame_rejoins(self) -> None:
+        packed = pack_command(
+            CommandType.UPDATE_TITLE, 9, canvas_id="c", title="t" * 300
+        )
+        fragments = split_frame(packed, 64)
+
+        assert all(len(f) <= 64 for f in fragments)
+        assert [frame_flags(f) for f in fragments] == [FRAME_FRAGMENT | FRAME_MORE] * (
+            len(fragments) - 1
+        ) + [FRAME_FRAGMENT]
+        joined = b"".join(f[FRAME_HEADER_SIZE:] for f in fragments)
+        assert unpack_command(joined).data["title"] == "t" * 300
+        with pytest.raises(ValueError, match="fragment"):
+            unpack_command(fragments[0])
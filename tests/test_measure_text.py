@@ -2,6 +2,7 @@
 
 import contextlib
 import threading
+import time
 import uuid
 from unittest.mock import MagicMock, patch
 
@@ -152,58 +153,79 @@ def test_measure_text_timeout(cid, monkeypatch):
 
 
 def test_request_measure_text_dispatches_to_render_thread(cid):
-    """request_measure_text sets _measure_text_request before blocking."""
+    """request_measure_text queues a render task and returns its result."""
     canvas = Canvas(cid)
     canvas._running = True
 
-    captured_req = {}
+    calls = []
 
-    def fake_wake():
-        # Simulate the render thread handling the request immediately
-        req = canvas._measure_text_request
-        if req is not None:
-            captured_req.update(req)
-            req["result"] = {"width": 42, "height": 16}
-            req["done"].set()
+    def fake_measure(text, font_size):
+        calls.append((text, font_size))
+        return {"width": 42, "height": 16}
 
-    canvas._wake_render = fake_wake  # type: ignore[method-assign]
+    canvas._measure_text = fake_measure  # type: ignore[method-assign]
+    # Simulate the render thread running the frame immediately
+    canvas._request_frame = canvas.render_tasks.run_pending
 
     result = canvas.request_measure_text("Hello", 16, timeout=2.0)
 
     assert result == {"width": 42, "height": 16}
-    assert captured_req["text"] == "Hello"
-    assert captured_req["font_size"] == 16
+    assert calls == [("Hello", 16)]
 
     canvas.shm_manager.cleanup()
 
 
-def test_request_measure_text_timeout_clears_request(cid):
-    """request_measure_text clears _measure_text_request on timeout."""
+def test_request_measure_text_timeout_cancels_task(cid):
+    """request_measure_text cancels its task on timeout."""
     canvas = Canvas(cid)
     canvas._running = True
-    canvas._wake_render = lambda: None  # type: ignore[method-assign]
 
     with pytest.raises(TimeoutError):
         canvas.request_measure_text("Hello", 16, timeout=0.05)
 
-    assert canvas._measure_text_request is None
+    assert canvas.render_tasks.run_pending() == 0
+
+    canvas.shm_manager.cleanup()
+
+
+def test_concurrent_measure_text_served_in_one_frame(cid):
+    """Concurrent requests do not overwrite each other; one frame serves all."""
+    canvas = Canvas(cid)
+    canvas._running = True
+    canvas._measure_text = lambda text, font_size: {  # type: ignore[method-assign]
+        "width": len(text),
+        "height": font_size,
+    }
+
+    results: dict[int, dict] = {}
+
+    def worker(i: int) -> None:
+        results[i] = canvas.request_measure_text("x" * i, i, timeout=5.0)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(1, 9)]
+    for t in threads:
+        t.start()
+    while len(canvas.render_tasks) < len(threads):
+        time.sleep(0.001)
+
+    assert canvas.render_tasks.run_pending() == len(threads)
+    for t in threads:
+        t.join(timeout=5.0)
+
+    assert results == {i: {"width": i, "height": i} for i in range(1, 9)}
 
     canvas.shm_manager.cleanup()
 
 
 # ---------------------------------------------------------------------------
-# Canvas._handle_measure_text — render-thread handler
+# Canvas._measure_text — render-thread handler
 # ---------------------------------------------------------------------------
 
 
-def test_handle_measure_text_calls_calc_text_size(cid):
-    """_handle_measure_text calls imgui.calc_text_size and stores result."""
+def test_measure_text_calls_calc_text_size(cid):
+    """_measure_text calls imgui.calc_text_size and stores result."""
     canvas = Canvas(cid)
 
-    done = threading.Event()
-    req = {"text": "Hello", "font_size": 14, "done": done}
-    canvas._measure_text_request = req  # type: ignore[assignment]
-
     mock_size = MagicMock()
     mock_size.x = 42.7
     mock_size.y = 16.3
@@ -218,35 +240,20 @@ def test_handle_measure_text_calls_calc_text_size(cid):
         patch("champi_imgui.core.canvas.imgui.get_io", return_value=mock_io),
         patch("champi_imgui.core.canvas.imgui.push_font"),
         patch("champi_imgui.core.canvas.imgui.calc_text_size", return_value=mock_size),
+        patch.object(canvas, "_learn_glyphs"),
         patch("champi_imgui.core.canvas.imgui.pop_font"),
     ):
-        canvas._handle_measure_text()
+        result = canvas._measure_text("Hello", 14)
 
-    assert done.is_set()
-    assert req["result"]["width"] == 42
-    assert req["result"]["height"] == 16
+    assert result["width"] == 42
+    assert result["height"] == 16
 
     canvas.shm_manager.cleanup()
 
 
-def test_handle_measure_text_no_request_is_noop(cid):
-    """_handle_measure_text does nothing when no request is pending."""
+def test_measure_text_truncates_floats(cid):
+    """_measure_text truncates float dimensions to int via int()."""
     canvas = Canvas(cid)
-    canvas._measure_text_request = None
-
-    # Should not raise
-    canvas._handle_measure_text()
-
-    canvas.shm_manager.cleanup()
-
-
-def test_handle_measure_text_truncates_floats(cid):
-    """_handle_measure_text truncates float dimensions to int via int()."""
-    canvas = Canvas(cid)
-
-    done = threading.Event()
-    req = {"text": "X", "font_size": 12, "done": done}
-    canvas._measure_text_request = req  # type: ignore[assignment]
 
     mock_size = MagicMock()
     mock_size.x = 9.99
@@ -258,10 +265,11 @@ def test_handle_measure_text_truncates_floats(cid):
     with (
         patch("champi_imgui.core.canvas.imgui.get_io", return_value=mock_io),
         patch("champi_imgui.core.canvas.imgui.calc_text_size", return_value=mock_size),
+        patch.object(canvas, "_learn_glyphs"),
     ):
-        canvas._handle_measure_text()
+        result = canvas._measure_text("X", 12)
 
-    assert req["result"]["width"] == 9
-    assert req["result"]["height"] == 13
+    assert result["width"] == 9
+    assert result["height"] == 13
 
     canvas.shm_manager.cleanup()
@@ -0,0 +1,190 @@
+"""Tests for the glyph-metrics cache and the measure_text_batch tool."""
+
+import contextlib
+import random
+import uuid
+
+import pytest
+from imgui_bundle import imgui
+
+from champi_imgui.api.server import create_mcp_app
+from champi_imgui.core.canvas import Canvas, CanvasManager
+from champi_imgui.core.text_metrics import PRELOAD_CHARS, TextMetricsCache, text_size
+
+_ADVANCES = {c: 7.5 for c in PRELOAD_CHARS}
+
+
+def _fn(mcp, name):
+    return mcp._local_provider._components[f"tool:{name}@"].fn
+
+
+@pytest.fixture()
+def manager():
+    mgr = CanvasManager()
+    yield mgr
+    for canvas in list(mgr.canvases.values()):
+        with contextlib.suppress(Exception):
+            canvas.shm_manager.cleanup()
+
+
+@pytest.fixture()
+def canvas(manager):
+    canvas = manager.create_canvas(f"c_{uuid.uuid4().hex[:8]}", auto_start=False)
+    canvas._running = True
+    return canvas
+
+
+@pytest.fixture()
+def display_size() -> tuple[float, float]:
+    return (800, 600)
+
+
+@pytest.fixture()
+def imgui_frame(imgui_context):
+    imgui.new_frame()
+    yield imgui_context
+    imgui.render()
+
+
+class TestTextSize:
+    def test_single_line_rounds_width_up(self):
+        assert text_size("ab", 13.0, {"a": 6.2, "b": 6.2}) == (13, 13)
+
+    def test_lines(self):
+        assert text_size("aa\na", 10.0, {"a": 5.0}) == (10, 20)
+        # A trailing newline does not start a counted line
+        assert text_size("a\n", 10.0, {"a": 5.0}) == (5, 10)
+        assert text_size("", 10.0, {}) == (0, 10)
+        assert text_size("\n", 10.0, {}) == (0, 10)
+
+
+class TestTextMetricsCache:
+    def test_unknown_size_or_char_misses(self):
+        cache = TextMetricsCache()
+        assert cache.measure("abc", 16) is None
+        cache.learn(16, 16.0, _ADVANCES)
+        assert cache.measure("abc", 16) == {"width": 23, "height": 16}
+        assert cache.measure("abc", 17) is None
+        assert cache.measure("añb", 16) is None
+
+    def test_missing(self):
+        cache = TextMetricsCache()
+        assert cache.missing(["ab\n", "b"], 16) == "ab"
+        cache.learn(16, 16.0, {"a": 1.0})
+        assert cache.missing(["ab\n", "b"], 16) == "b"
+
+    def test_line_height_change_resets_size(self):
+        cache = TextMetricsCache()
+        cache.learn(16, 16.0, {"a": 1.0})
+        cache.learn(16, 20.0, {"b": 1.0})
+        assert cache.measure("a", 16) is None
+        assert cache.measure("b", 16) == {"width": 1, "height": 20}
+
+    def test_clear(self):
+        cache = TextMetricsCache()
+        cache.learn(16, 16.0, _ADVANCES)
+        cache.clear()
+        assert len(cache) == 0
+        assert cache.measure("a", 16) is None
+
+
+class TestRenderThreadMeasurement:
+    def test_cache_matches_calc_text_size(self, canvas, imgui_frame):
+        rng = random.Random(7)
+        alphabet = "abcXYZ 019.,!?\t\néß"
+        texts = [
+            "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 30)))
+            for _ in range(200)
+        ]
+
+        for font_size in (13, 22):
+            measured = canvas._measure_texts(texts, font_size)["sizes"]
+            cached = [canvas.text_metrics.measure(t, font_size) for t in texts]
+            assert cached == measured
+
+    def test_preloads_printable_ascii(self, canvas, imgui_frame):
+        canvas._measure_texts(["x"], 16)
+        assert canvas.text_metrics.missing([PRELOAD_CHARS], 16) == ""
+
+    def test_style_change_clears_cache(self, manager, canvas):
+        canvas.text_metrics.learn(16, 16.0, _ADVANCES)
+        manager._on_style_changed(None)
+        assert len(canvas.text_metrics) == 0
+
+
+class TestRequests:
+    def test_cached_measurement_skips_render_thread(self, canvas):
+        canvas.text_metrics.learn(16, 16.0, _ADVANCES)
+        woken: list[bool] = []
+        canvas._request_frame = lambda: woken.append(True)
+
+        assert canvas.request_measure_text("Hi", 16) == {"width": 15, "height": 16}
+        assert woken == []
+
+    def test_batch_sends_only_misses_in_one_task(self, canvas):
+        canvas.text_metrics.learn(16, 16.0, _ADVANCES)
+        batches: list[list[str]] = []
+
+        def fake_measure(texts, font_size):
+            batches.append(texts)
+            return {"sizes": [{"width": 99, "height": font_size} for _ in texts]}
+
+        canvas._measure_texts = fake_measure  # type: ignore[method-assign]
+        canvas._request_frame = canvas.render_tasks.run_pending
+
+        result = canvas.request_measure_text_batch(["a", "ñ", "b", "ü"], 16)
+
+        assert batches == [["ñ", "ü"]]
+        assert result["cached"] == 2
+        assert [s["width"] for s in result["sizes"]] == [8, 99, 8, 99]
+
+    def test_batch_propagates_error(self, canvas):
+        canvas._measure_texts = lambda texts, size: {"error": "no font"}  # type: ignore[method-assign]
+        canvas._request_frame = canvas.render_tasks.run_pending
+
+        assert canvas.request_measure_text_batch(["a"], 16) == {"error": "no font"}
+
+
+class TestBatchTool:
+    def test_returns_sizes(self, manager, canvas):
+        canvas.text_metrics.learn(16, 16.0, _ADVANCES)
+        mcp = create_mcp_app(canvas_manager=manager)
+
+        result = _fn(mcp, "measure_text_batch")(
+            canvas.state.canvas_id, ["ab", "abcd"], 16
+        )
+
+        assert result["success"] is True
+        assert result["data"]["sizes"] == [
+            {"width": 15, "height": 16},
+            {"width": 30, "height": 16},
+        ]
+        assert result["data"]["cached"] == 2
+
+    def test_canvas_not_found(self, manager):
+        mcp = create_mcp_app(canvas_manager=manager)
+        result = _fn(mcp, "measure_text_batch")("missing", ["a"], 16)
+        assert result["success"] is False
+
+    def test_canvas_not_running(self, manager, canvas):
+        canvas._running = False
+        mcp = create_mcp_app(canvas_manager=manager)
+        result = _fn(mcp, "measure_text_batch")(canvas.state.canvas_id, ["a"], 16)
+        assert "not running" in result["error"]
+
+    def test_timeout(self, manager, canvas, monkeypatch):
+        def raise_timeout(*args, **kwargs):
+            raise TimeoutError("timed out")
+
+        monkeypatch.setattr(canvas, "request_measure_text_batch", raise_timeout)
+        mcp = create_mcp_app(canvas_manager=manager)
+        result = _fn(mcp, "measure_text_batch")(canvas.state.canvas_id, ["a"], 16)
+        assert "timed out" in result["error"]
+
+
+def test_canvas_exposes_text_metrics():
+    canvas = Canvas(f"c_{uuid.uuid4().hex[:8]}")
+    try:
+        assert isinstance(canvas.text_metrics, TextMetricsCache)
+    finally:
+        canvas.shm_manager.cleanup()
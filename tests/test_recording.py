@@ -0,0 +1,199 @@
+"""Tests for continuous frame capture (start_capture / stop_capture)."""
+
+import contextlib
+import json
+import uuid
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from champi_imgui.api.server import create_mcp_app
+from champi_imgui.core.canvas import Canvas, CanvasManager
+from champi_imgui.core.frame_capture import FramebufferReader
+from champi_imgui.core.recording import CaptureSession
+from tests.test_frame_capture import FakeGL
+
+_RECT = (0, 0, 16, 8)
+
+
+def _fn(mcp, name):
+    return mcp._local_provider._components[f"tool:{name}@"].fn
+
+
+def _run(session, reader, times):
+    for now in times:
+        session.on_frame(now, reader)
+        reader.poll()
+
+
+@pytest.fixture()
+def manager(monkeypatch):
+    mgr = CanvasManager()
+    monkeypatch.setattr(mgr, "ensure_canvas_running", lambda canvas_id: True)
+    yield mgr
+    for canvas in list(mgr.canvases.values()):
+        with contextlib.suppress(Exception):
+            canvas.stop_capture()
+            canvas.shm_manager.cleanup()
+
+
+@pytest.fixture()
+def canvas():
+    canvas = Canvas(f"c_{uuid.uuid4().hex[:8]}", size=(16, 8))
+    canvas._framebuffer = FramebufferReader(gl=FakeGL(16, 8))
+    yield canvas
+    canvas.stop_capture()
+    canvas.shm_manager.cleanup()
+
+
+class TestCaptureSession:
+    def test_image_sequence(self, tmp_path):
+        gl = FakeGL(16, 8)
+        reader = FramebufferReader(gl=gl)
+        session = CaptureSession(str(tmp_path), fps=10.0, rect=_RECT)
+
+        _run(session, reader, [0.0, 0.05, 0.1, 0.2])
+        stats = session.stop()
+
+        assert stats["captured"] == 3
+        assert stats["written"] == 3
+        assert stats["dropped"] == 0
+        frames = sorted(p.name for p in tmp_path.glob("frame_*.png"))
+        assert frames == ["frame_000000.png", "frame_000001.png", "frame_000002.png"]
+        image = np.asarray(Image.open(tmp_path / "frame_000000.png"))
+        np.testing.assert_array_equal(image, gl.framebuffer[::-1])
+        manifest = json.loads((tmp_path / "capture.json").read_text())
+        assert manifest["timestamps"] == [0.0, 0.1, 0.2]
+        assert (manifest["width"], manifest["height"]) == (16, 8)
+
+    def test_raw_stream(self, tmp_path):
+        gl = FakeGL(16, 8)
+        reader = FramebufferReader(gl=gl)
+        session = CaptureSession(
+            str(tmp_path), fps=30.0, rect=_RECT, image_format="rgba"
+        )
+
+        _run(session, reader, [0.0, 0.04, 0.08])
+        session.stop()
+
+        data = (tmp_path / "frames.rgba").read_bytes()
+        assert len(data) == 3 * 16 * 8 * 4
+        assert data[: 16 * 8 * 4] == gl.framebuffer[::-1].tobytes()
+
+    def test_frames_dropped_under_backpressure(self, tmp_path):
+        gl = FakeGL(16, 8)
+        gl.ready = False
+        reader = FramebufferReader(buffers=4, gl=gl)
+        session = CaptureSession(str(tmp_path), fps=10.0, rect=_RECT, max_pending=2)
+
+        _run(session, reader, [0.0, 0.15, 0.25, 0.35, 0.45])
+
+        stats = session.stats()
+        assert stats["captured"] == 2
+        assert stats["dropped"] == 3
+        assert stats["pending"] == 2
+
+    def test_reads_finishing_after_stop_are_dropped(self, tmp_path):
+        gl = FakeGL(16, 8)
+        gl.ready = False
+        reader = FramebufferReader(gl=gl)
+        session = CaptureSession(str(tmp_path), fps=10.0, rect=_RECT)
+        _run(session, reader, [0.0])
+
+        session.stop()
+        gl.ready = True
+        reader.poll()
+
+        stats = session.stats()
+        assert stats["written"] == 0
+        assert stats["dropped"] == 1
+        assert not stats["active"]
+
+    def test_read_failure_ends_session(self, tmp_path):
+        reader = FramebufferReader(gl=FakeGL(context=False))
+        session = CaptureSession(str(tmp_path), fps=10.0, rect=_RECT)
+
+        session.on_frame(0.0, reader)
+
+        assert not session.active
+        assert "context" in session.stats()["error"]
+        session.stop()
+
+    @pytest.mark.parametrize(
+        "options",
+        [{"fps": 0}, {"max_pending": 0}, {"image_format": "gif"}],
+    )
+    def test_rejects_bad_options(self, tmp_path, options):
+        kwargs = {"fps": 10.0, "rect": _RECT, **options}
+        with pytest.raises(ValueError):
+            CaptureSession(str(tmp_path), **kwargs)
+
+
+class TestCanvasCapture:
+    def test_capture_runs_from_render_frames(self, canvas, tmp_path):
+        canvas.start_capture(str(tmp_path), fps=10.0, region=[0, 0, 8, 4])
+        for now in (0.0, 0.1):
+            canvas._capture.on_frame(now, canvas._framebuffer)
+            canvas._framebuffer.poll()
+
+        stats = canvas.stop_capture()
+
+        assert stats["written"] == 2
+        assert (stats["width"], stats["height"]) == (8, 4)
+        assert canvas._capture is None
+
+    def test_second_start_is_rejected(self, canvas, tmp_path):
+        canvas.start_capture(str(tmp_path))
+        with pytest.raises(RuntimeError):
+            canvas.start_capture(str(tmp_path))
+
+    def test_idle_canvas_wakes_for_capture(self, canvas, tmp_path):
+        canvas._dirty_frames = 0
+        assert canvas.next_frame_delay(0.0) is None
+
+        canvas.start_capture(str(tmp_path), fps=4.0)
+        canvas._capture.on_frame(0.0, canvas._framebuffer)
+        canvas._framebuffer.poll()
+
+        assert canvas.next_frame_delay(0.1) == pytest.approx(0.15)
+
+    def test_stop_ends_capture(self, canvas, tmp_path):
+        canvas._running = True
+        canvas.start_capture(str(tmp_path))
+        canvas.stop()
+        assert canvas._capture is None
+        assert (tmp_path / "capture.json").exists()
+
+
+class TestCaptureTools:
+    def test_start_and_stop(self, manager, tmp_path):
+        canvas = manager.create_canvas(f"c_{uuid.uuid4().hex[:8]}", auto_start=False)
+        mcp = create_mcp_app(canvas_manager=manager)
+        cid = canvas.state.canvas_id
+
+        started = _fn(mcp, "start_capture")(cid, str(tmp_path), fps=5.0)
+        assert started["success"] is True
+        assert started["data"]["active"] is True
+
+        stopped = _fn(mcp, "stop_capture")(cid)
+        assert stopped["success"] is True
+        assert stopped["data"]["active"] is False
+
+    def test_stop_without_capture(self, manager):
+        canvas = manager.create_canvas(f"c_{uuid.uuid4().hex[:8]}", auto_start=False)
+        mcp = create_mcp_app(canvas_manager=manager)
+        result = _fn(mcp, "stop_capture")(canvas.state.canvas_id)
+        assert result["success"] is False
+
+    def test_start_rejects_bad_format(self, manager, tmp_path):
+        canvas = manager.create_canvas(f"c_{uuid.uuid4().hex[:8]}", auto_start=False)
+        mcp = create_mcp_app(canvas_manager=manager)
+        result = _fn(mcp, "start_capture")(
+            canvas.state.canvas_id, str(tmp_path), image_format="gif"
+        )
+        assert result["success"] is False
+
+    def test_unknown_canvas(self, manager, tmp_path):
+        mcp = create_mcp_app(canvas_manager=manager)
+        assert _fn(mcp, "start_capture")("missing", str(tmp_path))["success"] is False
@@ -0,0 +1,285 @@
+"""Tests for the out-of-process render host.
+
+The host's hello_imgui loop is not started here: a RenderHost is driven in
+the test process by calling process_control() and each canvas's
+_process_commands(), which is what one host frame does.  This checks that
+the server-side model and the host's canvases stay in sync through the
+control ring and the per-canvas command rings, how canvases are placed
+across several hosts, and that tools needing the in-process render loop fail
+fast for host-drawn canvases.
+"""
+
+import contextlib
+import threading
+import time
+import uuid
+
+import pytest
+
+from champi_imgui.api.server import create_mcp_app
+from champi_imgui.core.canvas import CanvasManager
+from champi_imgui.core.render_host import RenderHost
+from champi_imgui.ipc.command_types import AckStatus, CommandType
+from champi_imgui.ipc.shared_memory_manager import SharedMemoryManager
+from champi_imgui.widgets import ButtonWidget, TabBarWidget, TabItemWidget
+
+
+@pytest.fixture()
+def cid() -> str:
+    return f"c_{uuid.uuid4().hex[:8]}"
+
+
+@pytest.fixture()
+def pair(monkeypatch):
+    """A render_process manager wired to an in-process RenderHost."""
+    manager = CanvasManager(render_process=True)
+    handle = manager._hosts[0]
+    handle.control = SharedMemoryManager(name_prefix=handle.control_prefix)
+    handle.control.create_regions()
+    monkeypatch.setattr(handle, "is_alive", lambda: True)
+    host = RenderHost(handle.control_prefix)
+    yield manager, host
+    with contextlib.suppress(Exception):
+        host.cleanup()
+    monkeypatch.setattr(handle, "is_alive", lambda: False)
+    manager.cleanup()
+
+
+def _frame(host: RenderHost) -> None:
+    host.process_control()
+    for canvas in host.canvases.values():
+        canvas._process_commands()
+
+
+class TestControlRing:
+    def test_create_canvas_opens_host_canvas(self, pair, cid):
+        manager, host = pair
+        manager.create_canvas(
+            cid, auto_start=False, title="Board", size=(320, 240), fps_target=5
+        )
+        _frame(host)
+
+        canvas = host.canvases[cid]
+        assert canvas.state.title == "Board"
+        assert canvas.state.size == (320, 240)
+        assert canvas.state.fps_target == 5
+        assert canvas.shm_manager.is_creator is False
+
+    def test_remove_canvas_drops_host_canvas(self, pair, cid):
+        manager, host = pair
+        manager.create_canvas(cid, auto_start=False)
+        _frame(host)
+        manager.remove_canvas(cid)
+        _frame(host)
+        assert cid not in host.canvases
+
+    def test_empty_shutdown_requests_exit(self, pair):
+        manager, host = pair
+        manager._hosts[0].close_canvas("")
+        host.process_control()
+        assert host._exit_requested is True
+
+
+class TestModelMirroring:
+    def test_add_widget_is_mirrored(self, pair, cid):
+        manager, host = pair
+        canvas = manager.create_canvas(cid, auto_start=False)
+        canvas.add_widget(ButtonWidget("go", label="Go"))
+        _frame(host)
+
+        widget = host.canvases[cid].widget_registry.get("go")
+        assert isinstance(widget, ButtonWidget)
+        assert widget.state.properties["label"] == "Go"
+
+    def test_send_command_updates_model_and_host(self, pair, cid):
+        manager, host = pair
+        canvas = manager.create_canvas(cid, auto_start=False)
+        canvas.add_widget(ButtonWidget("go", label="Go"))
+        manager.send_command(
+            cid, CommandType.UPDATE_WIDGET, widget_id="go", properties={"label": "Stop"}
+        )
+        # The model sees the change before the host has run a frame
+        assert canvas.widget_registry.get("go").state.properties["label"] == "Stop"
+        _frame(host)
+        host_widget = host.canvases[cid].widget_registry.get("go")
+        assert host_widget.state.properties["label"] == "Stop"
+
+    def test_direct_model_update_is_forwarded(self, pair, cid):
+        manager, host = pair
+        canvas = manager.create_canvas(cid, auto_start=False)
+        widget = ButtonWidget("go", label="Go")
+        canvas.add_widget(widget)
+        widget.update(label="Direct")
+        _frame(host)
+        host_widget = host.canvases[cid].widget_registry.get("go")
+        assert host_widget.state.properties["label"] == "Direct"
+
+    def test_remove_widget_is_mirrored(self, pair, cid):
+        manager, host = pair
+        canvas = manager.create_canvas(cid, auto_start=False)
+        canvas.add_widget(ButtonWidget("go"))
+        canvas.remove_widget("go")
+        _frame(host)
+        assert host.canvases[cid].widget_registry.get("go") is None
+
+    def test_tab_item_keeps_parent(self, pair, cid):
+        manager, host = pair
+        canvas = manager.create_canvas(cid, auto_start=False)
+        bar = TabBarWidget("tabs")
+        canvas.add_widget(bar)
+        item = TabItemWidget("first", label="First")
+        bar.add_tab_item(item)
+        canvas.add_widget(item)
+        _frame(host)
+
+        host_bar = host.canvases[cid].widget_registry.get("tabs")
+        assert [t.widget_id for t in host_bar._tab_items] == ["first"]
+
+    def test_submit_command_acked_by_host(self, pair, cid):
+        manager, host = pair
+        canvas = manager.create_canvas(cid, auto_start=False)
+        canvas.add_widget(ButtonWidget("go"))
+        future = manager.submit_command(
+            cid, CommandType.UPDATE_WIDGET, widget_id="go", properties={"label": "A"}
+        )
+        _frame(host)
+        assert future.result(timeout=2.0) == AckStatus.OK
+
+
+class TestInProcessDefault:
+    def test_no_host_without_flag(self):
+        manager = CanvasManager()
+        assert manager._hosts == []
+        assert manager.is_loop_healthy() is False
+
+
+# ---------------------------------------------------------------------------
+# Sharding
+# ---------------------------------------------------------------------------
+
+
+def _fn(mcp, name):
+    return mcp._local_provider._components[f"tool:{name}@"].fn
+
+
+@pytest.fixture()
+def sharded():
+    managers = []
+
+    def make(**kwargs):
+        manager = CanvasManager(render_process=True, **kwargs)
+        managers.append(manager)
+        return manager
+
+    yield make
+    for manager in managers:
+        manager.cleanup()
+
+
+class TestSharding:
+    def test_round_robin_placement(self, sharded):
+        manager = sharded(render_hosts=3)
+        for i in range(5):
+            manager.create_canvas(f"rr_{uuid.uuid4().hex[:6]}_{i}", auto_start=False)
+        shards = [manager.shard_of(cid) for cid in manager.canvases]
+        assert shards == [0, 1, 2, 0, 1]
+
+    def test_least_loaded_prefers_fastest_host(self, sharded):
+        manager = sharded(render_hosts=3, placement="least_loaded")
+        for host, ms in zip(manager._hosts, (9.0, 2.0, 5.0), strict=True):
+            host._frame_time.value = ms
+        canvas_id = f"ll_{uuid.uuid4().hex[:6]}"
+        manager.create_canvas(canvas_id, auto_start=False)
+        assert manager.shard_of(canvas_id) == 1
+
+    def test_least_loaded_falls_back_to_canvas_count(self, sharded):
+        manager = sharded(render_hosts=2, placement="least_loaded")
+        ids = [f"ll_{uuid.uuid4().hex[:6]}_{i}" for i in range(4)]
+        for canvas_id in ids:
+            manager.create_canvas(canvas_id, auto_start=False)
+        assert sorted(manager.shard_of(cid) for cid in ids) == [0, 0, 1, 1]
+
+    def test_removed_canvas_has_no_shard(self, sharded):
+        manager = sharded(render_hosts=2)
+        canvas_id = f"rm_{uuid.uuid4().hex[:6]}"
+        manager.create_canvas(canvas_id, auto_start=False)
+        manager.remove_canvas(canvas_id)
+        assert manager.shard_of(canvas_id) is None
+
+    def test_canvas_health_follows_its_own_host(self, sharded, monkeypatch):
+        manager = sharded(render_hosts=2)
+        first = manager.create_canvas(f"h_{uuid.uuid4().hex[:6]}", auto_start=False)
+        second = manager.create_canvas(f"h_{uuid.uuid4().hex[:6]}", auto_start=False)
+        first._running = second._running = True
+        monkeypatch.setattr(manager._hosts[0], "is_alive", lambda: True)
+        assert first.is_render_healthy() is True
+        assert second.is_render_healthy() is False
+        assert manager.is_loop_healthy() is False
+
+    def test_invalid_arguments_rejected(self):
+        with pytest.raises(ValueError, match="render_hosts"):
+            CanvasManager(render_process=True, render_hosts=0)
+        with pytest.raises(ValueError, match="Unknown placement"):
+            CanvasManager(render_process=True, placement="random")
+
+    def test_replay_runs_outside_pool_lock(self, sharded, monkeypatch):
+        """Replaying waits on per-canvas locks, so it must not hold the pool."""
+        manager = sharded()
+        canvas_id = f"rp_{uuid.uuid4().hex[:6]}"
+        manager.create_canvas(canvas_id, auto_start=False)
+        host = manager._hosts[0]
+        monkeypatch.setattr(host, "start", lambda: None)
+        monkeypatch.setattr(host, "wait_ready", lambda timeout: True)
+        pool_free = []
+
+        def replay(host, canvas):
+            probe = threading.Thread(
+                target=lambda: pool_free.append(
+                    manager._clients_lock.acquire(timeout=1.0)
+                    and manager._clients_lock.release() is None
+                )
+            )
+            probe.start()
+            probe.join()
+
+        monkeypatch.setattr(manager, "_replay_canvas", replay)
+        manager._start_render_hosts()
+
+        assert pool_free == [True]
+
+    def test_system_state_reports_shard(self, sharded):
+        manager = sharded(render_hosts=2)
+        ids = [f"ss_{uuid.uuid4().hex[:6]}_{i}" for i in range(2)]
+        for canvas_id in ids:
+            manager.create_canvas(canvas_id, auto_start=False)
+        mcp = create_mcp_app(canvas_manager=manager)
+
+        result = _fn(mcp, "get_system_state")()
+
+        assert result["success"] is True
+        shards = {c["canvas_id"]: c["shard"] for c in result["data"]["canvases"]}
+        assert shards == {ids[0]: 0, ids[1]: 1}
+
+
+@pytest.mark.parametrize(
+    ("tool", "kwargs"),
+    [
+        ("screenshot_canvas", {"output": "base64"}),
+        ("measure_text", {"widget_id": "w", "text": "abc", "font_size": 13}),
+        ("measure_text_batch", {"texts": ["abc"], "font_size": 13}),
+        ("get_canvas_info", {}),
+    ],
+)
+def test_render_thread_tools_fail_fast_for_host_canvases(sharded, tool, kwargs):
+    manager = sharded()
+    canvas_id = f"rt_{uuid.uuid4().hex[:6]}"
+    canvas = manager.create_canvas(canvas_id, auto_start=False)
+    canvas._running = True
+    mcp = create_mcp_app(canvas_manager=manager)
+
+    start = time.monotonic()
+    result = _fn(mcp, tool)(canvas_id=canvas_id, **kwargs)
+
+    assert time.monotonic() - start < 1.0
+    assert result["success"] is False
+    assert "render host process" in result["error"]
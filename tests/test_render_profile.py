@@ -0,0 +1,167 @@
+"""Tests for the per-widget render profiler and the get_render_profile tool."""
+
+import contextlib
+import uuid
+
+import pytest
+from imgui_bundle import imgui
+
+from champi_imgui.api.server import create_mcp_app
+from champi_imgui.core.canvas import CanvasManager
+from champi_imgui.core.profiler import WINDOW_SIZE, RenderProfiler
+from champi_imgui.core.widget import Widget
+
+
+class _TextWidget(Widget):
+    def render(self) -> None:
+        imgui.text(self.widget_id)
+
+
+class _BrokenWidget(Widget):
+    def render(self) -> None:
+        raise RuntimeError("boom")
+
+
+def _fn(mcp, name):
+    return mcp._local_provider._components[f"tool:{name}@"].fn
+
+
+@pytest.fixture()
+def manager():
+    mgr = CanvasManager()
+    yield mgr
+    for canvas in list(mgr.canvases.values()):
+        with contextlib.suppress(Exception):
+            canvas.shm_manager.cleanup()
+
+
+@pytest.fixture()
+def canvas(manager):
+    canvas = manager.create_canvas(f"c_{uuid.uuid4().hex[:8]}", auto_start=False)
+    canvas.state.cache_draw_lists = False
+    return canvas
+
+
+@pytest.fixture()
+def display_size() -> tuple[float, float]:
+    return (800, 600)
+
+
+def _frames(canvas, count: int) -> None:
+    for _ in range(count):
+        imgui.get_io().delta_time = 1.0 / 60.0
+        imgui.new_frame()
+        canvas._render_frame()
+        imgui.render()
+
+
+class TestRenderProfiler:
+    def test_snapshot_reports_percentiles_and_counts(self):
+        profiler = RenderProfiler()
+        for us in range(1, 101):
+            profiler.record("w", us * 1000)
+        profiler.record("w", 5000, failed=True)
+
+        (stats,) = profiler.snapshot()["widgets"]
+        assert stats["calls"] == 101
+        assert stats["errors"] == 1
+        assert stats["max_us"] == 100.0
+        assert 49.0 <= stats["p50_us"] <= 51.0
+        assert 94.0 <= stats["p95_us"] <= 96.0
+
+    def test_window_is_rolling(self):
+        profiler = RenderProfiler()
+        for _ in range(WINDOW_SIZE):
+            profiler.record("w", 1_000_000)
+        for _ in range(WINDOW_SIZE):
+            profiler.record("w", 1000)
+
+        (stats,) = profiler.snapshot()["widgets"]
+        assert stats["p95_us"] == 1.0
+        assert stats["max_us"] == 1000.0
+        assert stats["window"] == WINDOW_SIZE
+
+    def test_slowest_widget_first(self):
+        profiler = RenderProfiler()
+        profiler.record("fast", 1000)
+        profiler.record("slow", 90_000)
+        ids = [w["widget_id"] for w in profiler.snapshot()["widgets"]]
+        assert ids == ["slow", "fast"]
+
+    def test_forget_and_reset(self):
+        profiler = RenderProfiler()
+        profiler.record("a", 1000)
+        profiler.record("b", 1000)
+        profiler.forget("a")
+        assert [w["widget_id"] for w in profiler.snapshot()["widgets"]] == ["b"]
+        profiler.reset()
+        assert profiler.snapshot()["widgets"] == []
+
+
+class TestCanvasProfiling:
+    def test_disabled_by_default(self, canvas, imgui_context):
+        canvas.add_widget(_TextWidget("t"))
+        _frames(canvas, 3)
+        assert canvas.profiler.snapshot()["widgets"] == []
+
+    def test_enabled_profiler_times_each_widget(self, canvas, imgui_context):
+        canvas.add_widget(_TextWidget("t"))
+        canvas.add_widget(_BrokenWidget("bad"))
+        canvas.profiler.enabled = True
+        _frames(canvas, 4)
+
+        stats = {w["widget_id"]: w for w in canvas.profiler.snapshot()["widgets"]}
+        assert stats["t"]["calls"] == 4
+        assert stats["t"]["errors"] == 0
+        assert stats["bad"]["errors"] == 4
+        assert canvas.profiler.snapshot()["full_frames"] == 4
+
+    def test_replayed_frames_are_counted(self, canvas, imgui_context):
+        canvas.state.cache_draw_lists = True
+        canvas.add_widget(_TextWidget("t"))
+        canvas.profiler.enabled = True
+        _frames(canvas, 5)
+
+        snapshot = canvas.profiler.snapshot()
+        assert snapshot["full_frames"] == 2
+        assert snapshot["replayed_frames"] == 3
+
+    def test_removed_widget_is_forgotten(self, canvas, imgui_context):
+        canvas.add_widget(_TextWidget("t"))
+        canvas.profiler.enabled = True
+        _frames(canvas, 1)
+        canvas.remove_widget("t")
+        assert canvas.profiler.snapshot()["widgets"] == []
+
+
+class TestProfileTools:
+    def test_get_render_profile_toggles(self, manager, canvas):
+        mcp = create_mcp_app(canvas_manager=manager)
+        get_profile = _fn(mcp, "get_render_profile")
+        cid = canvas.state.canvas_id
+
+        result = get_profile(cid, enable=True)
+        assert result["success"] is True
+        assert result["data"]["enabled"] is True
+        assert canvas.profiler.enabled is True
+
+        canvas.profiler.record("w", 2000)
+        result = get_profile(cid, enable=False, reset=True)
+        assert result["data"]["enabled"] is False
+        assert result["data"]["widgets"] == []
+
+    def test_get_render_profile_unknown_canvas(self, manager):
+        mcp = create_mcp_app(canvas_manager=manager)
+        result = _fn(mcp, "get_render_profile")("missing")
+        assert result["success"] is False
+
+    def test_diagnostics_include_profile(self, manager, canvas):
+        mcp = create_mcp_app(canvas_manager=manager)
+        canvas.profiler.enabled = True
+        canvas.profiler.record("w", 3000)
+
+        result = _fn(mcp, "get_canvas_diagnostics")(canvas.state.canvas_id)
+
+        profile = result["data"]["render"]["profile"]
+        assert profile["enabled"] is True
+        assert profile["widgets"][0]["widget_id"] == "w"
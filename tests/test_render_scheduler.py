@@ -0,0 +1,183 @@
+"""Tests for dirty-tracking render scheduling.
+
+Covers: the per-canvas dirty flag set by Widget.update/apply_ops, the binding
+layer and the command processor; animating widgets; the wait chosen by
+CanvasManager._render_all_canvases; and the doorbell watcher waking the
+loop for commands written by another handle.
+"""
+
+import contextlib
+import time
+import uuid
+
+import pytest
+
+from champi_imgui.core.binding import BindingManager, DataStore
+from champi_imgui.core.canvas import CanvasManager
+from champi_imgui.core.widget import Widget
+from champi_imgui.ipc.array_arena import array_ref
+from champi_imgui.ipc.command_types import CommandType
+from champi_imgui.widgets import LineChartWidget, LoadingIndicatorWidget
+
+
+class _PlainWidget(Widget):
+    def render(self) -> None:
+        pass
+
+
+@pytest.fixture()
+def manager():
+    mgr = CanvasManager()
+    yield mgr
+    mgr._loop_running = False
+    for canvas in list(mgr.canvases.values()):
+        with contextlib.suppress(Exception):
+            canvas.shm_manager.cleanup()
+
+
+@pytest.fixture()
+def canvas(manager):
+    canvas = manager.create_canvas(f"c_{uuid.uuid4().hex[:8]}", auto_start=False)
+    canvas._dirty_frames = 0
+    return canvas
+
+
+class TestDirtyFlag:
+    def test_new_canvas_renders_first_frames(self, manager):
+        fresh = manager.create_canvas(f"c_{uuid.uuid4().hex[:8]}", auto_start=False)
+        assert fresh.needs_frame() is True
+
+    def test_clean_canvas_does_not_need_frame(self, canvas):
+        canvas.add_widget(_PlainWidget("w"))
+        canvas._dirty_frames = 0
+        assert canvas.needs_frame() is False
+
+    def test_widget_update_marks_dirty_and_wakes(self, canvas):
+        wakes = []
+        canvas._request_frame = lambda: wakes.append(1)
+        widget = _PlainWidget("w")
+        canvas.add_widget(widget)
+        canvas._dirty_frames = 0
+        wakes.clear()
+
+        widget.update(text="x")
+
+        assert canvas.needs_frame() is True
+        assert wakes == [1]
+
+    def test_apply_ops_marks_dirty(self, canvas):
+        widget = _PlainWidget("w")
+        canvas.add_widget(widget)
+        canvas._dirty_frames = 0
+        widget.apply_ops([["extend", "items", [1]]])
+        assert canvas.needs_frame() is True
+
+    def test_removed_widget_no_longer_marks_dirty(self, canvas):
+        widget = _PlainWidget("w")
+        canvas.add_widget(widget)
+        canvas.remove_widget("w")
+        canvas._dirty_frames = 0
+        widget.update(text="x")
+        assert canvas.needs_frame() is False
+
+    def test_processed_commands_mark_dirty(self, manager, canvas):
+        canvas._running = True
+        manager.send_command(
+            canvas.state.canvas_id, CommandType.UPDATE_TITLE, title="New"
+        )
+        canvas._process_commands()
+        assert canvas.needs_frame() is True
+
+    def test_binding_update_marks_dirty(self, canvas):
+        widget = _PlainWidget("w")
+        canvas.add_widget(widget)
+        canvas._dirty_frames = 0
+        store = DataStore()
+        bindings = BindingManager(store)
+        bindings.set_widget_lookup(canvas.widget_registry.get)
+        bindings.bind("temp", "w", "text")
+
+        store.set("temp", "21C")
+
+        assert widget.state.properties["text"] == "21C"
+        assert canvas.needs_frame() is True
+
+
+class TestAnimating:
+    def test_spinner_keeps_loop_active(self, canvas):
+        canvas.add_widget(LoadingIndicatorWidget("spin"))
+        canvas._dirty_frames = 0
+        assert canvas.needs_frame() is True
+
+    def test_hidden_spinner_is_idle(self, canvas):
+        spinner = LoadingIndicatorWidget("spin")
+        spinner.set_visible(False)
+        canvas.add_widget(spinner)
+        canvas._dirty_frames = 0
+        assert canvas.needs_frame() is False
+
+    def test_plot_on_shared_array_is_animating(self):
+        plot = LineChartWidget("p", x_data=[0, 1], y_data=[0, 1])
+        assert plot.is_animating() is False
+        plot.update(y_data=array_ref("canvas_arr_unused"))
+        assert plot.is_animating() is True
+
+
+class TestScheduling:
+    def _run_frame(self, manager, monkeypatch):
+        decisions = []
+        monkeypatch.setattr(manager, "_schedule_next_frame", decisions.append)
+        for c in manager.canvases.values():
+            monkeypatch.setattr(c, "_render_frame", lambda: None)
+        manager._render_all_canvases()
+        return decisions[-1]
+
+    def test_idle_when_nothing_changed(self, manager, canvas, monkeypatch):
+        canvas._running = True
+        assert self._run_frame(manager, monkeypatch) is None
+
+    def test_active_while_dirty(self, manager, canvas, monkeypatch):
+        canvas._running = True
+        canvas.mark_dirty()
+        assert self._run_frame(manager, monkeypatch) == 0.0
+
+    def test_stopped_canvas_does_not_keep_loop_active(
+        self, manager, canvas, monkeypatch
+    ):
+        canvas.mark_dirty()
+        assert self._run_frame(manager, monkeypatch) is None
+
+    def test_waits_for_soonest_paced_canvas(self, manager, canvas, monkeypatch):
+        other = manager.create_canvas(f"c_{uuid.uuid4().hex[:8]}", auto_start=False)
+        for c, due in ((canvas, 0.5), (other, 0.2)):
+            c._running = True
+            c.state.fps_target = 1
+            c._next_due = due
+            c._clock = lambda: 0.0
+            c.mark_dirty()
+        assert self._run_frame(manager, monkeypatch) == pytest.approx(0.2)
+
+    def test_request_frame_posts_empty_event(self, manager, canvas):
+        posted = []
+        manager._post_empty_event = lambda: posted.append(1)
+        canvas._dirty_frames = 0
+        canvas.mark_dirty()
+        assert posted == [1]
+
+
+class TestBellWatcher:
+    def test_external_command_marks_canvas_dirty(self, manager, canvas):
+        canvas._running = True
+        manager._loop_running = True
+        manager._start_bell_watcher()
+        time.sleep(0.05)
+        canvas._dirty_frames = 0
+
+        manager.get_client(canvas.state.canvas_id).write_command(
+            CommandType.UPDATE_TITLE, canvas_id=canvas.state.canvas_id, title="T"
+        )
+
+        deadline = time.monotonic() + 2.0
+        while not canvas.needs_frame() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert canvas.needs_frame() is True
@@ -0,0 +1,118 @@
+"""Tests for the render-thread task queue and its use by Canvas."""
+
+import threading
+import uuid
+from concurrent.futures import CancelledError
+
+import pytest
+
+from champi_imgui.core.canvas import Canvas
+from champi_imgui.core.render_tasks import RenderTaskQueue
+
+
+@pytest.fixture()
+def canvas():
+    canvas = Canvas(f"c_{uuid.uuid4().hex[:8]}")
+    yield canvas
+    canvas.shm_manager.cleanup()
+
+
+class TestRenderTaskQueue:
+    def test_runs_tasks_in_order(self):
+        queue = RenderTaskQueue()
+        order: list[int] = []
+        futures = [queue.submit(order.append, i) for i in range(5)]
+
+        assert queue.run_pending() == 5
+        assert order == [0, 1, 2, 3, 4]
+        assert all(f.done() for f in futures)
+        assert len(queue) == 0
+
+    def test_result_and_exception(self):
+        queue = RenderTaskQueue()
+        ok = queue.submit(lambda a, b=0: a + b, 2, b=3)
+        bad = queue.submit(lambda: 1 / 0)
+        queue.run_pending()
+
+        assert ok.result(timeout=0) == 5
+        with pytest.raises(ZeroDivisionError):
+            bad.result(timeout=0)
+
+    def test_cancelled_task_is_skipped(self):
+        queue = RenderTaskQueue()
+        ran: list[str] = []
+        future = queue.submit(ran.append, "x")
+        future.cancel()
+
+        assert queue.run_pending() == 0
+        assert ran == []
+
+    def test_task_queued_by_task_runs_next_drain(self):
+        queue = RenderTaskQueue()
+        ran: list[str] = []
+        queue.submit(lambda: queue.submit(ran.append, "inner"))
+
+        assert queue.run_pending() == 1
+        assert ran == []
+        assert queue.run_pending() == 1
+        assert ran == ["inner"]
+
+    def test_cancel_all(self):
+        queue = RenderTaskQueue()
+        futures = [queue.submit(lambda: None) for _ in range(3)]
+
+        assert queue.cancel_all() == 3
+        assert all(f.cancelled() for f in futures)
+        assert queue.run_pending() == 0
+
+    def test_submit_from_many_threads(self):
+        queue = RenderTaskQueue()
+        threads = [
+            threading.Thread(
+                target=lambda: [queue.submit(lambda: None) for _ in range(100)]
+            )
+            for _ in range(8)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert queue.run_pending() == 800
+
+
+class TestCanvasRenderTasks:
+    def test_submit_wakes_render_loop(self, canvas):
+        woken: list[bool] = []
+        canvas._request_frame = lambda: woken.append(True)
+
+        future = canvas.submit_render_task(lambda: "done")
+
+        assert woken == [True]
+        assert not future.done()
+        canvas.render_tasks.run_pending()
+        assert future.result(timeout=0) == "done"
+
+    def test_pending_task_asks_for_immediate_frame(self, canvas):
+        canvas._dirty_frames = 0
+        assert canvas.next_frame_delay(0.0) is None
+
+        canvas.submit_render_task(lambda: None)
+        assert canvas.next_frame_delay(0.0) == 0.0
+
+    def test_stop_cancels_pending_tasks(self, canvas):
+        canvas._running = True
+        future = canvas.submit_render_task(lambda: None)
+
+        canvas.stop()
+
+        with pytest.raises(CancelledError):
+            future.result(timeout=0)
+
+    def test_request_after_stop_reports_error(self, canvas):
+        canvas._running = True
+        canvas._request_frame = canvas.stop
+
+        result = canvas.request_measure_text("Hello", 16, timeout=1.0)
+
+        assert "stopped" in result["error"]
@@ -2,8 +2,8 @@
 
 import contextlib
 import subprocess
-import threading
 import uuid
+from concurrent.futures import Future
 from unittest.mock import patch
 
 import pytest
@@ -107,25 +107,21 @@ def test_screenshot_canvas_timeout(cid, monkeypatch):
     assert "timed out" in result["error"].lower()
 
 
-def test_handle_screenshot_no_window_id(cid):
-    """_handle_screenshot returns error when OpenGL fails and window_id is None."""
+def test_take_screenshot_no_window_id(cid):
+    """_take_screenshot returns error when OpenGL fails and window_id is None."""
     canvas = Canvas(cid)
     canvas._window_id = None
 
-    done = threading.Event()
-    req = {"filepath": "/tmp/out.png", "region": None, "done": done}
-    canvas._screenshot_request = req
-    with patch.object(canvas, "_capture_opengl", return_value=False):
-        canvas._handle_screenshot()
+    with patch.object(canvas, "_capture_opengl", return_value=None):
+        result = canvas._take_screenshot("/tmp/out.png")
 
-    assert done.is_set()
-    assert req["result"]["success"] is False
-    assert "Wayland" in req["result"]["error"] or "X11" in req["result"]["error"]
+    assert result["success"] is False
+    assert "Wayland" in result["error"] or "X11" in result["error"]
 
     canvas.shm_manager.cleanup()
 
 
-def test_handle_screenshot_opengl_succeeds_without_window_id(cid, tmp_path):
+def test_take_screenshot_opengl_succeeds_without_window_id(cid, tmp_path):
     """OpenGL capture works even when win_id is None (Wayland/headless).
 
     This is the regression test for the bug introduced in v1.9.2 where
@@ -136,16 +132,13 @@ def test_handle_screenshot_opengl_succeeds_without_window_id(cid, tmp_path):
     canvas._window_id = None  # Simulates Wayland / no X11
     filepath = str(tmp_path / "shot.png")
 
-    done = threading.Event()
-    req = {"filepath": filepath, "region": None, "done": done}
-    canvas._screenshot_request = req
-
-    with patch.object(canvas, "_capture_opengl", return_value=True) as mock_gl:
-        canvas._handle_screenshot()
+    capture: Future = Future()
+    capture.set_result({"path": filepath})
+    with patch.object(canvas, "_capture_opengl", return_value=capture) as mock_gl:
+        result = canvas._take_screenshot(filepath)
 
-    assert done.is_set()
-    assert req["result"] == {"path": filepath}
-    mock_gl.assert_called_once_with(filepath)  # OpenGL was attempted
+    assert result is capture
+    assert mock_gl.call_args.args[0] == filepath  # OpenGL was attempted
     canvas.shm_manager.cleanup()
 
 
@@ -200,68 +193,53 @@ def test_capture_xwd_process_error(cid, tmp_path):
     canvas.shm_manager.cleanup()
 
 
-def test_handle_screenshot_gdk_fallback_to_xwd(cid, tmp_path):
-    """When GDK fails, _handle_screenshot falls back to xwd path."""
+def test_take_screenshot_gdk_fallback_to_xwd(cid, tmp_path):
+    """When GDK fails, _take_screenshot falls back to xwd path."""
     canvas = Canvas(cid)
     canvas._window_id = 99999
     filepath = str(tmp_path / "shot.png")
 
-    done = threading.Event()
-    req = {"filepath": filepath, "region": None, "done": done}
-    canvas._screenshot_request = req
-
     with (
         patch.object(canvas, "_capture_gdk", return_value=False),
         patch.object(canvas, "_capture_xwd", return_value=True),
     ):
-        canvas._handle_screenshot()
+        result = canvas._take_screenshot(filepath)
 
-    assert done.is_set()
-    assert req["result"] == {"path": filepath}
+    assert result == {"path": filepath}
     canvas.shm_manager.cleanup()
 
 
-def test_handle_screenshot_all_fail(cid, tmp_path):
+def test_take_screenshot_all_fail(cid, tmp_path):
     """When all capture methods fail, result contains success=False."""
     canvas = Canvas(cid)
     canvas._window_id = 99999
     filepath = str(tmp_path / "shot.png")
 
-    done = threading.Event()
-    req = {"filepath": filepath, "region": None, "done": done}
-    canvas._screenshot_request = req
-
     with (
-        patch.object(canvas, "_capture_opengl", return_value=False),
+        patch.object(canvas, "_capture_opengl", return_value=None),
         patch.object(canvas, "_capture_gdk", return_value=False),
         patch.object(canvas, "_capture_xwd", return_value=False),
     ):
-        canvas._handle_screenshot()
+        result = canvas._take_screenshot(filepath)
 
-    assert done.is_set()
-    assert req["result"]["success"] is False
-    assert "unavailable" in req["result"]["error"]
+    assert result["success"] is False
+    assert "unavailable" in result["error"]
     canvas.shm_manager.cleanup()
 
 
-def test_handle_screenshot_gdk_success(cid, tmp_path):
+def test_take_screenshot_gdk_success(cid, tmp_path):
     """When GDK succeeds, result is {"path": filepath}."""
     canvas = Canvas(cid)
     canvas._window_id = 11111
     filepath = str(tmp_path / "shot.png")
 
-    done = threading.Event()
-    req = {"filepath": filepath, "region": None, "done": done}
-    canvas._screenshot_request = req
-
     with (
         patch.object(canvas, "_capture_gdk", return_value=True),
         patch.object(canvas, "_capture_xwd", return_value=False),
     ):
-        canvas._handle_screenshot()
+        result = canvas._take_screenshot(filepath)
 
-    assert done.is_set()
-    assert req["result"] == {"path": filepath}
+    assert result == {"path": filepath}
     canvas.shm_manager.cleanup()
 
 
@@ -272,7 +250,7 @@ def test_screenshot_canvas_mcp_returns_filepath(cid, monkeypatch):
     monkeypatch.setattr(
         canvas,
         "request_screenshot",
-        lambda filepath, region=None, timeout=5.0: {"path": filepath},
+        lambda filepath, region=None, timeout=5.0, **options: {"path": filepath},
     )
 
     result = server.screenshot_canvas.fn(cid, "/tmp/out.png")
@@ -287,7 +265,7 @@ def test_screenshot_canvas_mcp_propagates_error(cid, monkeypatch):
     monkeypatch.setattr(
         canvas,
         "request_screenshot",
-        lambda filepath, region=None, timeout=5.0: {
+        lambda filepath, region=None, timeout=5.0, **options: {
             "success": False,
             "error": "GDK and xwd fallback both unavailable",
         },
@@ -296,3 +274,71 @@ def test_screenshot_canvas_mcp_propagates_error(cid, monkeypatch):
     result = server.screenshot_canvas.fn(cid, "/tmp/out.png")
     assert result["success"] is False
     assert "unavailable" in result["error"]
+
+
+def test_screenshot_canvas_mcp_base64(cid, monkeypatch):
+    """screenshot_canvas returns inline data and no filepath for base64 output."""
+    server.canvas_manager.create_canvas(cid, auto_start=False)
+    canvas = server.canvas_manager.get_canvas(cid)
+    calls = []
+
+    def fake_request(filepath, region=None, timeout=5.0, **options):
+        calls.append(options)
+        return {"width": 4, "height": 2, "format": "webp", "data": "AAAA"}
+
+    monkeypatch.setattr(canvas, "request_screenshot", fake_request)
+
+    result = server.screenshot_canvas.fn(
+        cid, image_format="webp", compression=30, output="base64"
+    )
+
+    assert result["success"] is True
+    assert result["data"] == "AAAA"
+    assert "filepath" not in result
+    assert calls == [
+        {
+            "image_format": "webp",
+            "compression": 30,
+            "output": "base64",
+            "diff_threshold": 0,
+            "skip_unchanged": False,
+        }
+    ]
+
+
+def test_screenshot_canvas_mcp_skipped_unchanged(cid, monkeypatch):
+    """An unchanged, skipped file capture reports no filepath."""
+    server.canvas_manager.create_canvas(cid, auto_start=False)
+    canvas = server.canvas_manager.get_canvas(cid)
+    calls = []
+
+    def fake_request(filepath, region=None, timeout=5.0, **options):
+        calls.append(options)
+        return {
+            "width": 4,
+            "height": 2,
+            "format": "png",
+            "unchanged": True,
+            "changed_region": None,
+            "hash": "00",
+        }
+
+    monkeypatch.setattr(canvas, "request_screenshot", fake_request)
+
+    result = server.screenshot_canvas.fn(
+        cid, "/tmp/out.png", skip_unchanged=True, diff_threshold=4
+    )
+
+    assert result["success"] is True
+    assert result["unchanged"] is True
+    assert "filepath" not in result
+    assert calls[0]["skip_unchanged"] is True
+    assert calls[0]["diff_threshold"] == 4
+
+
+def test_screenshot_canvas_mcp_rejects_bytes_output(cid):
+    """Raw bytes cannot travel over MCP; base64 is the inline option."""
+    server.canvas_manager.create_canvas(cid, auto_start=False)
+    result = server.screenshot_canvas.fn(cid, output="bytes")
+    assert result["success"] is False
+    assert "base64" in result["error"]
@@ -0,0 +1,209 @@
+"""Tests for the SPSC command ring in SharedMemoryManager.
+
+Covers: burst writes are queued instead of overwriting each other,
+drain_commands() empties the ring in one pass, full-ring back-pressure, and
+commands larger than the ring travelling as fragments, and invalid frames
+being skipped.
+"""
+
+import threading
+import time
+import uuid
+
+import pytest
+
+from champi_imgui.ipc.command_types import CommandType
+from champi_imgui.ipc.shared_memory_manager import (
+    DEFAULT_RING_CAPACITY,
+    RING_HEADER_SIZE,
+    SharedMemoryManager,
+)
+
+
+@pytest.fixture()
+def ring_pair():
+    """Yield a (creator, attacher) pair sharing one set of regions."""
+
+    def _make(capacity: int = DEFAULT_RING_CAPACITY):
+        prefix = f"ring_{uuid.uuid4().hex[:8]}"
+        creator = SharedMemoryManager(name_prefix=prefix, capacity=capacity)
+        creator.create_regions()
+        attacher = SharedMemoryManager(name_prefix=prefix)
+        attacher.attach_regions()
+        pairs.append((creator, attacher))
+        return creator, attacher
+
+    pairs: list[tuple[SharedMemoryManager, SharedMemoryManager]] = []
+    yield _make
+    for creator, attacher in pairs:
+        attacher.cleanup()
+        creator.cleanup()
+
+
+def test_attacher_reads_capacity_from_header(ring_pair):
+    _, attacher = ring_pair(capacity=16)
+    assert attacher.capacity == 16
+
+
+def test_back_to_back_commands_are_not_lost(ring_pair):
+    """UPDATE_TITLE followed by UPDATE_SIZE must both reach the reader."""
+    creator, attacher = ring_pair()
+    attacher.write_command(CommandType.UPDATE_TITLE, canvas_id="c", title="T")
+    attacher.write_command(CommandType.UPDATE_SIZE, canvas_id="c", width=3, height=4)
+
+    first = creator.read_command()
+    second = creator.read_command()
+    assert first is not None and first.command_type == CommandType.UPDATE_TITLE
+    assert first.data["title"] == "T"
+    assert second is not None and second.command_type == CommandType.UPDATE_SIZE
+    assert (second.data["width"], second.data["height"]) == (3, 4)
+    assert creator.read_command() is None
+
+
+def test_drain_returns_burst_in_order(ring_pair):
+    creator, attacher = ring_pair(capacity=512)
+    seqs = [
+        attacher.write_command(CommandType.UPDATE_TITLE, canvas_id="c", title=str(i))
+        for i in range(300)
+    ]
+    assert creator.pending_count() == 300
+
+    drained = creator.drain_commands()
+    assert [c.seq_num for c in drained] == seqs
+    assert [c.data["title"] for c in drained] == [str(i) for i in range(300)]
+    assert creator.pending_count() == 0
+    assert creator.drain_commands() == []
+
+
+def test_ring_wraps_around(ring_pair):
+    creator, attacher = ring_pair(capacity=4)
+    for round_ in range(5):
+        for i in range(3):
+            attacher.write_command(
+                CommandType.UPDATE_TITLE, canvas_id="c", title=f"{round_}-{i}"
+            )
+        titles = [c.data["title"] for c in creator.drain_commands()]
+        assert titles == [f"{round_}-{i}" for i in range(3)]
+
+
+def test_full_ring_raises_instead_of_overwriting(ring_pair):
+    creator, attacher = ring_pair(capacity=2)
+    attacher.write_command(CommandType.CLEAR_CANVAS, canvas_id="a")
+    attacher.write_command(CommandType.CLEAR_CANVAS, canvas_id="b")
+    with pytest.raises(RuntimeError, match="full"):
+        attacher.write_command(CommandType.CLEAR_CANVAS, canvas_id="c")
+
+    drained = creator.drain_commands()
+    assert [c.data["canvas_id"] for c in drained] == ["a", "b"]
+    # Space is released once the reader has drained
+    attacher.write_command(CommandType.CLEAR_CANVAS, canvas_id="c")
+    assert creator.read_command().data["canvas_id"] == "c"
+
+
+def test_large_frame_spans_slots_and_wraps(ring_pair):
+    """A frame bigger than one slot occupies consecutive slots across the wrap."""
+    creator, attacher = ring_pair(capacity=64)
+    points = [[float(i), float(i)] for i in range(100)]
+    for _ in range(10):
+        attacher.write_command(
+            CommandType.UPDATE_WIDGET,
+            canvas_id="c",
+            widget_id="w",
+            properties={"points": points},
+        )
+        drained = creator.drain_commands()
+        assert len(drained) == 1
+        assert drained[0].data["properties"]["points"] == points
+
+
+def test_frame_larger_than_ring_rejected(ring_pair):
+    _, attacher = ring_pair(capacity=4)
+    with pytest.raises(ValueError, match="larger than the command ring"):
+        attacher.write_command(CommandType.UPDATE_TITLE, canvas_id="c", title="x" * 500)
+
+
+def test_frame_larger_than_ring_sent_in_fragments(ring_pair):
+    creator, attacher = ring_pair(capacity=8)
+    attacher.write_timeout = 5.0
+    title = "".join(chr(ord("a") + i % 26) for i in range(5000))
+    received = []
+
+    def drain():
+        while not received:
+            received.extend(creator.drain_commands())
+            time.sleep(0.001)
+
+    reader = threading.Thread(target=drain)
+    reader.start()
+    seq = attacher.write_command(CommandType.UPDATE_TITLE, canvas_id="c", title=title)
+    reader.join(timeout=5.0)
+
+    assert [c.seq_num for c in received] == [seq]
+    assert received[0].data["title"] == title
+
+
+def test_full_ring_waits_for_space(ring_pair):
+    creator, attacher = ring_pair(capacity=2)
+    attacher.write_timeout = 5.0
+    attacher.write_command(CommandType.CLEAR_CANVAS, canvas_id="a")
+    attacher.write_command(CommandType.CLEAR_CANVAS, canvas_id="b")
+    timer = threading.Timer(0.1, creator.drain_commands)
+    timer.start()
+
+    attacher.write_command(CommandType.CLEAR_CANVAS, canvas_id="c")
+    timer.join()
+
+    assert creator.read_command().data["canvas_id"] == "c"
+
+
+def test_unfinished_fragmented_command_is_dropped(ring_pair):
+    creator, attacher = ring_pair(capacity=4)
+    attacher.write_timeout = 0.05
+    with pytest.raises(RuntimeError, match="full"):
+        attacher.write_command(CommandType.UPDATE_TITLE, canvas_id="c", title="x" * 500)
+    assert creator.drain_commands() == []
+
+    attacher.write_command(CommandType.CLEAR_CANVAS, canvas_id="next")
+    drained = creator.drain_commands()
+    assert [c.data["canvas_id"] for c in drained] == ["next"]
+
+
+def test_read_command_skips_invalid_frame(ring_pair):
+    creator, attacher = ring_pair()
+    attacher.write_command(CommandType.UPDATE_TITLE, canvas_id="c", title="bad")
+    attacher.write_command(CommandType.CLEAR_CANVAS, canvas_id="c")
+    # Corrupt the command type byte of the first frame
+    creator.cmd_region.buf[RING_HEADER_SIZE + 5] = 0xFF
+
+    command = creator.read_command()
+
+    assert command is not None and command.command_type == CommandType.CLEAR_CANVAS
+    assert creator.read_command() is None
+
+
+def test_invalid_capacity_rejected():
+    with pytest.raises(ValueError):
+        SharedMemoryManager(name_prefix="bad", capacity=0)
+
+
+def test_canvas_process_commands_applies_whole_burst():
+    """Canvas._process_commands must apply every queued command in one call."""
+    from champi_imgui.core.canvas import Canvas
+
+    cid = f"c_{uuid.uuid4().hex[:8]}"
+    canvas = Canvas(cid)
+    canvas._running = True
+    client = SharedMemoryManager(name_prefix=f"canvas_{cid}")
+    try:
+        client.attach_regions()
+        client.write_command(CommandType.UPDATE_TITLE, canvas_id=cid, title="New")
+        client.write_command(
+            CommandType.UPDATE_SIZE, canvas_id=cid, width=640, height=480
+        )
+        canvas._process_commands()
+        assert canvas.state.title == "New"
+        assert canvas.state.size == (640, 480)
+        assert canvas.shm_manager.pending_count() == 0
+    finally:
+        client.cleanup()
+        canvas.stop()
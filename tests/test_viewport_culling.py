@@ -0,0 +1,138 @@
+"""Tests for viewport culling of root widgets in Canvas._render_frame.
+
+Frames run in a headless ImGui context; the canvas window is 300x200 and
+holds far more rows than fit, so only rows inside the scroll region should
+run their render() while the content height stays that of the full list.
+"""
+
+import uuid
+
+import pytest
+from imgui_bundle import imgui
+
+from champi_imgui.core.canvas import Canvas
+from champi_imgui.core.widget import Widget
+
+_ROWS = 300
+
+
+class _Row(Widget):
+    def __init__(self, widget_id: str, **props) -> None:
+        super().__init__(widget_id, **props)
+        self.renders = 0
+
+    def render(self) -> None:
+        self.renders += 1
+        imgui.text(f"row {self.widget_id}")
+
+
+class _SameLineRow(_Row):
+    def render(self) -> None:
+        self.renders += 1
+        imgui.same_line()
+        imgui.text("tail")
+
+
+@pytest.fixture()
+def canvas(imgui_context):
+    canvas = Canvas(
+        f"cull_{uuid.uuid4().hex[:8]}",
+        title="Cull",
+        size=(300, 200),
+        cache_draw_lists=False,
+    )
+    yield canvas
+    canvas.shm_manager.cleanup()
+
+
+def _frame(canvas: Canvas, scroll_y: float | None = None) -> float:
+    """Run one frame; returns the window's maximum scroll."""
+    imgui.get_io().delta_time = 1.0 / 60.0
+    imgui.new_frame()
+    if scroll_y is not None:
+        imgui.set_next_window_scroll(imgui.ImVec2(0.0, scroll_y))
+    canvas._render_frame()
+    window = imgui.internal.find_window_by_name("Cull")
+    imgui.render()
+    return window.scroll_max.y
+
+
+def _rows(canvas: Canvas, cls=_Row) -> list[_Row]:
+    rows = [cls(f"r{i:04d}") for i in range(_ROWS)]
+    for row in rows:
+        canvas.add_widget(row)
+    return rows
+
+
+def _rendered(rows: list[_Row], before: list[int]) -> list[int]:
+    return [i for i, row in enumerate(rows) if row.renders > before[i]]
+
+
+class TestViewportCulling:
+    def test_only_visible_rows_render(self, canvas):
+        rows = _rows(canvas)
+        _frame(canvas)
+        _frame(canvas)
+
+        before = [row.renders for row in rows]
+        _frame(canvas)
+        rendered = _rendered(rows, before)
+
+        assert 0 < len(rendered) < 20
+        assert rendered[0] == 0
+
+    def test_content_height_is_preserved(self, canvas):
+        rows = _rows(canvas)
+        _frame(canvas)
+        # The window settles its scroll extent on the second frame
+        full = _frame(canvas)
+        assert full > 0
+        for _ in range(3):
+            assert _frame(canvas) == pytest.approx(full)
+        assert all(row.renders >= 1 for row in rows)
+
+    def test_scrolled_rows_render(self, canvas):
+        rows = _rows(canvas)
+        _frame(canvas)
+        scroll_max = _frame(canvas)
+
+        _frame(canvas, scroll_y=scroll_max / 2)
+        before = [row.renders for row in rows]
+        _frame(canvas)
+        rendered = _rendered(rows, before)
+
+        middle = _ROWS // 2
+        assert rendered
+        assert all(abs(i - middle) < 20 for i in rendered)
+
+    def test_new_widgets_render_until_measured(self, canvas):
+        rows = _rows(canvas)
+        _frame(canvas)
+        _frame(canvas)
+        late = _Row("late")
+        canvas.add_widget(late)
+
+        _frame(canvas)
+        assert late.renders == 1
+        _frame(canvas)
+        assert late.renders == 1
+        assert rows[0].renders == 4
+
+    def test_row_continued_by_same_line_is_not_culled(self, canvas):
+        rows = _rows(canvas)
+        tails = [_SameLineRow(f"t{i:04d}") for i in range(_ROWS)]
+        for tail in tails:
+            canvas.add_widget(tail)
+        _frame(canvas)
+        _frame(canvas)
+        _frame(canvas)
+        # Zero-height widgets always render, and so does the row before one
+        assert tails[-1].renders == 3
+        assert rows[-1].renders == 3
+        assert rows[_ROWS // 2].renders == 1
+
+    def test_removed_widget_forgets_extent(self, canvas):
+        _rows(canvas)
+        _frame(canvas)
+        canvas.remove_widget("r0000")
+        assert "r0000" not in canvas._extents
@@ -0,0 +1,237 @@
+"""Tests for the render-loop watchdog.
+
+The in-process tests hang a widget inside a real headless render loop (the
+windowed loop is only ever failed, and cleared again once it resumes, so a
+fake thread stands in); the render
+host tests swap the manager's host handles for fakes, since starting
+a host process needs a display.
+"""
+
+import threading
+import time
+import uuid
+
+import pytest
+
+import champi_imgui.core.watchdog as watchdog_module
+from champi_imgui.api.server import create_mcp_app
+from champi_imgui.core.canvas import CanvasManager
+from champi_imgui.core.watchdog import RenderWatchdog
+from champi_imgui.core.widget import Widget
+
+
+class _HangOnce(Widget):
+    """Loops in render() until the watchdog interrupts it, then renders."""
+
+    def __init__(self, widget_id: str, **props) -> None:
+        super().__init__(widget_id, **props)
+        self.hang = True
+        self.hanging = threading.Event()
+        self.rendered = threading.Event()
+
+    def render(self) -> None:
+        if self.hang:
+            self.hang = False
+            self.hanging.set()
+            while True:
+                time.sleep(0.01)
+        self.rendered.set()
+
+
+class _FakeHost:
+    def __init__(self) -> None:
+        self.started = 0.0
+        self.alive = True
+        self.kills = 0
+
+    def frame_started(self) -> float:
+        return self.started
+
+    def dump_stacks(self) -> str:
+        return 'File "widget.py", line 1, in render'
+
+    def kill(self) -> None:
+        self.kills += 1
+        self.alive = False
+
+    def is_alive(self) -> bool:
+        return self.alive
+
+    def stop(self) -> None:
+        self.alive = False
+
+    def open_canvas(self, canvas) -> None:
+        pass
+
+    def close_canvas(self, canvas_id: str) -> None:
+        pass
+
+
+@pytest.fixture()
+def host_manager():
+    manager = CanvasManager(render_process=True, stall_timeout=None)
+    host = _FakeHost()
+    manager._hosts = [host]
+    restarted = []
+
+    def start_render_hosts():
+        host.alive = True
+        host.started = 0.0
+        restarted.append(True)
+
+    manager._start_render_hosts = start_render_hosts
+    canvas = manager.create_canvas(f"wd_{uuid.uuid4().hex[:8]}", auto_start=False)
+    yield manager, host, canvas, restarted
+    manager.cleanup()
+
+
+@pytest.fixture()
+def windowed():
+    """A windowed manager whose render thread is stuck in a frame since t=100."""
+    manager = CanvasManager(stall_timeout=None)
+    canvas = manager.create_canvas(f"wd_{uuid.uuid4().hex[:8]}", auto_start=False)
+    canvas._running = True
+    release = threading.Event()
+    thread = threading.Thread(target=release.wait, daemon=True)
+    thread.start()
+    manager._render_thread = thread
+    manager._loop_running = True
+    manager._frame_started = 100.0
+    yield manager, canvas
+    release.set()
+    thread.join()
+    manager._render_thread = None
+    manager.cleanup()
+
+
+class TestInProcessLoop:
+    def test_stalled_widget_restarts_the_loop(self):
+        manager = CanvasManager(headless=True, stall_timeout=0.3)
+        try:
+            canvas = manager.create_canvas(f"wd_{uuid.uuid4().hex[:8]}")
+            widget = _HangOnce("stuck")
+            canvas.add_widget(widget)
+            assert widget.hanging.wait(5.0)
+            first_thread = manager._render_thread
+
+            # The fresh loop renders the same canvas and widget again
+            assert widget.rendered.wait(5.0)
+
+            report = manager.watchdog.last_report()
+            assert report["restarted"] is True
+            assert report["canvas_id"] == canvas.state.canvas_id
+            assert report["widget_id"] == "stuck"
+            assert "in render" in report["stack"]
+            assert manager.watchdog.restarts == 1
+            assert manager._render_thread is not first_thread
+            assert canvas.is_render_healthy()
+        finally:
+            manager.cleanup()
+
+    def test_windowed_loop_is_failed_not_restarted(self, windowed, monkeypatch):
+        manager, canvas = windowed
+        raised, restarted = [], []
+        monkeypatch.setattr(
+            watchdog_module, "_raise_in_thread", lambda *a: raised.append(a)
+        )
+        monkeypatch.setattr(manager, "_start_render_loop", lambda: restarted.append(1))
+
+        report = RenderWatchdog(manager, stall_timeout=1.0).check(now=102.0)[0]
+
+        assert report["restarted"] is False
+        assert raised == []
+        assert restarted == []
+        assert isinstance(canvas._render_error, TimeoutError)
+        assert canvas.is_render_healthy() is False
+
+    def test_windowed_loop_reports_healthy_once_it_resumes(self, windowed):
+        manager, canvas = windowed
+        watchdog = RenderWatchdog(manager, stall_timeout=1.0)
+        assert canvas.is_render_healthy() is True
+
+        watchdog.check(now=102.0)
+        assert canvas.is_render_healthy() is False
+        # Still inside the stalled frame
+        watchdog.check(now=110.0)
+        assert canvas.is_render_healthy() is False
+
+        manager._frame_started = None
+        assert watchdog.check(now=111.0) == []
+        assert canvas._render_error is None
+        assert canvas.is_render_healthy() is True
+
+    def test_other_render_errors_survive_the_resume(self, windowed):
+        manager, canvas = windowed
+        watchdog = RenderWatchdog(manager, stall_timeout=1.0)
+        watchdog.check(now=102.0)
+        canvas._render_error = RuntimeError("widget crashed")
+
+        manager._frame_started = 112.0
+        watchdog.check(now=112.5)
+
+        assert isinstance(canvas._render_error, RuntimeError)
+
+    def test_idle_loop_is_not_stalled(self):
+        manager = CanvasManager(headless=True, stall_timeout=None)
+        watchdog = RenderWatchdog(manager, stall_timeout=0.1)
+        manager._frame_started = None
+        assert watchdog.check(now=time.monotonic() + 10.0) == []
+
+
+class TestRenderHosts:
+    def test_stalled_host_is_killed_and_restarted(self, host_manager):
+        manager, host, canvas, restarted = host_manager
+        watchdog = RenderWatchdog(manager, stall_timeout=1.0)
+        host.started = 100.0
+
+        assert watchdog.check(now=100.5) == []
+        reports = watchdog.check(now=102.0)
+
+        assert len(reports) == 1
+        assert reports[0]["shard"] == 0
+        assert reports[0]["restarted"] is True
+        assert reports[0]["canvas_ids"] == [canvas.state.canvas_id]
+        assert "in render" in reports[0]["stack"]
+        assert host.kills == 1
+        assert restarted == [True]
+
+    def test_stall_is_handled_once(self, host_manager):
+        manager, host, _, _ = host_manager
+        watchdog = RenderWatchdog(manager, stall_timeout=1.0)
+        host.started = 100.0
+        host.kill = lambda: None
+        manager._start_render_hosts = lambda: None
+
+        assert len(watchdog.check(now=102.0)) == 1
+        assert watchdog.check(now=103.0) == []
+
+    def test_gives_up_after_max_restarts(self, host_manager):
+        manager, host, canvas, _ = host_manager
+        watchdog = RenderWatchdog(manager, stall_timeout=1.0, max_restarts=1)
+
+        host.started = 100.0
+        assert watchdog.check(now=102.0)[0]["restarted"] is True
+        host.started = 103.0
+        report = watchdog.check(now=105.0)[0]
+
+        assert report["restarted"] is False
+        assert host.kills == 1
+        assert isinstance(canvas._render_error, TimeoutError)
+
+    def test_render_health_reports_stalls(self, host_manager):
+        manager, host, canvas, _ = host_manager
+        manager.watchdog = RenderWatchdog(manager, stall_timeout=1.0)
+        host.started = 100.0
+        manager.watchdog.check(now=102.0)
+        mcp = create_mcp_app(canvas_manager=manager)
+
+        tool = mcp._local_provider._components["tool:get_render_health@"].fn
+        data = tool(canvas.state.canvas_id)["data"]
+
+        assert data["watchdog_restarts"] == 1
+        assert data["last_stall"]["shard"] == 0
+
+
+def test_rejects_bad_timeout():
+    with pytest.raises(ValueError):
+        RenderWatchdog(CanvasManager(stall_timeout=None), stall_timeout=0)
@@ -466,6 +466,61 @@ def test_widget_registry_clear():
     assert registry.list() == []
 
 
+def test_widget_registry_roots_skip_owned_widgets():
+    """Test that roots() lists only widgets without a parent, in order."""
+    registry = WidgetRegistry()
+    first = MockTestWidget("root-1")
+    child = MockTestWidget("child-1")
+    second = MockTestWidget("root-2")
+    child._parent_id = "root-1"
+    for widget in (first, child, second):
+        registry.add(widget)
+
+    assert registry.roots() == (first, second)
+    assert registry.widgets() == (first, child, second)
+
+
+def test_widget_registry_snapshots_are_reused():
+    """Test that snapshots are only rebuilt after a change."""
+    registry = WidgetRegistry()
+    registry.add(MockTestWidget("w-1"))
+
+    roots = registry.roots()
+    assert registry.roots() is roots
+
+    registry.add(MockTestWidget("w-2"))
+    assert registry.roots() is not roots
+    assert [w.widget_id for w in registry.roots()] == ["w-1", "w-2"]
+
+    registry.remove("w-1")
+    assert [w.widget_id for w in registry.roots()] == ["w-2"]
+
+
+def test_widget_registry_reparent_after_add():
+    """Test that giving a registered widget a parent drops it from roots()."""
+    registry = WidgetRegistry()
+    widget = MockTestWidget("late-child")
+    registry.add(widget)
+    assert registry.roots() == (widget,)
+
+    widget._parent_id = "container"
+    assert registry.roots() == ()
+
+    registry.remove("late-child")
+    widget._parent_id = None
+    assert registry.widgets() == ()
+
+
+def test_widget_registry_clear_resets_snapshots():
+    """Test that clear() empties the snapshots."""
+    registry = WidgetRegistry()
+    registry.add(MockTestWidget("w"))
+    registry.roots()
+    registry.clear()
+    assert registry.roots() == ()
+    assert registry.widgets() == ()
+
+
 def test_widget_registry_factory_integration():
     """Test full integration of factory with registry."""
     registry = WidgetRegistry()
@@ -0,0 +1,272 @@
+"""Tests for routing widget mutations through UPDATE_WIDGET commands.
+
+Covers: Widget.apply_ops, the Canvas ADD_WIDGET / UPDATE_WIDGET handlers fed
+through the command ring, and MCP tools queueing their writes when the
+render loop is live (applying them in place when it is not), however large.
+"""
+
+import contextlib
+import threading
+import time
+import uuid
+
+import pytest
+
+from champi_imgui.api.server import create_mcp_app
+from champi_imgui.core.canvas import CanvasManager
+from champi_imgui.core.widget import Widget
+from champi_imgui.ipc.command_types import CommandType
+from champi_imgui.ipc.shared_memory_manager import SharedMemoryManager
+from champi_imgui.widgets.drawing import DrawingWidget
+
+
+class _PlainWidget(Widget):
+    def render(self) -> None:
+        pass
+
+
+def _fn(mcp, name):
+    return mcp._local_provider._components[f"tool:{name}@"].fn
+
+
+@pytest.fixture()
+def cid() -> str:
+    return f"c_{uuid.uuid4().hex[:8]}"
+
+
+@pytest.fixture()
+def manager(monkeypatch):
+    mgr = CanvasManager()
+    monkeypatch.setattr(mgr, "ensure_canvas_running", lambda canvas_id: True)
+    yield mgr
+    for canvas in list(mgr.canvases.values()):
+        with contextlib.suppress(Exception):
+            canvas.shm_manager.cleanup()
+
+
+def _drawing_canvas(manager, cid, widget_id="board"):
+    canvas = manager.create_canvas(cid, auto_start=False)
+    widget = DrawingWidget(widget_id)
+    canvas.widget_registry._widgets[widget_id] = widget
+    return canvas, widget
+
+
+@contextlib.contextmanager
+def _render_loop(canvas):
+    """Drain the canvas's command ring on a thread, like its render loop."""
+    done = threading.Event()
+
+    def render_loop():
+        while not done.is_set():
+            canvas._process_commands()
+            time.sleep(0.001)
+        canvas._process_commands()
+
+    loop = threading.Thread(target=render_loop)
+    loop.start()
+    try:
+        yield
+    finally:
+        done.set()
+        loop.join(timeout=5.0)
+
+
+# ---------------------------------------------------------------------------
+# Widget.apply_ops
+# ---------------------------------------------------------------------------
+
+
+class TestApplyOps:
+    def test_extend_creates_and_appends(self):
+        widget = _PlainWidget("w")
+        widget.apply_ops([["extend", "items", [1, 2]], ["extend", "items", [3]]])
+        assert widget.state.properties["items"] == [1, 2, 3]
+
+    def test_set_item_merges_fields(self):
+        widget = _PlainWidget("w", items=[{"a": 1, "b": 2}])
+        widget.apply_ops([["set_item", "items", 0, {"b": 5}]])
+        assert widget.state.properties["items"] == [{"a": 1, "b": 5}]
+
+    def test_set_item_out_of_range_raises(self):
+        widget = _PlainWidget("w", items=[{"a": 1}])
+        with pytest.raises(IndexError, match=r"index 3 out of range \(1 items\)"):
+            widget.apply_ops([["set_item", "items", 3, {"a": 2}]])
+        assert widget.state.properties["items"] == [{"a": 1}]
+
+    def test_set_item_sees_earlier_extend(self):
+        widget = _PlainWidget("w")
+        widget.apply_ops([["extend", "items", [{"a": 1}]]])
+        widget.apply_ops([["set_item", "items", 0, {"a": 2}]])
+        assert widget.state.properties["items"] == [{"a": 2}]
+
+    def test_fill_on_unsupported_shape_rejected(self):
+        widget = DrawingWidget("d")
+        widget.add_shape("line", x1=0.0, y1=0.0, x2=1.0, y2=1.0)
+        with pytest.raises(ValueError, match="does not support fill"):
+            widget.apply_ops([["set_item", "shapes", 0, {"filled": True}]])
+
+    def test_call_remote_method(self):
+        widget = DrawingWidget("d")
+        widget.apply_ops([["call", "add_annotation", [1.0, 2.0, "hi"], {}]])
+        assert widget.state.properties["annotations"][0]["text"] == "hi"
+
+    def test_call_non_remote_method_rejected(self):
+        widget = DrawingWidget("d")
+        with pytest.raises(ValueError, match="not a remote method"):
+            widget.apply_ops([["call", "render", [], {}]])
+
+    def test_unknown_op_rejected(self):
+        with pytest.raises(ValueError, match="Unknown widget op"):
+            _PlainWidget("w").apply_ops([["pop", "items"]])
+
+
+# ---------------------------------------------------------------------------
+# Canvas command handlers
+# ---------------------------------------------------------------------------
+
+
+class TestCanvasWidgetCommands:
+    def test_add_then_update_over_ring(self, manager, cid):
+        canvas = manager.create_canvas(cid, auto_start=False)
+        canvas._running = True
+        client = SharedMemoryManager(name_prefix=f"canvas_{cid}")
+        try:
+            client.attach_regions()
+            client.write_command(
+                CommandType.ADD_WIDGET,
+                canvas_id=cid,
+                widget_id="btn",
+                widget_type="ButtonWidget",
+                properties={"label": "Go"},
+            )
+            client.write_command(
+                CommandType.UPDATE_WIDGET,
+                canvas_id=cid,
+                widget_id="btn",
+                properties={"label": "Stop"},
+            )
+            canvas._process_commands()
+        finally:
+            client.cleanup()
+
+        widget = canvas.widget_registry.get("btn")
+        assert widget is not None
+        assert widget.state.properties["label"] == "Stop"
+
+    def test_update_unknown_widget_returns_false(self, manager, cid):
+        canvas = manager.create_canvas(cid, auto_start=False)
+        assert canvas.apply_widget_update("missing", {"x": 1}) is False
+
+
+# ---------------------------------------------------------------------------
+# MCP tool routing
+# ---------------------------------------------------------------------------
+
+
+class TestToolRouting:
+    def test_inline_when_loop_not_running(self, manager, cid):
+        canvas, widget = _drawing_canvas(manager, cid)
+        mcp = create_mcp_app(canvas_manager=manager)
+
+        result = _fn(mcp, "drawing_add_llm_stroke")(
+            canvas_id=cid, widget_id="board", points=[[0, 0], [5, 5]]
+        )
+
+        assert result["success"] is True
+        assert len(widget.state.properties["strokes"]) == 1
+        assert canvas.shm_manager.pending_count() == 0
+
+    def test_queued_when_loop_live(self, manager, cid, monkeypatch):
+        canvas, widget = _drawing_canvas(manager, cid)
+        canvas._running = True
+        monkeypatch.setattr(manager, "is_loop_healthy", lambda: True)
+        mcp = create_mcp_app(canvas_manager=manager)
+
+        result = _fn(mcp, "drawing_add_llm_stroke")(
+            canvas_id=cid, widget_id="board", points=[[0, 0], [5, 5]]
+        )
+        assert result["success"] is True
+        assert result["data"]["stroke_count"] == 1
+        assert widget.state.properties.get("strokes", []) == []
+        assert canvas.shm_manager.pending_count() > 0
+
+        canvas._process_commands()
+        assert len(widget.state.properties["strokes"]) == 1
+
+    def test_concurrent_appends_are_not_lost(self, manager, cid, monkeypatch):
+        """Queued extend ops must not overwrite each other."""
+        canvas, widget = _drawing_canvas(manager, cid)
+        canvas._running = True
+        monkeypatch.setattr(manager, "is_loop_healthy", lambda: True)
+        mcp = create_mcp_app(canvas_manager=manager)
+        add_stroke = _fn(mcp, "drawing_add_llm_stroke")
+
+        for i in range(5):
+            add_stroke(canvas_id=cid, widget_id="board", points=[[i, 0], [i, 1]])
+        canvas._process_commands()
+
+        assert len(widget.state.properties["strokes"]) == 5
+
+    def test_update_shape_queued_as_set_item(self, manager, cid, monkeypatch):
+        canvas, widget = _drawing_canvas(manager, cid)
+        widget.add_shape("rect", x1=0.0, y1=0.0, x2=10.0, y2=10.0)
+        canvas._running = True
+        monkeypatch.setattr(manager, "is_loop_healthy", lambda: True)
+        mcp = create_mcp_app(canvas_manager=manager)
+
+        with _render_loop(canvas):
+            result = _fn(mcp, "update_shape")(
+                canvas_id=cid, widget_id="board", index=0, thickness=7.0
+            )
+
+        assert result["success"] is True
+        assert widget.state.properties["shapes"][0]["thickness"] == 7.0
+
+    def test_update_right_after_queued_add(self, manager, cid, monkeypatch):
+        """Bounds are checked after earlier queued extends have applied."""
+        canvas, widget = _drawing_canvas(manager, cid)
+        canvas._running = True
+        monkeypatch.setattr(manager, "is_loop_healthy", lambda: True)
+        mcp = create_mcp_app(canvas_manager=manager)
+
+        _fn(mcp, "drawing_add_llm_stroke")(
+            canvas_id=cid, widget_id="board", points=[[0, 0], [1, 1]]
+        )
+        assert widget.state.properties.get("strokes", []) == []
+        with _render_loop(canvas):
+            result = _fn(mcp, "update_stroke")(
+                canvas_id=cid, widget_id="board", index=0, brush_size=9.0
+            )
+
+        assert result["success"] is True
+        assert widget.state.properties["strokes"][0]["brush_size"] == 9.0
+
+    def test_queued_update_out_of_range_reports_error(self, manager, cid, monkeypatch):
+        canvas, _ = _drawing_canvas(manager, cid)
+        canvas._running = True
+        monkeypatch.setattr(manager, "is_loop_healthy", lambda: True)
+        mcp = create_mcp_app(canvas_manager=manager)
+
+        with _render_loop(canvas):
+            result = _fn(mcp, "update_annotation")(
+                canvas_id=cid, widget_id="board", index=2, text="x"
+            )
+
+        assert result["success"] is False
+        assert "ERROR" in result["error"]
+
+    def test_payload_larger_than_ring(self, manager, cid, monkeypatch):
+        canvas, widget = _drawing_canvas(manager, cid)
+        canvas._running = True
+        monkeypatch.setattr(manager, "is_loop_healthy", lambda: True)
+        mcp = create_mcp_app(canvas_manager=manager)
+        # ~350 KB of MessagePack, well past the 128 KiB ring
+        stroke = [[float(i), float(i % 97)] for i in range(20_000)]
+
+        with _render_loop(canvas):
+            result = _fn(mcp, "drawing_import_strokes")(
+                canvas_id=cid, widget_id="board", strokes=[stroke]
+            )
+
+        assert result["success"] is True
+        assert widget.state.properties["strokes"] == [stroke]